@@ -5,6 +5,8 @@ Amazon 크롤링 모니터링 및 알림 모듈
 """
 
 import smtplib
+import os
+import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -13,6 +15,7 @@ import logging
 import pandas as pd
 
 from config import EMAIL_CONFIG
+from price_parser import parse_price_series
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +40,11 @@ COUNTRY_NAMES = {
 }
 
 
+def _empty_mask(series):
+    """None, NaN, 빈 문자열을 빈 값으로 보는 마스크"""
+    return series.isna() | series.eq('')
+
+
 def analyze_crawl_results(country_code, target_count, results_df, error_logs=None):
     """
     크롤링 결과 분석
@@ -121,25 +129,24 @@ def analyze_crawl_results(country_code, target_count, results_df, error_logs=Non
                 })
                 analysis['is_critical'] = True
 
-    # ships_from 또는 sold_by가 있는데 retailprice가 없는 경우 감지
-    if results_df is not None and len(results_df) > 0:
-        if 'retailprice' in results_df.columns and ('ships_from' in results_df.columns or 'sold_by' in results_df.columns):
-            for idx, row in results_df.iterrows():
-                # retailprice가 None, NaN, 또는 빈 문자열인지 확인
-                price_val = row['retailprice'] if 'retailprice' in row.index else None
-                price_is_empty = price_val is None or pd.isna(price_val) or (isinstance(price_val, str) and price_val == '')
-
-                # ships_from이 유효한 값인지 확인
-                ships_from_val = row['ships_from'] if 'ships_from' in row.index else None
-                ships_from_exists = ships_from_val is not None and not pd.isna(ships_from_val) and ships_from_val != ''
-
-                # sold_by가 유효한 값인지 확인
-                sold_by_val = row['sold_by'] if 'sold_by' in row.index else None
-                sold_by_exists = sold_by_val is not None and not pd.isna(sold_by_val) and sold_by_val != ''
-
-                if price_is_empty and (ships_from_exists or sold_by_exists):
-                    analysis['has_price_error'] = True
-                    break
+    # ships_from 또는 sold_by가 있는데 retailprice가 없는 경우 감지 (행 반복 없이 컬럼 단위로 비교)
+    if 'retailprice' in results_df.columns and ('ships_from' in results_df.columns or 'sold_by' in results_df.columns):
+        seller_exists = pd.Series(False, index=results_df.index)
+        for field in ('ships_from', 'sold_by'):
+            if field in results_df.columns:
+                seller_exists |= ~_empty_mask(results_df[field])
+        analysis['has_price_error'] = bool((_empty_mask(results_df['retailprice']) & seller_exists).any())
+
+    # 값은 있지만 가격으로 해석되지 않는 retailprice (price_parser 일괄 변환)
+    if 'retailprice' in results_df.columns:
+        prices = results_df['retailprice']
+        unparsed_count = int((~_empty_mask(prices) & parse_price_series(prices, country_code).isna()).sum())
+        analysis['field_stats']['retailprice']['unparsed_count'] = unparsed_count
+        if unparsed_count > 0:
+            analysis['alerts'].append({
+                'type': 'WARNING',
+                'message': f'가격 형식 해석 불가 {unparsed_count}개 ({unparsed_count}/{crawled_count})'
+            })
 
     return analysis
 
@@ -338,6 +345,38 @@ def send_alert_email(analysis, error_message=None):
         return False
 
 
+def write_run_summary(analysis, error_message=None):
+    """
+    RUN_SUMMARY_FILE 환경변수가 있으면 분석 결과를 JSON으로 저장
+    (orchestrator.py가 리테일러별 실행 요약을 모으는 용도)
+
+    Args:
+        analysis: analyze_crawl_results()의 반환값
+        error_message: 추가 에러 메시지 (선택)
+
+    Returns:
+        bool: 저장 여부
+    """
+    summary_path = os.getenv('RUN_SUMMARY_FILE')
+    if not summary_path:
+        return False
+
+    try:
+        summary = dict(analysis)
+        summary['error_message'] = error_message
+        summary['finished_at'] = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y-%m-%d %H:%M:%S')
+
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+        logger.info(f"실행 요약 저장: {summary_path}")
+        return True
+
+    except Exception as e:
+        logger.error(f"실행 요약 저장 실패: {e}")
+        return False
+
+
 def monitor_and_alert(country_code, target_count, results_df, error_message=None, error_logs=None):
     """
     크롤링 결과 모니터링 및 알림 (메인 함수)
@@ -370,6 +409,9 @@ def monitor_and_alert(country_code, target_count, results_df, error_message=None
         # 결과 분석
         analysis = analyze_crawl_results(country_code, target_count, results_df, error_logs)
 
+        # 오케스트레이터 실행 시 요약 파일 기록
+        write_run_summary(analysis, error_message)
+
         # 항상 이메일 발송 (일일 리포트)
         return send_alert_email(analysis, error_message)
 
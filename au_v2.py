@@ -35,13 +35,42 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 
 from config import FILE_SERVER_CONFIG
+from alert_monitor import monitor_and_alert
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from html_snapshot import PageSnapshot
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import (
+    get_matcher, LABELS, BLOCKED_TITLE, BLOCKED, CONTINUE, NORMAL_PAGE, OUT_OF_STOCK, IN_STOCK
+)
+
+# 정상/차단/Continue/재고 문구 (영어 Amazon)
+PAGE_PATTERNS = get_matcher('en')
+
+# 호주 결과 테이블에는 channel_name 컬럼 없음
+AU_RESULT_COLUMNS = tuple(column for column in AMAZON_RESULT_COLUMNS if column != 'channel_name')
 
 class AmazonAustraliaScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
         self.country_code = 'au'
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Australia/Canberra')  # 호주 현지 시간 (캔버라)
@@ -264,8 +293,11 @@ class AmazonAustraliaScraper:
                 'profile.default_content_setting_values.notifications': 2
             })
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             
             self.wait = WebDriverWait(self.driver, 20)
             
@@ -384,61 +416,38 @@ class AmazonAustraliaScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
-    def is_page_blocked(self):
-        """페이지 차단 감지"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 (page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
-            
-            # 정상 페이지 확인 (우선 체크)
-            normal_indicators = [
-                'add to cart',
-                'buy now',
-                'product title',
-                'price',
-                'availability',
-                'customer reviews',
-                'product details',
-                'ships from',
-                'sold by'
-            ]
+            page = page if page is not None else PageSnapshot(self.driver)
             
-            normal_count = sum(1 for indicator in normal_indicators if indicator in page_source)
+            # 정상 페이지 확인 (우선 체크) - 정상/Continue/차단 문구를 브라우저 안에서 한 번에 검사해 일치한 패턴만 받아옴
+            found = page.classify(PAGE_PATTERNS, NORMAL_PAGE, CONTINUE, BLOCKED)
+            normal_count = len(found.get(NORMAL_PAGE, []))
             
             # 정상 지표가 3개 이상이면 정상 페이지
             if normal_count >= 3:
                 logger.info(f"정상 페이지 확인: {normal_count}개 지표 발견")
                 return False
             
-            serious_blocked_indicators = {
-                'title': [
-                    '503',
-                    'access denied',
-                    'error has occurred'
-                ],
-                'content': [
-                    'enter the characters',
-                    'verify you are human',
-                    'access denied',
-                    'automated access',
-                    'suspicious activity'
-                ]
-            }
+            # 제목/URL은 정상 페이지가 아닐 때만 조회
+            page_title = page.title.lower()
+            current_url = page.url.lower()
             
-            for pattern in serious_blocked_indicators['title']:
-                if pattern in page_title:
-                    logger.warning(f"심각한 차단 감지 (제목): {pattern}")
-                    return True
+            title_hits = PAGE_PATTERNS.classify(page_title, BLOCKED_TITLE)
+            if title_hits:
+                logger.warning(f"심각한 차단 감지 (제목): {title_hits[BLOCKED_TITLE][0]}")
+                self.last_blocked = True
+                return True
             
-            if ('continue shopping' not in page_source):
-                for pattern in serious_blocked_indicators['content']:
-                    if pattern in page_source:
-                        logger.warning(f"심각한 차단 감지 (본문): {pattern}")
-                        return True
+            if CONTINUE not in found and BLOCKED in found:
+                logger.warning(f"심각한 차단 감지 (본문): {found[BLOCKED][0]}")
+                self.last_blocked = True
+                return True
             
             if 'amazon.com.au' not in current_url:
                 logger.warning(f"Amazon Australia 페이지가 아님: {current_url}")
+                self.last_blocked = True
                 return True
             
             return False
@@ -512,24 +521,13 @@ class AmazonAustraliaScraper:
                                     logger.info(f"원본 텍스트: '{text}'")
                                     
                                     if element_name in ["Sold By", "Ships From"]:
-                                        label_only_patterns = [
-                                            'sold by',
-                                            'ships from'
-                                        ]
-                                        
-                                        text_lower = text.lower().strip()
-                                        
-                                        if text_lower in label_only_patterns:
+                                        label_only, value = LABELS.strip_label(text)
+                                        if label_only:
                                             logger.info(f"라벨만 있음, 스킵: '{text}'")
                                             continue
-                                        
-                                        for pattern in label_only_patterns:
-                                            if text_lower.startswith(pattern + ' '):
-                                                actual_value = text[len(pattern):].strip()
-                                                if actual_value:
-                                                    text = actual_value
-                                                    logger.info(f"라벨 제거 후: '{text}'")
-                                                break
+                                        if value != text.strip():
+                                            text = value
+                                            logger.info(f"라벨 제거 후: '{text}'")
                                     
                                     if text:
                                         logger.info(f"최종 추출: '{text}'")
@@ -545,31 +543,12 @@ class AmazonAustraliaScraper:
         return None
     
     def parse_aud_price(self, price_text):
-        """호주 달러 가격 파싱"""
-        try:
-            price_text = price_text.strip()
-            logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
-            
-            # AUD 기호와 공백 제거
-            cleaned = re.sub(r'[A$\s]', '', price_text)
-            logger.debug(f"통화 제거 후: '{cleaned}'")
-            
-            # 천단위 콤마가 있는 경우 제거하고 소수점 처리
-            if re.match(r'^\d{1,3}(,\d{3})*(\.\d{1,2})?$', cleaned):
-                cleaned = cleaned.replace(',', '')
-                logger.debug(f"콤마 제거 후: '{cleaned}'")
-                
-                if re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-            
-            # 단순 숫자 패턴
-            elif re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                return cleaned
-                    
-        except Exception as e:
-            logger.debug(f"가격 파싱 오류: {price_text} - {e}")
-            
-        return None
+        """호주 달러 가격 파싱 (price_parser 공통 규칙, 예: A$1,299.00 → 1299)"""
+        logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
+        price = parse_price(price_text, 'au', strict=True)
+        if price is not None:
+            self.last_price_text = price_text
+        return format_price(price)
     
     def extract_price(self):
         """가격 추출"""
@@ -705,20 +684,13 @@ class AmazonAustraliaScraper:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in [
-                    'currently unavailable',
-                    'out of stock',
-                    'temporarily out of stock'
-                ]):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"재고 없음: {availability_text}")
                     return False
                     
-                if any(phrase in availability_text for phrase in [
-                    'in stock',
-                    'only',
-                    'left in stock'
-                ]):
+                if IN_STOCK in stock:
                     logger.info(f"재고 있음: {availability_text}")
                     return True
                     
@@ -747,8 +719,17 @@ class AmazonAustraliaScraper:
             logger.warning(f"재고 확인 중 오류: {e}")
             return True
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AU_RESULT_COLUMNS,
+                          country_code=self.country_code, vat=row_data.get('vat', 'x'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info("=" * 60)
             logger.info("호주 제품 정보 추출 시작")
@@ -756,64 +737,30 @@ class AmazonAustraliaScraper:
             logger.info(f"브랜드: {row_data.get('brand', 'N/A')}")
             logger.info(f"제품: {row_data.get('item', 'N/A')}")
             
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(2, 4))
             
-            page_source_lower = self.driver.page_source.lower()
-            if ('continue shopping' in page_source_lower or 
-                'click the button below' in page_source_lower):
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
+            if page.classify(PAGE_PATTERNS, CONTINUE):
+                self.last_blocked = True
                 logger.info("차단/캡차 페이지 감지 - Continue 버튼 찾는 중...")
                 if self.handle_captcha_or_block_page():
                     time.sleep(3)
                     self.wait_for_page_load()
                 else:
                     logger.warning("Continue 버튼 클릭 실패")
+                page.invalidate()
             
             self.wait_for_page_load()
             
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.error("여전히 차단 페이지임")
                 raise Exception("페이지 차단됨")
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+            result = self.build_base_result(url, row_data)
             
             result['title'] = self.extract_element_text(
                 self.selectors[self.country_code].get('title', []), 
@@ -860,8 +807,7 @@ class AmazonAustraliaScraper:
                 except:
                     continue
             
-            page_source = self.driver.page_source
-            page_source_lower = page_source.lower()
+            # VAT 확인이 꺼져 있는 동안은 소스를 가져오지 않음 (다시 켤 때: page_source_lower = page.lower)
             
             # for vat_text in self.selectors[self.country_code].get('vat_text_list', []):
             #     if vat_text.lower() in page_source_lower:
@@ -877,6 +823,7 @@ class AmazonAustraliaScraper:
             logger.info(f"배송지: {result['ships_from']}")
             # logger.info(f"VAT: {result['vat']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -895,39 +842,8 @@ class AmazonAustraliaScraper:
                     self.setup_driver()
                 
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 크롤링 대상 URL 목록 조회"""
@@ -960,7 +876,7 @@ class AmazonAustraliaScraper:
         try:
             table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
             
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"DB 저장 완료: {len(df)}개 레코드 -> {table_name}")
             
             log_records = []
@@ -968,8 +884,8 @@ class AmazonAustraliaScraper:
                 log_records.append({
                     'country_code': self.country_code,
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -977,7 +893,7 @@ class AmazonAustraliaScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"크롤링 로그 저장 완료: {len(log_records)}개")
             
             return True
@@ -1038,6 +954,9 @@ class AmazonAustraliaScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_au_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1088,10 +1007,15 @@ class AmazonAustraliaScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """여러 URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table=f'amazon_price_crawl_tbl_{self.country_code}_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info("=" * 80)
         logger.info("호주 크롤링 시작")
@@ -1103,7 +1027,7 @@ class AmazonAustraliaScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AU_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
         
         try:
@@ -1112,7 +1036,9 @@ class AmazonAustraliaScraper:
                 
                 url = row.get('url')
                 
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 if result['retailprice'] is None and result['title'] is None:
                     failed_urls.append({
@@ -1132,25 +1058,11 @@ class AmazonAustraliaScraper:
                 results.append(result)
                 
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
-                            interim_df.to_sql(table_name, self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info("중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"{wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                    if (idx + 1) % 20 == 0:
-                        logger.info("20개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"스크래핑 중 오류: {e}")
         
@@ -1166,7 +1078,7 @@ class AmazonAustraliaScraper:
                 self.driver.quit()
                 logger.info("드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1188,7 +1100,7 @@ class AmazonAustraliaScraper:
             price_df = df[df['retailprice'].notna()].copy()
             
             try:
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("가격 통계:")
                 logger.info(f"   평균가: {price_df['price_numeric'].mean():.2f}")
@@ -1213,6 +1125,7 @@ def main():
     """메인 실행 함수"""
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print("=" * 80)
     print("Amazon Australia 가격 추출 시스템 v1.0")
@@ -1229,6 +1142,7 @@ def main():
     
     if scraper.db_engine is None:
         logger.error("DB 연결 실패로 종료합니다.")
+        monitor_and_alert('au', 0, None, error_message="DB 연결 실패")
         return
     
     if test_mode:
@@ -1258,14 +1172,16 @@ def main():
     
     if not urls_data:
         logger.warning("크롤링 대상이 없습니다.")
+        monitor_and_alert('au', 0, None, error_message="크롤링 대상 URL이 없습니다")
         return
     
     logger.info(f"크롤링 대상: {len(urls_data)}개")
     
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
+        monitor_and_alert('au', len(urls_data), None, error_message="크롤링 결과가 없습니다")
         return
     
     scraper.analyze_results(results_df)
@@ -1286,6 +1202,9 @@ def main():
     logger.info("크롤링 프로세스 완료!")
     logger.info("=" * 80)
 
+    # 크롤링 결과 모니터링 및 알림
+    monitor_and_alert('au', len(urls_data), results_df)
+
 if __name__ == "__main__":
     required_packages = [
         'undetected-chromedriver',
@@ -1302,6 +1221,7 @@ if __name__ == "__main__":
     print("환경변수 설정:")
     print("export TEST_MODE=false  # 테스트 모드")
     print("export MAX_ITEMS=10     # 최대 처리 개수 (선택사항)")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print()
     
     main()
\ No newline at end of file
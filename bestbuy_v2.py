@@ -6,7 +6,6 @@ DB에서 URL 읽어와서 크롤링 후 결과 저장
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 import pymysql
 from sqlalchemy import create_engine
@@ -30,11 +29,43 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from selector_memory import get_selector_memory
+from page_readiness import wait_until_ready, get_ready_timeout, get_page_load_strategy, apply_page_load_strategy
+from structured_data import extract_from_driver, fill_result
+from network_capture import SeleniumCapture, get_capture_timeout
+from http_fetch import HttpFetcher, get_fetch_engine, ENGINE_HTTP
+from price_parser import parse_price, parse_price_series
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, WALL_TITLE
+
+# 기존 가격 선택자가 모두 실패했을 때 쓰는 스크린리더용 가격 텍스트
+SR_ONLY_PRICE_XPATH = "//span[@class='sr-only' and contains(text(), 'current price')]"
+
+# 가격 요소에 실제 값이 채워졌는지 판정 ($ 금액 또는 숫자만 있는 텍스트)
+PRICE_READY_PATTERN = r'\$\s*\d|^[\d.,]+$'
+
+# 차단 페이지 제목 문구
+PAGE_PATTERNS = get_matcher('en')
 
 class BestBuyScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('bestbuy', initial_interval=3.5, min_interval=1.0)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
+        self.selector_memory = get_selector_memory('bestbuy')  # 상품별로 지난번 성공한 선택자 우선 시도
+        self.ready_timeout = get_ready_timeout('bestbuy', default=20)  # 가격 요소 등장 대기 한도 (초)
+        self.network_capture = SeleniumCapture('bestbuy')  # 가격 API 응답 캡처 (NETWORK_CAPTURE_BESTBUY=1)
+        self.capture_timeout = get_capture_timeout('bestbuy')
+        # HTTP 우선 수집 (FETCH_ENGINE_BESTBUY=http): 브라우저 세션 쿠키로 먼저 요청, 차단/불완전하면 브라우저
+        self.http_fetcher = HttpFetcher('bestbuy') if get_fetch_engine('bestbuy') == ENGINE_HTTP else None
         self.sftp_client = None
         self.session_initialized = False
         self.country_code = 'usa'
@@ -216,8 +247,11 @@ class BestBuyScraper:
             # 스텔스 모드 설정
             options.add_argument('--disable-blink-features=AutomationControlled')
             
+            apply_page_load_strategy(options, get_page_load_strategy('bestbuy'))
+            self.network_capture.enable_logging(options)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'bestbuy')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
             
             # 추가 스텔스 설정
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -244,6 +278,10 @@ class BestBuyScraper:
             # 국가 선택 팝업 처리
             self.handle_country_popup()
             
+            # HTTP 엔진이 같은 세션(쿠키/User-Agent)으로 요청하도록 전달
+            if self.http_fetcher is not None:
+                self.http_fetcher.load_selenium_session(self.driver)
+            
             # 세션 확인
             title = self.driver.title
             if "Best Buy" in title:
@@ -296,71 +334,39 @@ class BestBuyScraper:
             logger.warning(f"국가 팝업 처리 중 오류 (무시): {e}")
             return True
     
-    def wait_for_price_elements(self, max_wait=30):
-        """가격 요소들이 실제로 로드될 때까지 스마트 대기"""
-        
-        # 1단계: 기본 페이지 구조 대기
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-        except:
-            pass
-        
-        # 2단계: 가격 관련 컨테이너들 대기 (여러 후보 중 하나라도 나타나면 OK)
-        price_containers = [
-            "//div[contains(@class, 'pricing')]",
-            "//div[contains(@class, 'price')]", 
-            "//span[contains(@class, 'current-price')]",
-            "//div[contains(@data-testid, 'pricing')]"
-        ]
-        
-        for container in price_containers:
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, container))
-                )
-                break
-            except:
-                continue
-        
-        # 3단계: 실제 가격 값이 들어올 때까지 대기
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            for xpath in self.XPATHS.get('price', []):
-                try:
-                    element = self.driver.find_element(By.XPATH, xpath)
-                    text = element.text.strip()
-                    if text and ('$' in text or text.replace(',', '').replace('.', '').isdigit()):
-                        logger.info(f"✅ 가격 요소 로딩 완료: {text}")
-                        return True
-                except:
-                    continue
-            time.sleep(1)  # 1초마다 재확인
-        
-        logger.warning("⚠️ 가격 요소 로딩 시간 초과")
-        return False
-
-    def wait_for_network_idle(self, idle_time=2):
-        """네트워크 요청이 완료될 때까지 대기"""
-        try:
-            # Performance API 사용해서 네트워크 요청 완료 확인
-            script = """
-            return window.performance.getEntriesByType('navigation')[0].loadEventEnd > 0
-            """
-            
-            start_time = time.time()
-            while time.time() - start_time < 20:  # 최대 20초
-                if self.driver.execute_script(script):
-                    time.sleep(idle_time)  # 추가 안정화 시간
-                    return True
-                time.sleep(0.5)
-        except:
-            pass
-        return False
+    def wait_for_price_elements(self, max_wait=None):
+        """가격 값이 채워진 가격 요소가 나타나는 순간 반환 (MutationObserver, 폴링 없음)"""
+        price_xpaths = self.XPATHS.get('price', []) + [SR_ONLY_PRICE_XPATH]
+        matched = wait_until_ready(self.driver, price_xpaths, max_wait or self.ready_timeout,
+                                   text_pattern=PRICE_READY_PATTERN)
+        return matched is not None
+
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (브라우저/HTTP 엔진 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code=row_data.get('country', 'usa'), ships_from='usa',
+                          channel_name='bestbuy', sold_by='BestBuy', vat=row_data.get('vat', 'x'))
+
+    def parse_price_text(self, price_text):
+        """BestBuy 가격 형식 파싱: "$1,299.99" -> 1299.99 (첫 번째 달러 금액)"""
+        price = parse_price(price_text, 'usa', require_symbol=True)
+        if price is not None:
+            self.last_price_text = price_text
+        return price
+
+    def extract_via_http(self, url, row_data):
+        """HTTP 우선 추출 - 차단되었거나 필수 필드가 비면 None (브라우저로 처리)"""
+        result = self.build_base_result(url, row_data)
+        if self.http_fetcher.extract(url, result, self.XPATHS, self.parse_price_text, result['retailersku']):
+            return result
+        return None
 
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 (재시도 로직 포함)"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"🔍 페이지 접속: {url} (시도: {retry_count + 1}/{max_retries + 1})")
             
@@ -368,79 +374,38 @@ class BestBuyScraper:
             if not self.session_initialized:
                 self.initialize_session()
             
+            self.network_capture.reset(self.driver)
             self.driver.get(url)
             
-            # 스마트 대기 전략 적용
-            logger.info("⏳ 페이지 로딩 대기 중...")
-            
-            # 1. 네트워크 완료 대기
-            self.wait_for_network_idle()
-            
-            # 2. 가격 요소들 로딩 대기
-            if not self.wait_for_price_elements():
-                logger.warning("가격 요소 로딩 실패, 그래도 추출 시도")
-            
-            # 3. 추가 안정화 시간
-            time.sleep(random.uniform(2, 4))
+            # 가격 API 응답에서 가격이 잡히면 DOM 렌더링 대기 생략 (캡처 사용 시)
+            captured = self.network_capture.wait_for_values(
+                self.driver, row_data.get('retailersku', ''), self.capture_timeout
+            )
+            if 'retailprice' not in captured['values']:
+                # 가격 요소 등장 대기 (나타나는 즉시 진행, 한도는 READY_TIMEOUT_BESTBUY)
+                logger.info("⏳ 페이지 로딩 대기 중...")
+                if not self.wait_for_price_elements():
+                    logger.warning("가격 요소 로딩 실패, 그래도 추출 시도")
             
             # 페이지 로드 대기
             wait = WebDriverWait(self.driver, 20)
             
             # 차단 감지
             title = self.driver.title
-            blocked_patterns = ["Access Denied", "Blocked", "Robot", "Captcha", "Sorry", "Error"]
-            for pattern in blocked_patterns:
-                if pattern.lower() in title.lower():
-                    logger.warning(f"⚠️ 차단 감지: {pattern}")
-                    self.error_logs.append(f"[차단 감지] URL: {url} | 패턴: {pattern}")
-                    raise Exception(f"Blocked: {pattern}")
+            pattern = PAGE_PATTERNS.matches(title, WALL_TITLE)
+            if pattern:
+                self.last_blocked = True
+                logger.warning(f"⚠️ 차단 감지: {pattern}")
+                self.error_logs.append(f"[차단 감지] URL: {url} | 패턴: {pattern}")
+                raise Exception(f"Blocked: {pattern}")
             
-            # 현재 시간
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-
-            # ISO 8601 형식
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            tz_offset = local_time.strftime("%z")
-
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'usa'),
-                'ships_from': 'usa',
-                'channel_name': 'bestbuy',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'BestBuy',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+            result = self.build_base_result(url, row_data)
+            
+            # 가격 API 응답 -> 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 순서로 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, captured)
+            structured = extract_from_driver(self.driver, result['retailersku'])
+            fill_result(result, structured)
             
             # 재고 상태 확인
             page_source = self.driver.page_source
@@ -453,104 +418,102 @@ class BestBuyScraper:
                     break
             
             # 가격 추출
-            price_found = False
+            price_found = result['retailprice'] is not None
             
-            # 1단계: 기존 선택자로 시도
-            logger.info("💰 기존 가격 선택자로 시도 중...")
-            for xpath in self.XPATHS.get('price', []):
-                try:
-                    price_element = self.driver.find_element(By.XPATH, xpath)
-                    price_text = price_element.text.strip()
+            if not price_found:
+                # 기존 선택자 -> sr-only 가격 순서로 시도 (이 상품에서 지난번 성공한 선택자가 있으면 먼저)
+                logger.info("💰 가격 선택자로 시도 중...")
+                price_xpaths = self.selector_memory.ordered(
+                    url, 'price', self.XPATHS.get('price', []) + [SR_ONLY_PRICE_XPATH]
+                )
+                for xpath in price_xpaths:
+                    try:
+                        price_element = self.driver.find_element(By.XPATH, xpath)
+                        price_text = price_element.text.strip()
                     
-                    logger.info(f"🔍 선택자: {xpath}")
-                    logger.info(f"📝 추출된 텍스트: '{price_text}'")
+                        logger.info(f"🔍 선택자: {xpath}")
+                        logger.info(f"📝 추출된 텍스트: '{price_text}'")
                     
-                    if price_text:
-                        # BestBuy는 주로 $ 사용
-                        price_match = re.search(r'\$([\d,]+\.?\d*)', price_text)
-                        if price_match:
-                            price_number = price_match.group(1).replace(',', '')
-                            result['retailprice'] = float(price_number)
-                            logger.info(f"✅ 가격 추출 성공: ${result['retailprice']} (선택자: {xpath})")
-                            price_found = True
-                            break
+                        if price_text:
+                            # BestBuy는 주로 $ 사용
+                            price_match = re.search(r'\$([\d,]+\.?\d*)', price_text)
+                            if price_match:
+                                price_number = price_match.group(1).replace(',', '')
+                                result['retailprice'] = float(price_number)
+                                logger.info(f"✅ 가격 추출 성공: ${result['retailprice']} (선택자: {xpath})")
+                                self.selector_memory.remember(url, 'price', xpath)
+                                price_found = True
+                                break
+                            else:
+                                logger.info(f"❌ 가격 패턴 매칭 실패: '{price_text}'")
                         else:
-                            logger.info(f"❌ 가격 패턴 매칭 실패: '{price_text}'")
-                    else:
-                        logger.info("❌ 빈 텍스트")
-                except Exception as xe:
-                    logger.info(f"❌ 선택자 실행 실패: {xe}")
-                    continue
-            
-            # 2단계: CSS 선택자로 재시도
-            if not price_found:
-                logger.info("💰 CSS 선택자로 재시도 중...")
-                try:
-                    css_xpath = "//span[@class='sr-only' and contains(text(), 'current price')]"
-                    price_element = self.driver.find_element(By.XPATH, css_xpath)
-                    price_text = price_element.text
-                    if '$' in price_text:
-                        price_match = re.search(r'\$([\d,]+\.?\d*)', price_text)
-                        if price_match:
-                            result['retailprice'] = float(price_match.group(1).replace(',', ''))
-                            logger.info(f"✅ 가격 추출 성공 (CSS): ${result['retailprice']}")
-                            price_found = True
-                except Exception as ex:
-                    logger.info("CSS 선택자도 실패")
+                            logger.info("❌ 빈 텍스트")
+                    except Exception as xe:
+                        logger.info(f"❌ 선택자 실행 실패: {xe}")
+                        continue
             
-            if not price_found:
-                logger.warning("모든 가격 추출 방법 실패")
-                self.error_logs.append(f"[가격 추출 실패] URL: {url}")
+                if not price_found:
+                    logger.warning("모든 가격 추출 방법 실패")
+                    self.error_logs.append(f"[가격 추출 실패] URL: {url}")
             
             # 제목 추출
             is_soldout_fallback = False  # 품절 fallback 여부 플래그
-            try:
-                for xpath in self.XPATHS.get('title', []):
-                    try:
-                        title_element = self.driver.find_element(By.XPATH, xpath)
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목: {result['title'][:50]}...")
-                        break
-                    except:
-                        continue
+            if result['title'] is None:
+                try:
+                    for xpath in self.selector_memory.ordered(url, 'title', self.XPATHS.get('title', [])):
+                        try:
+                            title_element = self.driver.find_element(By.XPATH, xpath)
+                            result['title'] = title_element.text.strip()
+                            logger.info(f"제목: {result['title'][:50]}...")
+                            if result['title']:
+                                self.selector_memory.remember(url, 'title', xpath)
+                            break
+                        except:
+                            continue
 
-                # 제목 추출 실패 시 품절 상품용 fallback 시도
-                if not result['title']:
-                    try:
-                        title_element = self.driver.find_element(By.XPATH, '/html/body/div[5]/div[3]/div[1]/div/div[2]/h1')
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목 (품절 fallback): {result['title'][:50]}...")
-                        is_soldout_fallback = True  # 품절 fallback으로 제목 추출됨
-                    except:
-                        pass
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+                    # 제목 추출 실패 시 품절 상품용 fallback 시도
+                    if not result['title']:
+                        try:
+                            title_element = self.driver.find_element(By.XPATH, '/html/body/div[5]/div[3]/div[1]/div/div[2]/h1')
+                            result['title'] = title_element.text.strip()
+                            logger.info(f"제목 (품절 fallback): {result['title'][:50]}...")
+                            is_soldout_fallback = True  # 품절 fallback으로 제목 추출됨
+                        except:
+                            pass
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
 
             # 이미지 URL 추출
-            try:
-                for xpath in self.XPATHS.get('imageurl', []):
-                    try:
-                        image_element = self.driver.find_element(By.XPATH, xpath)
-                        result['imageurl'] = image_element.get_attribute('src')
-                        logger.info(f"이미지 URL: {result['imageurl'][:50]}...")
-                        break
-                    except:
-                        continue
+            if result['imageurl'] is None:
+                try:
+                    for xpath in self.selector_memory.ordered(url, 'imageurl', self.XPATHS.get('imageurl', [])):
+                        try:
+                            image_element = self.driver.find_element(By.XPATH, xpath)
+                            result['imageurl'] = image_element.get_attribute('src')
+                            logger.info(f"이미지 URL: {result['imageurl'][:50]}...")
+                            if result['imageurl']:
+                                self.selector_memory.remember(url, 'imageurl', xpath)
+                            break
+                        except:
+                            continue
 
-                # 이미지 추출 실패 시 품절 상품용 fallback 시도
-                if not result['imageurl']:
-                    try:
-                        image_element = self.driver.find_element(By.XPATH, '/html/body/div[5]/div[3]/div[1]/div/div[1]/img')
-                        result['imageurl'] = image_element.get_attribute('src')
-                        logger.info(f"이미지 URL (품절 fallback): {result['imageurl'][:50]}...")
-                    except:
-                        pass
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
+                    # 이미지 추출 실패 시 품절 상품용 fallback 시도
+                    if not result['imageurl']:
+                        try:
+                            image_element = self.driver.find_element(By.XPATH, '/html/body/div[5]/div[3]/div[1]/div/div[1]/img')
+                            result['imageurl'] = image_element.get_attribute('src')
+                            logger.info(f"이미지 URL (품절 fallback): {result['imageurl'][:50]}...")
+                        except:
+                            pass
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
 
             # 가격 추출 실패 시 재시도 (exception 없이 price가 None인 경우)
-            # 단, 품절 fallback으로 제목을 추출한 경우 재시도하지 않음 (품절 상품은 가격 없는 것이 정상)
-            if result['retailprice'] is None and retry_count < max_retries and not is_soldout_fallback:
+            # 단, 품절 fallback으로 제목을 추출했거나 구조화 데이터가 품절인 경우 재시도하지 않음 (품절 상품은 가격 없는 것이 정상)
+            is_soldout = is_soldout_fallback or 'out_of_stock' in (
+                captured['values'].get('availability'), structured['values'].get('availability')
+            )
+            if result['retailprice'] is None and retry_count < max_retries and not is_soldout:
                 wait_time = (retry_count + 1) * 10
                 logger.warning(f"⚠️ 가격 추출 실패, {wait_time}초 후 재시도... (재시도 {retry_count + 1}/{max_retries})")
                 time.sleep(wait_time)
@@ -571,9 +534,10 @@ class BestBuyScraper:
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
 
             # 품절 fallback으로 제목 추출된 경우 로그 출력
-            if is_soldout_fallback and result['retailprice'] is None:
+            if is_soldout and result['retailprice'] is None:
                 logger.info("ℹ️ 품절 상품으로 판단, 가격 재시도 생략")
 
+            attach_raw_price(result, self.last_price_text)
             return result
 
         except Exception as e:
@@ -605,44 +569,8 @@ class BestBuyScraper:
 
             # 최대 재시도 횟수 초과 시 기본값 반환
             logger.error(f"❌ 최대 재시도 횟수 초과: {url}")
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'usa'),
-                'ships_from': 'usa',
-                'channel_name': 'bestbuy',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'BestBuy',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+
+            return self.build_base_result(url, row_data)
 
     def extract_with_retry(self, url, row_data):
         """제품 정보 추출 (extract_product_info 내부에 재시도 로직 포함)"""
@@ -656,7 +584,7 @@ class BestBuyScraper:
         
         try:
             # bestbuy_price_crawl_tbl_usa_v2 테이블에 저장
-            df.to_sql('bestbuy_price_crawl_tbl_usa_v2', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'bestbuy_price_crawl_tbl_usa_v2', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
             
             # 크롤링 로그를 pandas DataFrame으로 만들어서 한번에 저장
@@ -665,7 +593,7 @@ class BestBuyScraper:
                 log_records.append({
                     'country_code': 'usa',
                     'url': row['producturl'],
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -673,7 +601,7 @@ class BestBuyScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
             
             # 저장된 데이터 확인
@@ -743,6 +671,9 @@ class BestBuyScraper:
         time_str = local_time.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_usa_bestbuy"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -872,7 +803,11 @@ class BestBuyScraper:
 
         logger.info(f"📊 총 {len(urls_data)}개 제품 처리 시작")
 
-        results = []
+        # HTTP 엔진이 쓸 브라우저 세션을 먼저 준비
+        if self.http_fetcher is not None and not self.session_initialized:
+            self.initialize_session()
+
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
 
         for idx, row in enumerate(urls_data):
@@ -883,8 +818,21 @@ class BestBuyScraper:
                 # URL 추출
                 url = row.get('url')
 
+                # HTTP 우선 수집 - 차단/불완전하면 브라우저로 처리
+                result = None
+                if self.http_fetcher is not None:
+                    self.rate_limiter.wait(url)
+                    result = self.extract_via_http(url, row)
+                    self.rate_limiter.record(url, blocked=self.http_fetcher.last_blocked)
+
                 # 제품 정보 추출 (재시도 로직 적용)
-                result = self.extract_with_retry(url, row)
+                if result is None:
+                    self.rate_limiter.wait(url)
+                    result = self.extract_with_retry(url, row)
+                    self.rate_limiter.record(url, blocked=self.last_blocked)
+                    if self.http_fetcher is not None:
+                        # 브라우저에서 갱신된 쿠키를 다음 HTTP 요청에 반영
+                        self.http_fetcher.load_selenium_session(self.driver)
 
                 # 실패 여부 확인
                 if result['retailprice'] is None:
@@ -898,25 +846,9 @@ class BestBuyScraper:
 
                 # 10개마다 DB에 중간 저장 (save_interim=True일 때만)
                 if save_interim and (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('bestbuy_price_crawl_tbl_usa_v2', self.db_engine,
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(2, 5)  # BestBuy는 조금 더 빠르게
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-
-                    # 10개마다 긴 휴식
-                    if (idx + 1) % 10 == 0:
-                        logger.info("☕ 10개 처리 완료, 20초 휴식...")
-                        time.sleep(20)
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'bestbuy_price_crawl_tbl_usa_v2', self.db_engine, self.country_code)
 
             except Exception as e:
                 logger.error(f"❌ 스크래핑 중 오류 (URL: {row.get('url', 'unknown')}): {e}")
@@ -931,7 +863,12 @@ class BestBuyScraper:
             if len(failed_urls) > 5:
                 logger.warning(f"  ... 외 {len(failed_urls) - 5}개")
 
-        return pd.DataFrame(results)
+        # 상품별 선택자 기억 저장 (다음 실행에서 우선 시도)
+        self.selector_memory.save()
+        if self.http_fetcher is not None:
+            self.http_fetcher.log_summary()
+
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -949,7 +886,7 @@ class BestBuyScraper:
         
         if with_price > 0:
             price_df = df[df['retailprice'].notna()].copy()
-            price_df['numeric_price'] = pd.to_numeric(price_df['retailprice'], errors='coerce')
+            price_df['numeric_price'] = parse_price_series(price_df['retailprice'], self.country_code)
             
             logger.info(f"\n💰 가격 통계:")
             logger.info(f"평균가: ${price_df['numeric_price'].mean():.2f}")
@@ -1088,7 +1025,7 @@ def main():
 
                     # 기존 실패한 결과를 재시도 결과로 업데이트
                     for _, retry_row in retry_results_df.iterrows():
-                        if retry_row['retailprice'] is not None:
+                        if pd.notna(retry_row['retailprice']):
                             # 성공한 경우 기존 데이터 업데이트
                             mask = final_results_df['producturl'] == retry_row['producturl']
                             if mask.any():
@@ -1178,6 +1115,11 @@ if __name__ == "__main__":
     print("pip install " + " ".join(required_packages))
     print("\n⚠️ DB 설정을 먼저 확인하세요:")
     print("DB_CONFIG 딕셔너리의 user, password, host 정보를 실제 값으로 변경해야 합니다.")
+    print("\n환경변수 설정:")
+    print("export READY_TIMEOUT_BESTBUY=20  # 가격 요소 등장 대기 한도 초 (기본: 20)")
+    print("export NETWORK_CAPTURE_BESTBUY=1  # 가격 API 응답에서 가격/재고 직접 추출 (기본: 끔)")
+    print("export CAPTURE_TIMEOUT_BESTBUY=5  # 가격 API 응답 대기 한도 초, 넘으면 DOM 대기 (기본: 5)")
+    print("export FETCH_ENGINE_BESTBUY=http  # HTTP 우선 수집, 차단/불완전한 URL만 브라우저 (기본: browser)")
     print()
     
     main()
\ No newline at end of file
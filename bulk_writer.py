@@ -0,0 +1,183 @@
+"""
+대량 DB 저장 (결과 테이블 *_price_crawl_tbl_* / amazon_crawl_logs 공통)
+- 기존: DataFrame.to_sql(if_exists='append') 기본 설정 -> 호출마다 테이블 리플렉션 + 행 단위 INSERT 왕복
+- 테이블 존재 확인은 테이블별 1회 (없으면 첫 배치를 to_sql로 저장해 기존과 같은 타입으로 생성)
+- 이후 저장은 컬럼 목록이 고정된 INSERT 문 1개를 청크 단위 executemany로 실행
+  (PyMySQL은 INSERT ... VALUES executemany를 다중 행 INSERT로 묶어 청크당 왕복 1번)
+- 큰 배치는 선택적으로 LOAD DATA LOCAL INFILE (임시 CSV 1개 -> 왕복 1번)
+  - BULK_LOAD_DATA=1 + 서버 local_infile=ON 필요 (클라이언트 옵션은 전용 엔진에서 켬)
+  - 실패하면 경고 1번 후 executemany로 저장 (이후 같은 엔진은 executemany만 사용)
+- 저장마다 행 수 / 소요 시간 / rows/sec 로그
+- 환경변수
+  - BULK_CHUNK_SIZE: executemany 청크 행 수 (기본 1000)
+  - BULK_LOAD_DATA: LOAD DATA LOCAL INFILE 사용 (기본 0)
+  - BULK_LOAD_DATA_MIN_ROWS: 이 행 수 이상일 때만 LOAD DATA (기본 5000)
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, inspect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_LOAD_DATA_MIN_ROWS = 5000
+
+# 청크당 바인딩 값 상한 (컬럼이 많으면 청크 행 수를 줄임)
+MAX_PARAMS_PER_CHUNK = 60000
+
+_lock = threading.Lock()
+_known_tables = set()    # 존재 확인된 (엔진 URL, 테이블)
+_load_engines = {}       # 엔진 URL -> local_infile 전용 엔진
+_load_disabled = set()   # LOAD DATA 실패한 엔진 URL
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        logger.warning(f"{name} 값이 잘못됨: {os.getenv(name)} -> {default} 사용")
+        return default
+
+
+def get_chunk_size(column_count):
+    """executemany 청크 행 수 (BULK_CHUNK_SIZE, 컬럼 수 기준 상한 적용)"""
+    return max(1, min(_env_int('BULK_CHUNK_SIZE', DEFAULT_CHUNK_SIZE), MAX_PARAMS_PER_CHUNK // max(1, column_count)))
+
+
+def load_data_enabled():
+    return os.getenv('BULK_LOAD_DATA', '0').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _quote(name):
+    return f"`{name}`"
+
+
+def _records(df):
+    """DataFrame -> DBAPI 파라미터 튜플 목록 (NaN/NA -> None, numpy 값 -> 파이썬 값)"""
+    values = df.astype(object).where(df.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def _ensure_table(engine, table_name, df):
+    """테이블이 없으면 첫 배치로 생성 (to_sql 타입 추론 그대로) - 생성했으면 True"""
+    key = (str(engine.url), table_name)
+    if key in _known_tables:
+        return False
+    with _lock:
+        if key in _known_tables:
+            return False
+        created = not inspect(engine).has_table(table_name)
+        if created:
+            with engine.begin() as conn:
+                df.to_sql(table_name, conn, if_exists='append', index=False)
+            logger.info(f"🧱 {table_name} 테이블 생성")
+        _known_tables.add(key)
+    return created
+
+
+def _insert_sql(engine, table_name, columns, upsert_keys):
+    placeholder = '?' if engine.dialect.paramstyle == 'qmark' else '%s'
+    sql = (f"INSERT INTO {_quote(table_name)} ({', '.join(_quote(c) for c in columns)}) "
+           f"VALUES ({', '.join([placeholder] * len(columns))})")
+    if upsert_keys:
+        updates = [f"{_quote(c)} = VALUES({_quote(c)})" for c in columns if c not in upsert_keys]
+        if updates:
+            sql += f" ON DUPLICATE KEY UPDATE {', '.join(updates)}"
+    return sql
+
+
+def _execute_many(engine, table_name, df, upsert_keys):
+    columns = list(df.columns)
+    sql = _insert_sql(engine, table_name, columns, upsert_keys)
+    records = _records(df)
+    chunk_size = get_chunk_size(len(columns))
+    with engine.begin() as conn:
+        for start in range(0, len(records), chunk_size):
+            conn.exec_driver_sql(sql, records[start:start + chunk_size])
+
+
+def _csv_field(value):
+    """LOAD DATA용 CSV 값 (NULL은 따옴표 없는 NULL, 문자열은 항상 따옴표)"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _load_engine(engine):
+    key = str(engine.url)
+    with _lock:
+        if key not in _load_engines:
+            _load_engines[key] = create_engine(engine.url, connect_args={'local_infile': True}, pool_pre_ping=True)
+        return _load_engines[key]
+
+
+def _load_data(engine, table_name, df, upsert_keys):
+    """LOAD DATA LOCAL INFILE (upsert_keys가 있으면 REPLACE - 같은 키 행을 새 값으로 교체)"""
+    columns = list(df.columns)
+    handle = tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', newline='', delete=False)
+    try:
+        with handle:
+            for record in _records(df):
+                handle.write(','.join(_csv_field(value) for value in record) + '\n')
+        path = handle.name.replace('\\', '/')
+        sql = (f"LOAD DATA LOCAL INFILE '{path}' {'REPLACE ' if upsert_keys else ''}"
+               f"INTO TABLE {_quote(table_name)} CHARACTER SET utf8mb4 "
+               f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+               f"LINES TERMINATED BY '\\n' ({', '.join(_quote(c) for c in columns)})")
+        with _load_engine(engine).begin() as conn:
+            conn.exec_driver_sql(sql)
+    finally:
+        os.unlink(handle.name)
+
+
+def bulk_insert(df, table_name, engine, upsert_keys=None):
+    """
+    DataFrame 대량 저장 (트랜잭션 1번)
+
+    Args:
+        df: 저장할 DataFrame (컬럼 = 테이블 컬럼)
+        table_name: 테이블
+        engine: SQLAlchemy 엔진
+        upsert_keys: UNIQUE 키 컬럼 - 주면 MySQL ON DUPLICATE KEY UPDATE (LOAD DATA는 REPLACE)
+
+    Returns:
+        dict: rows, seconds, rows_per_sec, method
+    """
+    stats = {'rows': len(df), 'seconds': 0.0, 'rows_per_sec': 0.0, 'method': None}
+    if df.empty:
+        return stats
+
+    started = time.perf_counter()
+    if _ensure_table(engine, table_name, df):
+        stats['method'] = 'create'
+    else:
+        mysql = engine.dialect.name == 'mysql'
+        upsert_keys = upsert_keys if mysql else None
+        url = str(engine.url)
+        use_load = (mysql and load_data_enabled() and url not in _load_disabled
+                    and len(df) >= _env_int('BULK_LOAD_DATA_MIN_ROWS', DEFAULT_LOAD_DATA_MIN_ROWS))
+        if use_load:
+            try:
+                _load_data(engine, table_name, df, upsert_keys)
+                stats['method'] = 'load_data'
+            except Exception as e:
+                logger.warning(f"LOAD DATA LOCAL INFILE 실패 - executemany로 저장 (이후 이 DB는 executemany만 사용): {e}")
+                _load_disabled.add(url)
+        if stats['method'] is None:
+            _execute_many(engine, table_name, df, upsert_keys)
+            stats['method'] = 'executemany'
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    logger.info(f"⚡ {table_name}: {stats['rows']}개 행 {stats['method']} "
+                f"{stats['seconds'] * 1000:.0f}ms ({stats['rows_per_sec']:.0f} rows/s)")
+    return stats
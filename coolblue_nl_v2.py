@@ -13,7 +13,6 @@ from sqlalchemy import create_engine
 import paramiko
 import time
 import random
-import re
 from datetime import datetime
 import pytz
 import logging
@@ -31,11 +30,28 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_readiness import get_page_load_strategy, apply_page_load_strategy
+from structured_data import extract_from_driver, fill_result
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, WALL_TITLE
+
+# 차단 페이지 제목 / 재고 없음 문구
+PAGE_PATTERNS = get_matcher('en')
 
 class CoolblueScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('coolblue', initial_interval=3.5, min_interval=1.0)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.sftp_client = None
         self.country_code = 'nl'
         # V2: 타임존 분리 (현지시간 + 한국시간)
@@ -179,8 +195,10 @@ class CoolblueScraper:
         logger.info("🔧 Chrome 드라이버 설정 중...")
         
         try:
-            self.driver = uc.Chrome()
+            options = apply_page_load_strategy(uc.ChromeOptions(), get_page_load_strategy('coolblue'))
+            self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'coolblue')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
             
             # 스텔스 모드 설정
             stealth_script = """
@@ -288,8 +306,18 @@ class CoolblueScraper:
             logger.debug(f"쿠키 팝업 처리 중 오류 (무시): {e}")
             return False
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code=row_data.get('country', 'nl'), ships_from='NL',
+                          channel_name='coolblue', sold_by='Coolblue', vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 (재시도 로직 포함)"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"🔍 페이지 접속: {url} (시도: {retry_count + 1}/{max_retries + 1})")
             self.driver.get(url)
@@ -300,287 +328,242 @@ class CoolblueScraper:
             
             # 차단 감지
             title = self.driver.title
-            blocked_patterns = ["Access Denied", "Blocked", "Robot", "Captcha", "Sorry", "Error"]
-            for pattern in blocked_patterns:
-                if pattern.lower() in title.lower():
-                    logger.warning(f"⚠️ 차단 감지: {pattern}")
-                    raise Exception(f"Blocked: {pattern}")
-            
-            # 현재 시간
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-
-            # ISO 8601 형식
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            tz_offset = local_time.strftime("%z")
-
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
+            pattern = PAGE_PATTERNS.matches(title, WALL_TITLE)
+            if pattern:
+                self.last_blocked = True
+                logger.warning(f"⚠️ 차단 감지: {pattern}")
+                raise Exception(f"Blocked: {pattern}")
 
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'nl'),
-                'ships_from': 'NL',
-                'channel_name': 'coolblue',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Coolblue',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
+            
+            # 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, extract_from_driver(self.driver, result['retailersku']))
             
             # 가격 추출
-            try:
-                price_found = False
+            if result['retailprice'] is None:
+                try:
+                    price_found = False
                 
-                # 가격 요소가 로드될 때까지 대기
-                logger.info("🔍 가격 요소 로드 대기 중...")
+                    # 가격 요소가 로드될 때까지 대기
+                    logger.info("🔍 가격 요소 로드 대기 중...")
                 
-                # 디버깅: 페이지 소스에서 가격 관련 요소 확인
-                page_source = self.driver.page_source
-                if 'main-content' in page_source:
-                    logger.info("✅ main-content 요소 발견")
-                else:
-                    logger.warning("⚠️ main-content 요소 없음")
+                    # 디버깅: 페이지 소스에서 가격 관련 요소 확인
+                    page_source = self.driver.page_source
+                    if 'main-content' in page_source:
+                        logger.info("✅ main-content 요소 발견")
+                    else:
+                        logger.warning("⚠️ main-content 요소 없음")
                 
-                if '€' in page_source:
-                    logger.info("✅ 유로(€) 기호 발견")
-                    # 유로 기호 주변 텍스트 일부 추출
-                    euro_index = page_source.find('€')
-                    context = page_source[max(0, euro_index-50):euro_index+50]
-                    logger.info(f"유로 기호 주변 텍스트: {context}")
-                else:
-                    logger.warning("⚠️ 유로(€) 기호 없음")
+                    if '€' in page_source:
+                        logger.info("✅ 유로(€) 기호 발견")
+                        # 유로 기호 주변 텍스트 일부 추출
+                        euro_index = page_source.find('€')
+                        context = page_source[max(0, euro_index-50):euro_index+50]
+                        logger.info(f"유로 기호 주변 텍스트: {context}")
+                    else:
+                        logger.warning("⚠️ 유로(€) 기호 없음")
                 
-                for xpath in self.XPATHS.get('price', []):
-                    try:
-                        logger.info(f"🔍 XPath 시도: {xpath}")
-                        # 특정 요소가 나타날 때까지 최대 6초 대기
-                        price_element = wait.until(
-                            EC.presence_of_element_located((By.XPATH, xpath))
-                        )
-                        logger.info(f"✅ XPath {xpath} 요소 발견됨")
+                    for xpath in self.XPATHS.get('price', []):
+                        try:
+                            logger.info(f"🔍 XPath 시도: {xpath}")
+                            # 특정 요소가 나타날 때까지 최대 6초 대기
+                            price_element = wait.until(
+                                EC.presence_of_element_located((By.XPATH, xpath))
+                            )
+                            logger.info(f"✅ XPath {xpath} 요소 발견됨")
                         
-                        # 요소가 visible해질 때까지 추가 대기
-                        wait.until(EC.visibility_of(price_element))
-                        logger.info(f"✅ XPath {xpath} 요소 표시됨")
+                            # 요소가 visible해질 때까지 추가 대기
+                            wait.until(EC.visibility_of(price_element))
+                            logger.info(f"✅ XPath {xpath} 요소 표시됨")
                         
-                        # 텍스트가 로드될 때까지 잠시 대기
-                        time.sleep(1)
+                            # 텍스트가 로드될 때까지 잠시 대기
+                            time.sleep(1)
                         
-                        price_text = price_element.text.strip()
-                        logger.info(f"🔍 XPath {xpath}에서 추출한 텍스트: '{price_text}'")
-                        
-                        if price_text:
-                            # Coolblue는 유럽식 숫자 형식 사용 (쉼표가 소수점)
-                            # 예: "1.299,99" -> 1299.99
-                            price_text_clean = price_text.replace('.', '').replace(',', '.').replace('€', '').strip()
-                            price_match = re.search(r'([\d,]+\.?\d*)', price_text_clean)
-                            if price_match:
-                                price_number = price_match.group(1)
-                                result['retailprice'] = float(price_number)
-                                logger.info(f"✅ 가격 추출 성공 (XPath): €{result['retailprice']}")
-                                price_found = True
-                                break
-                        else:
-                            logger.warning(f"⚠️ XPath {xpath}에서 빈 텍스트")
-                            
-                    except Exception as e:
-                        logger.warning(f"❌ XPath {xpath} 실패: {e}")
-                        continue
-                
-                # CSS 선택자로 재시도
-                if not price_found:
-                    css_selectors = [
-                        "span.js-sales-price-current",
-                        "[data-testid='sales-price-current']",
-                        ".sales-price__current",
-                        ".price-current",
-                        ".product-price",
-                        "span[class*='price']",
-                        "div[class*='price']",
-                        "p[class*='price']"
-                    ]
-                    
-                    for css_selector in css_selectors:
-                        try:
-                            price_element = self.driver.find_element(By.CSS_SELECTOR, css_selector)
                             price_text = price_element.text.strip()
-                            logger.info(f"🔍 CSS {css_selector}에서 추출한 텍스트: '{price_text}'")
-                            
-                            if price_text and any(char.isdigit() for char in price_text):
-                                price_text_clean = price_text.replace('.', '').replace(',', '.').replace('€', '').strip()
-                                price_match = re.search(r'([\d,]+\.?\d*)', price_text_clean)
-                                if price_match:
-                                    price_number = price_match.group(1)
-                                    result['retailprice'] = float(price_number)
-                                    logger.info(f"✅ 가격 추출 성공 (CSS): €{result['retailprice']}")
+                            logger.info(f"🔍 XPath {xpath}에서 추출한 텍스트: '{price_text}'")
+                        
+                            if price_text:
+                                # Coolblue는 유럽식 숫자 형식 사용 (쉼표가 소수점)
+                                # 예: "1.299,99" -> 1299.99
+                                price = parse_price(price_text, 'nl')
+                                if price is not None:
+                                    result['retailprice'] = price
+                                    self.last_price_text = price_text
+                                    logger.info(f"✅ 가격 추출 성공 (XPath): €{result['retailprice']}")
                                     price_found = True
                                     break
+                            else:
+                                logger.warning(f"⚠️ XPath {xpath}에서 빈 텍스트")
+                            
                         except Exception as e:
-                            logger.debug(f"CSS {css_selector} 실패: {e}")
+                            logger.warning(f"❌ XPath {xpath} 실패: {e}")
                             continue
                 
-                # JavaScript로 가격 찾기 (최후 수단)
-                if not price_found:
-                    try:
-                        script = """
-                        var priceSelectors = [
-                            'span[class*="price"]',
-                            'div[class*="price"]', 
-                            'p[class*="price"]',
-                            '[data-testid*="price"]',
-                            '.js-sales-price-current'
-                        ];
+                    # CSS 선택자로 재시도
+                    if not price_found:
+                        css_selectors = [
+                            "span.js-sales-price-current",
+                            "[data-testid='sales-price-current']",
+                            ".sales-price__current",
+                            ".price-current",
+                            ".product-price",
+                            "span[class*='price']",
+                            "div[class*='price']",
+                            "p[class*='price']"
+                        ]
+                    
+                        for css_selector in css_selectors:
+                            try:
+                                price_element = self.driver.find_element(By.CSS_SELECTOR, css_selector)
+                                price_text = price_element.text.strip()
+                                logger.info(f"🔍 CSS {css_selector}에서 추출한 텍스트: '{price_text}'")
+                            
+                                if price_text and any(char.isdigit() for char in price_text):
+                                    price = parse_price(price_text, 'nl')
+                                    if price is not None:
+                                        result['retailprice'] = price
+                                        self.last_price_text = price_text
+                                        logger.info(f"✅ 가격 추출 성공 (CSS): €{result['retailprice']}")
+                                        price_found = True
+                                        break
+                            except Exception as e:
+                                logger.debug(f"CSS {css_selector} 실패: {e}")
+                                continue
+                
+                    # JavaScript로 가격 찾기 (최후 수단)
+                    if not price_found:
+                        try:
+                            script = """
+                            var priceSelectors = [
+                                'span[class*="price"]',
+                                'div[class*="price"]', 
+                                'p[class*="price"]',
+                                '[data-testid*="price"]',
+                                '.js-sales-price-current'
+                            ];
                         
-                        for (var i = 0; i < priceSelectors.length; i++) {
-                            var elements = document.querySelectorAll(priceSelectors[i]);
-                            for (var j = 0; j < elements.length; j++) {
-                                var text = elements[j].textContent || elements[j].innerText;
-                                if (text && /\\d/.test(text) && text.includes('€')) {
-                                    return text.trim();
+                            for (var i = 0; i < priceSelectors.length; i++) {
+                                var elements = document.querySelectorAll(priceSelectors[i]);
+                                for (var j = 0; j < elements.length; j++) {
+                                    var text = elements[j].textContent || elements[j].innerText;
+                                    if (text && /\\d/.test(text) && text.includes('€')) {
+                                        return text.trim();
+                                    }
                                 }
                             }
-                        }
-                        return null;
-                        """
-                        js_result = self.driver.execute_script(script)
-                        if js_result:
-                            logger.info(f"🔍 JavaScript에서 추출한 텍스트: '{js_result}'")
-                            price_text_clean = js_result.replace('.', '').replace(',', '.').replace('€', '').strip()
-                            price_match = re.search(r'([\d,]+\.?\d*)', price_text_clean)
-                            if price_match:
-                                price_number = price_match.group(1)
-                                result['retailprice'] = float(price_number)
-                                logger.info(f"✅ 가격 추출 성공 (JS): €{result['retailprice']}")
-                                price_found = True
-                    except Exception as e:
-                        logger.debug(f"JavaScript 가격 추출 실패: {e}")
+                            return null;
+                            """
+                            js_result = self.driver.execute_script(script)
+                            if js_result:
+                                logger.info(f"🔍 JavaScript에서 추출한 텍스트: '{js_result}'")
+                                price = parse_price(js_result, 'nl')
+                                if price is not None:
+                                    result['retailprice'] = price
+                                    self.last_price_text = js_result
+                                    logger.info(f"✅ 가격 추출 성공 (JS): €{result['retailprice']}")
+                                    price_found = True
+                        except Exception as e:
+                            logger.debug(f"JavaScript 가격 추출 실패: {e}")
                 
-                if not price_found:
-                    logger.warning("모든 가격 추출 방법 실패")
+                    if not price_found:
+                        logger.warning("모든 가격 추출 방법 실패")
                         
-            except Exception as e:
-                logger.warning(f"가격 추출 실패: {e}")
+                except Exception as e:
+                    logger.warning(f"가격 추출 실패: {e}")
             
             # 제목 추출
-            try:
-                for xpath in self.XPATHS.get('title', []):
-                    try:
-                        title_element = self.driver.find_element(By.XPATH, xpath)
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목: {result['title']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+            if result['title'] is None:
+                try:
+                    for xpath in self.XPATHS.get('title', []):
+                        try:
+                            title_element = self.driver.find_element(By.XPATH, xpath)
+                            result['title'] = title_element.text.strip()
+                            logger.info(f"제목: {result['title']}")
+                            break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
             
             # 이미지 URL 추출 (다양한 선택자 시도)
-            try:
-                image_found = False
-                
-                # 1. 기존 XPath들 시도
-                for xpath in self.XPATHS.get('imageurl', []):
-                    try:
-                        image_element = self.driver.find_element(By.XPATH, xpath)
-                        src = image_element.get_attribute('src')
-                        if src and 'image.coolblue.nl' in src:
-                            result['imageurl'] = src
-                            logger.info(f"이미지 URL (XPath): {result['imageurl']}")
-                            image_found = True
-                            break
-                    except:
-                        continue
+            if result['imageurl'] is None:
+                try:
+                    image_found = False
                 
-                # 2. CSS 선택자들로 재시도
-                if not image_found:
-                    css_selectors = [
-                        'img[src*="image.coolblue.nl"]',  # Coolblue 이미지 도메인 포함
-                        'img[data-src*="image.coolblue.nl"]',  # lazy loading
-                        'img.product-image',
-                        'img.hero-image',
-                        '.product-image img',
-                        '.gallery img',
-                        'img[alt*="product"]',
-                        'img[alt*="Product"]'
-                    ]
-                    
-                    for selector in css_selectors:
+                    # 1. 기존 XPath들 시도
+                    for xpath in self.XPATHS.get('imageurl', []):
                         try:
-                            images = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            for img in images:
-                                src = img.get_attribute('src') or img.get_attribute('data-src')
-                                if src and 'image.coolblue.nl' in src:
-                                    result['imageurl'] = src
-                                    logger.info(f"이미지 URL (CSS): {result['imageurl']}")
-                                    image_found = True
-                                    break
-                            if image_found:
+                            image_element = self.driver.find_element(By.XPATH, xpath)
+                            src = image_element.get_attribute('src')
+                            if src and 'image.coolblue.nl' in src:
+                                result['imageurl'] = src
+                                logger.info(f"이미지 URL (XPath): {result['imageurl']}")
+                                image_found = True
                                 break
                         except:
                             continue
                 
-                # 3. JavaScript로 이미지 찾기 (최후 수단)
-                if not image_found:
-                    try:
-                        script = """
-                        var imgs = document.querySelectorAll('img');
-                        for (var i = 0; i < imgs.length; i++) {
-                            var src = imgs[i].src || imgs[i].getAttribute('data-src');
-                            if (src && src.includes('image.coolblue.nl') && src.includes('products')) {
-                                return src;
+                    # 2. CSS 선택자들로 재시도
+                    if not image_found:
+                        css_selectors = [
+                            'img[src*="image.coolblue.nl"]',  # Coolblue 이미지 도메인 포함
+                            'img[data-src*="image.coolblue.nl"]',  # lazy loading
+                            'img.product-image',
+                            'img.hero-image',
+                            '.product-image img',
+                            '.gallery img',
+                            'img[alt*="product"]',
+                            'img[alt*="Product"]'
+                        ]
+                    
+                        for selector in css_selectors:
+                            try:
+                                images = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                                for img in images:
+                                    src = img.get_attribute('src') or img.get_attribute('data-src')
+                                    if src and 'image.coolblue.nl' in src:
+                                        result['imageurl'] = src
+                                        logger.info(f"이미지 URL (CSS): {result['imageurl']}")
+                                        image_found = True
+                                        break
+                                if image_found:
+                                    break
+                            except:
+                                continue
+                
+                    # 3. JavaScript로 이미지 찾기 (최후 수단)
+                    if not image_found:
+                        try:
+                            script = """
+                            var imgs = document.querySelectorAll('img');
+                            for (var i = 0; i < imgs.length; i++) {
+                                var src = imgs[i].src || imgs[i].getAttribute('data-src');
+                                if (src && src.includes('image.coolblue.nl') && src.includes('products')) {
+                                    return src;
+                                }
                             }
-                        }
-                        return null;
-                        """
-                        js_result = self.driver.execute_script(script)
-                        if js_result:
-                            result['imageurl'] = js_result
-                            logger.info(f"이미지 URL (JS): {result['imageurl']}")
-                            image_found = True
-                    except:
-                        pass
+                            return null;
+                            """
+                            js_result = self.driver.execute_script(script)
+                            if js_result:
+                                result['imageurl'] = js_result
+                                logger.info(f"이미지 URL (JS): {result['imageurl']}")
+                                image_found = True
+                        except:
+                            pass
                 
-                if not image_found:
-                    logger.warning("모든 이미지 추출 방법 실패")
+                    if not image_found:
+                        logger.warning("모든 이미지 추출 방법 실패")
                     
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
-            
-            # 재고 상태 확인
-            stock_flags = ['Out of Stock', 'Sold Out', 'Currently unavailable', 'Temporarily out of stock']
-            page_source = self.driver.page_source
-            stock_available = not any(flag in page_source for flag in stock_flags)
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
             
             # VAT 텍스트 확인
             # vat_texts = ['inclusief btw', 'incl. BTW', 'Tax included', 'Inclusive of all taxes']
             # result['vat'] = 'o' if any(text in page_source for text in vat_texts) else 'x'
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -607,38 +590,8 @@ class CoolblueScraper:
             
             # 최대 재시도 횟수 초과 시 기본값 반환
             logger.error(f"❌ 최대 재시도 횟수 초과: {url}")
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
 
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'nl'),
-                'ships_from': 'NL',
-                'channel_name': 'coolblue',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Coolblue',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
     
     def save_to_db(self, df):
         """DB에 결과 저장"""
@@ -648,7 +601,7 @@ class CoolblueScraper:
         
         try:
             # coolblue_price_crawl_tbl_nl_v2 테이블에 저장
-            df.to_sql('coolblue_price_crawl_tbl_nl_v2', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'coolblue_price_crawl_tbl_nl_v2', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
             
             # 크롤링 로그를 pandas DataFrame으로 만들어서 한번에 저장
@@ -657,7 +610,7 @@ class CoolblueScraper:
                 log_records.append({
                     'country_code': 'nl',
                     'url': row['producturl'],
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -665,7 +618,7 @@ class CoolblueScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
             
             # 저장된 데이터 확인
@@ -735,6 +688,9 @@ class CoolblueScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_nl_coolblue"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -856,7 +812,7 @@ class CoolblueScraper:
         
         logger.info(f"📊 총 {len(urls_data)}개 제품 처리 시작")
         
-        results = []
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         failed_urls = []  # 실패한 URL 추적
         
         try:
@@ -868,7 +824,9 @@ class CoolblueScraper:
                 url = row.get('url')
                 
                 # 제품 정보 추출 (재시도 로직 포함)
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 # 실패한 URL 추적 로직 추가
                 if result['retailprice'] is None:
@@ -883,26 +841,10 @@ class CoolblueScraper:
                 
                 # 10개마다 DB에 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('coolblue_price_crawl_tbl_nl_v2', self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(2, 5)
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                    # 10개마다 긴 휴식
-                    if (idx + 1) % 10 == 0:
-                        logger.info("☕ 10개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'coolblue_price_crawl_tbl_nl_v2', self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"❌ 스크래핑 중 오류: {e}")
         
@@ -919,7 +861,7 @@ class CoolblueScraper:
                 self.driver.quit()
                 logger.info("🔧 드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
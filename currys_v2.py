@@ -13,7 +13,6 @@ from sqlalchemy import create_engine
 import paramiko
 import time
 import random
-import re
 from datetime import datetime
 import pytz
 import logging
@@ -30,11 +29,28 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_readiness import get_page_load_strategy, apply_page_load_strategy
+from structured_data import extract_from_driver, fill_result
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, WALL_TITLE
+
+# 차단 페이지 제목
+PAGE_PATTERNS = get_matcher('en')
 
 class CurrysScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('currys', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.sftp_client = None
         self.country_code = 'gb'
 
@@ -173,8 +189,10 @@ class CurrysScraper:
         logger.info("🔧 Chrome 드라이버 설정 중...")
         
         try:
-            self.driver = uc.Chrome()
+            options = apply_page_load_strategy(uc.ChromeOptions(), get_page_load_strategy('currys'))
+            self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'currys')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
             logger.info("✅ 드라이버 설정 완료")
             return True
         except Exception as e:
@@ -219,8 +237,19 @@ class CurrysScraper:
             logger.debug(f"쿠키 팝업 처리 중 오류 (무시): {e}")
             return False
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code=row_data.get('country', 'gb'), ships_from='gb', channel_name='currys',
+                          sold_by='Currys', vat=row_data.get('vat', 'o'),
+                          channel=row_data.get('channel', 'Offline'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 (재시도 로직 포함)"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"🔍 페이지 접속: {url} (시도: {retry_count + 1}/{max_retries + 1})")
             self.driver.get(url)
@@ -231,114 +260,85 @@ class CurrysScraper:
             # 페이지 로드 대기
             wait = WebDriverWait(self.driver, 20)
             time.sleep(random.uniform(3, 5))
-            
-            # 현재 시간
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-
-            # ISO 8601 형식
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            tz_offset = local_time.strftime("%z")
-
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
 
+            # 차단 감지
+            title = self.driver.title
+            pattern = PAGE_PATTERNS.matches(title, WALL_TITLE)
+            if pattern:
+                self.last_blocked = True
+                logger.warning(f"⚠️ 차단 감지: {pattern}")
+                raise Exception(f"Blocked: {pattern}")
 
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'gb'),
-                'ships_from': 'gb',
-                'channel_name': 'currys',
-                'channel': row_data.get('channel', 'Offline'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Currys',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o'),
-            }
+            result = self.build_base_result(url, row_data)
+            
+            # 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, extract_from_driver(self.driver, result['retailersku']))
             
             # 가격 추출
-            try:
-                price_found = False
-                for xpath in self.XPATHS.get('price', []):
-                    try:
-                        price_element = self.driver.find_element(By.XPATH, xpath)
-                        price_text = price_element.text.strip()
+            if result['retailprice'] is None:
+                try:
+                    price_found = False
+                    for xpath in self.XPATHS.get('price', []):
+                        try:
+                            price_element = self.driver.find_element(By.XPATH, xpath)
+                            price_text = price_element.text.strip()
                         
-                        if price_text:
-                            price_match = re.search(r'£?([\d,]+\.?\d*)', price_text)
-                            if price_match:
-                                price_number = price_match.group(1).replace(',', '')
-                                result['retailprice'] = float(price_number)
-                                logger.info(f"✅ 가격 추출 성공: {result['retailprice']}")
-                                price_found = True
-                                break
-                    except:
-                        continue
+                            if price_text:
+                                price = parse_price(price_text, 'gb')
+                                if price is not None:
+                                    result['retailprice'] = price
+                                    self.last_price_text = price_text
+                                    logger.info(f"✅ 가격 추출 성공: {result['retailprice']}")
+                                    price_found = True
+                                    break
+                        except:
+                            continue
                 
-                # CSS 선택자로 재시도
-                if not price_found:
-                    try:
-                        price_element = self.driver.find_element(By.CSS_SELECTOR, "span.pdp-pricing__now-price")
-                        price_text = price_element.text
-                        if '£' in price_text:
-                            price_match = re.search(r'£?([\d,]+\.?\d*)', price_text)
-                            if price_match:
-                                result['retailprice'] = float(price_match.group(1).replace(',', ''))
-                                logger.info(f"✅ 가격 추출 성공 (CSS): {result['retailprice']}")
-                    except:
-                        logger.warning("모든 가격 추출 방법 실패")
+                    # CSS 선택자로 재시도
+                    if not price_found:
+                        try:
+                            price_element = self.driver.find_element(By.CSS_SELECTOR, "span.pdp-pricing__now-price")
+                            price_text = price_element.text
+                            if '£' in price_text:
+                                price = parse_price(price_text, 'gb')
+                                if price is not None:
+                                    result['retailprice'] = price
+                                    self.last_price_text = price_text
+                                    logger.info(f"✅ 가격 추출 성공 (CSS): {result['retailprice']}")
+                        except:
+                            logger.warning("모든 가격 추출 방법 실패")
                         
-            except Exception as e:
-                logger.warning(f"가격 추출 실패: {e}")
+                except Exception as e:
+                    logger.warning(f"가격 추출 실패: {e}")
             
             # 제목 추출
-            try:
-                for xpath in self.XPATHS.get('title', []):
-                    try:
-                        title_element = self.driver.find_element(By.XPATH, xpath)
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목: {result['title']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+            if result['title'] is None:
+                try:
+                    for xpath in self.XPATHS.get('title', []):
+                        try:
+                            title_element = self.driver.find_element(By.XPATH, xpath)
+                            result['title'] = title_element.text.strip()
+                            logger.info(f"제목: {result['title']}")
+                            break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
             
             # 이미지 URL 추출
-            try:
-                for xpath in self.XPATHS.get('imageurl', []):
-                    try:
-                        image_element = self.driver.find_element(By.XPATH, xpath)
-                        result['imageurl'] = image_element.get_attribute('src')
-                        logger.info(f"이미지 URL: {result['imageurl']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
+            if result['imageurl'] is None:
+                try:
+                    for xpath in self.XPATHS.get('imageurl', []):
+                        try:
+                            image_element = self.driver.find_element(By.XPATH, xpath)
+                            result['imageurl'] = image_element.get_attribute('src')
+                            logger.info(f"이미지 URL: {result['imageurl']}")
+                            break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
               
             # VAT 텍스트 확인 (DB에서 가져온 경우)
             # vat_texts = []
@@ -360,6 +360,7 @@ class CurrysScraper:
             #     page_source = self.driver.page_source
             #     result['vat'] = 'o' if any(text in page_source for text in vat_texts) else 'x'
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -385,38 +386,8 @@ class CurrysScraper:
             
             # 최대 재시도 횟수 초과 시 기본값 반환
             logger.error(f"❌ 최대 재시도 횟수 초과: {url}")
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'gb'),
-                'ships_from': 'gb',
-                'channel_name': 'currys',
-                'channel': row_data.get('channel', 'Offline'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Currys',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+
+            return self.build_base_result(url, row_data)
     
     def save_to_db(self, df):
         """DB에 결과 저장"""
@@ -426,7 +397,7 @@ class CurrysScraper:
         
         try:
             # currys_price_crawl_tbl_gb_v2 테이블에 저장
-            df.to_sql('currys_price_crawl_tbl_gb_v2', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'currys_price_crawl_tbl_gb_v2', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
             
             # 크롤링 로그를 pandas DataFrame으로 만들어서 한번에 저장
@@ -435,8 +406,8 @@ class CurrysScraper:
                 log_records.append({
                     'country_code': 'gb',
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -444,7 +415,7 @@ class CurrysScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
             
             # 저장된 데이터 확인
@@ -514,6 +485,9 @@ class CurrysScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_gb_currys"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -574,7 +548,7 @@ class CurrysScraper:
         if not self.setup_driver():
             return None
         
-        results = []
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         failed_urls = []  # 실패한 URL 추적
         
         try:
@@ -586,7 +560,9 @@ class CurrysScraper:
                 url = row.get('url')
                 
                 # 제품 정보 추출 (재시도 로직 포함)
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 # 실패 여부 확인
                 if result['retailprice'] is None:
@@ -600,26 +576,10 @@ class CurrysScraper:
                 
                 # 10개마다 DB에 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('currys_price_crawl_tbl_gb_v2', self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                    # 10개마다 긴 휴식
-                    if (idx + 1) % 10 == 0:
-                        logger.info("☕ 10개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'currys_price_crawl_tbl_gb_v2', self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"❌ 스크래핑 중 오류: {e}")
         
@@ -636,7 +596,7 @@ class CurrysScraper:
                 self.driver.quit()
                 logger.info("🔧 드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -780,7 +740,7 @@ def main():
 
                     # 기존 실패한 결과를 재시도 결과로 업데이트
                     for _, retry_row in retry_results_df.iterrows():
-                        if retry_row['retailprice'] is not None:
+                        if pd.notna(retry_row['retailprice']):
                             # 성공한 경우 기존 데이터 업데이트
                             mask = final_results_df['producturl'] == retry_row['producturl']
                             if mask.any():
@@ -34,13 +34,36 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_readiness import get_page_load_strategy, apply_page_load_strategy
+from structured_data import extract_from_driver, fill_result
+from html_snapshot import get_extract_engine, take_snapshot, ENGINE_SNAPSHOT
+from page_scan import scan_page, regex_pattern
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import PATTERNS, build_matcher, ERROR_PAGE, OUT_OF_STOCK
+from selector_stats import SelectorStats
+
+# 오류 페이지 / 재고 없음 문구 (한국어 품절 문구 + 영어는 줄 시작 'Currently unavailable'만)
+PAGE_PATTERNS = build_matcher(('ko',), categories=(OUT_OF_STOCK,), extra={
+    OUT_OF_STOCK: ['no featured offers available', regex_pattern('^Currently unavailable')],
+    ERROR_PAGE: PATTERNS['en'][ERROR_PAGE]
+})
 
 class DanawaScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('danawa', initial_interval=2.0, min_interval=0.5)  # 도메인별 적응형 요청 간격
         self.sftp_client = None
         self.country_code = 'kr'
+        self.extract_engine = get_extract_engine()  # live: WebDriver 조회, snapshot: HTML 1회 파싱
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
 
         # V2: 타임존 설정 (다나와는 한국 사이트이므로 둘 다 Asia/Seoul)
         self.korea_tz = pytz.timezone('Asia/Seoul')
@@ -52,6 +75,11 @@ class DanawaScraper:
         # DB에서 XPath 로드
         self.load_xpaths_from_db()
         
+        # 선택자 적중률 통계 (mall_selectors는 priority DESC 순으로 로드)
+        self.selector_stats = SelectorStats(
+            'mall_selectors', {'mall_name': 'danawa', 'country_code': 'kr'}, self.XPATHS, priority_order='desc'
+        )
+        
     def setup_db_connection(self):
         """DB 연결 설정"""
         try:
@@ -173,8 +201,10 @@ class DanawaScraper:
             options.add_argument('--accept-lang=ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7')
             options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36')
             
+            apply_page_load_strategy(options, get_page_load_strategy('danawa'))
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'danawa')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
             logger.info("✅ 드라이버 설정 완료")
             return True
         except Exception as e:
@@ -185,7 +215,6 @@ class DanawaScraper:
         """페이지 정상 여부 확인"""
         try:
             page_title = self.driver.title
-            page_source = self.driver.page_source
             
             # 차단 또는 오류 페이지 제목 패턴
             blocked_patterns_title = [
@@ -199,15 +228,10 @@ class DanawaScraper:
                     logger.warning("페이지 비정상: 제목 패턴 감지")
                     return False
             
-            # 본문 차단 패턴
-            blocked_patterns_body = [
-                "We're sorry, an error has occurred. Please reload this page and try again."
-            ]
-            
-            for pattern in blocked_patterns_body:
-                if pattern in page_source:
-                    logger.warning("페이지 비정상: 본문 패턴 감지")
-                    return False
+            # 본문 오류 문구는 브라우저 안에서 검사해 일치한 문구만 받아옴
+            if scan_page(self.driver, PAGE_PATTERNS.patterns(ERROR_PAGE)):
+                logger.warning("페이지 비정상: 본문 패턴 감지")
+                return False
             
             logger.debug("페이지 정상")
             return True
@@ -227,8 +251,11 @@ class DanawaScraper:
                 time.sleep(wait)
                 
                 if self.is_page_normal():
+                    self.rate_limiter.record(url, blocked=False)
                     return True
                 
+                self.rate_limiter.record(url, blocked=True)
+                
                 # 대기 시간 계산: 지수 백오프 + 랜덤
                 wait = wait * backoff + random.uniform(0, 1)
                 logger.warning(f"재시도 대기: {wait:.1f}초")
@@ -240,24 +267,20 @@ class DanawaScraper:
         logger.error(f"최대 재시도 횟수 초과: {url}")
         return False
     
-    def check_stock_status(self):
-        """재고 상태 확인"""
+    def check_stock_status(self, snapshot=None):
+        """재고 상태 확인 (snapshot이 있으면 스냅샷 소스, 없으면 브라우저 안에서 검사)"""
         try:
             # 재고 없음을 나타내는 텍스트 패턴
-            stock_flag_patterns = [
-                'No featured offers available',
-                '^Currently unavailable',
-                '일시품절',
-                '품절',
-                '재고없음'
-            ]
+            stock_flag_patterns = PAGE_PATTERNS.patterns(OUT_OF_STOCK)
             
-            page_source = self.driver.page_source
+            if snapshot is not None:
+                matched = snapshot.scan(stock_flag_patterns)
+            else:
+                matched = scan_page(self.driver, stock_flag_patterns)
             
-            for pattern in stock_flag_patterns:
-                if re.search(pattern, page_source, re.IGNORECASE):
-                    logger.info("재고 없음 감지")
-                    return False
+            if matched:
+                logger.info(f"재고 없음 감지: {', '.join(sorted(matched))}")
+                return False
             
             return True
             
@@ -265,42 +288,39 @@ class DanawaScraper:
             logger.error(f"재고 확인 중 오류: {e}")
             return True  # 기본적으로 재고 있는 것으로 간주
     
+    def find_text(self, xpath, snapshot=None):
+        """XPath 첫 요소의 텍스트 (snapshot이 있으면 오프라인 파싱, 요소가 없으면 예외)"""
+        if snapshot is not None:
+            text = snapshot.text(xpath)
+            if text is None:
+                raise LookupError(f"요소 없음: {xpath}")
+            return text
+        return self.driver.find_element(By.XPATH, xpath).text.strip()
+    
+    def find_attr(self, xpath, name, snapshot=None):
+        """XPath 첫 요소의 속성값 (snapshot이 있으면 오프라인 파싱, 요소가 없으면 예외)"""
+        if snapshot is not None:
+            if not snapshot.find_all(xpath):
+                raise LookupError(f"요소 없음: {xpath}")
+            return snapshot.attr(xpath, name)
+        return self.driver.find_element(By.XPATH, xpath).get_attribute(name)
+    
     def parse_price_by_country(self, price_str, country_code='kr'):
-        """국가별 가격 형식 처리"""
-        if not price_str or pd.isna(price_str):
-            return 0
-        
-        try:
-            # 한국: 쉼표를 천단위 구분자로 사용
-            if country_code == 'kr':
-                # 숫자와 쉼표만 추출
-                price_match = re.search(r'[\d,]+', str(price_str))
-                if price_match:
-                    price_clean = price_match.group().replace(',', '')
-                    return float(price_clean)
-            
-            # 기타 국가 처리
-            elif country_code in ['fr', 'it', 'es']:
-                # 유럽: 쉼표를 소수점으로 사용
-                price_match = re.search(r'[\d,]+', str(price_str))
-                if price_match:
-                    price_clean = price_match.group().replace(',', '.')
-                    return float(price_clean)
-            else:
-                # 영미권: 점을 소수점으로 사용
-                price_match = re.search(r'[\d,.]+', str(price_str))
-                if price_match:
-                    price_clean = price_match.group().replace(',', '')
-                    return float(price_clean)
-            
-            return 0
-            
-        except Exception as e:
-            logger.error(f"가격 파싱 오류: {price_str} -> {e}")
-            return 0
+        """국가별 가격 형식 처리 (price_parser 공통 규칙, 해석할 수 없으면 0)"""
+        price = parse_price(price_str, country_code)
+        if price is not None:
+            self.last_price_text = price_str
+        return price or 0
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code='kr', ships_from='KR', channel_name='danawa', sold_by='Danawa',
+                          vat='o')
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 (재시도 로직 포함)"""
+        self.last_price_text = None
         try:
             logger.info(f"🔍 페이지 접속: {url} (시도: {retry_count + 1}/{max_retries + 1})")
             
@@ -310,139 +330,120 @@ class DanawaScraper:
             
             # 페이지 로드 대기
             time.sleep(random.uniform(2, 4))
-            
-            # 현재 시간
-            # V2: 타임존 분리
-            now_time = datetime.now(self.korea_tz)
-            local_time = datetime.now(self.local_tz)
-
-
-            # ISO 8601 형식
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            tz_offset = local_time.strftime("%z")
-
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
 
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'kr',
-                'ships_from': 'KR',
-                'channel_name': 'danawa',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Danawa',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': 'o'  # 한국은 VAT 포함
-            }
+            result = self.build_base_result(url, row_data)
+            
+            # snapshot 엔진: 렌더링된 HTML을 한 번만 가져와 이후 모든 선택자를 오프라인으로 평가
+            snapshot = take_snapshot(self.driver) if self.extract_engine == ENGINE_SNAPSHOT else None
+            
+            # 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, extract_from_driver(self.driver, result['retailersku'], snapshot))
             
             # 재고 상태 확인
-            stock_available = self.check_stock_status()
+            stock_available = self.check_stock_status(snapshot)
             
             if stock_available:
                 # 가격 추출
-                try:
-                    price_found = False
-                    for xpath in self.XPATHS.get('price', []):
-                        try:
-                            price_element = self.driver.find_element(By.XPATH, xpath)
-                            price_text = price_element.text.strip()
+                if result['retailprice'] is None:
+                    try:
+                        price_found = False
+                        price_xpaths = self.XPATHS.get('price', [])
+                        for xpath in price_xpaths:
+                            try:
+                                price_text = self.find_text(xpath, snapshot)
                             
-                            if price_text:
-                                parsed_price = self.parse_price_by_country(price_text, 'kr')
-                                if parsed_price > 0:
-                                    result['retailprice'] = parsed_price
-                                    logger.info(f"✅ 가격 추출 성공: {result['retailprice']}")
-                                    price_found = True
-                                    break
-                        except Exception as e:
-                            logger.debug(f"가격 추출 실패 (XPath: {xpath}): {e}")
-                            continue
+                                if price_text:
+                                    parsed_price = self.parse_price_by_country(price_text, 'kr')
+                                    if parsed_price > 0:
+                                        result['retailprice'] = parsed_price
+                                        logger.info(f"✅ 가격 추출 성공: {result['retailprice']}")
+                                        price_found = True
+                                        break
+                            except Exception as e:
+                                logger.debug(f"가격 추출 실패 (XPath: {xpath}): {e}")
+                                continue
+                        self.selector_stats.record_first('price', price_xpaths, xpath if price_found else None)
                     
-                    if not price_found:
-                        logger.warning("모든 가격 XPath에서 추출 실패")
+                        if not price_found:
+                            logger.warning("모든 가격 XPath에서 추출 실패")
                         
-                except Exception as e:
-                    logger.warning(f"가격 추출 실패: {e}")
+                    except Exception as e:
+                        logger.warning(f"가격 추출 실패: {e}")
             else:
                 # 재고 없음
                 result['retailprice'] = 0
                 logger.info("재고 없음으로 가격 0 설정")
             
             # 제목 추출
-            try:
-                for xpath in self.XPATHS.get('title', []):
-                    try:
-                        title_element = self.driver.find_element(By.XPATH, xpath)
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목: {result['title']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+            if result['title'] is None:
+                try:
+                    title_xpaths = self.XPATHS.get('title', [])
+                    title_hit = None
+                    for xpath in title_xpaths:
+                        try:
+                            result['title'] = self.find_text(xpath, snapshot)
+                            logger.info(f"제목: {result['title']}")
+                            title_hit = xpath if result['title'] else None
+                            break
+                        except:
+                            continue
+                    self.selector_stats.record_first('title', title_xpaths, title_hit)
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
             
             # 이미지 URL 추출
-            try:
-                for xpath in self.XPATHS.get('imageurl', []):
-                    try:
-                        image_element = self.driver.find_element(By.XPATH, xpath)
-                        result['imageurl'] = image_element.get_attribute('src')
-                        logger.info(f"이미지 URL: {result['imageurl']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
+            if result['imageurl'] is None:
+                try:
+                    image_xpaths = self.XPATHS.get('imageurl', [])
+                    image_hit = None
+                    for xpath in image_xpaths:
+                        try:
+                            result['imageurl'] = self.find_attr(xpath, 'src', snapshot)
+                            logger.info(f"이미지 URL: {result['imageurl']}")
+                            image_hit = xpath if result['imageurl'] else None
+                            break
+                        except:
+                            continue
+                    self.selector_stats.record_first('imageurl', image_xpaths, image_hit)
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
             
             # 배송지 정보 추출
             try:
-                for xpath in self.XPATHS.get('ships_from', []):
+                ships_xpaths = self.XPATHS.get('ships_from', [])
+                ships_hit = None
+                for xpath in ships_xpaths:
                     try:
-                        ships_element = self.driver.find_element(By.XPATH, xpath)
-                        ships_text = ships_element.text.strip()
+                        ships_text = self.find_text(xpath, snapshot)
                         if ships_text:
                             result['ships_from'] = ships_text
+                            ships_hit = xpath
                         break
                     except:
                         continue
+                self.selector_stats.record_first('ships_from', ships_xpaths, ships_hit)
             except Exception as e:
                 logger.warning(f"배송지 정보 추출 실패: {e}")
             
             # 판매자 정보 추출
             try:
-                for xpath in self.XPATHS.get('sold_by', []):
+                seller_xpaths = self.XPATHS.get('sold_by', [])
+                seller_hit = None
+                for xpath in seller_xpaths:
                     try:
-                        seller_element = self.driver.find_element(By.XPATH, xpath)
-                        seller_text = seller_element.text.strip()
+                        seller_text = self.find_text(xpath, snapshot)
                         if seller_text:
                             result['sold_by'] = seller_text
+                            seller_hit = xpath
                         break
                     except:
                         continue
+                self.selector_stats.record_first('sold_by', seller_xpaths, seller_hit)
             except Exception as e:
                 logger.warning(f"판매자 정보 추출 실패: {e}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -468,36 +469,8 @@ class DanawaScraper:
             
             # 최대 재시도 횟수 초과 시 기본값 반환
             logger.error(f"❌ 최대 재시도 횟수 초과: {url}")
-            # V2: 타임존 분리
-            now_time = datetime.now(self.korea_tz)
-            local_time = datetime.now(self.local_tz)
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'kr',
-                'ships_from': 'KR',
-                'channel_name': 'danawa',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Danawa',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': 'o'
-            }
+
+            return self.build_base_result(url, row_data)
     
     def save_to_db(self, df):
         """DB에 결과 저장"""
@@ -507,7 +480,7 @@ class DanawaScraper:
         
         try:
             # danawa_price_crawl_tbl_kr_v2 테이블에 저장
-            df.to_sql('danawa_price_crawl_tbl_kr_v2', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'danawa_price_crawl_tbl_kr_v2', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
             
             # 크롤링 로그를 pandas DataFrame으로 만들어서 한번에 저장
@@ -516,8 +489,8 @@ class DanawaScraper:
                 log_records.append({
                     'country_code': 'kr',
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -525,7 +498,7 @@ class DanawaScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('danawa_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'danawa_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
             
             # 저장된 데이터 확인
@@ -595,6 +568,9 @@ class DanawaScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_kr_danawa"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -658,7 +634,7 @@ class DanawaScraper:
         if not self.setup_driver():
             return None
         
-        results = []
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         failed_urls = []  # 실패한 URL 추적
 
         for idx, row in enumerate(urls_data):
@@ -670,6 +646,7 @@ class DanawaScraper:
                 url = row.get('url')
 
                 # 제품 정보 추출 (재시도 로직 포함)
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
 
                 # 실패 여부 확인
@@ -684,40 +661,19 @@ class DanawaScraper:
 
                 # 10개마다 DB에 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('danawa_price_crawl_tbl_kr_v2', self.db_engine,
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(1, 3)  # 다나와는 좀 더 짧은 대기시간
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-
-                    # 20개마다 긴 휴식
-                    if (idx + 1) % 20 == 0:
-                        logger.info("☕ 20개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'danawa_price_crawl_tbl_kr_v2', self.db_engine, self.country_code)
 
             except Exception as e:
                 logger.error(f"❌ 스크래핑 중 오류 (URL: {row.get('url', 'unknown')}): {e}")
                 continue
 
         # 마지막 남은 데이터 저장 (10개 단위로 떨어지지 않는 경우)
-        remaining_count = len(results) % 10
-        if remaining_count > 0 and self.db_engine:
-            try:
-                remaining_df = pd.DataFrame(results[-remaining_count:])
-                remaining_df.to_sql('danawa_price_crawl_tbl_kr_v2', self.db_engine,
-                                  if_exists='append', index=False)
-                logger.info(f"💾 마지막 배치 저장: {remaining_count}개 레코드 DB 저장")
-            except Exception as e:
-                logger.error(f"마지막 배치 저장 실패: {e}")
+        remaining_df = results.take_unflushed()
+        if remaining_df is not None and self.db_engine:
+            submit_results(remaining_df, 'danawa_price_crawl_tbl_kr_v2', self.db_engine, self.country_code,
+                           label='마지막 배치 저장')
 
         # 정리
         if failed_urls:
@@ -731,7 +687,7 @@ class DanawaScraper:
             self.driver.quit()
             logger.info("🔧 드라이버 종료")
 
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -865,7 +821,7 @@ def main():
                 
                 # 기존 실패한 결과를 재시도 결과로 업데이트
                 for _, retry_row in retry_results_df.iterrows():
-                    if retry_row['retailprice'] is not None:
+                    if pd.notna(retry_row['retailprice']):
                         # 성공한 경우 기존 데이터 업데이트
                         mask = final_results_df['producturl'] == retry_row['producturl']
                         if mask.any():
@@ -922,6 +878,11 @@ def main():
     
     logger.info("\n✅ 크롤링 프로세스 완료!")
 
+    # 선택자 적중률 리포트 + 학습된 priority 일괄 반영
+    scraper.selector_stats.report()
+    if os.getenv('SELECTOR_WRITEBACK', '1') == '1':
+        scraper.selector_stats.write_back(scraper.db_engine)
+
     # 크롤링 완료 후 알림 (빈 값 50% 이상 시 경고)
     monitor_and_alert('kr_danawa', len(urls_data), final_results_df)
 
@@ -934,13 +895,18 @@ if __name__ == "__main__":
         'pymysql',
         'sqlalchemy',
         'paramiko',
-        'openpyxl'
+        'openpyxl',
+        'lxml',
+        'cssselect'
     ]
     
     print("📦 필요한 패키지:")
     print("pip install " + " ".join(required_packages))
     print("\n⚠️ DB 설정을 먼저 확인하세요:")
     print("DB_CONFIG 딕셔너리의 user, password, host 정보를 실제 값으로 변경해야 합니다.")
+    print("\n환경변수 설정:")
+    print("export EXTRACT_ENGINE=snapshot  # HTML 1회 스냅샷 후 lxml로 오프라인 추출 (기본: live)")
+    print("export SELECTOR_WRITEBACK=0      # 학습된 선택자 priority DB 반영 끄기 (기본: 반영)")
     print()
     
     main()
\ No newline at end of file
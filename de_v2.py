@@ -35,13 +35,40 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from dom_extractor import (
+    find_excluded_price_elements, AMAZON_EXCLUDED_CLOSEST, AMAZON_EXCLUDED_CONTAINER_IDS,
+    AMAZON_EXCLUDED_CONTAINER_CLASSES, RECOMMENDATION_XPATH_PATTERN
+)
+from html_snapshot import PageSnapshot
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, ERROR_PAGE, CONTINUE, OUT_OF_STOCK, IN_STOCK
+
+# 503/차단/Continue/재고 문구 (영어 + 독일어 Amazon, 브라우저 안에서 검사)
+PAGE_PATTERNS = get_matcher('en', 'de')
+
 
 class AmazonDEScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
         self.country_code = 'de'
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Europe/Berlin')  # 독일 현지 시간
@@ -234,8 +261,11 @@ class AmazonDEScraper:
             # 독일어 언어 설정
             options.add_experimental_option('prefs', {'intl.accept_languages': 'de-DE,de'})
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             self.wait = WebDriverWait(self.driver, 20)
             
             logger.info("드라이버 설정 완료")
@@ -244,8 +274,8 @@ class AmazonDEScraper:
             logger.error(f"드라이버 설정 실패: {e}")
             return False
     
-    def handle_captcha_or_block_page(self, original_url=None):
-        """차단 페이지나 캡차 처리"""
+    def handle_captcha_or_block_page(self, original_url=None, page=None):
+        """차단 페이지나 캡차 처리 (page: 이번 페이지의 PageSnapshot, 이미 읽은 소스 재사용)"""
         try:
             logger.info("독일 차단/캡차 페이지 확인 중...")
             
@@ -259,15 +289,16 @@ class AmazonDEScraper:
                 pass
             
             # 독일 503 오류 페이지 감지 (더 구체적으로)
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
+            page_title = page.title.lower()
+            found = page.scan(PAGE_PATTERNS.patterns(ERROR_PAGE, CONTINUE))  # 브라우저 안에서 검사해 일치한 문구만 받아옴
             
             # 503 오류 페이지의 명확한 특징만 확인
             is_503_page = (
                 page_title == '503 - service nicht verfügbar' or
-                (('tut uns leid' in page_source and 
-                  'fehler beim verarbeiten ihrer anforderung' in page_source) and
-                 'klicken sie hier' in page_source)
+                (('tut uns leid' in found and 
+                  'fehler beim verarbeiten ihrer anforderung' in found) and
+                 'klicken sie hier' in found)
             )
             
             if is_503_page:
@@ -310,7 +341,7 @@ class AmazonDEScraper:
                         continue
             
             # 일반적인 차단 페이지 처리 (더 구체적으로)
-            if ('weiter shoppen' in page_source and 'amazon-startseite' in page_source):
+            if ('weiter shoppen' in found and 'amazon-startseite' in found):
                 continue_button_texts = ['Weiter shoppen', 'Weiter einkaufen', 'Fortfahren']
                 
                 all_selectors = []
@@ -356,162 +387,32 @@ class AmazonDEScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
+    def price_exclusion_reasons(self, elements):
+        """가격 후보 요소들의 제외 사유를 스크립트 1회로 판정 (유지할 요소는 None)"""
+        return find_excluded_price_elements(
+            self.driver, elements,
+            areas=self.selectors.get('excluded_price_areas', []),
+            xpath_patterns=self.selectors.get('excluded_xpath_patterns', []) + [RECOMMENDATION_XPATH_PATTERN, r'span\[3\]/span\[1\]'],
+            require_center_col=True,
+            closest=AMAZON_EXCLUDED_CLOSEST,
+            container_ids=AMAZON_EXCLUDED_CONTAINER_IDS,
+            container_classes=AMAZON_EXCLUDED_CONTAINER_CLASSES
+        )
+
     def is_excluded_price_element(self, element):
         """가격 요소가 제외 대상인지 확인 (추천상품/관련상품 영역 강화)"""
-        try:
-            # 1. 요소의 HTML 확인
-            element_html = self.driver.execute_script("return arguments[0].outerHTML;", element)
-            excluded_areas = self.selectors.get('excluded_price_areas', [])
-            
-            for pattern in excluded_areas:
-                if pattern in element_html.lower():
-                    logger.debug(f"제외 영역 감지: {pattern}")
-                    return True
-            
-            # 2. centerCol 외부의 요소는 제외
-            try:
-                center_col = self.driver.execute_script(r"""
-                    return arguments[0].closest('#centerCol');
-                """, element)
-                if not center_col:
-                    logger.info("centerCol 외부 요소 - 제외")
-                    return True
-            except Exception as e:
-                logger.debug(f"centerCol 확인 오류: {e}")
-            
-            # 3. XPath로 요소 위치 확인
-            try:
-                element_xpath = self.driver.execute_script(r"""
-                    function getXPath(element) {
-                        var xpath = '';
-                        for (; element && element.nodeType == 1; element = element.parentNode) {
-                            var id = element.id;
-                            if (id) {
-                                xpath = '//' + element.tagName.toLowerCase() + '[@id="' + id + '"]' + xpath;
-                                break;
-                            } else {
-                                var sameTag = [];
-                                for (var i = 0; i < element.parentNode.childNodes.length; i++) {
-                                    var child = element.parentNode.childNodes[i];
-                                    if (child.nodeType == 1 && child.tagName == element.tagName) {
-                                        sameTag.push(child);
-                                    }
-                                }
-                                xpath = '/' + element.tagName.toLowerCase() + '[' + (sameTag.indexOf(element) + 1) + ']' + xpath;
-                            }
-                        }
-                        return xpath;
-                    }
-                    return getXPath(arguments[0]);
-                """, element)
-                
-                logger.debug(f"요소 xpath: {element_xpath}")
-                
-                # 제외할 xpath 패턴 확인
-                excluded_patterns = self.selectors.get('excluded_xpath_patterns', [])
-                for pattern in excluded_patterns:
-                    if re.search(pattern, element_xpath):
-                        logger.info(f"제외 xpath 패턴 매치: {pattern}")
-                        return True
-                
-                # div[4] 이후 영역들은 추천상품으로 간주하여 제외
-                if ('div[1]/div[4]' in element_xpath or 
-                    'div[1]/div[5]' in element_xpath or 
-                    'div[1]/div[6]' in element_xpath or
-                    'div[1]/div[7]' in element_xpath or
-                    'div[1]/div[8]' in element_xpath or
-                    'div[1]/div[9]' in element_xpath or
-                    re.search(r'div\[1\]/div\[1[0-9]\]', element_xpath)):
-                    logger.info(f"div[4] 이후 영역 제외: {element_xpath}")
-                    return True
-                
-                # 문제 xpath 패턴 직접 차단
-                if 'span[3]/span[1]' in element_xpath:
-                    logger.info(f"문제 xpath 패턴 차단: {element_xpath}")
-                    return True
-                    
-            except Exception as e:
-                logger.debug(f"XPath 확인 오류: {e}")
-            
-            # 4. 부모 요소들 확인
-            parent_checks = [
-                "arguments[0].closest('.product-comparison-desktop')",
-                "arguments[0].closest('[class*=\"comparison\"]')",
-                "arguments[0].closest('[class*=\"non-deal\"]')",
-                "arguments[0].closest('[class*=\"recommendations\"]')",
-                "arguments[0].closest('[class*=\"sponsored\"]')",
-                "arguments[0].closest('[class*=\"similarities\"]')",
-                "arguments[0].closest('[class*=\"also-bought\"]')",
-                "arguments[0].closest('[class*=\"also-viewed\"]')",
-                "arguments[0].closest('[class*=\"related\"]')",
-                "arguments[0].closest('[class*=\"frequently\"]')",
-                "arguments[0].closest('[class*=\"customers-also\"]')",
-                "arguments[0].closest('[id*=\"sims\"]')",
-                "arguments[0].closest('[id*=\"ads\"]')",
-                "arguments[0].closest('[data-component-type*=\"sims\"]')",
-                "arguments[0].closest('[data-feature-name*=\"sims\"]')",
-                # usedBuySection은 별도 처리하므로 여기서 제외
-            ]
-            
-            for check in parent_checks:
-                try:
-                    parent = self.driver.execute_script(f"return {check}", element)
-                    if parent:
-                        logger.info(f"제외 상위 요소 발견")
-                        return True
-                except:
-                    continue
-            
-            # 5. 특정 ID나 클래스를 가진 상위 요소 확인
-            try:
-                # 추천/관련 상품 영역의 상위 컨테이너 확인
-                excluded_containers = self.driver.execute_script(r"""
-                    var element = arguments[0];
-                    var excludedIds = ['dp-sims-desktop', 'similarities-desktop', 'desktop-dp-sims', 
-                                      'recommendations', 'also-bought', 'also-viewed', 'bundleV2'];
-                    var excludedClasses = ['sims-', 'recommendations', 'also-', 'sponsored', 'ads-'];
-                    
-                    while (element && element !== document.body) {
-                        if (element.id) {
-                            for (var i = 0; i < excludedIds.length; i++) {
-                                if (element.id.indexOf(excludedIds[i]) !== -1) {
-                                    return true;
-                                }
-                            }
-                        }
-                        if (element.className && typeof element.className === 'string') {
-                            for (var i = 0; i < excludedClasses.length; i++) {
-                                if (element.className.indexOf(excludedClasses[i]) !== -1) {
-                                    return true;
-                                }
-                            }
-                        }
-                        element = element.parentElement;
-                    }
-                    return false;
-                """, element)
-                
-                if excluded_containers:
-                    logger.info("제외 컨테이너 내부 요소 감지")
-                    return True
-            except Exception as e:
-                logger.debug(f"컨테이너 확인 오류: {e}")
-            
-            return False
-        except Exception as e:
-            logger.debug(f"제외 요소 확인 오류: {e}")
-            return False
+        return self.price_exclusion_reasons([element])[0] is not None
     
-    def is_page_blocked(self):
-        """페이지 차단 감지 (정상 페이지는 우선 확인)"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 (정상 페이지는 우선 확인, page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
+            current_url = page.url.lower()
             
             # 기본 도메인 확인
             if 'amazon' not in current_url:
                 logger.info("Amazon 도메인이 아닌 페이지")
+                self.last_blocked = True
                 return True
             
             # 먼저 정상 제품 페이지인지 확인 (우선순위)
@@ -536,17 +437,22 @@ class AmazonDEScraper:
             except Exception as e:
                 logger.debug(f"정상 페이지 확인 중 오류: {e}")
             
-            # 정상 페이지 요소가 없을 때만 차단 페이지 확인
+            # 정상 페이지 요소가 없을 때만 차단 페이지 확인 (문구는 브라우저 안에서 검사)
+            page_title = page.title.lower()
+            found = page.scan(PAGE_PATTERNS.patterns(ERROR_PAGE, CONTINUE))
+            
             # 503 오류 페이지의 명확한 특징만 확인
             if (page_title == '503 - service nicht verfügbar' or
-                'tut uns leid' in page_source and 'fehler beim verarbeiten ihrer anforderung' in page_source):
+                'tut uns leid' in found and 'fehler beim verarbeiten ihrer anforderung' in found):
                 logger.info("명확한 503 오류 페이지 감지")
+                self.last_blocked = True
                 return True
             
             # 일반 차단 페이지 감지 (더 구체적으로)
             if (page_title == 'access denied' or 
-                'weiter shoppen' in page_source and 'amazon-startseite' in page_source):
+                'weiter shoppen' in found and 'amazon-startseite' in found):
                 logger.info("일반 차단 페이지 감지")
+                self.last_blocked = True
                 return True
             
             return False  # 기본적으로 정상으로 판단
@@ -632,10 +538,11 @@ class AmazonDEScraper:
                 logger.info(f"발견된 요소: {len(elements)}개")
                 
                 if elements:
-                    for element in elements:
+                    excluded = self.price_exclusion_reasons(elements) if element_name == "가격" else [None] * len(elements)
+                    for element, excluded_reason in zip(elements, excluded):
                         try:
                             if element.is_displayed():
-                                if element_name == "가격" and self.is_excluded_price_element(element):
+                                if excluded_reason:
                                     continue
                                 
                                 text = self.extract_clean_text_from_element(element, element_name)
@@ -652,70 +559,24 @@ class AmazonDEScraper:
         return None
     
     def parse_german_price(self, price_text):
-        """독일 가격 파싱 (개선된 버전)"""
-        try:
-            price_text = price_text.strip()
-            logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
-            
-            # 무효한 패턴 확인
-            invalid_patterns = [
-                r'^[a-zA-Z\s]+$',
-                r'^\d+\s*[a-zA-Z]',
-                r'was\s*€',
-                r'list\s*price',
-                r'buy\s*used'
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, price_text, re.IGNORECASE):
-                    logger.debug(f"무효한 가격 패턴 감지: {pattern}")
-                    return None
-            
-            # 유로 기호와 공백 제거
-            cleaned = re.sub(r'[€\s]', '', price_text)
-            logger.debug(f"통화 제거 후: '{cleaned}'")
-            
-            # 빈 문자열 체크
-            if not cleaned:
-                return None
-            
-            # 4자리 숫자인 경우 센트로 간주 (예: 1299 → 12.99)
-            if re.match(r'^\d{4}$', cleaned) and len(cleaned) == 4:
-                try:
-                    cents = int(cleaned)
-                    euros = cents / 100
-                    if 10 <= euros <= 10000:
-                        formatted_price = f"{euros:.2f}"
-                        logger.debug(f"독일 센트→유로 변환: {cleaned} → {formatted_price}")
-                        return formatted_price
-                except:
-                    pass
-            
-            # 독일식 숫자 형식 처리 (예: 1.299,99 → 1299.99)
-            if ',' in cleaned and '.' not in cleaned:
-                # 단순히 쉼표를 소수점으로 변경
-                cleaned = cleaned.replace(',', '.')
-            elif ',' in cleaned and '.' in cleaned:
-                # 천단위 구분자(.)와 소수점 구분자(,) 구분
-                parts = cleaned.rsplit(',', 1)
-                if len(parts) == 2 and len(parts[1]) <= 2:
-                    integer_part = parts[0].replace('.', '')
-                    decimal_part = parts[1]
-                    cleaned = f"{integer_part}.{decimal_part}"
-            
-            # 최종 검증
-            if re.match(r'^\d+(?:\.\d{1,2})?$', cleaned):
-                try:
-                    price_value = float(cleaned)
-                    if 1 <= price_value <= 50000:  # 가격 범위 확대
-                        return cleaned
-                except:
-                    pass
-            
-        except Exception as e:
-            logger.debug(f"가격 파싱 오류: {e}")
-        
-        return None
+        """독일 가격 파싱 (price_parser 공통 규칙, 1~50000유로)"""
+        if not price_text:
+            return None
+        logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
+
+        # 4자리 숫자인 경우 센트로 간주 (예: 1299 → 12.99) - 정수/소수 요소가 붙어서 읽힌 경우
+        cleaned = re.sub(r'[€\s]', '', price_text)
+        if re.fullmatch(r'\d{4}', cleaned):
+            euros = int(cleaned) / 100
+            if 10 <= euros <= 10000:
+                logger.debug(f"독일 센트→유로 변환: {cleaned} → {euros:.2f}")
+                self.last_price_text = price_text
+                return f"{euros:.2f}"
+
+        price = parse_price(price_text, 'de', strict=True, bounds=(1, 50000))
+        if price is not None:
+            self.last_price_text = price_text
+        return format_price(price)
     
     def extract_price(self):
         """가격 추출 (개선된 버전) - 메인 상품 영역만 타겟팅"""
@@ -733,10 +594,11 @@ class AmazonDEScraper:
                 else:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 
-                for element in elements:
+                excluded = self.price_exclusion_reasons(elements)
+                for element, excluded_reason in zip(elements, excluded):
                     try:
                         if element.is_displayed():
-                            if self.is_excluded_price_element(element):
+                            if excluded_reason:
                                 continue
                             
                             text = self.extract_clean_text_from_element(element, "가격")
@@ -772,8 +634,7 @@ class AmazonDEScraper:
                     whole_elem.is_displayed() and fraction_elem.is_displayed()):
                     
                     # 제외 요소 확인
-                    if (self.is_excluded_price_element(whole_elem) or 
-                        self.is_excluded_price_element(fraction_elem)):
+                    if any(self.price_exclusion_reasons([whole_elem, fraction_elem])):
                         continue
                     
                     whole_text = whole_elem.text.strip()
@@ -832,17 +693,13 @@ class AmazonDEScraper:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in [
-                    'nicht verfügbar', 'ausverkauft', 'temporarily out of stock',
-                    'currently unavailable', 'out of stock'
-                ]):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"재고 없음: {availability_text}")
                     return False
                 
-                if any(phrase in availability_text for phrase in [
-                    'auf lager', 'only', 'left in stock', 'in stock'
-                ]):
+                if IN_STOCK in stock:
                     logger.info(f"재고 있음: {availability_text}")
                     return True
             except:
@@ -862,38 +719,52 @@ class AmazonDEScraper:
             logger.warning(f"재고 확인 중 오류: {e}")
             return True
 
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code='de', channel_name='amazon.de', vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info("=" * 60)
             logger.info(f"독일 제품 정보 추출 시작: {url}")
             
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(2, 4))
+            
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
             
             # 503 오류 페이지 확인 및 처리
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.info("503 또는 차단 페이지 감지 - 복구 시도")
-                if self.handle_captcha_or_block_page(original_url=url):
+                if self.handle_captcha_or_block_page(original_url=url, page=page):
                     logger.info("차단 페이지 복구 완료")
                     time.sleep(3)
                     # 복구 후 페이지 로딩 대기
                     self.wait_for_page_load()
+                    page.invalidate()
                 else:
                     raise Exception("차단 페이지 복구 실패")
             
             # 일반적인 차단 페이지 확인
-            page_source_lower = self.driver.page_source.lower()
-            continue_patterns = ['weiter shoppen', 'weiter einkaufen', 'fortfahren']
-            
-            if any(pattern in page_source_lower for pattern in continue_patterns):
+            if page.classify(PAGE_PATTERNS, CONTINUE):
+                self.last_blocked = True
                 logger.info("일반 차단 페이지 감지 - Continue 버튼 시도")
-                self.handle_captcha_or_block_page(original_url=url)
+                self.handle_captcha_or_block_page(original_url=url, page=page)
                 time.sleep(3)
                 self.wait_for_page_load()
+                page.invalidate()
             
             # 복구 후 현재 URL 확인
-            current_url = self.driver.current_url.lower()
+            current_url = page.url.lower()
             logger.info(f"현재 페이지 URL: {current_url}")
             
             # 정상 Amazon 제품 페이지인지 확인 (차단 페이지가 아닌)
@@ -930,47 +801,8 @@ class AmazonDEScraper:
             except Exception as e:
                 logger.error(f"제품 페이지 검증 실패: {e}")
                 raise Exception("제품 페이지 접근 실패")
-            
-            # V2: 타임존 분리
 
-            
-            now_time = datetime.now(self.korea_tz)
-
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'de',
-                'ships_from': None,
-                'channel_name': 'amazon.de',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o'),
-            }
+            result = self.build_base_result(url, row_data)
             
             # 제목 추출
             result['title'] = self.extract_element_text(
@@ -1056,6 +888,7 @@ class AmazonDEScraper:
             logger.info(f"판매자: {result['sold_by']}")
             logger.info(f"배송지: {result['ships_from']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -1066,40 +899,8 @@ class AmazonDEScraper:
                 logger.info(f"{wait_time}초 후 재시도... ({retry_count + 1}/{max_retries})")
                 time.sleep(wait_time)
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'de',
-                'ships_from': None,
-                'channel_name': 'amazon.de',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o'),
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 크롤링 대상 조회"""
@@ -1130,7 +931,7 @@ class AmazonDEScraper:
         
         try:
             table_name = 'amazon_price_crawl_tbl_de_v2'
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"독일 DB 저장 완료: {len(df)}개")
             return True
         except Exception as e:
@@ -1189,6 +990,9 @@ class AmazonDEScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_de_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1239,10 +1043,15 @@ class AmazonDEScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table='amazon_price_crawl_tbl_de_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info(f"독일 크롤링 시작 - {len(urls_data)}개 URL")
         
@@ -1250,7 +1059,7 @@ class AmazonDEScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
         
         try:
@@ -1258,7 +1067,9 @@ class AmazonDEScraper:
                 logger.info(f"진행률: {idx + 1}/{len(urls_data)}")
                 
                 url = row.get('url')
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 if result['retailprice'] is None and result['title'] is None:
                     failed_urls.append({
@@ -1277,23 +1088,11 @@ class AmazonDEScraper:
                 
                 # 10개마다 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = 'amazon_price_crawl_tbl_de_v2'
-                            interim_df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
-                            logger.info("독일 중간 저장: 10개 레코드")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    time.sleep(wait_time)
-                    
-                    if (idx + 1) % 20 == 0:
-                        logger.info("20개 처리 완료, 30초 휴식")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = 'amazon_price_crawl_tbl_de_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"스크래핑 중 오류: {e}")
         
@@ -1309,7 +1108,7 @@ class AmazonDEScraper:
                 except:
                     pass
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1326,7 +1125,7 @@ class AmazonDEScraper:
         if with_price > 0:
             try:
                 price_df = df[df['retailprice'].notna()].copy()
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("독일 가격 통계:")
                 logger.info(f"  평균: {price_df['price_numeric'].mean():.2f}€")
@@ -1339,6 +1138,7 @@ def main():
     """메인 실행 함수"""
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print("=" * 60)
     print("Amazon 독일 크롤러 v2.0 - 추천상품/관련상품 영역 필터링 강화판")
@@ -1398,7 +1198,7 @@ def main():
         monitor_and_alert('de', 0, None, error_message="크롤링 대상 없음")
         return
 
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과 없음")
         monitor_and_alert('de', len(urls_data), None, error_message="크롤링 결과 없음")
@@ -1422,6 +1222,7 @@ if __name__ == "__main__":
     print("환경변수 (선택사항):")
     print("export TEST_MODE=true      # 테스트 모드")
     print("export MAX_ITEMS=100       # 선택사항 (없으면 전체)")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print()
     print("독일 전용 크롤링 모드로 실행 중...")
     print()
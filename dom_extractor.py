@@ -0,0 +1,330 @@
+"""
+브라우저 내 일괄 필드 추출
+- 필드별 선택자 목록을 execute_script 한 번으로 페이지에 넘겨 브라우저 안에서 우선순위대로 평가
+- find_elements / is_displayed / get_attribute 를 요소마다 호출하던 WebDriver 왕복을 1회로 줄임
+- 결과는 {'values': {필드: 값}, 'hits': {필드: 사용된 선택자}} 형태의 JSON
+"""
+
+import logging
+import time
+
+from pattern_registry import label_patterns
+
+logger = logging.getLogger(__name__)
+
+# Ships From / Sold By 에서 라벨만 있는 텍스트 (소문자, pattern_registry 전체 언어)
+LABEL_ONLY_PATTERNS = label_patterns()
+
+# arguments[0]: 필드 스펙 {필드명: {type, selectors, ...}}
+EXTRACT_FIELDS_JS = r"""
+const spec = arguments[0];
+
+function findAll(selector) {
+    try {
+        if (selector.startsWith('//') || selector.startsWith('(')) {
+            const snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                const node = snapshot.snapshotItem(i);
+                if (node.nodeType === Node.ELEMENT_NODE) nodes.push(node);
+            }
+            return nodes;
+        }
+        return Array.from(document.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+}
+
+// Selenium is_displayed() 근사: display/visibility/opacity/크기 확인
+function isShown(el) {
+    for (let node = el; node && node.nodeType === Node.ELEMENT_NODE; node = node.parentElement) {
+        const style = window.getComputedStyle(node);
+        if (style.display === 'none' || parseFloat(style.opacity) === 0) return false;
+    }
+    const style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.visibility === 'collapse') return false;
+    const rect = el.getBoundingClientRect();
+    return (rect.width > 0 && rect.height > 0) || el.getClientRects().length > 0;
+}
+
+function texts(el) {
+    return [(el.textContent || '').trim(), (el.innerText || '').trim()];
+}
+
+function stripLabel(text, labels) {
+    const lower = text.toLowerCase().trim();
+    if (labels.includes(lower)) return '';
+    for (const label of labels) {
+        if (lower.startsWith(label + ' ')) {
+            const value = text.slice(label.length).trim();
+            return value || text;
+        }
+    }
+    return text;
+}
+
+const values = {};
+const hits = {};
+
+for (const [field, conf] of Object.entries(spec)) {
+    values[field] = conf.type === 'texts' ? [] : (conf.type === 'pairs' ? [] : null);
+
+    if (conf.type === 'pairs') {
+        for (const pair of conf.pairs) {
+            const whole = findAll(pair.whole)[0];
+            const fraction = findAll(pair.fraction)[0];
+            if (whole && fraction && isShown(whole) && isShown(fraction)) {
+                values[field].push([(whole.innerText || '').trim(), (fraction.innerText || '').trim()]);
+            } else {
+                values[field].push(null);
+            }
+        }
+        continue;
+    }
+
+    for (const selector of conf.selectors) {
+        const nodes = findAll(selector);
+        if (!nodes.length) continue;
+
+        if (conf.type === 'attr') {
+            const value = nodes[0].getAttribute(conf.attr);
+            if (value) { values[field] = value; hits[field] = selector; break; }
+            continue;
+        }
+
+        if (conf.type === 'exists') {
+            if (nodes.some(isShown)) { values[field] = true; hits[field] = selector; break; }
+            continue;
+        }
+
+        for (const el of nodes) {
+            if (!isShown(el)) continue;
+            const candidates = texts(el).filter(t => t);
+
+            if (conf.type === 'texts') {
+                for (const t of candidates) {
+                    if (!values[field].includes(t)) values[field].push(t);
+                }
+                continue;
+            }
+
+            // type === 'text': 가장 긴 텍스트 사용, 필요 시 라벨 제거
+            let text = candidates.reduce((a, b) => (b.length > a.length ? b : a), '');
+            if (text && conf.labels) text = stripLabel(text, conf.labels);
+            if (text) { values[field] = text; hits[field] = selector; break; }
+        }
+        if (conf.type === 'text' && values[field] !== null) break;
+    }
+    if (conf.type === 'exists' && values[field] === null) values[field] = false;
+}
+
+return {values: values, hits: hits};
+"""
+
+
+def text_field(selectors, strip_labels=False):
+    """첫 번째로 보이는 요소의 텍스트 (가장 긴 textContent/innerText)"""
+    conf = {'type': 'text', 'selectors': list(selectors)}
+    if strip_labels:
+        conf['labels'] = LABEL_ONLY_PATTERNS
+    return conf
+
+
+def texts_field(selectors):
+    """선택자 순서대로 보이는 요소의 모든 텍스트 후보 (가격 파싱용)"""
+    return {'type': 'texts', 'selectors': list(selectors)}
+
+
+def attr_field(selectors, attr):
+    """첫 번째로 찾은 요소의 속성값 (보임 여부 무관)"""
+    return {'type': 'attr', 'selectors': list(selectors), 'attr': attr}
+
+
+def exists_field(selectors):
+    """보이는 요소가 하나라도 있는지 여부"""
+    return {'type': 'exists', 'selectors': list(selectors)}
+
+
+def pairs_field(pairs):
+    """(정수부, 소수부) 선택자 조합별 [정수 텍스트, 소수 텍스트] 또는 None"""
+    return {'type': 'pairs', 'pairs': [{'whole': whole, 'fraction': fraction} for whole, fraction in pairs]}
+
+
+def extract_fields(driver, spec):
+    """
+    필드 스펙을 한 번의 execute_script로 평가
+
+    Args:
+        driver: Selenium WebDriver
+        spec: {필드명: text_field()/texts_field()/... 결과}
+
+    Returns:
+        dict: {'values': {...}, 'hits': {...}} / 스크립트 실패 시 None (호출측에서 기존 방식으로 대체)
+    """
+    started = time.perf_counter()
+    try:
+        bundle = driver.execute_script(EXTRACT_FIELDS_JS, spec)
+    except Exception as e:
+        logger.warning(f"일괄 추출 스크립트 실패 - 기존 방식으로 대체: {e}")
+        return None
+
+    if not isinstance(bundle, dict) or 'values' not in bundle:
+        logger.warning("일괄 추출 결과 형식 오류 - 기존 방식으로 대체")
+        return None
+
+    logger.info(f"⚡ 일괄 추출 완료: {len(spec)}개 필드, {(time.perf_counter() - started) * 1000:.0f}ms")
+    return bundle
+
+
+# 가격 후보 요소 제외 규칙 (de/fr/it/nl Amazon 공통)
+AMAZON_EXCLUDED_CLOSEST = [
+    '.product-comparison-desktop',
+    '[class*="comparison"]',
+    '[class*="non-deal"]',
+    '[class*="recommendations"]',
+    '[class*="sponsored"]',
+    '[class*="similarities"]',
+    '[class*="also-bought"]',
+    '[class*="also-viewed"]',
+    '[class*="related"]',
+    '[class*="frequently"]',
+    '[class*="customers-also"]',
+    '[id*="sims"]',
+    '[id*="ads"]',
+    '[data-component-type*="sims"]',
+    '[data-feature-name*="sims"]'
+    # usedBuySection은 별도 처리하므로 여기서 제외
+]
+AMAZON_EXCLUDED_CONTAINER_IDS = [
+    'dp-sims-desktop', 'similarities-desktop', 'desktop-dp-sims',
+    'recommendations', 'also-bought', 'also-viewed', 'bundleV2'
+]
+AMAZON_EXCLUDED_CONTAINER_CLASSES = ['sims-', 'recommendations', 'also-', 'sponsored', 'ads-']
+
+# centerCol 하위 div[4] 이후 영역은 추천상품으로 간주
+RECOMMENDATION_XPATH_PATTERN = r'div\[1\]/div\[([4-9]|1[0-9])\]'
+
+# arguments[0]: 요소 배열, arguments[1]: 규칙 / 요소별 제외 사유(문자열) 또는 null 반환
+PRICE_EXCLUSION_JS = r"""
+const elements = arguments[0];
+const rules = arguments[1];
+
+const xpathRules = (rules.xpath_patterns || []).map(function (pattern) {
+    try { return [pattern, new RegExp(pattern)]; } catch (e) { return null; }
+}).filter(Boolean);
+
+function getXPath(element) {
+    var xpath = '';
+    for (; element && element.nodeType == 1; element = element.parentNode) {
+        var id = element.id;
+        if (id) {
+            xpath = '//' + element.tagName.toLowerCase() + '[@id="' + id + '"]' + xpath;
+            break;
+        } else {
+            var sameTag = [];
+            for (var i = 0; i < element.parentNode.childNodes.length; i++) {
+                var child = element.parentNode.childNodes[i];
+                if (child.nodeType == 1 && child.tagName == element.tagName) {
+                    sameTag.push(child);
+                }
+            }
+            xpath = '/' + element.tagName.toLowerCase() + '[' + (sameTag.indexOf(element) + 1) + ']' + xpath;
+        }
+    }
+    return xpath;
+}
+
+function containerReason(element) {
+    for (; element && element !== document.body; element = element.parentElement) {
+        const id = element.id || '';
+        for (const part of rules.container_ids || []) {
+            if (id.indexOf(part) !== -1) return 'container id: ' + part;
+        }
+        if (typeof element.className === 'string') {
+            for (const part of rules.container_classes || []) {
+                if (element.className.indexOf(part) !== -1) return 'container class: ' + part;
+            }
+        }
+    }
+    return null;
+}
+
+function reasonFor(element) {
+    if (!element) return null;
+
+    const html = (element.outerHTML || '').toLowerCase();
+    for (const area of rules.areas || []) {
+        if (html.indexOf(area) !== -1) return 'area: ' + area;
+    }
+
+    if (rules.require_center_col && !element.closest('#centerCol')) return 'centerCol 외부';
+
+    if (xpathRules.length) {
+        const xpath = getXPath(element);
+        for (const [pattern, regex] of xpathRules) {
+            if (regex.test(xpath)) return 'xpath: ' + pattern + ' (' + xpath + ')';
+        }
+    }
+
+    for (const selector of rules.closest || []) {
+        try {
+            if (element.closest(selector)) return 'closest: ' + selector;
+        } catch (e) {}
+    }
+
+    return containerReason(element);
+}
+
+return elements.map(function (element) {
+    try { return reasonFor(element); } catch (e) { return null; }
+});
+"""
+
+
+def find_excluded_price_elements(driver, elements, areas=(), xpath_patterns=(), require_center_col=False,
+                                 closest=(), container_ids=(), container_classes=()):
+    """
+    가격 후보 요소들의 제외 여부를 execute_script 1회로 판정
+
+    규칙 적용 순서는 기존 is_excluded_price_element와 같다:
+    outerHTML 제외 영역 -> centerCol 외부 -> XPath 패턴 -> closest() 상위 요소 -> 상위 컨테이너 id/class
+
+    Args:
+        driver: Selenium WebDriver
+        elements: WebElement 목록
+        areas: outerHTML(소문자)에 포함되면 제외할 문자열 (excluded_price_areas)
+        xpath_patterns: 요소 XPath에 매치되면 제외할 정규식 (excluded_xpath_patterns)
+        require_center_col: True면 #centerCol 외부 요소 제외
+        closest: 상위에 존재하면 제외할 CSS 선택자
+        container_ids / container_classes: 상위 요소 id/class에 포함되면 제외할 문자열
+
+    Returns:
+        list: 요소별 제외 사유 (유지할 요소는 None). 스크립트 실패 시 모두 None
+    """
+    elements = list(elements)
+    if not elements:
+        return []
+
+    rules = {
+        'areas': list(areas),
+        'xpath_patterns': list(xpath_patterns),
+        'require_center_col': require_center_col,
+        'closest': list(closest),
+        'container_ids': list(container_ids),
+        'container_classes': list(container_classes)
+    }
+
+    try:
+        reasons = driver.execute_script(PRICE_EXCLUSION_JS, elements, rules)
+    except Exception as e:
+        logger.debug(f"제외 요소 확인 오류: {e}")
+        return [None] * len(elements)
+
+    if not isinstance(reasons, list) or len(reasons) != len(elements):
+        return [None] * len(elements)
+
+    for reason in reasons:
+        if reason:
+            logger.info(f"제외 가격 요소: {reason}")
+    return reasons
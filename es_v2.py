@@ -35,13 +35,37 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from dom_extractor import find_excluded_price_elements
+from html_snapshot import PageSnapshot
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, BLOCKED_TITLE, BLOCKED, CONTINUE, ERROR_PAGE, OUT_OF_STOCK, IN_STOCK
+
+# 차단/오류/Continue/재고 문구 (영어 + 독일어 + 스페인어 Amazon)
+PAGE_PATTERNS = get_matcher('en', 'de', 'es', retailer='amazon_es')
 
 class AmazonScraper:
     def __init__(self, country_code='usa'):
         self.driver = None
         self.db_engine = None
         self.country_code = country_code.lower()
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Europe/Madrid')  # 스페인 현지 시간
@@ -209,32 +233,21 @@ class AmazonScraper:
             }
         }
     
-    def is_excluded_price_element(self, element):
-        """추천상품/관련상품 영역 제외 필터링 - desktop-dp-lpo 영역만 제외"""
-        try:
-            # desktop-dp-lpo_feature_div (추천상품 영역)에 속하는지 확인
-            is_in_lpo = self.driver.execute_script("""
-                var el = arguments[0];
-                while (el && el !== document.body) {
-                    var id = el.id || '';
-                    // desktop-dp-lpo_feature_div_01 또는 유사 패턴 체크
-                    if (id.indexOf('desktop-dp-lpo') !== -1) {
-                        return true;
-                    }
-                    el = el.parentElement;
-                }
-                return false;
-            """, element)
-
-            if is_in_lpo:
-                logger.debug("제외됨 - desktop-dp-lpo 추천상품 영역")
-                return True
+    def price_exclusion_reasons(self, elements, comparison=False):
+        """
+        추천상품/관련상품 영역 제외 판정을 스크립트 1회로 처리 - desktop-dp-lpo 영역만 제외
 
-            return False
+        comparison=True면 비교 테이블(.product-comparison-desktop, [class*="comparison"]) 요소도 제외
+        """
+        return find_excluded_price_elements(
+            self.driver, elements,
+            closest=['.product-comparison-desktop', '[class*="comparison"]'] if comparison else [],
+            container_ids=['desktop-dp-lpo']  # desktop-dp-lpo_feature_div_01 또는 유사 패턴
+        )
 
-        except Exception as e:
-            logger.debug(f"필터링 체크 중 오류 (무시): {e}")
-            return False
+    def is_excluded_price_element(self, element):
+        """추천상품/관련상품 영역 제외 필터링 - desktop-dp-lpo 영역만 제외"""
+        return self.price_exclusion_reasons([element])[0] is not None
     
     def load_selectors_from_db(self):
         """DB에서 선택자 로드"""
@@ -306,8 +319,11 @@ class AmazonScraper:
             lang = language_map.get(self.country_code, 'en-US,en')
             options.add_experimental_option('prefs', {'intl.accept_languages': lang})
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             
             self.wait = WebDriverWait(self.driver, 20)
             
@@ -318,30 +334,16 @@ class AmazonScraper:
             logger.error(f"드라이버 설정 실패: {e}")
             return False
     
-    def is_error_page(self):
-        """오류 페이지 확인 (파란색 링크 감지 포함)"""
+    def is_error_page(self, page=None):
+        """오류 페이지 확인 (파란색 링크 감지 포함, page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title.lower()
-            
-            # 오류 페이지 감지 키워드 확장
-            error_indicators = [
-                'lo sentimos',
-                'se ha producido un error',
-                'error de servicio',
-                '503',
-                'service unavailable',
-                'algo salió mal',
-                'error has occurred',
-                'haz clic aquí para volver',
-                'something went wrong',
-                'robot check',
-                'automated access'
-            ]
+            page = page if page is not None else PageSnapshot(self.driver)
             
-            for indicator in error_indicators:
-                if indicator in page_title or indicator in page_source:
-                    logger.info(f"오류 페이지 감지: {indicator}")
+            # 제목 + 본문을 브라우저 안에서 검사해 일치한 문구만 받아옴 (오류 + 봇 확인 문구)
+            found = page.classify(PAGE_PATTERNS, ERROR_PAGE, BLOCKED)
+            for category in (ERROR_PAGE, BLOCKED):
+                if category in found:
+                    logger.info(f"오류 페이지 감지: {found[category][0]}")
                     return True
             
             return False
@@ -453,13 +455,13 @@ class AmazonScraper:
             logger.error(f"파란색 링크 클릭 중 오류: {e}")
             return False
     
-    def handle_captcha_or_block_page(self):
-        """차단 페이지나 캡차 처리 - 파란색 링크 우회 통합"""
+    def handle_captcha_or_block_page(self, page=None):
+        """차단 페이지나 캡차 처리 - 파란색 링크 우회 통합 (page: PageSnapshot - 이미 읽은 URL 재사용)"""
         try:
             logger.info("차단/캡차 페이지 확인 중...")
             
             # 현재 URL 저장
-            original_url = self.driver.current_url
+            original_url = page.url if page is not None else self.driver.current_url
             
             # 먼저 파란색 링크 우회 시도
             if self.click_blue_link_and_return(original_url):
@@ -547,53 +549,33 @@ class AmazonScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
-    def is_page_blocked(self):
-        """페이지 차단 감지 (파란색 링크 페이지 포함)"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 (파란색 링크 페이지 포함, page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
-            
-            serious_blocked_indicators = {
-                'title': [
-                    '503',
-                    'access denied',
-                    'error has occurred',
-                    'fehler aufgetreten',
-                    'lo sentimos',
-                    'se ha producido un error'
-                ],
-                'content': [
-                    'enter the characters',
-                    'verify you are human',
-                    'access denied',
-                    'automated access',
-                    'suspicious activity',
-                    'geben sie die zeichen ein',
-                    'beweisen sie dass sie ein mensch sind',
-                    'haz clic aquí para volver',
-                    'robot check'
-                ]
-            }
+            page = page if page is not None else PageSnapshot(self.driver)
+            page_title = page.title.lower()
+            current_url = page.url.lower()
+            
+            title_hits = PAGE_PATTERNS.classify(page_title, BLOCKED_TITLE)
+            if title_hits:
+                logger.warning(f"차단 감지 (제목): {title_hits[BLOCKED_TITLE][0]}")
+                self.last_blocked = True
+                return True
             
-            for pattern in serious_blocked_indicators['title']:
-                if pattern in page_title:
-                    logger.warning(f"차단 감지 (제목): {pattern}")
-                    return True
+            # 본문 문구는 브라우저 안에서 검사해 일치한 패턴만 받아옴
+            found = page.classify(PAGE_PATTERNS, CONTINUE, ERROR_PAGE, BLOCKED)
             
             # 파란색 링크나 Continue 버튼이 없는 경우에만 본문 검사
-            if ('continue shopping' not in page_source and 
-                'weiter shoppen' not in page_source and
-                'continuar comprando' not in page_source and
-                'seguir comprando' not in page_source and
-                'haz clic aquí para volver' not in page_source):
-                for pattern in serious_blocked_indicators['content']:
-                    if pattern in page_source:
-                        logger.warning(f"차단 감지 (본문): {pattern}")
-                        return True
+            if (CONTINUE not in found and
+                'haz clic aquí para volver' not in found.get(ERROR_PAGE, []) and
+                BLOCKED in found):
+                logger.warning(f"차단 감지 (본문): {found[BLOCKED][0]}")
+                self.last_blocked = True
+                return True
             
             if 'amazon' not in current_url:
                 logger.warning(f"Amazon 페이지가 아님: {current_url}")
+                self.last_blocked = True
                 return True
             
             return False
@@ -709,77 +691,21 @@ class AmazonScraper:
         return None
     
     def parse_price_by_country(self, price_text, country_code):
-        """국가별 가격 파싱 - 강화된 검증 추가"""
-        try:
-            price_text = price_text.strip()
-            logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
-            
-            # 가격이 아닌 텍스트 필터링 (165 문제 방지)
-            invalid_patterns = [
-                r'^[a-zA-Z\s]+$',  # 알파벳만 있는 경우
-                r'^\d+\s*[a-zA-Z]',  # 숫자 + 문자 조합
-                r'^[^€$£¥₹]\d+$',   # 통화 기호 없는 순수 숫자
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, price_text):
-                    logger.debug(f"무효한 가격 패턴 감지: {pattern}")
-                    return None
-            
-            if country_code in ['fr', 'it', 'es', 'de']:
-                cleaned = re.sub(r'[€\s]', '', price_text)
-                logger.debug(f"통화 제거 후: '{cleaned}'")
-                
-                if country_code == 'es':
-                    if ',' in cleaned and '.' not in cleaned:
-                        cleaned = cleaned.replace(',', '.')
-                        logger.debug(f"스페인 쉼표→점 변환: '{cleaned}'")
-                    elif ',' in cleaned and '.' in cleaned:
-                        parts = cleaned.rsplit(',', 1)
-                        if len(parts) == 2 and len(parts[1]) <= 2:
-                            integer_part = parts[0].replace('.', '')
-                            decimal_part = parts[1]
-                            cleaned = f"{integer_part}.{decimal_part}"
-                            logger.debug(f"스페인 복합형식 변환: '{cleaned}'")
-                else:
-                    if ',' in cleaned:
-                        parts = cleaned.split(',')
-                        if len(parts) == 2 and len(parts[1]) <= 2 and parts[1].isdigit():
-                            integer_part = parts[0].replace('.', '')
-                            decimal_part = parts[1]
-                            cleaned = f"{integer_part}.{decimal_part}"
-                
-                if re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    # 최소 가격 검증 (10유로 이상, 10000유로 미만)
-                    try:
-                        price_value = float(cleaned)
-                        if 10 <= price_value <= 10000:  
-                            return cleaned
-                        else:
-                            logger.debug(f"가격 범위 벗어남: {price_value}")
-                            return None
-                    except:
-                        return None
-                    
-            elif country_code == 'jp':
-                cleaned = re.sub(r'[¥￥\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{3})*$', cleaned) or re.match(r'^\d+$', cleaned):
-                    return cleaned
-                    
-            elif country_code == 'in':
-                cleaned = re.sub(r'[₹\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{2,3})*(\.\d{1,2})?$', cleaned) or re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-                    
-            else:
-                cleaned = re.sub(r'[$£\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{3})*(\.\d{1,2})?$', cleaned) or re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-                    
-        except Exception as e:
-            logger.debug(f"가격 파싱 오류: {price_text} - {e}")
-            
-        return None
+        """국가별 가격 파싱 (price_parser 공통 규칙) - 유로권은 10~10000유로만 인정"""
+        if not price_text:
+            return None
+        logger.debug(f"파싱할 가격 텍스트: '{price_text}'")
+
+        # 통화 기호 없는 순수 숫자는 가격으로 보지 않음 (165 문제 방지)
+        if re.fullmatch(r'\d{2,}', price_text.strip()):
+            logger.debug(f"통화 기호 없는 숫자 제외: '{price_text}'")
+            return None
+
+        bounds = (10, 10000) if country_code in ['fr', 'it', 'es', 'de'] else None
+        price = parse_price(price_text, country_code, strict=True, bounds=bounds)
+        if price is not None:
+            self.last_price_text = price_text
+        return format_price(price)
     
     def extract_price(self, country_code):
         """가격 추출 - 165 문제 해결 + 추천상품 필터링 버전"""
@@ -802,21 +728,12 @@ class AmazonScraper:
                 logger.info(f"시도: {selector}")
                 elements = self.driver.find_elements(By.XPATH, selector)
                 
-                for element in elements:
+                # 추천상품/관련상품 영역 + 비교 테이블 제외 필터링 (요소 전체를 한 번에 판정)
+                excluded = self.price_exclusion_reasons(elements, comparison=True)
+                for element, excluded_reason in zip(elements, excluded):
                     if element.is_displayed():
-                        # 추천상품/관련상품 영역 제외 필터링 적용
-                        if self.is_excluded_price_element(element):
-                            logger.info("추천상품/관련상품 영역 요소 스킵")
-                            continue
-                        
-                        # 비교 테이블인지 확인
-                        parent_html = self.driver.execute_script(
-                            "return arguments[0].closest('.product-comparison-desktop') || arguments[0].closest('[class*=\"comparison\"]')", 
-                            element
-                        )
-                        
-                        if parent_html:
-                            logger.info("비교 테이블 요소 스킵")
+                        if excluded_reason:
+                            logger.info("추천상품/관련상품/비교 테이블 영역 요소 스킵")
                             continue
                         
                         text_methods = [
@@ -882,7 +799,7 @@ class AmazonScraper:
                 
                 if whole_elem and fraction_elem and whole_elem.is_displayed() and fraction_elem.is_displayed():
                     # 추천상품/관련상품 영역 제외 필터링 적용
-                    if self.is_excluded_price_element(whole_elem) or self.is_excluded_price_element(fraction_elem):
+                    if any(self.price_exclusion_reasons([whole_elem, fraction_elem])):
                         logger.info("추천상품/관련상품 영역 요소 조합 스킵")
                         continue
                     
@@ -918,21 +835,12 @@ class AmazonScraper:
                 else:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 
-                for element in elements:
+                # 추천상품/관련상품 영역 + 비교 테이블 제외 필터링 (요소 전체를 한 번에 판정)
+                excluded = self.price_exclusion_reasons(elements, comparison=True)
+                for element, excluded_reason in zip(elements, excluded):
                     if element.is_displayed():
-                        # 추천상품/관련상품 영역 제외 필터링 적용
-                        if self.is_excluded_price_element(element):
-                            logger.info("추천상품/관련상품 영역 요소 스킵")
-                            continue
-                        
-                        # 비교 테이블인지 확인
-                        parent_html = self.driver.execute_script(
-                            "return arguments[0].closest('.product-comparison-desktop') || arguments[0].closest('[class*=\"comparison\"]')", 
-                            element
-                        )
-                        
-                        if parent_html:
-                            logger.info("비교 테이블 요소 스킵")
+                        if excluded_reason:
+                            logger.info("추천상품/관련상품/비교 테이블 영역 요소 스킵")
                             continue
                         
                         text_methods = [
@@ -963,24 +871,13 @@ class AmazonScraper:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in [
-                    'currently unavailable',
-                    'out of stock',
-                    'temporarily out of stock',
-                    'no disponible',
-                    'agotado'
-                ]):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"재고 없음: {availability_text}")
                     return False
                     
-                if any(phrase in availability_text for phrase in [
-                    'in stock',
-                    'only',
-                    'left in stock',
-                    'disponible',
-                    'en stock'
-                ]):
+                if IN_STOCK in stock:
                     logger.info(f"재고 있음: {availability_text}")
                     return True
                     
@@ -1009,8 +906,18 @@ class AmazonScraper:
             logger.warning(f"재고 확인 중 오류: {e}")
             return True
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code=self.country_code, channel_name='amazon.es',
+                          vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 - 파란색 링크 우회 + 추천상품 필터링 통합"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info("=" * 60)
             logger.info("제품 정보 추출 시작")
@@ -1018,72 +925,41 @@ class AmazonScraper:
             logger.info(f"브랜드: {row_data.get('brand', 'N/A')}")
             logger.info(f"제품: {row_data.get('item', 'N/A')}")
             
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(2, 4))
+            
+            # 이번 페이지의 title/URL은 한 번만 조회해 오류/차단 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
             
             # 정상 페이지인지 먼저 확인
             if self.is_normal_product_page():
                 logger.info("정상 제품 페이지 확인 - 크롤링 진행")
             else:
                 # 오류 페이지인지 확인하고 우회 시도
-                if self.is_error_page():
+                if self.is_error_page(page):
+                    self.last_blocked = True
                     logger.info("오류 페이지 감지 - 우회 시도")
-                    if self.handle_captcha_or_block_page():
+                    if self.handle_captcha_or_block_page(page):
                         time.sleep(3)
                         self.wait_for_page_load()
+                        page.invalidate()
                         
                         # 우회 후 다시 정상 페이지 확인
                         if not self.is_normal_product_page():
                             logger.warning("우회 후에도 정상 페이지 아님")
                     else:
                         logger.warning("우회 실패")
+                        page.invalidate()
                 else:
                     logger.info("오류 페이지는 아니지만 주요 요소 없음 - 진행")
             
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.error("여전히 차단 페이지임")
                 raise Exception("페이지 차단됨")
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.es',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
             
             result['title'] = self.extract_element_text(
                 self.selectors[self.country_code].get('title', []), 
@@ -1163,9 +1039,6 @@ class AmazonScraper:
                 except:
                     continue
             
-            page_source = self.driver.page_source
-            page_source_lower = page_source.lower()
-            
             logger.info("추출 결과:")
             logger.info(f"제목: {result['title'][:50] + '...' if result['title'] and len(result['title']) > 50 else result['title']}")
             logger.info(f"가격: {result['retailprice']}")
@@ -1173,6 +1046,7 @@ class AmazonScraper:
             logger.info(f"판매자: {result['sold_by']}")
             logger.info(f"배송지: {result['ships_from']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -1191,40 +1065,8 @@ class AmazonScraper:
                     self.setup_driver()
                 
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.es',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 크롤링 대상 URL 목록 조회"""
@@ -1257,7 +1099,7 @@ class AmazonScraper:
         try:
             table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
             
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"DB 저장 완료: {len(df)}개 레코드 -> {table_name}")
             
             log_records = []
@@ -1265,8 +1107,8 @@ class AmazonScraper:
                 log_records.append({
                     'country_code': self.country_code,
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -1274,7 +1116,7 @@ class AmazonScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"크롤링 로그 저장 완료: {len(log_records)}개")
             
             return True
@@ -1335,6 +1177,9 @@ class AmazonScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_es_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1385,10 +1230,15 @@ class AmazonScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """여러 URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table=f'amazon_price_crawl_tbl_{self.country_code}_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info("=" * 80)
         logger.info("크롤링 시작 - 165 문제 해결 + 파란색 링크 우회 + 추천상품 필터링 버전")
@@ -1406,7 +1256,7 @@ class AmazonScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
         
         try:
@@ -1415,7 +1265,9 @@ class AmazonScraper:
                 
                 url = row.get('url')
                 
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 if result['retailprice'] is None and result['title'] is None:
                     failed_urls.append({
@@ -1435,25 +1287,11 @@ class AmazonScraper:
                 results.append(result)
                 
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
-                            interim_df.to_sql(table_name, self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info("중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"{wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                    if (idx + 1) % 20 == 0:
-                        logger.info("20개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"스크래핑 중 오류: {e}")
         
@@ -1469,7 +1307,7 @@ class AmazonScraper:
                 self.driver.quit()
                 logger.info("드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1491,7 +1329,7 @@ class AmazonScraper:
             price_df = df[df['retailprice'].notna()].copy()
             
             try:
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("가격 통계:")
                 logger.info(f"   평균가: {price_df['price_numeric'].mean():.2f}")
@@ -1528,6 +1366,7 @@ def main():
     country_code = os.getenv('COUNTRY_CODE', 'es').lower()  
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'  # 전체 크롤링 모드로 변경
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None  # 전체 크롤링 (제한 없음)
+    pool_workers = get_pool_workers()
     
     print("=" * 80)
     print("Amazon 가격 추출 시스템 v6.0 (165 Problem + Blue Link Bypass + Recommended Filtering)")
@@ -1586,7 +1425,7 @@ def main():
 
     logger.info(f"크롤링 대상: {len(urls_data)}개")
     
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
@@ -1631,6 +1470,7 @@ if __name__ == "__main__":
     print("export COUNTRY_CODE=es  # us, uk, de, fr, es, jp, ind 등")
     print("export TEST_MODE=true   # 테스트 모드")
     print("export MAX_ITEMS=1      # 최대 처리 개수 (선택사항)")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print()
     
     main()
\ No newline at end of file
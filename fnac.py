@@ -15,6 +15,8 @@ os.environ['TMP'] = temp_dir
 tempfile.tempdir = temp_dir
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright
+import asyncio
 import pandas as pd
 import pymysql
 from sqlalchemy import create_engine
@@ -38,6 +40,59 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import get_block_profile, should_block_request
+from structured_data import extract_from_html, fill_result
+from network_capture import PlaywrightCapture
+from http_fetch import HttpFetcher, get_fetch_engine, ENGINE_HTTP
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+
+# 브라우저 실행 옵션 (동기/비동기 엔진 공통)
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process'
+]
+
+# 컨텍스트 옵션 (프랑스 사용자 시뮬레이션)
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'fr-FR',
+    'timezone_id': 'Europe/Paris',
+    'geolocation': {'latitude': 48.8566, 'longitude': 2.3522},  # Paris
+    'permissions': ['geolocation']
+}
+
+# 추가 스텔스 설정
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['fr-FR', 'fr', 'en-US', 'en']
+    });
+
+    window.chrome = {
+        runtime: {}
+    };
+"""
+
+# 캡차 감지용 선택자 (비동기 엔진은 수동 해결을 기다리지 않고 순차 재시도로 넘김)
+CAPTCHA_FRAME_SELECTOR = "iframe[src*='captcha'], iframe[title*='captcha' i], iframe[title*='verify' i]"
 
 class FnacScraper:
     def __init__(self):
@@ -46,6 +101,13 @@ class FnacScraper:
         self.context = None
         self.page = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('fnac', initial_interval=3.5, min_interval=1.0)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
+        self.block_profile = get_block_profile('fnac')  # 이미지/폰트/미디어/광고 요청 차단 (캡차 호스트 제외)
+        self.network_capture = PlaywrightCapture('fnac')  # 가격 API 응답 캡처 (NETWORK_CAPTURE_FNAC=1)
+        # HTTP 우선 수집 (FETCH_ENGINE_FNAC=http): 캡차 통과한 세션 쿠키로 먼저 요청, 차단/불완전하면 브라우저
+        self.http_fetcher = HttpFetcher('fnac') if get_fetch_engine('fnac') == ENGINE_HTTP else None
         self.sftp_client = None
         self.country_code = 'fr'
         # V2: 타임존 분리 (현지시간 + 한국시간)
@@ -218,6 +280,21 @@ class FnacScraper:
             logger.error(f"크롤링 대상 조회 실패: {e}")
             return []
 
+    def _route_request(self, route):
+        """차단 프로필에 해당하는 요청은 중단, 나머지는 그대로 진행"""
+        request = route.request
+        if should_block_request(request.url, request.resource_type, self.block_profile):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _route_request_async(self, route):
+        request = route.request
+        if should_block_request(request.url, request.resource_type, self.block_profile):
+            await route.abort()
+        else:
+            await route.continue_()
+
     def setup_browser(self):
         """Playwright 브라우저 설정"""
         logger.info("🔧 Playwright 브라우저 설정 중...")
@@ -228,47 +305,21 @@ class FnacScraper:
             # Chromium 브라우저 시작 (headless=False로 더 자연스럽게)
             self.browser = self.playwright.chromium.launch(
                 headless=False,  # GUI 모드
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process'
-                ]
+                args=BROWSER_ARGS
             )
 
             # 컨텍스트 생성 (프랑스 사용자 시뮬레이션)
-            self.context = self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='fr-FR',
-                timezone_id='Europe/Paris',
-                geolocation={'latitude': 48.8566, 'longitude': 2.3522},  # Paris
-                permissions=['geolocation']
-            )
+            self.context = self.browser.new_context(**CONTEXT_OPTIONS)
+            if self.block_profile != 'off':
+                self.context.route('**/*', self._route_request)
+                logger.info(f"🚫 리소스 차단 프로필 적용: fnac={self.block_profile}")
 
             # 페이지 생성
             self.page = self.context.new_page()
+            self.network_capture.attach(self.page)
 
             # 추가 스텔스 설정
-            self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['fr-FR', 'fr', 'en-US', 'en']
-                });
-
-                window.chrome = {
-                    runtime: {}
-                };
-            """)
+            self.page.add_init_script(STEALTH_INIT_SCRIPT)
 
             logger.info("✅ Playwright 브라우저 설정 완료")
             return True
@@ -331,6 +382,7 @@ class FnacScraper:
                 return True
 
             # 2. 캡차가 있으면 사용자에게 알리고 대기
+            self.last_blocked = True
             logger.warning("⚠️ 캡차가 감지되었습니다!")
             logger.warning(f"💡 수동으로 캡차를 해결해주세요. 최대 {max_wait_seconds}초 대기합니다...")
 
@@ -401,7 +453,6 @@ class FnacScraper:
                     style_attr = canvas.first.get_attribute('style')
                     if style_attr:
                         # "left: 94px;" 같은 형식에서 숫자 추출
-                        import re
                         left_match = re.search(r'left:\s*(\d+)px', style_attr)
                         if left_match:
                             puzzle_gap_left = int(left_match.group(1))
@@ -639,10 +690,43 @@ class FnacScraper:
             logger.error(f"❌ 세션 초기화 실패: {e}")
             return False
 
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (동기/비동기 엔진 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code=row_data.get('country', 'fr'), ships_from='FR', channel_name='fnac',
+                          sold_by='Fnac', vat=row_data.get('vat', 'o'))
+
+    def parse_price_text(self, price_text):
+        """Fnac 프랑스 가격 형식 파싱: "1 419,99 €" 또는 "419,99€" -> 419.99"""
+        price = parse_price(price_text, 'fr')
+        if price is not None:
+            self.last_price_text = price_text
+        return price
+
+    def sync_http_session(self):
+        """브라우저 컨텍스트 쿠키(캡차 통과 쿠키 포함)를 HTTP 엔진에 전달"""
+        if self.http_fetcher is not None and self.context:
+            try:
+                self.http_fetcher.load_playwright_state(self.context.storage_state(), CONTEXT_OPTIONS['user_agent'])
+            except Exception as e:
+                logger.warning(f"HTTP 엔진 세션 전달 실패: {e}")
+
+    def extract_via_http(self, url, row_data):
+        """HTTP 우선 추출 - 차단되었거나 필수 필드가 비면 None (브라우저로 처리)"""
+        result = self.build_base_result(url, row_data)
+        if self.http_fetcher.extract(url, result, self.XPATHS, self.parse_price_text, result['retailersku']):
+            return result
+        return None
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 (차단 페이지 감지 및 재시도 로직)"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"🔍 페이지 접속: {url} (시도: {retry_count + 1}/{max_retries + 1})")
+            self.network_capture.reset()
             response = self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
 
             # 페이지 로드 대기
@@ -670,68 +754,39 @@ class FnacScraper:
                 else:
                     logger.info("✅ 재접속 성공")
 
-            # 현재 시간
-            now_time = datetime.now(self.korea_tz)
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'fr'),
-                'ships_from': 'FR',
-                'channel_name': 'fnac',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Fnac',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
+
+            # 가격 API 응답 -> 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 순서로 우선 - 선택자는 남은 필드만 시도
+            # (상품 JSON-LD가 있는 페이지는 차단 페이지가 아니므로 제목 확인도 대신함)
+            fill_result(result, self.network_capture.extract_responses(result['retailersku']))
+            fill_result(result, extract_from_html(self.page.content(), self.page.url, result['retailersku']))
 
             # 제목 추출 (차단 페이지 감지)
-            title_extracted = False
-            try:
-                for selector in self.XPATHS.get('title', []):
-                    try:
-                        # XPath인지 CSS인지 판단
-                        if selector.startswith('//'):
-                            locator = self.page.locator(f'xpath={selector}')
-                        else:
-                            locator = self.page.locator(selector)
+            title_extracted = bool(result['title'])
+            if not title_extracted:
+                try:
+                    for selector in self.XPATHS.get('title', []):
+                        try:
+                            # XPath인지 CSS인지 판단
+                            if selector.startswith('//'):
+                                locator = self.page.locator(f'xpath={selector}')
+                            else:
+                                locator = self.page.locator(selector)
 
-                        # 요소가 나타날 때까지 대기 (최대 5초)
-                        locator.wait_for(state='visible', timeout=5000)
-                        title_text = locator.inner_text()
+                            # 요소가 나타날 때까지 대기 (최대 5초)
+                            locator.wait_for(state='visible', timeout=5000)
+                            title_text = locator.inner_text()
 
-                        if title_text and title_text.strip():
-                            result['title'] = title_text.strip()
-                            logger.info(f"제목: {result['title']}")
-                            title_extracted = True
-                            break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+                            if title_text and title_text.strip():
+                                result['title'] = title_text.strip()
+                                logger.info(f"제목: {result['title']}")
+                                title_extracted = True
+                                break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
 
             # 차단 페이지 감지 및 재시도 로직
             if not title_extracted:
@@ -799,134 +854,131 @@ class FnacScraper:
                         raise Exception("Title extraction failed - possible blocked page")
 
             # 가격 추출
-            try:
-                price_found = False
+            if result['retailprice'] is None:
+                try:
+                    price_found = False
 
-                logger.info("🔍 가격 추출 시도...")
+                    logger.info("🔍 가격 추출 시도...")
 
-                for selector in self.XPATHS.get('price', []):
-                    try:
-                        logger.info(f"🔍 선택자 시도: {selector}")
+                    for selector in self.XPATHS.get('price', []):
+                        try:
+                            logger.info(f"🔍 선택자 시도: {selector}")
 
-                        if selector.startswith('//'):
-                            locator = self.page.locator(f'xpath={selector}')
-                        else:
-                            locator = self.page.locator(selector)
+                            if selector.startswith('//'):
+                                locator = self.page.locator(f'xpath={selector}')
+                            else:
+                                locator = self.page.locator(selector)
 
-                        locator.wait_for(state='visible', timeout=5000)
-                        price_text = locator.inner_text()
-                        logger.info(f"🔍 추출한 텍스트: '{price_text}'")
+                            locator.wait_for(state='visible', timeout=5000)
+                            price_text = locator.inner_text()
+                            logger.info(f"🔍 추출한 텍스트: '{price_text}'")
 
-                        if price_text and price_text.strip():
-                            # Fnac 프랑스 가격 형식: "419,99 €" 또는 "419,99€"
-                            # 쉼표를 점으로 변환, € 기호 제거
-                            price_text_clean = price_text.replace(',', '.').replace('€', '').replace('\xa0', '').strip()
-                            price_match = re.search(r'(\d+\.?\d*)', price_text_clean)
-                            if price_match:
-                                price_number = price_match.group(1)
-                                result['retailprice'] = float(price_number)
-                                logger.info(f"✅ 가격 추출 성공: €{result['retailprice']}")
-                                price_found = True
-                                break
+                            if price_text and price_text.strip():
+                                price_number = self.parse_price_text(price_text)
+                                if price_number is not None:
+                                    result['retailprice'] = price_number
+                                    logger.info(f"✅ 가격 추출 성공: €{result['retailprice']}")
+                                    price_found = True
+                                    break
 
-                    except Exception as e:
-                        logger.warning(f"❌ 선택자 {selector} 실패: {e}")
-                        continue
+                        except Exception as e:
+                            logger.warning(f"❌ 선택자 {selector} 실패: {e}")
+                            continue
 
-                # JavaScript로 가격 찾기 (최후 수단)
-                if not price_found:
-                    try:
-                        js_result = self.page.evaluate("""
-                            () => {
-                                var priceSelectors = [
-                                    '.f-faPriceBox__price',
-                                    '[class*="price"]',
-                                    'span[class*="Price"]'
-                                ];
-
-                                for (var i = 0; i < priceSelectors.length; i++) {
-                                    var elements = document.querySelectorAll(priceSelectors[i]);
-                                    for (var j = 0; j < elements.length; j++) {
-                                        var text = elements[j].textContent || elements[j].innerText;
-                                        if (text && /\\d/.test(text) && text.includes('€')) {
-                                            return text.trim();
+                    # JavaScript로 가격 찾기 (최후 수단)
+                    if not price_found:
+                        try:
+                            js_result = self.page.evaluate("""
+                                () => {
+                                    var priceSelectors = [
+                                        '.f-faPriceBox__price',
+                                        '[class*="price"]',
+                                        'span[class*="Price"]'
+                                    ];
+
+                                    for (var i = 0; i < priceSelectors.length; i++) {
+                                        var elements = document.querySelectorAll(priceSelectors[i]);
+                                        for (var j = 0; j < elements.length; j++) {
+                                            var text = elements[j].textContent || elements[j].innerText;
+                                            if (text && /\\d/.test(text) && text.includes('€')) {
+                                                return text.trim();
+                                            }
                                         }
                                     }
+                                    return null;
                                 }
-                                return null;
-                            }
-                        """)
-
-                        if js_result:
-                            logger.info(f"🔍 JavaScript에서 추출한 텍스트: '{js_result}'")
-                            price_text_clean = js_result.replace(',', '.').replace('€', '').replace('\xa0', '').strip()
-                            price_match = re.search(r'(\d+\.?\d*)', price_text_clean)
-                            if price_match:
-                                price_number = price_match.group(1)
-                                result['retailprice'] = float(price_number)
-                                logger.info(f"✅ 가격 추출 성공 (JS): €{result['retailprice']}")
-                                price_found = True
-                    except Exception as e:
-                        logger.debug(f"JavaScript 가격 추출 실패: {e}")
+                            """)
+
+                            if js_result:
+                                logger.info(f"🔍 JavaScript에서 추출한 텍스트: '{js_result}'")
+                                price_number = self.parse_price_text(js_result)
+                                if price_number is not None:
+                                    result['retailprice'] = price_number
+                                    logger.info(f"✅ 가격 추출 성공 (JS): €{result['retailprice']}")
+                                    price_found = True
+                        except Exception as e:
+                            logger.debug(f"JavaScript 가격 추출 실패: {e}")
 
-                if not price_found:
-                    logger.warning("모든 가격 추출 방법 실패")
+                    if not price_found:
+                        logger.warning("모든 가격 추출 방법 실패")
 
-            except Exception as e:
-                logger.warning(f"가격 추출 실패: {e}")
+                except Exception as e:
+                    logger.warning(f"가격 추출 실패: {e}")
 
             # 이미지 URL 추출
-            try:
-                image_found = False
+            if result['imageurl'] is None:
+                try:
+                    image_found = False
 
-                # 1. 선택자들 시도
-                for selector in self.XPATHS.get('imageurl', []):
-                    try:
-                        if selector.startswith('//'):
-                            locator = self.page.locator(f'xpath={selector}')
-                        else:
-                            locator = self.page.locator(selector)
+                    # 1. 선택자들 시도
+                    for selector in self.XPATHS.get('imageurl', []):
+                        try:
+                            if selector.startswith('//'):
+                                locator = self.page.locator(f'xpath={selector}')
+                            else:
+                                locator = self.page.locator(selector)
 
-                        locator.wait_for(state='visible', timeout=5000)
-                        src = locator.get_attribute('src')
+                            locator.wait_for(state='visible', timeout=5000)
+                            src = locator.get_attribute('src')
 
-                        if src and 'fnac-static.com' in src:
-                            result['imageurl'] = src
-                            logger.info(f"이미지 URL: {result['imageurl']}")
-                            image_found = True
-                            break
-                    except:
-                        continue
+                            if src and 'fnac-static.com' in src:
+                                result['imageurl'] = src
+                                logger.info(f"이미지 URL: {result['imageurl']}")
+                                image_found = True
+                                break
+                        except:
+                            continue
 
-                # 2. JavaScript로 이미지 찾기
-                if not image_found:
-                    try:
-                        js_result = self.page.evaluate("""
-                            () => {
-                                var imgs = document.querySelectorAll('img');
-                                for (var i = 0; i < imgs.length; i++) {
-                                    var src = imgs[i].src || imgs[i].getAttribute('data-src');
-                                    if (src && src.includes('fnac-static.com')) {
-                                        return src;
+                    # 2. JavaScript로 이미지 찾기
+                    if not image_found:
+                        try:
+                            js_result = self.page.evaluate("""
+                                () => {
+                                    var imgs = document.querySelectorAll('img');
+                                    for (var i = 0; i < imgs.length; i++) {
+                                        var src = imgs[i].src || imgs[i].getAttribute('data-src');
+                                        if (src && src.includes('fnac-static.com')) {
+                                            return src;
+                                        }
                                     }
+                                    return null;
                                 }
-                                return null;
-                            }
-                        """)
-
-                        if js_result:
-                            result['imageurl'] = js_result
-                            logger.info(f"이미지 URL (JS): {result['imageurl']}")
-                            image_found = True
-                    except:
-                        pass
+                            """)
 
-                if not image_found:
-                    logger.warning("이미지 URL 추출 실패")
+                            if js_result:
+                                result['imageurl'] = js_result
+                                logger.info(f"이미지 URL (JS): {result['imageurl']}")
+                                image_found = True
+                        except:
+                            pass
 
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
+                    if not image_found:
+                        logger.warning("이미지 URL 추출 실패")
 
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
+
+            attach_raw_price(result, self.last_price_text)
             return result
 
         except Exception as e:
@@ -943,40 +995,7 @@ class FnacScraper:
 
             # 최대 재시도 횟수 초과 시 기본값 반환
             logger.error(f"❌ 최대 재시도 횟수 초과: {url}")
-            now_time = datetime.now(self.korea_tz)
-            local_time = datetime.now(self.local_tz)
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'fr'),
-                'ships_from': 'FR',
-                'channel_name': 'fnac',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'Fnac',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
 
     def save_to_db(self, df):
         """DB에 결과 저장"""
@@ -986,7 +1005,7 @@ class FnacScraper:
 
         try:
             # fnac_price_crawl_tbl_fr 테이블에 저장
-            df.to_sql('fnac_price_crawl_tbl_fr', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'fnac_price_crawl_tbl_fr', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
 
             # 크롤링 로그를 pandas DataFrame으로 만들어서 한번에 저장
@@ -995,7 +1014,7 @@ class FnacScraper:
                 log_records.append({
                     'country_code': 'fr',
                     'url': row['producturl'],
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -1003,7 +1022,7 @@ class FnacScraper:
 
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
 
             return True
@@ -1067,6 +1086,9 @@ class FnacScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_fr_fnac"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1191,8 +1213,9 @@ class FnacScraper:
 
         logger.info(f"📊 총 {len(urls_data)}개 제품 처리 시작")
 
-        results = []
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
+        self.sync_http_session()
 
         try:
             for idx, row in enumerate(urls_data):
@@ -1200,7 +1223,20 @@ class FnacScraper:
                 logger.info(f"진행률: {idx + 1}/{len(urls_data)} ({(idx + 1)/len(urls_data)*100:.1f}%)")
 
                 url = row.get('url')
-                result = self.extract_product_info(url, row)
+
+                # HTTP 우선 수집 - 차단/불완전하면 브라우저로 처리
+                result = None
+                if self.http_fetcher is not None:
+                    self.rate_limiter.wait(url)
+                    result = self.extract_via_http(url, row)
+                    self.rate_limiter.record(url, blocked=self.http_fetcher.last_blocked)
+
+                if result is None:
+                    self.rate_limiter.wait(url)
+                    result = self.extract_product_info(url, row)
+                    self.rate_limiter.record(url, blocked=self.last_blocked)
+                    # 브라우저에서 갱신된 쿠키(캡차 재통과 등)를 다음 HTTP 요청에 반영
+                    self.sync_http_session()
 
                 if result['retailprice'] is None:
                     failed_urls.append({
@@ -1213,24 +1249,9 @@ class FnacScraper:
 
                 # 10개마다 DB에 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('fnac_price_crawl_tbl_fr', self.db_engine,
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(2, 5)
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-
-                    if (idx + 1) % 10 == 0:
-                        logger.info("☕ 10개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'fnac_price_crawl_tbl_fr', self.db_engine, self.country_code)
 
         except Exception as e:
             logger.error(f"❌ 스크래핑 중 오류: {e}")
@@ -1243,6 +1264,9 @@ class FnacScraper:
                 if len(failed_urls) > 5:
                     logger.warning(f"  ... 외 {len(failed_urls) - 5}개")
 
+            if self.http_fetcher is not None:
+                self.http_fetcher.log_summary()
+
             if self.browser:
                 self.browser.close()
                 logger.info("🔧 브라우저 종료")
@@ -1251,7 +1275,202 @@ class FnacScraper:
                 self.playwright.stop()
                 logger.info("🔧 Playwright 종료")
 
-        return pd.DataFrame(results)
+        return results.to_frame()
+
+    def _locate_async(self, page, selector):
+        """XPath/CSS 선택자를 비동기 페이지 locator로 변환"""
+        if selector.startswith('//'):
+            return page.locator(f'xpath={selector}').first
+        return page.locator(selector).first
+
+    async def _extract_title_async(self, page):
+        for selector in self.XPATHS.get('title', []):
+            try:
+                locator = self._locate_async(page, selector)
+                await locator.wait_for(state='visible', timeout=5000)
+                title_text = await locator.inner_text()
+                if title_text and title_text.strip():
+                    return title_text.strip()
+            except Exception:
+                continue
+        return None
+
+    async def extract_product_info_async(self, context, url, row_data, throttle):
+        """
+        비동기 엔진용 제품 정보 추출 - extract_product_info()와 같은 결과 행 생성
+
+        Returns:
+            (result, blocked): blocked=True면 캡차/차단으로 판단되어 순차 재시도 대상
+        """
+        result = self.build_base_result(url, row_data)
+        await throttle.wait_async(url)
+
+        page = await context.new_page()
+        capture = PlaywrightCapture('fnac')
+        capture.attach(page)
+        try:
+            logger.info(f"🔍 [async] 페이지 접속: {url}")
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+
+            # 404 위장 차단 대응: 한 번만 재접속
+            if response and response.status == 404:
+                logger.warning(f"⚠️ [async] 404 감지 - 재접속: {url}")
+                await asyncio.sleep(random.uniform(3, 5))
+                response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                if response and response.status == 404:
+                    return result, True
+
+            # 캡차는 여러 페이지에서 동시에 수동 해결할 수 없으므로 순차 재시도로 넘김
+            if await page.locator(CAPTCHA_FRAME_SELECTOR).count() > 0:
+                logger.warning(f"🧩 [async] 캡차 감지 - 순차 재시도 대상: {url}")
+                return result, True
+
+            # 가격 API 응답 -> 구조화 데이터 순서로 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, await capture.extract_responses_async(result['retailersku']))
+            fill_result(result, extract_from_html(await page.content(), page.url, result['retailersku']))
+
+            if not result['title']:
+                result['title'] = await self._extract_title_async(page)
+            if not result['title']:
+                logger.warning(f"⚠️ [async] 제목 추출 실패 - 새로고침: {url}")
+                await page.reload(wait_until='domcontentloaded', timeout=30000)
+                result['title'] = await self._extract_title_async(page)
+                if not result['title']:
+                    return result, True
+            logger.info(f"제목: {result['title']}")
+
+            # 가격 추출
+            if result['retailprice'] is None:
+                for selector in self.XPATHS.get('price', []):
+                    try:
+                        locator = self._locate_async(page, selector)
+                        await locator.wait_for(state='visible', timeout=5000)
+                        price_text = await locator.inner_text()
+                        if price_text and price_text.strip():
+                            price_number = self.parse_price_text(price_text)
+                            if price_number is not None:
+                                result['retailprice'] = price_number
+                                attach_raw_price(result, price_text)
+                                logger.info(f"✅ [async] 가격 추출 성공: €{result['retailprice']}")
+                                break
+                    except Exception:
+                        continue
+
+            # 이미지 URL 추출
+            if result['imageurl'] is None:
+                for selector in self.XPATHS.get('imageurl', []):
+                    try:
+                        locator = self._locate_async(page, selector)
+                        await locator.wait_for(state='visible', timeout=5000)
+                        src = await locator.get_attribute('src')
+                        if src and 'fnac-static.com' in src:
+                            result['imageurl'] = src
+                            break
+                    except Exception:
+                        continue
+
+            return result, False
+
+        except Exception as e:
+            logger.error(f"❌ [async] 페이지 처리 오류 ({url}): {e}")
+            return result, True
+
+        finally:
+            await page.close()
+
+    async def _scrape_urls_async(self, urls_data, concurrency, storage_state, on_result):
+        """캡차를 통과한 쿠키를 공유하는 컨텍스트 하나에서 여러 페이지를 동시에 처리"""
+        semaphore = asyncio.Semaphore(concurrency)
+        blocked = []
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=False, args=BROWSER_ARGS)
+            context = await browser.new_context(storage_state=storage_state, **CONTEXT_OPTIONS)
+            await context.add_init_script(STEALTH_INIT_SCRIPT)
+            if self.block_profile != 'off':
+                await context.route('**/*', self._route_request_async)
+
+            async def run_one(order, row):
+                async with semaphore:
+                    result, is_blocked = await self.extract_product_info_async(
+                        context, row.get('url'), row, self.rate_limiter
+                    )
+                self.rate_limiter.record(row.get('url'), blocked=is_blocked)
+                if is_blocked:
+                    blocked.append((order, row))
+                else:
+                    on_result(order, result)
+
+            try:
+                await asyncio.gather(*(run_one(order, row) for order, row in enumerate(urls_data)))
+            finally:
+                await context.close()
+                await browser.close()
+
+        return blocked
+
+    def scrape_urls_async(self, urls_data, max_items=None, concurrency=4):
+        """
+        비동기 다중 페이지 모드 스크래핑
+
+        test_connection()으로 캡차를 통과한 동기 세션의 쿠키(storage_state)를 넘겨받아
+        최대 concurrency개 페이지를 동시에 처리한다. 캡차/차단으로 실패한 URL은
+        마지막에 기존 동기 엔진으로 순차 재시도(수동 캡차 해결 포함)한다.
+        """
+        if max_items:
+            urls_data = urls_data[:max_items]
+
+        logger.info(f"📊 [async] 총 {len(urls_data)}개 제품 처리 시작 (동시 페이지 {concurrency}개)")
+
+        storage_state = self.context.storage_state() if self.context else None
+        if self.browser:
+            self.browser.close()
+        if self.playwright:
+            self.playwright.stop()
+        self.playwright = self.browser = self.context = self.page = None
+
+        # 완료 순서로 쌓고 최종 결과는 원래 대상 순서(order)로 정렬
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
+        unsaved = 0
+
+        def on_result(order, result):
+            nonlocal unsaved
+            results.append(result, order=order)
+            unsaved += 1
+
+            # 10개마다 DB에 중간 저장
+            if unsaved >= 10 and self.db_engine:
+                interim_df = results.take_unflushed()
+                unsaved = 0
+                submit_results(interim_df, 'fnac_price_crawl_tbl_fr', self.db_engine, self.country_code)
+
+        blocked = asyncio.run(self._scrape_urls_async(urls_data, concurrency, storage_state, on_result))
+
+        if blocked:
+            logger.warning(f"⚠️ [async] 차단/캡차 {len(blocked)}개 - 동기 엔진으로 순차 재시도")
+            if self.setup_browser():
+                try:
+                    self.initialize_session()
+                    for order, row in sorted(blocked, key=lambda item: item[0]):
+                        self.rate_limiter.wait(row.get('url'))
+                        result = self.extract_product_info(row.get('url'), row)
+                        self.rate_limiter.record(row.get('url'), blocked=self.last_blocked)
+                        results.append(result, order=order)
+                finally:
+                    if self.browser:
+                        self.browser.close()
+                    if self.playwright:
+                        self.playwright.stop()
+            else:
+                for order, row in blocked:
+                    results.append(self.build_base_result(row.get('url'), row), order=order)
+
+        df = results.to_frame()
+        failed = int(df['retailprice'].isna().sum())
+        if failed:
+            logger.warning(f"\n⚠️ 가격 추출 실패한 URL {failed}개")
+
+        return df
 
     def analyze_results(self, df):
         """결과 분석"""
@@ -1333,7 +1552,11 @@ def main():
     logger.info(f"✅ 크롤링 대상: {len(urls_data)}개")
 
     start_time = datetime.now(scraper.korea_tz)
-    results_df = scraper.scrape_urls(urls_data)
+    async_pages = int(os.getenv('FNAC_ASYNC_PAGES', '0'))
+    if async_pages > 1:
+        results_df = scraper.scrape_urls_async(urls_data, concurrency=async_pages)
+    else:
+        results_df = scraper.scrape_urls(urls_data)
 
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
@@ -1376,6 +1599,9 @@ if __name__ == "__main__":
     print("📦 필요한 패키지:")
     print("pip install playwright pandas pymysql sqlalchemy paramiko")
     print("playwright install chromium")
+    print("export FNAC_ASYNC_PAGES=4  # 동시 처리 페이지 수 (선택사항, 1 이하면 기존 순차 모드)")
+    print("export NETWORK_CAPTURE_FNAC=1  # 가격 API 응답에서 가격/재고 직접 추출 (선택사항)")
+    print("export FETCH_ENGINE_FNAC=http  # HTTP 우선 수집, 차단/불완전한 URL만 브라우저 (순차 모드)")
     print()
 
     main()
@@ -0,0 +1,270 @@
+"""
+렌더링된 HTML 스냅샷 기반 오프라인 추출
+- 페이지 준비 후 driver.page_source를 한 번만 가져와 lxml로 파싱
+- 설정된 XPath/CSS 선택자(setup_default_selectors, amazon_selectors/mall_selectors)는
+  컴파일해서 캐시한 뒤 Python에서 평가 (WebDriver 왕복 없음)
+- 차단/재고 패턴 검사용 소문자 소스도 스냅샷에서 한 번만 계산
+- 보임 여부(is_displayed) 판단이 필요한 필드는 호출측에서 live DOM으로 조회
+- PageSnapshot: 페이지 이동 1회 동안 title / current_url / page_source를 필요할 때 최대 1번씩만 조회
+  (차단/재고/VAT 검사가 같은 값을 공유, 이동/새로고침 후에는 invalidate)
+- 차단/재고 패턴은 scan()으로 검사: 소스를 아직 안 가져왔으면 브라우저 안에서 검사 (page_scan)
+  어느 쪽이든 text 패턴은 보이는 텍스트(innerText / visible_text)에서만 찾음
+"""
+
+import logging
+import os
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from cssselect import GenericTranslator, SelectorError
+from lxml import etree, html as lxml_html
+
+from page_scan import normalize_patterns, scan_page, scan_text, visible_text
+
+logger = logging.getLogger(__name__)
+
+ENGINE_LIVE = 'live'
+ENGINE_SNAPSHOT = 'snapshot'
+
+# URL로 해석해야 하는 속성 (Selenium get_attribute()는 절대 URL을 반환)
+_URL_ATTRIBUTES = {'src', 'href', 'data-old-hires'}
+
+_translator = GenericTranslator()
+
+
+def get_extract_engine(default=ENGINE_LIVE):
+    """EXTRACT_ENGINE 환경변수 조회 (live: 기존 WebDriver 조회, snapshot: HTML 스냅샷 오프라인 추출)"""
+    engine = (os.getenv('EXTRACT_ENGINE', default) or default).strip().lower()
+    if engine not in (ENGINE_LIVE, ENGINE_SNAPSHOT):
+        logger.warning(f"EXTRACT_ENGINE 값이 잘못됨: {engine} -> {default} 사용")
+        return default
+    return engine
+
+
+def is_xpath(selector):
+    return selector.startswith('/') or selector.startswith('(')
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector):
+    """XPath/CSS 선택자를 lxml XPath 객체로 컴파일 (프로세스 내 캐시)"""
+    expression = selector if is_xpath(selector) else _translator.css_to_xpath(selector)
+    return etree.XPath(expression)
+
+
+def normalize_text(text):
+    """Selenium .text와 비슷하게 공백 정리"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class HtmlSnapshot:
+    """
+    페이지 1회 스냅샷
+
+    Args:
+        page_source: driver.page_source
+        url: driver.current_url (상대 URL 해석 및 도메인 확인용)
+    """
+
+    def __init__(self, page_source, url=''):
+        self.html = page_source or ''
+        self.url = url or ''
+        self._lower = None
+        self._visible_lower = None
+        try:
+            self.tree = lxml_html.fromstring(self.html) if self.html.strip() else None
+        except (etree.ParserError, ValueError) as e:
+            logger.warning(f"HTML 스냅샷 파싱 실패: {e}")
+            self.tree = None
+
+    @property
+    def lower(self):
+        """소문자 소스 (패턴 검사용, 최초 1회만 계산)"""
+        if self._lower is None:
+            self._lower = self.html.lower()
+        return self._lower
+
+    @property
+    def visible_lower(self):
+        """소문자 보이는 텍스트 (브라우저 innerText 기준 패턴 검사용, 최초 1회만 계산)"""
+        if self._visible_lower is None:
+            self._visible_lower = visible_text(self.tree).lower()
+        return self._visible_lower
+
+    @property
+    def title(self):
+        if self.tree is None:
+            return ''
+        return normalize_text(self.tree.findtext('.//title'))
+
+    def find_all(self, selector):
+        """선택자에 매치되는 요소 목록 (선택자 오류 시 빈 목록)"""
+        if self.tree is None:
+            return []
+        try:
+            nodes = compile_selector(selector)(self.tree)
+        except (etree.XPathError, SelectorError) as e:
+            logger.debug(f"선택자 컴파일/평가 오류: {selector} - {e}")
+            return []
+        if not isinstance(nodes, list):
+            return []
+        return [node for node in nodes if isinstance(node, etree._Element)]
+
+    def text(self, selector):
+        """첫 번째 요소의 텍스트 (요소가 없으면 None)"""
+        nodes = self.find_all(selector)
+        if not nodes:
+            return None
+        return normalize_text(nodes[0].text_content())
+
+    def attr(self, selector, name):
+        """첫 번째 요소의 속성값 (src/href는 절대 URL로 변환, 요소가 없으면 None)"""
+        nodes = self.find_all(selector)
+        if not nodes:
+            return None
+        value = nodes[0].get(name)
+        if value and name in _URL_ATTRIBUTES and self.url:
+            value = urljoin(self.url, value)
+        return value
+
+    def first_text_match(self, selectors):
+        """선택자 우선순위대로 첫 번째 비어있지 않은 (텍스트, 선택자) - 없으면 (None, None)"""
+        for selector in selectors:
+            text = self.text(selector)
+            if text:
+                return text, selector
+        return None, None
+
+    def first_attr_match(self, selectors, name):
+        """선택자 우선순위대로 첫 번째 비어있지 않은 (속성값, 선택자) - 없으면 (None, None)"""
+        for selector in selectors:
+            value = self.attr(selector, name)
+            if value:
+                return value, selector
+        return None, None
+
+    def first_text(self, selectors):
+        """선택자 우선순위대로 첫 번째 비어있지 않은 텍스트"""
+        return self.first_text_match(selectors)[0]
+
+    def first_attr(self, selectors, name):
+        """선택자 우선순위대로 첫 번째 비어있지 않은 속성값"""
+        return self.first_attr_match(selectors, name)[0]
+
+    def contains(self, pattern):
+        """소문자 소스에 문자열 포함 여부 (대소문자 무시)"""
+        return pattern.lower() in self.lower
+
+    def scan(self, patterns):
+        """제목 + 보이는 텍스트(html 패턴은 소스)에서 일치한 패턴 ID 집합 (page_scan 패턴 형식)"""
+        return scan_text(self.title, self.visible_lower, patterns, self.lower)
+
+    def classify(self, matcher, *categories):
+        """pattern_registry.PatternMatcher로 제목 + 보이는 텍스트 분류 -> {카테고리: [패턴]}"""
+        return matcher.classify(self.title + '\n' + self.visible_lower, *categories, markup=self.lower)
+
+
+def take_snapshot(driver):
+    """현재 페이지 스냅샷 (page_source/current_url 각 1회 조회)"""
+    return HtmlSnapshot(driver.page_source, driver.current_url)
+
+
+class PageSnapshot:
+    """
+    페이지 이동 1회분 조회 캐시
+
+    title / current_url / page_source는 처음 읽을 때 한 번만 WebDriver로 가져오고,
+    소문자 소스와 lxml 파싱 결과(parsed)도 한 번만 계산한다.
+    HtmlSnapshot과 같은 title / url / lower / contains를 제공하므로 차단 확인 함수에 그대로 넘길 수 있다.
+    페이지 이동, 새로고침, 버튼 클릭 뒤에는 invalidate() (refresh()는 자동 처리).
+
+    Args:
+        driver: Selenium WebDriver
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.invalidate()
+
+    def invalidate(self):
+        """캐시 비우기 (다음 접근 시 다시 조회)"""
+        self._title = None
+        self._url = None
+        self._html = None
+        self._lower = None
+        self._parsed = None
+        self._scanned = {}  # 패턴 ID -> 일치 여부 (브라우저 내 검사 결과)
+
+    @property
+    def title(self):
+        if self._title is None:
+            self._title = self.driver.title or ''
+        return self._title
+
+    @property
+    def url(self):
+        if self._url is None:
+            self._url = self.driver.current_url or ''
+        return self._url
+
+    @property
+    def html(self):
+        if self._html is None:
+            self._html = self.driver.page_source or ''
+        return self._html
+
+    @property
+    def lower(self):
+        """소문자 소스 (최초 1회만 계산)"""
+        if self._lower is None:
+            self._lower = self.html.lower()
+        return self._lower
+
+    @property
+    def parsed(self):
+        """같은 소스의 HtmlSnapshot (오프라인 선택자 평가용, 최초 1회만 파싱)"""
+        if self._parsed is None:
+            self._parsed = HtmlSnapshot(self.html, self.url)
+            self._parsed._lower = self._lower
+        return self._parsed
+
+    def contains(self, pattern):
+        """소문자 소스에 문자열 포함 여부 (대소문자 무시)"""
+        return pattern.lower() in self.lower
+
+    def contains_any(self, patterns):
+        """패턴 중 하나라도 포함되면 그 패턴 (없으면 None)"""
+        return next((pattern for pattern in patterns if self.contains(pattern)), None)
+
+    def scan(self, patterns):
+        """
+        일치한 패턴 ID 집합 (page_scan 패턴 형식)
+
+        소스를 이미 가져왔으면 캐시(보이는 텍스트 기준)에서 검사하고, 아니면 브라우저 안에서 검사해 ID만 받아옴.
+        같은 페이지에서 이미 검사한 패턴은 다시 검사하지 않음
+        """
+        if self._html is not None:
+            return self.parsed.scan(patterns)
+        specs = normalize_patterns(patterns)
+        pending = [spec for spec in specs if spec['id'] not in self._scanned]
+        if pending:
+            matched = scan_page(self.driver, pending)
+            for spec in pending:
+                self._scanned[spec['id']] = spec['id'] in matched
+        return {spec['id'] for spec in specs if self._scanned[spec['id']]}
+
+    def classify(self, matcher, *categories):
+        """
+        pattern_registry.PatternMatcher 분류 -> {카테고리: [패턴]}
+
+        소스가 캐시돼 있으면 보이는 텍스트를 matcher의 정규식으로 한 번 훑고, 아니면 해당 카테고리 패턴만 브라우저 안에서 검사
+        """
+        if self._html is not None:
+            return self.parsed.classify(matcher, *categories)
+        return matcher.categorize(self.scan(matcher.patterns(*categories)), categories)
+
+    def refresh(self):
+        """새로고침 후 캐시 비우기"""
+        self.driver.refresh()
+        self.invalidate()
@@ -0,0 +1,261 @@
+"""
+HTTP 우선 수집 엔진 (브라우저 폴백)
+- 서버 HTML에 이미 가격이 들어있는 상품은 Chrome을 띄울 필요 없이 keep-alive HTTP 연결 풀로 가져옴
+- 브라우저 세션(BestBuy initialize_session 후, Fnac 캡차 통과 후)의 쿠키와 User-Agent를 넘겨받아 같은 세션으로 요청
+- 응답 HTML은 html_snapshot으로 파싱해 구조화 데이터(structured_data) -> DB 선택자 순으로 기존과 같은 필드 추출
+- 차단 응답(4xx/5xx, 캡차/차단 페이지)이거나 필수 필드(기본: 제목+가격)가 비면 None -> 호출측이 브라우저로 처리
+- 리테일러별 사용 여부: FETCH_ENGINE_{RETAILER}=http (기본 browser)
+- 요청 대상 URL을 가리지 않으므로 로컬 스텁 HTTP 서버(http://127.0.0.1:포트/...)로도 그대로 동작 확인 가능
+"""
+
+import logging
+import os
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlparse
+
+import urllib3
+
+from html_snapshot import HtmlSnapshot
+from pattern_registry import get_matcher, WALL_TITLE
+from structured_data import extract_structured, fill_result
+
+logger = logging.getLogger(__name__)
+
+ENGINE_BROWSER = 'browser'
+ENGINE_HTTP = 'http'
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# 차단 페이지 판정 - 제목 (pattern_registry WALL_TITLE, 브라우저 크롤러와 같은 기준)
+TITLE_PATTERNS = get_matcher('en', retailer='http_fetch')
+
+# 차단 페이지 판정 - 본문 (봇 차단 서비스 스크립트/챌린지 흔적)
+BLOCKED_BODY_MARKERS = ['captcha-delivery.com', 'px-captcha', '/cdn-cgi/challenge-platform', 'cf-chl-', 'validatecaptcha']
+
+
+def get_fetch_engine(retailer, default=ENGINE_BROWSER):
+    """FETCH_ENGINE_{RETAILER} 환경변수 (browser: 기존 브라우저만, http: HTTP 우선 + 브라우저 폴백)"""
+    name = f'FETCH_ENGINE_{retailer.upper()}'
+    engine = (os.getenv(name, default) or default).strip().lower()
+    if engine not in (ENGINE_BROWSER, ENGINE_HTTP):
+        logger.warning(f"{name} 값이 잘못됨: {engine} -> {default} 사용")
+        return default
+    return engine
+
+
+def _cookie_matches(cookie_domain, host):
+    domain = (cookie_domain or '').lstrip('.').lower()
+    return not domain or host == domain or host.endswith('.' + domain)
+
+
+class FetchResult:
+    """HTTP 응답 1건 (차단 여부 판정 포함)"""
+
+    def __init__(self, url, status, html, elapsed, reason=None):
+        self.url = url
+        self.status = status
+        self.html = html
+        self.elapsed = elapsed
+        self.reason = reason  # 차단/실패 사유 (정상이면 None)
+        self._snapshot = None
+
+    @property
+    def ok(self):
+        return self.reason is None
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = HtmlSnapshot(self.html, self.url)
+        return self._snapshot
+
+
+class HttpFetcher:
+    """
+    리테일러 1곳용 keep-alive HTTP 클라이언트
+
+    Args:
+        retailer: 리테일러 키 (로그/환경변수용)
+        required: 이 필드가 모두 채워져야 HTTP 결과를 사용 (아니면 브라우저 폴백)
+        timeout: 요청 한도(초) - HTTP_TIMEOUT 환경변수
+        pool_size: 호스트별 연결 수 - HTTP_POOL_SIZE 환경변수
+    """
+
+    def __init__(self, retailer, required=('title', 'retailprice'), timeout=None, pool_size=None):
+        self.retailer = retailer
+        self.required = tuple(required)
+        self.timeout = timeout or float(os.getenv('HTTP_TIMEOUT', '15'))
+        pool_size = pool_size or int(os.getenv('HTTP_POOL_SIZE', '4'))
+        self.pool = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=pool_size,
+            retries=urllib3.Retry(total=2, connect=2, read=0, redirect=5, status=0, raise_on_redirect=False),
+            timeout=urllib3.Timeout(total=self.timeout)
+        )
+        self.user_agent = DEFAULT_USER_AGENT
+        self.extra_headers = {}
+        self.cookies = {}  # (domain, name) -> {'name', 'value', 'domain', 'path'}
+        self.stats = {'http': 0, 'fallback': 0}
+        self.last_blocked = False  # 마지막 extract()가 차단 응답이었는지 (rate_limiter 기록용)
+
+    # ---- 브라우저 세션 가져오기 ----
+
+    def load_cookies(self, cookies, user_agent=None):
+        """쿠키 목록 [{'name', 'value', 'domain', 'path'}] 적용 (Selenium get_cookies / Playwright cookies 형식)"""
+        for cookie in cookies or []:
+            if not cookie.get('name'):
+                continue
+            domain = (cookie.get('domain') or '').lower()
+            self.cookies[(domain, cookie['name'])] = {
+                'name': cookie['name'],
+                'value': cookie.get('value', ''),
+                'domain': domain,
+                'path': cookie.get('path') or '/'
+            }
+        if user_agent:
+            self.user_agent = user_agent
+        logger.info(f"🍪 [{self.retailer}] 브라우저 세션 적용: 쿠키 {len(self.cookies)}개")
+
+    def load_selenium_session(self, driver):
+        """Selenium 드라이버의 쿠키/User-Agent 가져오기"""
+        try:
+            user_agent = driver.execute_script('return navigator.userAgent')
+            self.load_cookies(driver.get_cookies(), user_agent)
+            return True
+        except Exception as e:
+            logger.warning(f"[{self.retailer}] 브라우저 세션 가져오기 실패: {e}")
+            return False
+
+    def load_playwright_state(self, storage_state, user_agent=None):
+        """Playwright context.storage_state() 쿠키 가져오기"""
+        self.load_cookies((storage_state or {}).get('cookies', []), user_agent)
+
+    # ---- 요청 ----
+
+    def _cookie_header(self, url):
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        path = parsed.path or '/'
+        pairs = [
+            f"{cookie['name']}={cookie['value']}"
+            for cookie in self.cookies.values()
+            if _cookie_matches(cookie['domain'], host) and path.startswith(cookie['path'])
+        ]
+        return '; '.join(pairs)
+
+    def _store_set_cookies(self, url, response):
+        host = (urlparse(url).hostname or '').lower()
+        for header in response.headers.getlist('Set-Cookie'):
+            parsed = SimpleCookie()
+            try:
+                parsed.load(header)
+            except Exception:
+                continue
+            for name, morsel in parsed.items():
+                domain = (morsel['domain'] or host).lower()
+                self.cookies[(domain, name)] = {'name': name, 'value': morsel.value, 'domain': domain,
+                                                'path': morsel['path'] or '/'}
+
+    def blocked_reason(self, status, snapshot):
+        """차단/실패 사유 (정상이면 None)"""
+        if status >= 400:
+            return f"HTTP {status}"
+        pattern = TITLE_PATTERNS.matches(snapshot.title, WALL_TITLE)
+        if pattern:
+            return f"차단 페이지 제목: {pattern}"
+        for marker in BLOCKED_BODY_MARKERS:
+            if snapshot.contains(marker):
+                return f"차단 페이지 표시: {marker}"
+        return None
+
+    def fetch(self, url):
+        """URL 1건 요청 (네트워크 오류도 FetchResult의 reason으로 반환)"""
+        headers = {**DEFAULT_HEADERS, **self.extra_headers, 'User-Agent': self.user_agent}
+        cookie_header = self._cookie_header(url)
+        if cookie_header:
+            headers['Cookie'] = cookie_header
+
+        started = time.perf_counter()
+        try:
+            response = self.pool.request('GET', url, headers=headers, redirect=True)
+        except urllib3.exceptions.HTTPError as e:
+            return FetchResult(url, 0, '', time.perf_counter() - started, reason=f"요청 실패: {e}")
+
+        elapsed = time.perf_counter() - started
+        final_url = getattr(response, 'url', None) or url
+        self._store_set_cookies(final_url, response)
+        charset = 'utf-8'
+        content_type = response.headers.get('Content-Type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip() or charset
+        try:
+            html = response.data.decode(charset, errors='replace')
+        except LookupError:
+            html = response.data.decode('utf-8', errors='replace')
+
+        result = FetchResult(final_url, response.status, html, elapsed)
+        result.reason = self.blocked_reason(response.status, result.snapshot)
+        return result
+
+    # ---- 추출 ----
+
+    def extract(self, url, result, selectors, parse_price, sku=None):
+        """
+        HTTP 응답으로 결과 행 채우기 (구조화 데이터 -> DB 선택자 순)
+
+        Args:
+            url: 상품 URL
+            result: 크롤러의 기본 결과 dict (build_base_result)
+            selectors: 크롤러 XPATHS ({'price': [...], 'title': [...], 'imageurl': [...]})
+            parse_price: 가격 텍스트 -> float/None (크롤러의 가격 파서)
+            sku: retailersku
+
+        Returns:
+            bool: 필수 필드가 모두 채워졌으면 True / 차단·불완전이면 False (브라우저 폴백 대상)
+        """
+        page = self.fetch(url)
+        self.last_blocked = not page.ok
+        if not page.ok:
+            logger.info(f"🌐 [{self.retailer}] HTTP 결과 사용 불가 ({page.reason}) - 브라우저로 처리")
+            self.stats['fallback'] += 1
+            return False
+
+        snapshot = page.snapshot
+        fill_result(result, extract_structured(snapshot, sku))
+
+        if result.get('retailprice') is None:
+            for selector in selectors.get('price', []):
+                text = snapshot.text(selector)
+                price = parse_price(text) if text else None
+                if price is not None:
+                    result['retailprice'] = price
+                    result['retailprice_raw'] = text
+                    break
+        if not result.get('title'):
+            result['title'] = snapshot.first_text(selectors.get('title', []))
+        if not result.get('imageurl'):
+            result['imageurl'] = snapshot.first_attr(selectors.get('imageurl', []), 'src')
+
+        missing = [field for field in self.required if result.get(field) in (None, '')]
+        if missing:
+            logger.info(f"🌐 [{self.retailer}] HTTP 응답에 필드 없음 ({', '.join(missing)}) - 브라우저로 처리")
+            self.stats['fallback'] += 1
+            return False
+
+        self.stats['http'] += 1
+        logger.info(f"🌐 [{self.retailer}] HTTP 추출 성공 ({page.elapsed:.2f}초): {result.get('retailprice')}")
+        return True
+
+    def log_summary(self):
+        total = self.stats['http'] + self.stats['fallback']
+        if total:
+            logger.info(f"🌐 [{self.retailer}] HTTP 우선 수집: HTTP {self.stats['http']}개 / "
+                        f"브라우저 폴백 {self.stats['fallback']}개 ({self.stats['http'] / total * 100:.1f}% HTTP)")
@@ -21,7 +21,6 @@ from sqlalchemy import create_engine
 import paramiko
 import time
 import random
-import re
 from datetime import datetime
 import pytz
 import logging
@@ -39,13 +38,34 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from html_snapshot import PageSnapshot
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, BLOCKED, CONTINUE, NORMAL_PAGE, NOT_FOUND, OUT_OF_STOCK, IN_STOCK
+
+# 정상/차단/Continue/재고 문구 (영어 + 힌디어 Amazon)
+PAGE_PATTERNS = get_matcher('en', 'hi', retailer='amazon_in')
 
 class AmazonIndiaScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
         self.country_code = 'in'
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Asia/Kolkata')  # 인도 현지 시간
@@ -289,8 +309,11 @@ class AmazonIndiaScraper:
             })
             
             # Chrome 드라이버 생성
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             
             # WebDriverWait 객체 생성
             self.wait = WebDriverWait(self.driver, 20)
@@ -504,61 +527,45 @@ class AmazonIndiaScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
-    def is_page_blocked(self):
-        """페이지 차단 감지 - 개선된 로직"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 - 개선된 로직 (page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
-            
-            # 1. 정상 페이지 확인 (우선 체크)
-            normal_indicators = [
-                'add to cart',
-                'buy now',
-                'product title',
-                'price',
-                'availability',
-                'customer reviews',
-                'product details',
-                'ships from',
-                'sold by'
-            ]
+            page = page if page is not None else PageSnapshot(self.driver)
             
-            normal_count = sum(1 for indicator in normal_indicators if indicator in page_source)
+            # 1. 정상 페이지 확인 (우선 체크) - 정상/차단 문구를 브라우저 안에서 한 번에 검사해 일치한 패턴만 받아옴
+            found = page.classify(PAGE_PATTERNS, NORMAL_PAGE, BLOCKED, NOT_FOUND)
+            normal_count = len(found.get(NORMAL_PAGE, []))
             
             # 정상 지표가 3개 이상이면 정상 페이지
             if normal_count >= 3:
                 logger.info(f"✅ 정상 페이지 확인: {normal_count}개 지표 발견")
                 return False
             
-            # 2. 명확한 차단 징후만 체크
-            serious_blocked_indicators = [
-                'enter the characters you see below',
-                'to continue shopping, please type the characters',
-                'verify you are human',
-                'access denied',
-                'automated access',
-                'suspicious activity',
-                '503 service unavailable',
-                'sorry, we just need to make sure you',
-                'are you a robot',
-                'the web address you entered is not a functioning page on our site',
-                "we're sorry. the web address"
-            ]
+            # 제목/URL은 정상 페이지가 아닐 때만 조회
+            page_title = page.title.lower()
+            current_url = page.url.lower()
             
-            for pattern in serious_blocked_indicators:
-                if pattern in page_source:
-                    logger.warning(f"🚫 명확한 차단 감지: '{pattern}'")
-                    return True
+            # 없는 상품(404) 페이지는 차단이 아님 - 재시도/감속하지 않음
+            if NOT_FOUND in found:
+                logger.info(f"상품 페이지 없음 (404): {current_url}")
+                return False
+            
+            # 2. 명확한 차단 징후만 체크
+            if BLOCKED in found:
+                logger.warning(f"🚫 명확한 차단 감지: '{found[BLOCKED][0]}'")
+                self.last_blocked = True
+                return True
             
             # 3. Amazon India 도메인 확인
             if 'amazon.in' not in current_url:
                 logger.warning(f"Amazon India 페이지가 아님: {current_url}")
+                self.last_blocked = True
                 return True
             
             # 4. 페이지 제목 확인
             if 'sorry' in page_title or 'error' in page_title:
                 logger.warning(f"🚫 오류 페이지 제목: {page_title}")
+                self.last_blocked = True
                 return True
             
             # 5. 기본적인 Amazon 요소 확인
@@ -701,36 +708,17 @@ class AmazonIndiaScraper:
         return None
     
     def parse_rupee_price(self, price_text):
-        """루피 가격 파싱 - 통화기호 완전 제거, 정수/소수점 자동 처리"""
-        try:
-            # 기본 정리
-            price_text = price_text.strip()
-            logger.debug(f"원본 가격 텍스트: '{price_text}'")
-            
-            # 루피 기호와 공백 제거
-            price_text = re.sub(r'[₹\s]', '', price_text)
-            
-            # 콤마 제거
-            price_text = price_text.replace(',', '')
-            
-            # 숫자만 추출
-            match = re.search(r'(\d+\.?\d*)', price_text)
-            if match:
-                price = float(match.group(1))
-                
-                # 소수점 이하가 0이면 정수로 변환
-                if price == int(price):
-                    price = int(price)
-                    logger.debug(f"파싱된 가격 (정수): {price}")
-                else:
-                    logger.debug(f"파싱된 가격 (소수): {price}")
-                
-                return price
-                
-        except Exception as e:
-            logger.debug(f"루피 가격 파싱 오류: {price_text} - {e}")
-            
-        return None
+        """루피 가격 파싱 (price_parser 공통 규칙, 예: ₹1,23,456.50) - 소수점 이하가 0이면 정수"""
+        price = parse_price(price_text, 'in')
+        if price is None:
+            logger.debug(f"루피 가격 파싱 실패: '{price_text}'")
+            return None
+        self.last_price_text = price_text
+
+        if price == int(price):
+            price = int(price)
+        logger.debug(f"파싱된 가격: {price}")
+        return price
     
     def extract_ships_from_india(self):
         """인도 전용 ships_from 추출"""
@@ -861,22 +849,13 @@ class AmazonIndiaScraper:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in [
-                    'currently unavailable',
-                    'out of stock',
-                    'temporarily out of stock',
-                    'currently not available'
-                ]):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"재고 없음: {availability_text}")
                     return False
                     
-                if any(phrase in availability_text for phrase in [
-                    'in stock',
-                    'available',
-                    'only',
-                    'left in stock'
-                ]):
+                if IN_STOCK in stock:
                     logger.info(f"재고 있음: {availability_text}")
                     return True
                     
@@ -925,8 +904,17 @@ class AmazonIndiaScraper:
             logger.error(f"가격 0 규칙 적용 중 오류: {e}")
             return price
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code='in', channel_name='amazon.in', vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"\n{'='*60}")
             logger.info("인도 Amazon 제품 정보 추출")
@@ -935,67 +923,29 @@ class AmazonIndiaScraper:
             logger.info(f"제품: {row_data.get('item', 'N/A')}")
             
             # 페이지 로드
-            self.driver.get(url)
-            time.sleep(random.uniform(3, 6))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(3, 6))
+            
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
             
             # 차단 페이지 처리
-            page_source_lower = self.driver.page_source.lower()
-            if 'continue shopping' in page_source_lower:
+            if page.classify(PAGE_PATTERNS, CONTINUE):
+                self.last_blocked = True
                 logger.info("⚠️ 차단 페이지 감지")
                 self.handle_captcha_or_block_page(url)
                 time.sleep(3)
+                page.invalidate()
             
             # 차단 확인
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.error("❌ 페이지 차단됨")
                 raise Exception("페이지 차단됨")
-            
-            # 현재 시간
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-            
-            # ISO 8601 형식
-            
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            
-            tz_offset = local_time.strftime("%z")
-            
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
 
-            
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'in',
-                'ships_from': None,
-                'channel_name': 'amazon.in',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
             
             # 제목 추출
             result['title'] = self.extract_element_text(
@@ -1049,6 +999,7 @@ class AmazonIndiaScraper:
             logger.info(f"   🚢 Ships From: {result['ships_from']}")
             logger.info(f"   🏪 판매자: {result['sold_by']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -1069,37 +1020,7 @@ class AmazonIndiaScraper:
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
             
             # 최종 실패 시 기본값
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'in',
-                'ships_from': None,
-                'channel_name': 'amazon.in',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 인도 크롤링 대상 조회"""
@@ -1124,27 +1045,14 @@ class AmazonIndiaScraper:
             return []
     
     def save_to_db(self, df):
-        """DB에 결과 저장 - 통화기호 제거 및 정수/소수점 자동 처리"""
+        """DB에 결과 저장 - 가격은 result_schema 타입 스키마로 변환 (통화기호 제거, 숫자/최소 단위 컬럼)"""
         if self.db_engine is None:
             logger.info("DB 연결이 없어 DB 저장 건너뜀")
             return False
         
         try:
-            # 가격 컬럼에서 통화기호 제거 및 정수/소수점 처리
-            if 'retailprice' in df.columns:
-                # 문자열로 저장된 가격이 있다면 숫자로 변환
-                df['retailprice'] = pd.to_numeric(df['retailprice'], errors='coerce')
-                
-                # 소수점 이하가 0인 경우 정수로 변환
-                mask = df['retailprice'].notna()
-                df.loc[mask, 'retailprice'] = df.loc[mask, 'retailprice'].apply(
-                    lambda x: int(x) if x == int(x) else x
-                )
-                
-                logger.info("✅ 가격 데이터 정수/소수점 자동 처리 완료")
-            
             table_name = 'amazon_price_crawl_tbl_ind_v2'
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"✅ 인도 DB 저장: {len(df)}개 → {table_name}")
             
             # 저장된 가격 데이터 샘플 로그 (천단위 구분자 포함)
@@ -1216,6 +1124,9 @@ class AmazonIndiaScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_in_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1266,10 +1177,15 @@ class AmazonIndiaScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table=None,
+                                    throttle=self.rate_limiter)
         
         logger.info(f"\n{'='*80}")
         logger.info("🇮🇳 Amazon India 크롤링 시작 (강화 버전)")
@@ -1280,7 +1196,7 @@ class AmazonIndiaScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS)
 
         try:
             for idx, row in enumerate(urls_data):
@@ -1290,53 +1206,17 @@ class AmazonIndiaScraper:
 
                 # 개별 제품마다 try-except 처리
                 try:
+                    self.rate_limiter.wait(url)
                     result = self.extract_product_info(url, row)
+                    self.rate_limiter.record(url, blocked=self.last_blocked)
                     results.append(result)
                 except Exception as product_error:
                     logger.error(f"❌ 제품 수집 실패 (URL: {url}): {product_error}")
                     logger.info("⏭️  다음 제품으로 계속 진행...")
                     # 실패한 제품도 기본값으로 결과에 추가
-                    now_time = datetime.now(self.korea_tz)
-                    local_time = datetime.now(self.local_tz)
-                    crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-                    tz_offset = local_time.strftime("%z")
-                    tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-                    crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-                    failed_result = {
-                        'retailerid': row.get('retailerid', ''),
-                        'country_code': 'in',
-                        'ships_from': None,
-                        'channel_name': 'amazon.in',
-                        'channel': row.get('channel', 'Online'),
-                        'retailersku': row.get('retailersku', ''),
-                        'brand': row.get('brand', ''),
-                        'brand_eng': row.get('brand_eng', row.get('brand', '')),
-                        'form_factor': row.get('form_factor', ''),
-                        'segment_lv1': row.get('seg_lv1', ''),
-                        'segment_lv2': row.get('seg_lv2', ''),
-                        'segment_lv3': row.get('seg_lv3', ''),
-                        'capacity': row.get('capacity', ''),
-                        'item': row.get('item', ''),
-                        'retailprice': None,
-                        'sold_by': None,
-                        'imageurl': None,
-                        'producturl': url,
-                        'crawl_datetime': crawl_datetime_iso,
-                        'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                        'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                        'title': None,
-                        'vat': row.get('vat', 'o')
-                    }
+                    failed_result = self.build_base_result(url, row)
                     results.append(failed_result)
 
-                # 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"⏳ {wait_time:.1f}초 대기...")
-                    time.sleep(wait_time)
-
         except Exception as e:
             logger.error(f"❌ 전체 스크래핑 오류: {e}")
 
@@ -1344,7 +1224,7 @@ class AmazonIndiaScraper:
             if self.driver:
                 self.driver.quit()
 
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1385,6 +1265,7 @@ def main():
     """메인 실행 함수"""
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print(f"\n{'='*80}")
     print("🇮🇳 Amazon India 가격 추출 시스템 v2.0 (완전 강화 버전)")
@@ -1443,7 +1324,7 @@ def main():
     
     logger.info(f"✅ 크롤링 대상: {len(urls_data)}개")
     
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
@@ -1477,6 +1358,7 @@ if __name__ == "__main__":
     print("\n⚠️ 환경변수 설정:")
     print("export TEST_MODE=false")
     print("export MAX_ITEMS=10")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print()
     
     main()
\ No newline at end of file
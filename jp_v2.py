@@ -17,7 +17,6 @@ from sqlalchemy import create_engine
 import paramiko
 import time
 import random
-import re
 from datetime import datetime
 import pytz
 import logging
@@ -35,13 +34,36 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from html_snapshot import PageSnapshot
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, BLOCKED_TITLE, BLOCKED, CONTINUE, ERROR_PAGE
+
+# 차단/오류/Continue 문구 (영어 + 일본어 Amazon, 제목 'sorry'는 일본 크롤러만 사용)
+PAGE_PATTERNS = get_matcher('en', 'ja', retailer='amazon_jp')
 
 class AmazonScraper:
     def __init__(self, country_code='usa'):
         self.driver = None
         self.db_engine = None
         self.country_code = country_code.lower()
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Asia/Tokyo')  # 일본 현지 시간
@@ -228,8 +250,11 @@ class AmazonScraper:
             options.add_experimental_option('prefs', {'intl.accept_languages': lang})
             
             # Chrome 드라이버 생성
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             
             # WebDriverWait 객체 생성
             self.wait = WebDriverWait(self.driver, 20)
@@ -406,12 +431,10 @@ class AmazonScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
-    def is_page_blocked(self):
-        """페이지 차단 감지 - 정상 제품 페이지 요소가 있으면 차단으로 간주하지 않음"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 - 정상 제품 페이지 요소가 있으면 차단으로 간주하지 않음 (page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
 
             # 먼저 정상 제품 페이지 요소 확인 (차단 페이지 오판 방지)
             normal_page_indicators = [
@@ -436,68 +459,50 @@ class AmazonScraper:
                 logger.info(f"✅ 정상 제품 페이지 확인됨 (요소 {normal_elements_found}개 발견)")
                 return False
 
-            # 정상 페이지 요소가 없을 때만 차단 페이지 텍스트 확인
-            # 일본 아마존 차단 페이지 특징
-            japanese_block_indicators = [
-                'ご迷惑をおかけしています',  # "ご迷惑をおかけしています"
-                'お客様のリクエストの処理中にエラーが発生しました',
-                'しばらくしてから',
-                'amazon.co.jpホームへ'
-            ]
+            # 정상 페이지 요소가 없을 때만 차단 페이지 텍스트 확인 (문구는 브라우저 안에서 검사)
+            page_title = page.title.lower()
+            current_url = page.url.lower()
 
-            # 일본어 차단 페이지 확인
-            for indicator in japanese_block_indicators:
-                if indicator in page_source:
-                    logger.warning(f"🚫 일본 아마존 차단 페이지 감지: '{indicator}'")
-                    return True
+            found = page.classify(PAGE_PATTERNS, ERROR_PAGE, CONTINUE, BLOCKED)
+
+            # 일본어 차단(오류) 페이지 확인
+            if ERROR_PAGE in found:
+                logger.warning(f"🚫 일본 아마존 차단 페이지 감지: '{found[ERROR_PAGE][0]}'")
+                self.last_blocked = True
+                return True
 
-            # 기존 영어 차단 징후들
-            serious_blocked_indicators = {
-                'title': [
-                    '503',
-                    'access denied',
-                    'error has occurred',
-                    'sorry'
-                ],
-                'content': [
-                    'enter the characters',
-                    'verify you are human',
-                    'access denied',
-                    'automated access',
-                    'suspicious activity',
-                    'robot check'
-                ]
-            }
-            
             # 제목 확인
-            for pattern in serious_blocked_indicators['title']:
-                if pattern in page_title:
-                    logger.warning(f"🚫 차단 감지 (제목): '{pattern}' in '{page_title}'")
-                    return True
+            title_hits = PAGE_PATTERNS.classify(page_title, BLOCKED_TITLE)
+            if title_hits:
+                logger.warning(f"🚫 차단 감지 (제목): '{title_hits[BLOCKED_TITLE][0]}' in '{page_title}'")
+                self.last_blocked = True
+                return True
 
             # Continue shopping이 있으면 차단 페이지로 간주
-            if 'continue shopping' in page_source or 'ショッピングを続ける' in page_source:
+            if CONTINUE in found:
                 logger.warning("🚫 Continue shopping 페이지 감지")
+                self.last_blocked = True
                 return True
 
             # 본문 확인
-            for pattern in serious_blocked_indicators['content']:
-                if pattern in page_source:
-                    logger.warning(f"🚫 차단 감지 (본문): '{pattern}'")
-                    
-                    # 스크린샷 저장
-                    try:
-                        screenshot_name = f"blocked_{self.country_code}_{datetime.now(self.korea_tz).strftime('%Y%m%d_%H%M%S')}.png"
-                        self.driver.save_screenshot(screenshot_name)
-                        logger.info(f"📸 차단 페이지 스크린샷 저장: {screenshot_name}")
-                    except:
-                        pass
-                    
-                    return True
+            for pattern in found.get(BLOCKED, []):
+                logger.warning(f"🚫 차단 감지 (본문): '{pattern}'")
+                
+                # 스크린샷 저장
+                try:
+                    screenshot_name = f"blocked_{self.country_code}_{datetime.now(self.korea_tz).strftime('%Y%m%d_%H%M%S')}.png"
+                    self.driver.save_screenshot(screenshot_name)
+                    logger.info(f"📸 차단 페이지 스크린샷 저장: {screenshot_name}")
+                except:
+                    pass
+                
+                self.last_blocked = True
+                return True
             
             # Amazon 페이지가 아닌 경우
             if 'amazon' not in current_url:
                 logger.warning(f"🚫 Amazon 페이지가 아님: {current_url}")
+                self.last_blocked = True
                 return True
             
             return False
@@ -784,52 +789,13 @@ class AmazonScraper:
         return None
     
     def parse_price_by_country(self, price_text, country_code):
-        """국가별 가격 파싱"""
-        try:
-            # 기본 정리
-            price_text = price_text.strip()
-            
-            if country_code in ['fr', 'it', 'es', 'de']:
-                # 유럽: 1.234,56 형식
-                price_text = re.sub(r'[€\s]', '', price_text)
-                price_text = price_text.replace('.', '')
-                price_text = price_text.replace(',', '.')
-                match = re.search(r'(\d+\.?\d*)', price_text)
-                if match:
-                    result = float(match.group(1))
-                    return result if result > 0 else None
-                    
-            elif country_code == 'jp':
-                # 일본: ¥1,234 형식
-                price_text = re.sub(r'[¥￥\s]', '', price_text)
-                price_text = price_text.replace(',', '')
-                match = re.search(r'(\d+)', price_text)
-                if match:
-                    result = float(match.group(1))
-                    return result if result > 0 else None
-                    
-            elif country_code == 'in':
-                # 인도: ₹1,234.56 형식
-                price_text = re.sub(r'[₹\s]', '', price_text)
-                price_text = price_text.replace(',', '')
-                match = re.search(r'(\d+\.?\d*)', price_text)
-                if match:
-                    result = float(match.group(1))
-                    return result if result > 0 else None
-                    
-            else:
-                # 영미권: $1,234.56 형식
-                price_text = re.sub(r'[$£\s]', '', price_text)
-                price_text = price_text.replace(',', '')
-                match = re.search(r'(\d+\.?\d*)', price_text)
-                if match:
-                    result = float(match.group(1))
-                    return result if result > 0 else None
-                    
-        except Exception as e:
-            logger.debug(f"가격 파싱 오류: {price_text} - {e}")
-            
-        return None
+        """국가별 가격 파싱 (price_parser 공통 규칙, 텍스트 안의 첫 금액)"""
+        price = parse_price(price_text, country_code)
+        if price is None:
+            logger.debug(f"가격 파싱 실패: {price_text}")
+        else:
+            self.last_price_text = price_text
+        return price
     
     def validate_seller_info(self, ships_from, sold_by):
         """ships_from과 sold_by 정보 검증 - 둘 다 비어있을 때만 False"""
@@ -853,8 +819,18 @@ class AmazonScraper:
             logger.error(f"판매자 정보 검증 오류: {e}")
             return True  # 오류시 정상 처리
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code=self.country_code, channel_name='amazon.co.jp',
+                          vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출 - 차단 페이지 처리 개선"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info(f"\n{'='*60}")
             logger.info(f"🔍 제품 정보 추출 시작")
@@ -863,20 +839,26 @@ class AmazonScraper:
             logger.info(f"📌 제품: {row_data.get('item', 'N/A')}")
             
             # 페이지 로드
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(2, 4))
+            
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단/VAT 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
             
             # 차단 페이지 확인 및 처리
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.warning("⚠️ 차단 페이지 감지됨")
                 
                 # Continue shopping 버튼 클릭하고 원래 URL로 재시도
                 if self.handle_captcha_or_block_page(target_url=url):
                     logger.info("✅ 차단 페이지 처리 완료, 페이지 재로드됨")
                     time.sleep(3)
+                    page.invalidate()
                     
                     # 여전히 차단 페이지인지 재확인
-                    if self.is_page_blocked():
+                    if self.is_page_blocked(page):
                         logger.error("❌ 여전히 차단 페이지임")
                         raise Exception("페이지 차단 지속")
                 else:
@@ -885,53 +867,9 @@ class AmazonScraper:
             
             # 페이지 로드 대기
             self.wait_for_page_load()
-            
-            # 현재 시간
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-            
-            # ISO 8601 형식
-            
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            
-            tz_offset = local_time.strftime("%z")
-            
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
 
-            
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.co.jp',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
             
             # 제목 추출
             result['title'] = self.extract_element_text(
@@ -1019,8 +957,7 @@ class AmazonScraper:
                     continue
             
             # VAT 확인 (대소문자 구분 없이)
-            page_source = self.driver.page_source
-            page_source_lower = page_source.lower()
+            # VAT 확인이 꺼져 있는 동안은 소스를 가져오지 않음 (다시 켤 때: page_source_lower = page.lower)
             
             # for vat_text in self.selectors[self.country_code].get('vat_text_list', []):
             #     if vat_text.lower() in page_source_lower:
@@ -1052,6 +989,7 @@ class AmazonScraper:
             logger.info(f"   📦 배송지: {result['ships_from']}")
             # logger.info(f"   💸 VAT: {result['vat']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -1073,37 +1011,7 @@ class AmazonScraper:
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
             
             # 최종 실패 - 기본값 반환
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.co.jp',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 크롤링 대상 URL 목록 조회"""
@@ -1138,7 +1046,7 @@ class AmazonScraper:
             table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
             
             # 데이터 저장
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드 → {table_name}")
             
             # 크롤링 로그 저장
@@ -1147,8 +1055,8 @@ class AmazonScraper:
                 log_records.append({
                     'country_code': self.country_code,
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -1156,7 +1064,7 @@ class AmazonScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"✅ 크롤링 로그 저장 완료: {len(log_records)}개")
             
             return True
@@ -1217,6 +1125,9 @@ class AmazonScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_jp_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1267,10 +1178,15 @@ class AmazonScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """여러 URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table=f'amazon_price_crawl_tbl_{self.country_code}_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info(f"\n{'='*80}")
         logger.info(f"📊 크롤링 시작")
@@ -1282,7 +1198,7 @@ class AmazonScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
         
         try:
@@ -1292,7 +1208,9 @@ class AmazonScraper:
                 url = row.get('url')
                 
                 # 제품 정보 추출
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
                 
                 # 실패 판단
                 if result['retailprice'] is None and result['title'] is None:
@@ -1314,27 +1232,11 @@ class AmazonScraper:
                 
                 # 10개마다 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
-                            interim_df.to_sql(table_name, self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-                
-                # 다음 요청 전 대기
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"⏳ {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                    # 20개마다 긴 휴식
-                    if (idx + 1) % 20 == 0:
-                        logger.info("☕ 20개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
+
         except Exception as e:
             logger.error(f"❌ 스크래핑 중 오류: {e}")
         
@@ -1352,7 +1254,7 @@ class AmazonScraper:
                 self.driver.quit()
                 logger.info("🔧 드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1402,6 +1304,7 @@ def main():
     country_code = os.getenv('COUNTRY_CODE', 'jp').lower()  # 기본값을 jp로 변경
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print(f"\n{'='*80}")
     print(f"🚀 Amazon 일본 가격 추출 시스템 v5.1 (차단 페이지 처리 개선)")
@@ -1458,7 +1361,7 @@ def main():
     logger.info(f"✅ 크롤링 대상: {len(urls_data)}개")
     
     # 크롤링 실행
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
@@ -1509,6 +1412,7 @@ if __name__ == "__main__":
     print("export COUNTRY_CODE=jp  # usa, gb, de, fr, jp, in 등")
     print("export TEST_MODE=false  # 테스트 모드")
     print("export MAX_ITEMS=10     # 최대 처리 개수 (선택사항)")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print("\n🎯 일본 아마존 전용 개선사항:")
     print("- ショッピングを続ける 버튼 자동 감지 및 클릭")
     print("- 차단 페이지 처리 후 원래 URL로 자동 재시도")
@@ -15,7 +15,6 @@ from sqlalchemy import create_engine
 import paramiko
 import time
 import random
-import re
 from datetime import datetime, timedelta
 import pytz
 import logging
@@ -27,6 +26,18 @@ import hashlib
 # Import configuration V2
 from config import DB_CONFIG_V2 as DB_CONFIG, FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_readiness import get_page_load_strategy, apply_page_load_strategy
+from structured_data import extract_from_driver, fill_result
+from page_scan import scan_page
+from price_parser import parse_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import get_persistence_queue, submit_results
+from result_buffer import RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, CHALLENGE
 
 # 로깅 설정
 logging.basicConfig(
@@ -39,10 +50,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Cloudflare 챌린지 문구 (영어 + 독일어 + 한국어 브라우저 표시)
+CHALLENGE_PATTERNS = get_matcher('en', 'de', 'ko')
+
 class MediaMarktInfiniteScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
+        self.rate_limiter = get_rate_limiter('mediamarkt', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.sftp_client = None
         self.is_logged_in = False
         self.crawl_count = 0
@@ -212,8 +229,10 @@ class MediaMarktInfiniteScraper:
                 "intl.accept_languages": "de-DE,de"
             })
             
+            apply_page_load_strategy(options, get_page_load_strategy('mediamarkt'))
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'mediamarkt')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
             self.driver.set_page_load_timeout(30)
             
             logger.info("✅ 드라이버 설정 완료")
@@ -270,24 +289,12 @@ class MediaMarktInfiniteScraper:
             return False
     
     def check_cloudflare_challenge(self):
-        """Cloudflare 챌린지 페이지인지 확인"""
+        """Cloudflare 챌린지 페이지인지 확인 (브라우저 안에서 검사, 일치한 패턴만 받아옴)"""
         try:
-            indicators = [
-                "Verifying you are human",
-                "사람인지 확인",
-                "cf-challenge",
-                "Just a moment",
-                "einen Moment"
-            ]
-            
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title.lower()
-            
-            for indicator in indicators:
-                if indicator.lower() in page_source or indicator.lower() in page_title:
-                    return True
-                    
-            return False
+            matched = scan_page(self.driver, CHALLENGE_PATTERNS.patterns(CHALLENGE))
+            if matched:
+                logger.debug(f"Cloudflare 챌린지 표시: {sorted(matched)}")
+            return bool(matched)
             
         except Exception:
             return False
@@ -397,8 +404,17 @@ class MediaMarktInfiniteScraper:
             logger.error(f"Keep-alive 오류: {e}")
             # 에러가 나도 즉시 세션을 종료하지 않음
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, RESULT_COLUMNS,
+                          country_code=row_data.get('country', 'de'), ships_from='DE',
+                          channel_name='mediamarkt', sold_by='MediaMarkt', vat='o')
+
     def extract_product_info(self, url, row_data):
         """제품 정보 추출"""
+        self.last_blocked = False
+        self.last_price_text = None
+
         try:
             logger.info(f"🔍 페이지 접속: {url}")
             self.driver.get(url)
@@ -408,163 +424,125 @@ class MediaMarktInfiniteScraper:
             
             # Cloudflare 체크
             if self.check_cloudflare_challenge():
+                self.last_blocked = True
                 logger.error("❌ Cloudflare 챌린지 감지! 세션이 만료되었습니다.")
                 self.is_logged_in = False
                 return None
-            
-            # V2: 타임존 분리
-            now_time = datetime.now(self.korea_tz)
-            local_time = datetime.now(self.local_tz)
-
-
-            # ISO 8601 형식
-
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            tz_offset = local_time.strftime("%z")
-
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
 
             # 기본 결과 구조
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': row_data.get('country', 'de'),
-                'ships_from': 'DE',
-                'channel_name': 'mediamarkt',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': 'MediaMarkt',
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': 'o'
-            }
+            result = self.build_base_result(url, row_data)
+            
+            # 구조화 데이터(JSON-LD / 상태 JSON / 메타 태그) 우선 - 선택자는 남은 필드만 시도
+            fill_result(result, extract_from_driver(self.driver, result['retailersku']))
             
             # 가격 추출
-            try:
-                price_found = False
+            if result['retailprice'] is None:
+                try:
+                    price_found = False
                 
-                # DB에서 가져온 선택자로 시도
-                for selector in self.XPATHS.get('price', []):
-                    try:
-                        if selector.startswith('//'):
-                            # XPath인 경우
-                            price_elements = self.driver.find_elements(By.XPATH, selector)
-                        else:
-                            # CSS 선택자인 경우
-                            price_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    # DB에서 가져온 선택자로 시도
+                    for selector in self.XPATHS.get('price', []):
+                        try:
+                            if selector.startswith('//'):
+                                # XPath인 경우
+                                price_elements = self.driver.find_elements(By.XPATH, selector)
+                            else:
+                                # CSS 선택자인 경우
+                                price_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                         
-                        for price_element in price_elements:
-                            price_text = price_element.text.strip()
+                            for price_element in price_elements:
+                                price_text = price_element.text.strip()
                             
-                            if price_text:
-                                # 유로 가격 추출 (다양한 형식 지원)
-                                # 예: "89,99 €", "€ 89.99", "89.99", "89,99"
-                                price_text = price_text.replace('€', '').strip()
-                                price_match = re.search(r'(\d+)[,.]?(\d*)', price_text)
-                                if price_match:
-                                    price = price_match.group(1)
-                                    if price_match.group(2):
-                                        price += '.' + price_match.group(2)
-                                    result['retailprice'] = float(price)
-                                    logger.info(f"✅ 가격 추출 성공: {result['retailprice']}€ (선택자: {selector})")
-                                    price_found = True
-                                    break
+                                if price_text:
+                                    # 유로 가격 추출 (다양한 형식 지원)
+                                    # 예: "89,99 €", "€ 89.99", "89.99", "1.299,00 €"
+                                    price = parse_price(price_text, 'de')
+                                    if price is not None:
+                                        result['retailprice'] = price
+                                        self.last_price_text = price_text
+                                        logger.info(f"✅ 가격 추출 성공: {result['retailprice']}€ (선택자: {selector})")
+                                        price_found = True
+                                        break
                         
-                        if price_found:
-                            break
+                            if price_found:
+                                break
                             
-                    except Exception as e:
-                        logger.debug(f"선택자 {selector} 실패: {e}")
-                        continue
+                        except Exception as e:
+                            logger.debug(f"선택자 {selector} 실패: {e}")
+                            continue
                 
-                if not price_found:
-                    logger.warning("❌ DB 선택자로 가격을 찾을 수 없습니다")
-                    # 추가 선택자 시도 (페이지 구조가 변경된 경우)
-                    additional_selectors = [
-                        "meta[property='product:price:amount']",
-                        "[data-price]",
-                        ".price-now"
-                    ]
+                    if not price_found:
+                        logger.warning("❌ DB 선택자로 가격을 찾을 수 없습니다")
+                        # 추가 선택자 시도 (페이지 구조가 변경된 경우)
+                        additional_selectors = [
+                            "meta[property='product:price:amount']",
+                            "[data-price]",
+                            ".price-now"
+                        ]
                     
-                    for selector in additional_selectors:
-                        try:
-                            if selector.startswith('meta'):
-                                elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                                price_text = elem.get_attribute('content')
-                            else:
-                                elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                                price_text = elem.get_attribute('data-price') or elem.text
+                        for selector in additional_selectors:
+                            try:
+                                if selector.startswith('meta'):
+                                    elem = self.driver.find_element(By.CSS_SELECTOR, selector)
+                                    price_text = elem.get_attribute('content')
+                                else:
+                                    elem = self.driver.find_element(By.CSS_SELECTOR, selector)
+                                    price_text = elem.get_attribute('data-price') or elem.text
                             
-                            if price_text:
-                                price_match = re.search(r'(\d+)[,.]?(\d*)', price_text)
-                                if price_match:
-                                    price = price_match.group(1)
-                                    if price_match.group(2):
-                                        price += '.' + price_match.group(2)
-                                    result['retailprice'] = float(price)
-                                    logger.info(f"✅ 가격 추출 성공 (추가 선택자): {result['retailprice']}€")
+                                if price_text:
+                                    price = parse_price(price_text, 'de')
+                                    if price is not None:
+                                        result['retailprice'] = price
+                                        self.last_price_text = price_text
+                                        logger.info(f"✅ 가격 추출 성공 (추가 선택자): {result['retailprice']}€")
                                     
-                                    # 새로운 선택자를 DB에 추가하라고 제안
-                                    logger.info(f"💡 새로운 선택자 발견: {selector}")
-                                    logger.info(f"DB에 추가하세요: INSERT INTO mall_selectors (mall_name, country_code, element_type, selector_value, priority, is_active) VALUES ('mediamarkt', 'de', 'price', '{selector}', 2, TRUE);")
-                                    break
-                        except:
-                            continue
+                                        # 새로운 선택자를 DB에 추가하라고 제안
+                                        logger.info(f"💡 새로운 선택자 발견: {selector}")
+                                        logger.info(f"DB에 추가하세요: INSERT INTO mall_selectors (mall_name, country_code, element_type, selector_value, priority, is_active) VALUES ('mediamarkt', 'de', 'price', '{selector}', 2, TRUE);")
+                                        break
+                            except:
+                                continue
                     
-            except Exception as e:
-                logger.warning(f"가격 추출 실패: {e}")
+                except Exception as e:
+                    logger.warning(f"가격 추출 실패: {e}")
             
             # 제목 추출
-            try:
-                for selector in self.XPATHS.get('title', []):
-                    try:
-                        if selector.startswith('//'):
-                            title_element = self.driver.find_element(By.XPATH, selector)
-                        else:
-                            title_element = self.driver.find_element(By.CSS_SELECTOR, selector)
+            if result['title'] is None:
+                try:
+                    for selector in self.XPATHS.get('title', []):
+                        try:
+                            if selector.startswith('//'):
+                                title_element = self.driver.find_element(By.XPATH, selector)
+                            else:
+                                title_element = self.driver.find_element(By.CSS_SELECTOR, selector)
                         
-                        result['title'] = title_element.text.strip()
-                        logger.info(f"제목: {result['title']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"제목 추출 실패: {e}")
+                            result['title'] = title_element.text.strip()
+                            logger.info(f"제목: {result['title']}")
+                            break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"제목 추출 실패: {e}")
             
             # 이미지 URL 추출
-            try:
-                for selector in self.XPATHS.get('imageurl', []):
-                    try:
-                        if selector.startswith('//'):
-                            image_element = self.driver.find_element(By.XPATH, selector)
-                        else:
-                            image_element = self.driver.find_element(By.CSS_SELECTOR, selector)
+            if result['imageurl'] is None:
+                try:
+                    for selector in self.XPATHS.get('imageurl', []):
+                        try:
+                            if selector.startswith('//'):
+                                image_element = self.driver.find_element(By.XPATH, selector)
+                            else:
+                                image_element = self.driver.find_element(By.CSS_SELECTOR, selector)
                         
-                        result['imageurl'] = image_element.get_attribute('src')
-                        logger.info(f"이미지 URL: {result['imageurl']}")
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                logger.warning(f"이미지 URL 추출 실패: {e}")
+                            result['imageurl'] = image_element.get_attribute('src')
+                            logger.info(f"이미지 URL: {result['imageurl']}")
+                            break
+                        except:
+                            continue
+                except Exception as e:
+                    logger.warning(f"이미지 URL 추출 실패: {e}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -579,7 +557,7 @@ class MediaMarktInfiniteScraper:
         
         try:
             # mediamarkt_price_crawl_tbl_de_v2 테이블에 저장
-            df.to_sql('mediamarkt_price_crawl_tbl_de_v2', self.db_engine, if_exists='append', index=False)
+            df = write_results(df, 'mediamarkt_price_crawl_tbl_de_v2', self.db_engine, self.country_code)
             logger.info(f"✅ DB 저장 완료: {len(df)}개 레코드")
             
             # 크롤링 로그 저장
@@ -588,8 +566,8 @@ class MediaMarktInfiniteScraper:
                 log_records.append({
                     'country_code': 'de',
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -597,7 +575,7 @@ class MediaMarktInfiniteScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
             
             return True
             
@@ -657,6 +635,9 @@ class MediaMarktInfiniteScraper:
         time_str = now.strftime("%H%M%S")
         base_filename = f"{date_str}_{time_str}_de_mediamarkt"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         # DB 저장
@@ -708,6 +689,13 @@ class MediaMarktInfiniteScraper:
 
         return results
     
+    def log_save_results(self, future):
+        """백그라운드 save_results 완료 로그 (실패는 저장 큐가 기록)"""
+        if future.exception() is None:
+            save_results = future.result()
+            logger.info(f"DB 저장: {'✅' if save_results['db_saved'] else '❌'}")
+            logger.info(f"파일서버 업로드: {'✅' if save_results['server_uploaded'] else '❌'}")
+
     def crawl_once(self):
         """1회 크롤링 실행"""
         logger.info(f"\n{'='*60}")
@@ -724,7 +712,7 @@ class MediaMarktInfiniteScraper:
         
         logger.info(f"📊 총 {len(urls_data)}개 제품 처리 예정")
         
-        results = []
+        results = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
         success_count = 0
         
         for idx, row in enumerate(urls_data):
@@ -739,7 +727,9 @@ class MediaMarktInfiniteScraper:
             url = row.get('url')
             
             # 제품 정보 추출
+            self.rate_limiter.wait(url)
             result = self.extract_product_info(url, row)
+            self.rate_limiter.record(url, blocked=self.last_blocked)
             
             if result:
                 results.append(result)
@@ -770,37 +760,23 @@ class MediaMarktInfiniteScraper:
                 
                 # 중간 저장
                 if results:
-                    interim_df = pd.DataFrame(results[-5:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('mediamarkt_price_crawl_tbl_de_v2', self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info(f"💾 중간 저장: 5개 레코드")
-                        except:
-                            pass
-            
-            # 다음 요청 전 대기
-            if idx < len(urls_data) - 1:
-                wait_time = random.uniform(5, 10)
-                time.sleep(wait_time)
-                
-                # 25개마다 긴 휴식
-                if (idx + 1) % 25 == 0:
-                    logger.info("☕ 25개 처리 완료, 30초 휴식...")
-                    time.sleep(30)
-        
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'mediamarkt_price_crawl_tbl_de_v2', self.db_engine, self.country_code)
+
         # 결과 저장
         if results:
-            df = pd.DataFrame(results)
-            save_results = self.save_results(df)
+            df = results.to_frame()
+            # DB/CSV/파일서버 업로드는 저장 큐에서 처리 (다음 회차 대기와 keep-alive를 막지 않음)
+            persistence = get_persistence_queue()
+            persistence.submit('결과 저장/업로드', self.save_results, df).add_done_callback(self.log_save_results)
 
             # 통계
             logger.info(f"\n📊 === 크롤링 완료 ===")
             logger.info(f"전체 제품: {len(results)}개")
             logger.info(f"가격 추출 성공: {success_count}개")
             logger.info(f"성공률: {success_count/len(results)*100:.1f}%")
-            logger.info(f"DB 저장: {'✅' if save_results['db_saved'] else '❌'}")
-            logger.info(f"파일서버 업로드: {'✅' if save_results['server_uploaded'] else '❌'}")
+            logger.info(f"DB 저장/파일서버 업로드: 백그라운드 진행 (대기 작업 {persistence.pending()}개)")
 
             self.crawl_count += 1
             return df
@@ -860,6 +836,8 @@ class MediaMarktInfiniteScraper:
                 logger.error(traceback.format_exc())
                 time.sleep(300)  # 5분 대기 후 계속
         
+        # 남은 저장/업로드 작업 완료 대기
+        get_persistence_queue().flush()
         logger.info("무한 크롤링 종료")
     
     def accept_cookies(self):
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+결과 테이블 가격 스키마 컬럼 마이그레이션 (1회 실행)
+- result_schema.apply_result_schema가 만드는 retailprice_minor / currency / retailprice_raw 컬럼을 기존 테이블에 추가
+- 저장 경로(write_results)에서 ALTER TABLE을 실행하지 않도록 컬럼 추가는 이 스크립트로 분리
+  (마이그레이션 전에는 저장 시 없는 컬럼을 빼고 저장)
+- 기본 대상은 v2 크롤러/fnac가 저장하는 DB (DB_CONFIG_V2), --v1이면 기존 DB (DB_CONFIG)
+
+사용법:
+    python migrate_result_columns.py                    # *_price_crawl_tbl_* 테이블 전체
+    python migrate_result_columns.py <테이블> [<테이블> ...]
+    python migrate_result_columns.py --dry-run          # 실행할 DDL만 출력
+    python migrate_result_columns.py --v1               # 기존 DB (DB_CONFIG)
+"""
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+from migrate_result_unique_keys import connection_string, get_db_config
+from result_schema import missing_result_columns
+
+
+def add_column_ddl(table_name, column, sql_type):
+    return f"ALTER TABLE `{table_name}` ADD COLUMN `{column}` {sql_type}"
+
+
+def migrate_table(engine, inspector, table_name, dry_run=False):
+    """테이블 1개에 없는 가격 컬럼 추가 - 결과 문자열 반환"""
+    missing = missing_result_columns(inspector, table_name)
+    if not missing:
+        return '이미 있음'
+
+    statements = [add_column_ddl(table_name, column, sql_type) for column, sql_type in missing]
+    if dry_run:
+        return 'DDL: ' + '; '.join(statements)
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    return f"추가 완료 ({', '.join(column for column, _ in missing)})"
+
+
+def main(argv):
+    dry_run = '--dry-run' in argv
+    db_config = get_db_config(v1='--v1' in argv)
+    tables = [arg for arg in argv if not arg.startswith('--')]
+
+    engine = create_engine(connection_string(db_config))
+    inspector = inspect(engine)
+    if not tables:
+        tables = [name for name in inspector.get_table_names() if '_price_crawl_tbl_' in name]
+
+    print("=" * 80)
+    print(f"가격 스키마 컬럼 마이그레이션 - DB: {db_config['database']}{' - dry run' if dry_run else ''}")
+    print("=" * 80)
+
+    failed = 0
+    for table_name in tables:
+        try:
+            status = migrate_table(engine, inspector, table_name, dry_run)
+        except Exception as e:
+            status = f"실패: {e}"
+            failed += 1
+        print(f"{table_name}: {status}")
+
+    print("=" * 80)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+결과 테이블 행 키 UNIQUE 인덱스 마이그레이션 (1회 실행)
+- result_writer는 (producturl, crawl_strdatetime) UNIQUE 인덱스가 있는 테이블에서만 INSERT ... ON DUPLICATE KEY UPDATE 사용
+- 저장 경로에서 ALTER TABLE을 실행하지 않도록 인덱스 생성은 이 스크립트로 분리
+- 이미 같은 키에 중복 행이 있는 테이블은 건너뜀 (중복 정리 후 다시 실행)
+- 기본 대상은 v2 크롤러/fnac가 저장하는 DB (DB_CONFIG_V2), --v1이면 기존 DB (DB_CONFIG)
+
+사용법:
+    python migrate_result_unique_keys.py                    # *_price_crawl_tbl_* 테이블 전체
+    python migrate_result_unique_keys.py <테이블> [<테이블> ...]
+    python migrate_result_unique_keys.py --dry-run          # 실행할 DDL만 출력
+    python migrate_result_unique_keys.py --v1               # 기존 DB (DB_CONFIG)
+"""
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+from config import DB_CONFIG, DB_CONFIG_V2
+from result_writer import RESULT_KEY, UNIQUE_KEY_NAME
+
+
+def get_db_config(v1=False):
+    """마이그레이션 대상 DB 설정 (기본: v2 크롤러의 write_results가 쓰는 DB_CONFIG_V2)"""
+    return DB_CONFIG if v1 else DB_CONFIG_V2
+
+
+def connection_string(db_config):
+    return (
+        f"mysql+pymysql://{db_config['user']}:{db_config['password']}@"
+        f"{db_config['host']}:{db_config['port']}/{db_config['database']}"
+    )
+
+
+def unique_key_ddl(table_name, column_types):
+    """행 키 UNIQUE 인덱스 DDL (TEXT/BLOB 컬럼(to_sql 기본)은 인덱스 접두 길이 255)"""
+    parts = [f"`{column}`(255)" if 'TEXT' in column_types.get(column, '') or 'BLOB' in column_types.get(column, '')
+             else f"`{column}`" for column in RESULT_KEY]
+    return f"ALTER TABLE `{table_name}` ADD UNIQUE KEY `{UNIQUE_KEY_NAME}` ({', '.join(parts)})"
+
+
+def migrate_table(engine, inspector, table_name, dry_run=False):
+    """테이블 1개에 UNIQUE 인덱스 추가 - 결과 문자열 반환"""
+    for index in inspector.get_indexes(table_name):
+        if index.get('unique') and tuple(index['column_names']) == RESULT_KEY:
+            return '이미 있음'
+
+    column_types = {column['name']: str(column['type']).upper() for column in inspector.get_columns(table_name)}
+    missing = [column for column in RESULT_KEY if column not in column_types]
+    if missing:
+        return f"건너뜀 (키 컬럼 없음: {', '.join(missing)})"
+
+    key_columns = ', '.join(f"`{column}`" for column in RESULT_KEY)
+    with engine.connect() as conn:
+        duplicates = conn.execute(text(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM `{table_name}` GROUP BY {key_columns} HAVING COUNT(*) > 1) d"
+        )).scalar()
+    if duplicates:
+        return f"건너뜀 (중복 키 {duplicates}개 - 정리 후 다시 실행)"
+
+    ddl = unique_key_ddl(table_name, column_types)
+    if dry_run:
+        return f"DDL: {ddl}"
+    with engine.begin() as conn:
+        conn.execute(text(ddl))
+    return '추가 완료'
+
+
+def main(argv):
+    dry_run = '--dry-run' in argv
+    db_config = get_db_config(v1='--v1' in argv)
+    tables = [arg for arg in argv if not arg.startswith('--')]
+
+    engine = create_engine(connection_string(db_config))
+    inspector = inspect(engine)
+    if not tables:
+        tables = [name for name in inspector.get_table_names() if '_price_crawl_tbl_' in name]
+
+    print("=" * 80)
+    print(f"행 키 UNIQUE 인덱스 마이그레이션 ({', '.join(RESULT_KEY)}) - DB: {db_config['database']}"
+          f"{' - dry run' if dry_run else ''}")
+    print("=" * 80)
+
+    failed = 0
+    for table_name in tables:
+        try:
+            status = migrate_table(engine, inspector, table_name, dry_run)
+        except Exception as e:
+            status = f"실패: {e}"
+            failed += 1
+        print(f"{table_name}: {status}")
+
+    print("=" * 80)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
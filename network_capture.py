@@ -0,0 +1,291 @@
+"""
+가격 API 응답 캡처 (네트워크 가로채기)
+- 일부 리테일러는 페이지 로드 후 클라이언트 측 가격 API 호출로 가격/재고를 채움 (BestBuy priceBlocks 등)
+- DOM에 값이 그려질 때까지 기다리는 대신 해당 JSON 응답을 직접 받아 가격/재고를 읽음
+  - Selenium(undetected_chromedriver): performance 로그의 CDP Network.responseReceived / loadingFinished 이벤트
+    + Network.getResponseBody
+  - Playwright(fnac): page.on('response') 핸들러
+- 응답 JSON에서 retailersku 값을 가진 객체의 가격/재고만 사용 (structured_data.find_product_values)
+- 리테일러별 사용 여부: NETWORK_CAPTURE_{RETAILER}=1 (기본 끔)
+- URL 패턴: CAPTURE_PATTERNS 기본값, CAPTURE_PATTERNS_{RETAILER}=정규식,정규식 환경변수로 변경
+- 결과는 structured_data와 같은 {'values': {필드: 값}, 'sources': {필드: 'network'}} 형태
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import time
+
+from structured_data import find_product_values
+
+logger = logging.getLogger(__name__)
+
+SOURCE_NETWORK = 'network'
+
+# 리테일러별 가격/재고 API URL 패턴 (정규식, 대소문자 무시)
+CAPTURE_PATTERNS = {
+    'bestbuy': [r'/api/3\.0/priceBlocks', r'/pricing/v\d+/', r'/api/tcfb/model\.json'],
+    'fnac': [r'/Nav/API/', r'/api/.*(price|offer)'],
+    'mediamarkt': [r'/api/v\d+/graphql'],
+    'coolblue': [r'/api/.*(price|product)'],
+    'currys': [r'/api/.*(price|product)'],
+    'xkom': [r'/api/.*(price|product)']
+}
+
+# 한 페이지에서 본문을 받아볼 최대 응답 수 (패턴이 넓을 때 과도한 CDP 호출 방지)
+MAX_RESPONSES = 20
+
+
+def network_capture_enabled(retailer):
+    """NETWORK_CAPTURE_{RETAILER} 환경변수 (기본 끔)"""
+    value = os.getenv(f'NETWORK_CAPTURE_{retailer.upper()}', '0')
+    return value.strip().lower() in ('1', 'true', 'on', 'yes')
+
+
+def get_capture_timeout(retailer, default=5):
+    """응답 대기 한도(초) - CAPTURE_TIMEOUT_{RETAILER} 환경변수 (넘으면 DOM 대기로 진행)"""
+    name = f'CAPTURE_TIMEOUT_{retailer.upper()}'
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.5)
+    except ValueError:
+        logger.warning(f"{name} 값이 잘못됨: {value} -> {default}초 사용")
+        return default
+
+
+def get_capture_patterns(retailer):
+    """리테일러 URL 패턴 컴파일 목록 - CAPTURE_PATTERNS_{RETAILER} 환경변수 > CAPTURE_PATTERNS"""
+    name = f'CAPTURE_PATTERNS_{retailer.upper()}'
+    raw = os.getenv(name)
+    patterns = [p.strip() for p in raw.split(',') if p.strip()] if raw else CAPTURE_PATTERNS.get(retailer, [])
+
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as e:
+            logger.warning(f"{name} 패턴 오류 (무시): {pattern} - {e}")
+    return compiled
+
+
+def _is_json(mime_type):
+    mime_type = (mime_type or '').lower()
+    return 'json' in mime_type or 'javascript' in mime_type
+
+
+def _load_payload(text):
+    """응답 본문 -> JSON (XSSI 방지 접두어 ")]}'," 제거)"""
+    if not text:
+        return None
+    text = text.lstrip()
+    if text.startswith(")]}'"):
+        text = text.split('\n', 1)[-1]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+class _CaptureBase:
+    """캡처한 JSON 응답 보관 및 필드 추출 (Selenium / Playwright 공통)"""
+
+    def __init__(self, retailer):
+        self.retailer = retailer
+        self.enabled = network_capture_enabled(retailer)
+        self.patterns = get_capture_patterns(retailer) if self.enabled else []
+        if self.enabled and not self.patterns:
+            logger.warning(f"가격 API 캡처 패턴 없음 - 비활성화: {retailer}")
+            self.enabled = False
+        self.payloads = []  # [(url, JSON)]
+
+    def matches(self, url):
+        return any(pattern.search(url or '') for pattern in self.patterns)
+
+    def reset(self):
+        """페이지 이동 전 이전 페이지 응답 비우기"""
+        self.payloads = []
+
+    def extract(self, sku):
+        """
+        캡처한 응답에서 대상 상품 필드 (응답 순서대로 빈 필드만 채움)
+
+        Returns:
+            dict: {'values': {필드: 값}, 'sources': {필드: 'network'}}
+        """
+        values, sources = {}, {}
+        sku = str(sku).strip() if sku else None
+        for url, payload in self.payloads:
+            found = find_product_values(payload, sku)
+            for field, value in found.items():
+                if field not in values:
+                    values[field] = value
+                    sources[field] = SOURCE_NETWORK
+            if found:
+                logger.info(f"📡 가격 API 응답에서 추출: {', '.join(found)} ({url[:80]})")
+            if 'retailprice' in values and 'availability' in values:
+                break
+        return {'values': values, 'sources': sources}
+
+
+class SeleniumCapture(_CaptureBase):
+    """
+    CDP performance 로그 기반 응답 캡처
+
+    setup_driver에서 enable_logging(options) 후 드라이버 생성,
+    페이지 이동 전 reset(driver), 이동 후 wait_for_values(driver, sku, timeout)
+    """
+
+    def __init__(self, retailer):
+        super().__init__(retailer)
+        self._pending = {}   # requestId -> url (응답 헤더 수신, 본문 수신 대기)
+        self._fetched = set()
+
+    def enable_logging(self, options):
+        """ChromeOptions에 performance 로그 수집 설정 (사용 안 하면 그대로)"""
+        if self.enabled:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            logger.info(f"📡 가격 API 캡처 사용: {self.retailer} ({len(self.patterns)}개 패턴)")
+        return options
+
+    def reset(self, driver=None):
+        """이전 페이지 로그/응답 비우기"""
+        super().reset()
+        self._pending = {}
+        self._fetched = set()
+        if self.enabled and driver is not None:
+            try:
+                driver.get_log('performance')
+            except Exception as e:
+                logger.debug(f"performance 로그 비우기 실패: {e}")
+
+    def collect(self, driver):
+        """새 performance 로그를 읽어 본문 수신이 끝난 패턴 일치 응답을 JSON으로 보관"""
+        if not self.enabled:
+            return 0
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"performance 로그 조회 실패: {e}")
+            return 0
+
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if self.matches(response.get('url')) and _is_json(response.get('mimeType')):
+                    self._pending[params.get('requestId')] = response.get('url')
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                finished.append(params['requestId'])
+
+        added = 0
+        for request_id in finished:
+            url = self._pending.pop(request_id)
+            if request_id in self._fetched or len(self._fetched) >= MAX_RESPONSES:
+                continue
+            self._fetched.add(request_id)
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                logger.debug(f"응답 본문 조회 실패: {url} - {e}")
+                continue
+            text = body.get('body')
+            if text and body.get('base64Encoded'):
+                text = base64.b64decode(text).decode('utf-8', errors='replace')
+            payload = _load_payload(text)
+            if payload is not None:
+                self.payloads.append((url, payload))
+                added += 1
+        return added
+
+    def wait_for_values(self, driver, sku, timeout, fields=('retailprice',), interval=0.25):
+        """
+        지정 필드가 응답에서 나올 때까지 로그 수집 (DOM 렌더링 대기 대신 사용)
+
+        Returns:
+            dict: extract() 결과 (한도 초과 시 그때까지 수집한 결과)
+        """
+        if not self.enabled:
+            return {'values': {}, 'sources': {}}
+
+        deadline = time.perf_counter() + timeout
+        result = {'values': {}, 'sources': {}}
+        while True:
+            if self.collect(driver):
+                result = self.extract(sku)
+                if all(field in result['values'] for field in fields):
+                    return result
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(interval)
+
+        logger.info(f"📡 가격 API 응답 없음 ({timeout}초) - DOM 추출로 진행")
+        return result
+
+
+class PlaywrightCapture(_CaptureBase):
+    """
+    Playwright page.on('response') 기반 응답 캡처
+
+    핸들러에서는 응답 객체만 보관하고 본문은 이동 후 extract_responses()/extract_responses_async()에서 읽음
+    (sync API 이벤트 핸들러 안에서 다른 API 호출을 피함)
+    """
+
+    def __init__(self, retailer):
+        super().__init__(retailer)
+        self._responses = []
+
+    def attach(self, page):
+        """페이지에 응답 핸들러 등록 (사용 안 하면 등록하지 않음)"""
+        if self.enabled:
+            page.on('response', self._on_response)
+        return page
+
+    def _on_response(self, response):
+        if len(self._responses) >= MAX_RESPONSES or not self.matches(response.url):
+            return
+        if _is_json(response.headers.get('content-type')):
+            self._responses.append(response)
+
+    def reset(self):
+        super().reset()
+        self._responses = []
+
+    def extract_responses(self, sku):
+        """보관한 응답 본문을 읽어 필드 추출 (sync API)"""
+        if not self.enabled:
+            return {'values': {}, 'sources': {}}
+        for response in self._responses:
+            try:
+                payload = _load_payload(response.text())
+            except Exception as e:
+                logger.debug(f"응답 본문 조회 실패: {response.url} - {e}")
+                continue
+            if payload is not None:
+                self.payloads.append((response.url, payload))
+        self._responses = []
+        return self.extract(sku)
+
+    async def extract_responses_async(self, sku):
+        """보관한 응답 본문을 읽어 필드 추출 (async API)"""
+        if not self.enabled:
+            return {'values': {}, 'sources': {}}
+        for response in self._responses:
+            try:
+                payload = _load_payload(await response.text())
+            except Exception as e:
+                logger.debug(f"응답 본문 조회 실패: {response.url} - {e}")
+                continue
+            if payload is not None:
+                self.payloads.append((response.url, payload))
+        self._responses = []
+        return self.extract(sku)
@@ -35,6 +35,25 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from resource_blocking import apply_resource_blocking
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from dom_extractor import (
+    find_excluded_price_elements, AMAZON_EXCLUDED_CLOSEST, AMAZON_EXCLUDED_CONTAINER_IDS,
+    AMAZON_EXCLUDED_CONTAINER_CLASSES, RECOMMENDATION_XPATH_PATTERN
+)
+from html_snapshot import PageSnapshot
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, BLOCKED_TITLE, BLOCKED, CONTINUE, ERROR_PAGE, OUT_OF_STOCK, IN_STOCK
+
+# 차단/오류/Continue/재고 문구 (영어 + 네덜란드어, 이탈리아 크롤러에서 가져온 문구 유지)
+PAGE_PATTERNS = get_matcher('en', 'nl', 'it')
 
 class AmazonNLScraper:
     def __init__(self):
@@ -42,6 +61,9 @@ class AmazonNLScraper:
         self.db_engine = None
         self.country_code = 'nl'
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Europe/Amsterdam')  # 네덜란드 현지 시간
@@ -300,8 +322,11 @@ class AmazonNLScraper:
                 'intl.accept_languages': 'nl-NL,nl,en-US,en'
             })
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             self.wait = WebDriverWait(self.driver, 20)
             
             logger.info("네덜란드 드라이버 설정 완료")
@@ -311,151 +336,27 @@ class AmazonNLScraper:
             logger.error(f"드라이버 설정 실패: {e}")
             return False
     
+    def price_exclusion_reasons(self, elements):
+        """가격 후보 요소들의 제외 사유를 스크립트 1회로 판정 (유지할 요소는 None)"""
+        return find_excluded_price_elements(
+            self.driver, elements,
+            areas=self.selectors.get('excluded_price_areas', []),
+            xpath_patterns=self.selectors.get('excluded_xpath_patterns', []) + [RECOMMENDATION_XPATH_PATTERN],
+            require_center_col=True,
+            closest=AMAZON_EXCLUDED_CLOSEST,
+            container_ids=AMAZON_EXCLUDED_CONTAINER_IDS,
+            container_classes=AMAZON_EXCLUDED_CONTAINER_CLASSES
+        )
+
     def is_excluded_price_element(self, element):
         """가격 요소가 제외 대상인지 확인 (추천상품/관련상품 영역 강화)"""
-        try:
-            # 1. 요소의 HTML 확인
-            element_html = self.driver.execute_script("return arguments[0].outerHTML;", element)
-            excluded_areas = self.selectors.get('excluded_price_areas', [])
-            
-            for pattern in excluded_areas:
-                if pattern in element_html.lower():
-                    logger.debug(f"제외 영역 감지: {pattern}")
-                    return True
-            
-            # 2. centerCol 외부의 요소는 제외
-            try:
-                center_col = self.driver.execute_script(r"""
-                    return arguments[0].closest('#centerCol');
-                """, element)
-                if not center_col:
-                    logger.info("centerCol 외부 요소 - 제외")
-                    return True
-            except Exception as e:
-                logger.debug(f"centerCol 확인 오류: {e}")
-            
-            # 3. XPath로 요소 위치 확인
-            try:
-                element_xpath = self.driver.execute_script(r"""
-                    function getXPath(element) {
-                        var xpath = '';
-                        for (; element && element.nodeType == 1; element = element.parentNode) {
-                            var id = element.id;
-                            if (id) {
-                                xpath = '//' + element.tagName.toLowerCase() + '[@id="' + id + '"]' + xpath;
-                                break;
-                            } else {
-                                var sameTag = [];
-                                for (var i = 0; i < element.parentNode.childNodes.length; i++) {
-                                    var child = element.parentNode.childNodes[i];
-                                    if (child.nodeType == 1 && child.tagName == element.tagName) {
-                                        sameTag.push(child);
-                                    }
-                                }
-                                xpath = '/' + element.tagName.toLowerCase() + '[' + (sameTag.indexOf(element) + 1) + ']' + xpath;
-                            }
-                        }
-                        return xpath;
-                    }
-                    return getXPath(arguments[0]);
-                """, element)
-                
-                logger.debug(f"요소 xpath: {element_xpath}")
-                
-                # 제외할 xpath 패턴 확인
-                excluded_patterns = self.selectors.get('excluded_xpath_patterns', [])
-                for pattern in excluded_patterns:
-                    if re.search(pattern, element_xpath):
-                        logger.info(f"제외 xpath 패턴 매치: {pattern}")
-                        return True
-                
-                # div[4] 이후 영역들은 추천상품으로 간주하여 제외
-                if ('div[1]/div[4]' in element_xpath or 
-                    'div[1]/div[5]' in element_xpath or 
-                    'div[1]/div[6]' in element_xpath or
-                    'div[1]/div[7]' in element_xpath or
-                    'div[1]/div[8]' in element_xpath or
-                    'div[1]/div[9]' in element_xpath or
-                    re.search(r'div\[1\]/div\[1[0-9]\]', element_xpath)):
-                    logger.info(f"div[4] 이후 영역 제외: {element_xpath}")
-                    return True
-                    
-            except Exception as e:
-                logger.debug(f"XPath 확인 오류: {e}")
-            
-            # 4. 부모 요소들 확인
-            parent_checks = [
-                "arguments[0].closest('.product-comparison-desktop')",
-                "arguments[0].closest('[class*=\"comparison\"]')",
-                "arguments[0].closest('[class*=\"non-deal\"]')",
-                "arguments[0].closest('[class*=\"recommendations\"]')",
-                "arguments[0].closest('[class*=\"sponsored\"]')",
-                "arguments[0].closest('[class*=\"similarities\"]')",
-                "arguments[0].closest('[class*=\"also-bought\"]')",
-                "arguments[0].closest('[class*=\"also-viewed\"]')",
-                "arguments[0].closest('[class*=\"related\"]')",
-                "arguments[0].closest('[class*=\"frequently\"]')",
-                "arguments[0].closest('[class*=\"customers-also\"]')",
-                "arguments[0].closest('[id*=\"sims\"]')",
-                "arguments[0].closest('[id*=\"ads\"]')",
-                "arguments[0].closest('[data-component-type*=\"sims\"]')",
-                "arguments[0].closest('[data-feature-name*=\"sims\"]')",
-            ]
-            
-            for check in parent_checks:
-                try:
-                    parent = self.driver.execute_script(f"return {check}", element)
-                    if parent:
-                        logger.info(f"제외 상위 요소 발견")
-                        return True
-                except:
-                    continue
-            
-            # 5. 특정 ID나 클래스를 가진 상위 요소 확인
-            try:
-                excluded_containers = self.driver.execute_script(r"""
-                    var element = arguments[0];
-                    var excludedIds = ['dp-sims-desktop', 'similarities-desktop', 'desktop-dp-sims', 
-                                      'recommendations', 'also-bought', 'also-viewed', 'bundleV2'];
-                    var excludedClasses = ['sims-', 'recommendations', 'also-', 'sponsored', 'ads-'];
-                    
-                    while (element && element !== document.body) {
-                        if (element.id) {
-                            for (var i = 0; i < excludedIds.length; i++) {
-                                if (element.id.indexOf(excludedIds[i]) !== -1) {
-                                    return true;
-                                }
-                            }
-                        }
-                        if (element.className && typeof element.className === 'string') {
-                            for (var i = 0; i < excludedClasses.length; i++) {
-                                if (element.className.indexOf(excludedClasses[i]) !== -1) {
-                                    return true;
-                                }
-                            }
-                        }
-                        element = element.parentElement;
-                    }
-                    return false;
-                """, element)
-                
-                if excluded_containers:
-                    logger.info("제외 컨테이너 내부 요소 감지")
-                    return True
-            except Exception as e:
-                logger.debug(f"컨테이너 확인 오류: {e}")
-            
-            return False
-        except Exception as e:
-            logger.debug(f"제외 요소 확인 오류: {e}")
-            return False
+        return self.price_exclusion_reasons([element])[0] is not None
     
-    def is_page_blocked(self):
-        """네덜란드 페이지 차단 감지"""
+    def is_page_blocked(self, page=None):
+        """네덜란드 페이지 차단 감지 (page: PageSnapshot - 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
+            current_url = page.url.lower()
             
             # 기본 도메인 확인
             if 'amazon' not in current_url:
@@ -484,47 +385,26 @@ class AmazonNLScraper:
             except Exception as e:
                 logger.debug(f"정상 페이지 확인 중 오류: {e}")
             
-            # 정상 페이지 요소가 없을 때만 차단 페이지 확인
+            # 정상 페이지 요소가 없을 때만 차단 페이지 확인 (문구는 브라우저 안에서 검사)
+            page_title = page.title.lower()
+            
             # 네덜란드 심각한 차단 지표
-            serious_blocked_indicators = {
-                'title': [
-                    '503',
-                    'access denied',
-                    'accesso negato',
-                    'error has occurred',
-                    'errore',
-                    'ci dispiace'
-                ],
-                'content': [
-                    'enter the characters',
-                    'inserisci i caratteri',
-                    'verify you are human',
-                    'controlla di essere umano',
-                    'access denied',
-                    'accesso negato',
-                    'automated access',
-                    'suspicious activity',
-                    'attività sospetta',
-                    'si è verificato un errore',
-                    'ci dispiace'
-                ]
-            }
+            title_hits = PAGE_PATTERNS.classify(page_title, BLOCKED_TITLE)
+            if title_hits:
+                logger.warning(f"네덜란드 심각한 차단 감지 (제목): {title_hits[BLOCKED_TITLE][0]}")
+                return True
             
-            for pattern in serious_blocked_indicators['title']:
-                if pattern in page_title:
-                    logger.warning(f"네덜란드 심각한 차단 감지 (제목): {pattern}")
-                    return True
+            found = page.classify(PAGE_PATTERNS, BLOCKED, CONTINUE, ERROR_PAGE)
+            error_hits = found.get(ERROR_PAGE, [])
             
             # "Ci dispiace" 오류는 차단이 아닌 처리 가능한 오류로 분류
-            if ('ci dispiace' in page_source and 
-                'continua lo shopping' not in page_source and 
-                'continue shopping' not in page_source and
-                'clicca qui per tornare' not in page_source):
+            if ('ci dispiace' in error_hits and 
+                CONTINUE not in found and
+                'clicca qui per tornare' not in error_hits):
                 # 홈페이지 링크도 없으면 심각한 차단
-                for pattern in serious_blocked_indicators['content']:
-                    if pattern in page_source and pattern not in ['ci dispiace', 'si è verificato un errore']:
-                        logger.warning(f"네덜란드 심각한 차단 감지 (본문): {pattern}")
-                        return True
+                if BLOCKED in found:
+                    logger.warning(f"네덜란드 심각한 차단 감지 (본문): {found[BLOCKED][0]}")
+                    return True
             
             return False  # 기본적으로 정상으로 판단
             
@@ -566,8 +446,8 @@ class AmazonNLScraper:
             logger.warning(f"네덜란드 페이지 로드 대기 중 오류: {e}")
             return False
 
-    def handle_captcha_or_block_page(self, original_url=None):
-        """네덜란드 차단 페이지나 캡차 처리"""
+    def handle_captcha_or_block_page(self, original_url=None, page=None):
+        """네덜란드 차단 페이지나 캡차 처리 (page: 이번 페이지의 PageSnapshot, 이미 읽은 소스 재사용)"""
         try:
             logger.info("네덜란드 차단/캡차 페이지 확인 중...")
             
@@ -580,16 +460,17 @@ class AmazonNLScraper:
             except:
                 pass
             
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
+            page_title = page.title.lower()
+            found = page.scan(PAGE_PATTERNS.patterns(ERROR_PAGE))  # 일치한 문구만 받아옴
             
             # 1. "Ci dispiace" 오류 페이지 정확한 감지
             ci_dispiace_indicators = [
                 'ci dispiace' in page_title,
-                'si è verificato un errore quando abbiamo tentato di elaborare la richiesta' in page_source,
-                'stiamo lavorando al problema' in page_source,
-                'clicca qui per tornare alla home page di amazon.nl' in page_source,
-                'non sarà stato elaborato per il momento' in page_source
+                'si è verificato un errore quando abbiamo tentato di elaborare la richiesta' in found,
+                'stiamo lavorando al problema' in found,
+                'clicca qui per tornare alla home page di amazon' in found,
+                'non sarà stato elaborato per il momento' in found
             ]
             
             if sum(ci_dispiace_indicators) >= 2:
@@ -654,7 +535,7 @@ class AmazonNLScraper:
                 return True
             
             # 2. 일반 Continue 버튼 처리 (Ci dispiace가 아닌 경우에만)
-            if 'ci dispiace' not in page_title and 'ci dispiace' not in page_source:
+            if 'ci dispiace' not in page_title and 'ci dispiace' not in found:
                 for selector in self.selectors['continue_buttons']:
                     try:
                         logger.info(f"네덜란드 Continue 버튼 찾기 시도: {selector}")
@@ -771,11 +652,12 @@ class AmazonNLScraper:
                 logger.info(f"타입: {selector_type}, 발견: {len(elements)}개")
                 
                 if elements:
-                    for i, element in enumerate(elements):
+                    excluded = self.price_exclusion_reasons(elements) if element_name == "가격" else [None] * len(elements)
+                    for i, (element, excluded_reason) in enumerate(zip(elements, excluded)):
                         try:
                             if element.is_displayed():
                                 # 가격 요소만 강화된 필터링 적용
-                                if element_name == "가격" and self.is_excluded_price_element(element):
+                                if excluded_reason:
                                     continue
                                 
                                 text = self.extract_clean_text_from_element(element, element_name)
@@ -793,76 +675,12 @@ class AmazonNLScraper:
         return None
     
     def parse_dutch_price(self, price_text):
-        """네덜란드 가격 파싱 (€ 통화, 쉼표 소수점)"""
-        try:
-            price_text = price_text.strip()
-            logger.debug(f"네덜란드 가격 파싱: '{price_text}'")
-            
-            # 무효한 패턴 확인
-            invalid_patterns = [
-                r'^[a-zA-Z\s]+$',
-                r'^\d+\s*[a-zA-Z]',
-                r'was\s*€',
-                r'list\s*price',
-                r'buy\s*used'
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, price_text, re.IGNORECASE):
-                    logger.debug(f"무효한 가격 패턴 감지: {pattern}")
-                    return None
-            
-            # 유로 기호와 공백 제거
-            cleaned = re.sub(r'[€\s]', '', price_text)
-            logger.debug(f"통화 제거 후: '{cleaned}'")
-            
-            # 빈 문자열 체크
-            if not cleaned:
-                return None
-            
-            # 네덜란드 형식: 61,84 또는 1.234,56
-            if ',' in cleaned:
-                # 쉼표가 있으면 마지막 쉼표를 소수점으로 처리
-                parts = cleaned.rsplit(',', 1)
-                if len(parts) == 2 and len(parts[1]) <= 2 and parts[1].isdigit():
-                    # 정수 부분에서 점 제거 (천단위 구분자)
-                    integer_part = parts[0].replace('.', '')
-                    decimal_part = parts[1]
-                    final_price = f"{integer_part}.{decimal_part}"
-                    logger.debug(f"네덜란드 쉼표→점 변환: '{final_price}'")
-                    
-                    # 최종 검증
-                    if re.match(r'^\d+\.\d{1,2}$', final_price):
-                        return final_price
-                else:
-                    # 쉼표가 있지만 소수점이 아닌 경우
-                    cleaned = cleaned.replace(',', '')
-            
-            # 끝에 점만 있는 경우 처리 (예: "294." -> "294")
-            if cleaned.endswith('.') and len(cleaned) > 1:
-                cleaned_no_dot = cleaned[:-1]
-                if cleaned_no_dot.isdigit():
-                    logger.debug(f"끝 점 제거: '{cleaned}' -> '{cleaned_no_dot}'")
-                    cleaned = cleaned_no_dot
-            
-            # 정수 가격 또는 점으로 구분된 가격
-            if re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                try:
-                    price_value = float(cleaned)
-                    logger.info(f"네덜란드 최종 가격 검증: '{cleaned}' -> {price_value}")
-                    if 1 <= price_value <= 50000:
-                        logger.info(f"네덜란드 가격 파싱 성공: {cleaned}")
-                        return cleaned
-                    else:
-                        logger.debug(f"가격 범위 벗어남: {price_value}")
-                except Exception as e:
-                    logger.debug(f"float 변환 실패: {cleaned} - {e}")
-                    pass
-                
-        except Exception as e:
-            logger.debug(f"네덜란드 가격 파싱 오류: {price_text} - {e}")
-            
-        return None
+        """네덜란드 가격 파싱 (price_parser 공통 규칙, 1~50000유로, 예: 1.234,56 / 294.)"""
+        logger.debug(f"네덜란드 가격 파싱: '{price_text}'")
+        price = parse_price(price_text, 'nl', strict=True, bounds=(1, 50000))
+        if price is not None:
+            self.last_price_text = price_text
+        return format_price(price)
     
     def extract_price(self):
         """네덜란드 가격 추출 (개선된 버전) - 메인 상품 영역만 타겟팅"""
@@ -880,10 +698,11 @@ class AmazonNLScraper:
                 else:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 
-                for element in elements:
+                excluded = self.price_exclusion_reasons(elements)
+                for element, excluded_reason in zip(elements, excluded):
                     try:
                         if element.is_displayed():
-                            if self.is_excluded_price_element(element):
+                            if excluded_reason:
                                 continue
                             
                             text = self.extract_clean_text_from_element(element, "가격")
@@ -928,8 +747,7 @@ class AmazonNLScraper:
                     whole_elem.is_displayed() and fraction_elem.is_displayed()):
                     
                     # 제외 요소 확인
-                    if (self.is_excluded_price_element(whole_elem) or 
-                        self.is_excluded_price_element(fraction_elem)):
+                    if any(self.price_exclusion_reasons([whole_elem, fraction_elem])):
                         continue
                     
                     whole_text = whole_elem.text.strip()
@@ -963,34 +781,15 @@ class AmazonNLScraper:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
                 # 네덜란드 재고 없음 메시지 확인
-                dutch_out_of_stock = [
-                    'attualmente non disponibile',
-                    'non disponibile', 
-                    'esaurito',
-                    'temporaneamente non disponibile',
-                    'currently unavailable',
-                    'out of stock',
-                    'temporarily out of stock'
-                ]
-                
-                if any(phrase in availability_text for phrase in dutch_out_of_stock):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"네덜란드 재고 없음: {availability_text}")
                     return False
                     
                 # 네덜란드 재고 있음 메시지 확인
-                dutch_in_stock = [
-                    'disponibile',
-                    'in stock',
-                    'disponibilità immediata',
-                    'pronto per la spedizione',
-                    'only',
-                    'left in stock',
-                    'disponibili'
-                ]
-                
-                if any(phrase in availability_text for phrase in dutch_in_stock):
+                if IN_STOCK in stock:
                     logger.info(f"네덜란드 재고 있음: {availability_text}")
                     return True
                     
@@ -1020,8 +819,14 @@ class AmazonNLScraper:
             logger.warning(f"네덜란드 재고 확인 중 오류: {e}")
             return True
 
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code='nl', channel_name='amazon.nl', vat=row_data.get('vat', 'o'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """네덜란드 제품 정보 추출"""
+        self.last_price_text = None
         try:
             logger.info("=" * 60)
             logger.info("네덜란드 제품 정보 추출 시작")
@@ -1029,21 +834,27 @@ class AmazonNLScraper:
             logger.info(f"브랜드: {row_data.get('brand', 'N/A')}")
             logger.info(f"제품: {row_data.get('item', 'N/A')}")
             
-            self.driver.get(url)
-            time.sleep(random.uniform(3, 5))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(3, 5))
+            
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단 검사에서 공유 (문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
             
             # 차단 페이지 확인 및 처리
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.info("네덜란드 차단 페이지 감지 - 복구 시도")
-                if self.handle_captcha_or_block_page(original_url=url):
+                if self.handle_captcha_or_block_page(original_url=url, page=page):
                     logger.info("네덜란드 차단 페이지 복구 완료")
                     time.sleep(3)
                     self.wait_for_page_load()
+                    page.invalidate()
                 else:
                     raise Exception("네덜란드 차단 페이지 복구 실패")
             
             # 복구 후 현재 URL 확인
-            current_url = self.driver.current_url.lower()
+            current_url = page.url.lower()
             logger.info(f"현재 페이지 URL: {current_url}")
             
             # 정상 Amazon 제품 페이지인지 확인
@@ -1079,47 +890,8 @@ class AmazonNLScraper:
             except Exception as e:
                 logger.error(f"제품 페이지 검증 실패: {e}")
                 raise Exception("제품 페이지 접근 실패")
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
 
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'nl',
-                'ships_from': None,
-                'channel_name': 'amazon.nl',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            result = self.build_base_result(url, row_data)
             
             # 제목 추출
             result['title'] = self.extract_element_text(
@@ -1218,6 +990,7 @@ class AmazonNLScraper:
             logger.info(f"판매자: {result['sold_by']}")
             logger.info(f"배송지: {result['ships_from']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -1238,37 +1011,7 @@ class AmazonNLScraper:
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
             
             # 실패 시 기본 결과 반환
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'nl',
-                'ships_from': None,
-                'channel_name': 'amazon.nl',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'o')
-            }
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """네덜란드 크롤링 대상 URL 목록 조회"""
@@ -1301,7 +1044,7 @@ class AmazonNLScraper:
         try:
             table_name = 'amazon_price_crawl_tbl_nl'
 
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"네덜란드 DB 저장 완료: {len(df)}개 레코드 -> {table_name}")
             
             return True
@@ -1362,6 +1105,9 @@ class AmazonNLScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_nl_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1427,7 +1173,7 @@ class AmazonNLScraper:
             logger.error("네덜란드 드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
         
         try:
@@ -1457,14 +1203,9 @@ class AmazonNLScraper:
                 
                 # 중간 저장 (10개마다)
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            interim_df.to_sql('amazon_price_crawl_tbl_nl', self.db_engine, 
-                                            if_exists='append', index=False)
-                            logger.info("네덜란드 중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"네덜란드 중간 저장 실패: {e}")
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        submit_results(interim_df, 'amazon_price_crawl_tbl_nl', self.db_engine, self.country_code)
                 
                 # 대기 시간
                 if idx < len(urls_data) - 1:
@@ -1492,7 +1233,7 @@ class AmazonNLScraper:
                 self.driver.quit()
                 logger.info("네덜란드 드라이버 종료")
         
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """네덜란드 결과 분석"""
@@ -1515,7 +1256,7 @@ class AmazonNLScraper:
             
             try:
                 # 네덜란드 가격 숫자 변환
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("네덜란드 가격 통계 (€):")
                 logger.info(f"   평균가: €{price_df['price_numeric'].mean():.2f}")
@@ -0,0 +1,276 @@
+"""
+리테일러 크롤러 통합 실행기
+- *_v2 크롤러들을 각각 별도 프로세스로 동시에 실행 (서로 다른 도메인이므로 병렬 가능)
+- 프로세스 단위 격리: 한 리테일러가 죽어도 다른 리테일러는 계속 진행
+- 비정상 종료 시 리테일러별 자동 재시작 (횟수 제한 + 백오프)
+- 리테일러별 동시 브라우저 수(POOL_WORKERS) 예산 지정
+- 각 크롤러가 남긴 실행 요약(RUN_SUMMARY_FILE)을 하나의 리포트로 취합
+  (요약을 남기지 않은 리테일러는 0건으로 합산하지 않고 missing_summary로 따로 표시)
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pytz
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 리테일러 목록: 이름 -> 실행 스크립트 / 추가 환경변수 / 기본 동시 브라우저 수
+# interactive=True인 크롤러는 수동 Cloudflare 통과(input 대기)가 필요하므로 기본 실행 대상에서 제외
+RETAILERS = {
+    'usa': {'script': 'usa_v2.py', 'env': {'COUNTRY_CODE': 'usa'}, 'workers': 2},
+    'jp': {'script': 'jp_v2.py', 'env': {'COUNTRY_CODE': 'jp'}, 'workers': 2},
+    'es': {'script': 'es_v2.py', 'env': {'COUNTRY_CODE': 'es'}, 'workers': 1},
+    'de': {'script': 'de_v2.py', 'env': {}, 'workers': 1},
+    'fr': {'script': 'fr_v2.py', 'env': {}, 'workers': 1},
+    'it': {'script': 'it_v2.py', 'env': {}, 'workers': 1},
+    'in': {'script': 'in_v2.py', 'env': {}, 'workers': 1},
+    'au': {'script': 'au_v2.py', 'env': {}, 'workers': 1},
+    'gb': {'script': 'uk_v2.py', 'env': {}, 'workers': 1},
+    'usa_bestbuy': {'script': 'bestbuy_v2.py', 'env': {}, 'workers': 1},
+    'gb_currys': {'script': 'currys_v2.py', 'env': {}, 'workers': 1},
+    'nl_coolblue': {'script': 'coolblue_nl_v2.py', 'env': {}, 'workers': 1},
+    'kr_danawa': {'script': 'danawa_v2.py', 'env': {}, 'workers': 1},
+    'de_mediamarkt': {'script': 'mediamarkt_v2.py', 'env': {}, 'workers': 1},
+    'fr_fnac': {'script': 'fnac.py', 'env': {}, 'workers': 1},
+    'pl_xkom': {'script': 'xkom_v2.py', 'env': {}, 'workers': 1, 'interactive': True},
+}
+
+
+def parse_workers_override(value):
+    """ORCH_WORKERS="usa=3,jp=2" 형식 파싱"""
+    overrides = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        name, count = item.split('=', 1)
+        try:
+            overrides[name.strip()] = max(1, int(count))
+        except ValueError:
+            logger.warning(f"ORCH_WORKERS 항목 무시: {item}")
+    return overrides
+
+
+class RetailerRun:
+    """리테일러 1개의 실행/재시작 관리"""
+
+    def __init__(self, name, spec, workers, max_restarts, log_dir, timeout=None):
+        self.name = name
+        self.spec = spec
+        self.workers = workers
+        self.max_restarts = max_restarts
+        self.log_dir = log_dir
+        self.timeout = timeout
+
+    def build_env(self, summary_path):
+        env = os.environ.copy()
+        env.update(self.spec.get('env', {}))
+        env['POOL_WORKERS'] = str(self.workers)
+        env['RUN_SUMMARY_FILE'] = summary_path
+        env['PYTHONUNBUFFERED'] = '1'
+        return env
+
+    def run(self):
+        """스크립트 실행 (비정상 종료 시 재시작)"""
+        report = {
+            'retailer': self.name,
+            'script': self.spec['script'],
+            'workers': self.workers,
+            'attempts': [],
+            'status': 'failed',
+            'summary': None
+        }
+        started = time.time()
+
+        for attempt in range(1, self.max_restarts + 2):
+            summary_fd, summary_path = tempfile.mkstemp(prefix=f'{self.name}_', suffix='.json')
+            os.close(summary_fd)
+            os.remove(summary_path)
+
+            log_path = os.path.join(
+                self.log_dir,
+                f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{attempt}.log"
+            )
+            attempt_started = time.time()
+            logger.info(f"▶️ [{self.name}] 실행 ({attempt}/{self.max_restarts + 1}) - 브라우저 {self.workers}개, 로그: {log_path}")
+
+            try:
+                with open(log_path, 'w', encoding='utf-8') as log_file:
+                    proc = subprocess.run(
+                        [sys.executable, os.path.join(BASE_DIR, self.spec['script'])],
+                        cwd=BASE_DIR,
+                        env=self.build_env(summary_path),
+                        stdin=subprocess.DEVNULL,
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT,
+                        timeout=self.timeout
+                    )
+                returncode = proc.returncode
+            except subprocess.TimeoutExpired:
+                logger.error(f"⏰ [{self.name}] 실행 시간 초과 ({self.timeout}초)")
+                returncode = 'timeout'
+            except Exception as e:
+                logger.error(f"❌ [{self.name}] 실행 오류: {e}")
+                returncode = 'error'
+
+            summary = None
+            if os.path.exists(summary_path):
+                try:
+                    with open(summary_path, 'r', encoding='utf-8') as f:
+                        summary = json.load(f)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] 실행 요약 읽기 실패: {e}")
+                finally:
+                    os.remove(summary_path)
+
+            report['attempts'].append({
+                'attempt': attempt,
+                'returncode': returncode,
+                'elapsed_sec': round(time.time() - attempt_started, 1),
+                'log_file': log_path
+            })
+            if summary is not None:
+                report['summary'] = summary
+
+            if returncode == 0:
+                report['status'] = 'success'
+                logger.info(f"✅ [{self.name}] 완료 ({time.time() - attempt_started:.0f}초)")
+                break
+
+            logger.warning(f"⚠️ [{self.name}] 비정상 종료 (코드: {returncode})")
+            if attempt <= self.max_restarts:
+                backoff = 30 * attempt
+                logger.info(f"🔁 [{self.name}] {backoff}초 후 재시작")
+                time.sleep(backoff)
+
+        report['elapsed_sec'] = round(time.time() - started, 1)
+        return report
+
+
+def build_report(reports, started_at):
+    """리테일러별 결과를 하나의 리포트로 취합"""
+    korea_tz = pytz.timezone('Asia/Seoul')
+    totals = {'target_count': 0, 'crawled_count': 0}
+    missing_summary = []
+    for report in reports:
+        summary = report.get('summary')
+        if summary is None:
+            missing_summary.append(report['retailer'])
+            continue
+        totals['target_count'] += int(summary.get('target_count') or 0)
+        totals['crawled_count'] += int(summary.get('crawled_count') or 0)
+
+    return {
+        'started_at': started_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'finished_at': datetime.now(korea_tz).strftime('%Y-%m-%d %H:%M:%S'),
+        'retailer_count': len(reports),
+        'success_count': sum(1 for r in reports if r['status'] == 'success'),
+        'critical_count': sum(1 for r in reports if (r.get('summary') or {}).get('is_critical')),
+        'totals': totals,
+        'missing_summary': sorted(missing_summary),
+        'retailers': sorted(reports, key=lambda r: r['retailer'])
+    }
+
+
+def log_report(report):
+    logger.info("=" * 80)
+    logger.info("통합 실행 리포트")
+    logger.info("=" * 80)
+    for r in report['retailers']:
+        summary = r.get('summary')
+        if summary is None:
+            logger.info(
+                f"{r['retailer']:<15} {r['status']:<8} 시도 {len(r['attempts'])}회 | "
+                f"실행 요약 없음 | {r['elapsed_sec']:.0f}초"
+            )
+            continue
+        price_stats = (summary.get('field_stats') or {}).get('retailprice', {})
+        logger.info(
+            f"{r['retailer']:<15} {r['status']:<8} 시도 {len(r['attempts'])}회 | "
+            f"{summary.get('crawled_count', '-')}/{summary.get('target_count', '-')}개 | "
+            f"가격 빈값 {price_stats.get('empty_rate', '-')}% | {r['elapsed_sec']:.0f}초"
+        )
+    logger.info(f"성공: {report['success_count']}/{report['retailer_count']} | 긴급: {report['critical_count']}")
+    if report['missing_summary']:
+        logger.warning(f"⚠️ 실행 요약 없음 (합계에서 제외): {', '.join(report['missing_summary'])}")
+
+
+def main():
+    """메인 실행 함수"""
+    korea_tz = pytz.timezone('Asia/Seoul')
+    started_at = datetime.now(korea_tz)
+
+    requested = [r.strip() for r in os.getenv('ORCH_RETAILERS', '').split(',') if r.strip()]
+    if requested:
+        unknown = [r for r in requested if r not in RETAILERS]
+        if unknown:
+            logger.warning(f"알 수 없는 리테일러 무시: {unknown}")
+        names = [r for r in requested if r in RETAILERS]
+    else:
+        names = [name for name, spec in RETAILERS.items() if not spec.get('interactive')]
+
+    max_parallel = int(os.getenv('ORCH_MAX_PARALLEL', '0')) or len(names)
+    max_restarts = int(os.getenv('ORCH_MAX_RESTARTS', '2'))
+    timeout = int(os.getenv('ORCH_TIMEOUT', '0')) or None
+    workers_override = parse_workers_override(os.getenv('ORCH_WORKERS', ''))
+    log_dir = os.getenv('ORCH_LOG_DIR', os.path.join(BASE_DIR, 'logs'))
+    os.makedirs(log_dir, exist_ok=True)
+
+    logger.info("=" * 80)
+    logger.info(f"통합 크롤링 시작: {len(names)}개 리테일러, 동시 실행 {max_parallel}개")
+    logger.info("=" * 80)
+
+    runs = [
+        RetailerRun(
+            name,
+            RETAILERS[name],
+            workers_override.get(name, RETAILERS[name]['workers']),
+            max_restarts,
+            log_dir,
+            timeout
+        )
+        for name in names
+    ]
+
+    reports = []
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {executor.submit(run.run): run.name for run in runs}
+        for future in as_completed(futures):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                logger.error(f"[{futures[future]}] 감독 스레드 오류: {e}")
+                reports.append({'retailer': futures[future], 'status': 'failed', 'attempts': [], 'elapsed_sec': 0, 'summary': None})
+
+    report = build_report(reports, started_at)
+    log_report(report)
+
+    report_path = os.path.join(log_dir, f"orchestrator_report_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    logger.info(f"리포트 저장: {report_path}")
+
+    return 0 if report['success_count'] == report['retailer_count'] else 1
+
+
+if __name__ == "__main__":
+    print("환경변수 설정:")
+    print("export ORCH_RETAILERS=usa,jp,usa_bestbuy  # 실행할 리테일러 (기본: 수동 개입 필요 없는 전체)")
+    print("export ORCH_MAX_PARALLEL=4                # 동시 실행 프로세스 수 (기본: 전체)")
+    print("export ORCH_WORKERS=usa=3,jp=2            # 리테일러별 동시 브라우저 수")
+    print("export ORCH_MAX_RESTARTS=2                # 비정상 종료 시 재시작 횟수")
+    print("export ORCH_TIMEOUT=3300                  # 리테일러별 실행 제한 시간(초, 선택)")
+    print()
+
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+이벤트 기반 페이지 준비 대기 / 조기 로딩 중단
+- 고정 sleep / 1초 간격 폴링 대신 브라우저 안에 MutationObserver를 설치해
+  리테일러의 가격/제목 노드가 DOM에 나타나는 순간 바로 반환
+- execute_async_script 1회로 대기하므로 대기 중 WebDriver 왕복 없음
+- 리테일러별 대기 한도는 READY_TIMEOUT_{RETAILER} 환경변수 하나로 설정 (예: READY_TIMEOUT_AMAZON=15)
+- PAGE_LOAD_STRATEGY_{RETAILER}=eager/none 이면 제목+가격이 보이는 즉시 Page.stopLoading으로
+  광고/추천/트래커 로딩을 끊고, NAV_DEADLINE_{RETAILER} 초가 지나면 재시도 가능한 NavigationTimeout
+"""
+
+import logging
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from render_profile import get_render_profile
+
+logger = logging.getLogger(__name__)
+
+LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+# Amazon 공통: 제목 + (가격 또는 재고 표시)가 있으면 추출 가능한 상태
+AMAZON_READY_GROUPS = [
+    {'selectors': ['#productTitle', '#title']},
+    {'selectors': [
+        '#corePrice_feature_div .a-offscreen',
+        '#corePriceDisplay_desktop_feature_div .a-price-whole',
+        '#apex_desktop .a-price .a-offscreen',
+        '#priceblock_ourprice',
+        '#availability',
+        '#outOfStock'
+    ]}
+]
+
+# Amazon 차단(캡차/Continue shopping) 페이지 - 나타나면 필드 대기 없이 바로 반환
+AMAZON_BLOCK_SELECTORS = [
+    'form[action*="validateCaptcha"]',
+    "//button[contains(., 'Continue shopping') or contains(., 'Weiter shoppen')]"
+]
+
+# arguments[0]: 조건 그룹 [{selectors, pattern}] (모든 그룹이 만족돼야 준비 완료)
+# arguments[1]: 하나라도 나타나면 즉시 반환할 선택자 (차단 페이지 등)
+# arguments[2]: 대기 한도(ms), arguments[3]: true면 readyState가 complete가 되어도 반환
+# 마지막 인자: execute_async_script 완료 콜백
+WAIT_FOR_NODES_JS = r"""
+const groups = arguments[0].map(function (group) {
+    return {selectors: group.selectors, pattern: group.pattern ? new RegExp(group.pattern) : null};
+});
+const escapeSelectors = arguments[1] || [];
+const timeoutMs = arguments[2];
+const returnOnComplete = arguments[3];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+
+function findFirst(selector) {
+    try {
+        if (selector.startsWith('/') || selector.startsWith('(')) {
+            return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(selector);
+    } catch (e) {
+        return null;
+    }
+}
+
+// 그룹 안에서 선택자 순서대로 조건을 만족하는 첫 번째 선택자 (없으면 null)
+function matchGroup(group) {
+    for (const selector of group.selectors) {
+        const node = findFirst(selector);
+        if (!node) continue;
+        if (group.pattern && !group.pattern.test((node.textContent || '').trim())) continue;
+        return selector;
+    }
+    return null;
+}
+
+function check() {
+    for (const selector of escapeSelectors) {
+        if (findFirst(selector)) return {matched: null, escaped: selector};
+    }
+    const matched = [];
+    for (const group of groups) {
+        const selector = matchGroup(group);
+        if (selector === null) return null;
+        matched.push(selector);
+    }
+    return {matched: matched, escaped: null};
+}
+
+let finished = false;
+let observer = null;
+let timer = null;
+
+function finish(state) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    if (timer) clearTimeout(timer);
+    document.removeEventListener('readystatechange', onReadyState);
+    done({
+        matched: state ? state.matched : null,
+        escaped: state ? state.escaped : null,
+        elapsed_ms: Math.round(performance.now() - started),
+        ready_state: document.readyState,
+        stale: !!window.__readinessStale
+    });
+}
+
+function onReadyState() {
+    if (returnOnComplete && document.readyState === 'complete') finish(check());
+}
+
+// 이전 페이지 문서에서 실행된 경우(none 전략): 새 문서로 넘어가며 스크립트가 중단될 때까지 대기만 함
+if (!window.__readinessStale) {
+    const initial = check();
+    if (initial !== null || (returnOnComplete && document.readyState === 'complete')) {
+        finish(initial);
+        return;
+    }
+    observer = new MutationObserver(function () {
+        const state = check();
+        if (state !== null) finish(state);
+    });
+    observer.observe(document.documentElement || document, {
+        childList: true,
+        subtree: true,
+        characterData: groups.some(function (group) { return group.pattern !== null; })
+    });
+    document.addEventListener('readystatechange', onReadyState);
+}
+timer = setTimeout(function () { finish(window.__readinessStale ? null : check()); }, timeoutMs);
+"""
+
+
+class NavigationTimeout(Exception):
+    """탐색 한도 초과 - 워커를 멈추지 않고 재시도 대상으로 처리"""
+    pass
+
+
+def _env_float(name, default, minimum):
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(float(value), minimum)
+    except ValueError:
+        logger.warning(f"{name} 값이 잘못됨: {value} -> {default}초 사용")
+        return default
+
+
+def get_ready_timeout(retailer, default=15):
+    """리테일러별 준비 대기 한도(초) - READY_TIMEOUT_{RETAILER} 환경변수"""
+    return _env_float(f'READY_TIMEOUT_{retailer.upper()}', default, 0.5)
+
+
+def get_navigation_deadline(retailer, default=60):
+    """리테일러별 탐색 한도(초) - NAV_DEADLINE_{RETAILER} 환경변수 (driver.get + 필드 대기 전체)"""
+    return _env_float(f'NAV_DEADLINE_{retailer.upper()}', default, 5)
+
+
+def get_page_load_strategy(retailer, default='normal'):
+    """리테일러별 페이지 로드 전략 - PAGE_LOAD_STRATEGY_{RETAILER} 환경변수 > 튜닝된 렌더링 프로필 (normal/eager/none)"""
+    render = get_render_profile(retailer)
+    if render is not None:
+        default = render['load_strategy']
+    name = f'PAGE_LOAD_STRATEGY_{retailer.upper()}'
+    strategy = (os.getenv(name, default) or default).strip().lower()
+    if strategy not in LOAD_STRATEGIES:
+        logger.warning(f"{name} 값이 잘못됨: {strategy} -> {default} 사용")
+        return default
+    return strategy
+
+
+def apply_page_load_strategy(options, strategy):
+    """ChromeOptions에 로드 전략 설정 (normal이면 기본값 유지)"""
+    if strategy != 'normal':
+        options.page_load_strategy = strategy
+        logger.info(f"페이지 로드 전략: {strategy}")
+    return options
+
+
+def stop_loading(driver):
+    """남은 리소스 로딩 중단 (CDP Page.stopLoading, 실패 시 window.stop())"""
+    try:
+        driver.execute_cdp_cmd('Page.stopLoading', {})
+    except Exception:
+        try:
+            driver.execute_script('window.stop();')
+        except Exception as e:
+            logger.debug(f"로딩 중단 실패: {e}")
+
+
+def _wait_for_groups(driver, groups, timeout, escape=(), return_on_complete=False):
+    """WAIT_FOR_NODES_JS 실행 (스크립트 오류는 호출측으로 전달)"""
+    # 브라우저 측 타이머가 먼저 끝나도록 여유를 둠
+    driver.set_script_timeout(timeout + 5)
+    result = driver.execute_async_script(
+        WAIT_FOR_NODES_JS, list(groups), list(escape), int(timeout * 1000), return_on_complete
+    )
+    return result if isinstance(result, dict) else {}
+
+
+def wait_until_ready(driver, selectors, timeout, text_pattern=None):
+    """
+    선택자 중 하나가 DOM에 나타날 때까지 대기 (MutationObserver)
+
+    Args:
+        driver: Selenium WebDriver
+        selectors: XPath/CSS 선택자 목록 (앞에 있을수록 우선)
+        timeout: 대기 한도(초)
+        text_pattern: 노드 textContent가 만족해야 하는 JS 정규식 (예: 가격 값이 채워졌는지 확인)
+
+    Returns:
+        str: 처음 조건을 만족한 선택자 / 한도 초과 또는 오류 시 None
+    """
+    started = time.perf_counter()
+
+    try:
+        result = _wait_for_groups(driver, [{'selectors': list(selectors), 'pattern': text_pattern}], timeout)
+    except Exception as e:
+        # 대기 중 리다이렉트 등으로 스크립트가 중단된 경우: 남은 시간 동안 readyState만 확인
+        logger.debug(f"준비 대기 스크립트 오류 - readyState 대기로 대체: {e}")
+        remaining = max(timeout - (time.perf_counter() - started), 0.5)
+        try:
+            WebDriverWait(driver, remaining).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except Exception:
+            pass
+        return None
+
+    matched = (result.get('matched') or [None])[0]
+    if matched:
+        logger.info(f"⚡ 페이지 준비 완료: {result.get('elapsed_ms')}ms ({matched[:60]})")
+    else:
+        logger.warning(f"⚠️ 페이지 준비 대기 한도 초과: {timeout}초")
+    return matched
+
+
+def navigate(driver, url, strategy, deadline, ready_groups=None, escape=()):
+    """
+    로드 전략에 맞춰 페이지 이동
+
+    - normal: driver.get()이 load 이벤트까지 대기 (set_page_load_timeout 초과 시 NavigationTimeout)
+    - eager/none: ready_groups가 모두 나타나는 즉시 로딩 중단 후 반환.
+      차단 페이지(escape)가 보이거나 로딩이 끝났는데 필드가 없으면 그대로 반환해 호출측 차단/재고 처리에 맡김
+
+    Args:
+        driver: Selenium WebDriver (setup_driver에서 set_page_load_timeout(deadline) 설정)
+        url: 이동할 URL
+        strategy: 'normal' / 'eager' / 'none'
+        deadline: 탐색 한도(초)
+        ready_groups: 모두 만족해야 하는 조건 그룹 [{'selectors': [...], 'pattern': 정규식 또는 None}]
+        escape: 나타나면 즉시 반환할 선택자
+
+    Returns:
+        bool: 핵심 필드를 확인하고 로딩을 중단했으면 True (호출측 고정 대기 생략 가능)
+
+    Raises:
+        NavigationTimeout: 한도 안에 페이지가 준비되지 않음 (재시도 대상)
+    """
+    started = time.perf_counter()
+
+    if strategy != 'normal' and ready_groups:
+        # none 전략에서는 driver.get()이 즉시 반환되므로 이전 문서에서 대기 스크립트가 돌지 않도록 표시
+        try:
+            driver.execute_script('window.__readinessStale = true;')
+        except Exception:
+            pass
+
+    try:
+        driver.get(url)
+    except TimeoutException:
+        stop_loading(driver)
+        raise NavigationTimeout(f"페이지 로드 한도 초과 ({deadline}초): {url}")
+
+    if strategy == 'normal' or not ready_groups:
+        return False
+
+    while True:
+        remaining = deadline - (time.perf_counter() - started)
+        if remaining <= 0:
+            break
+        try:
+            result = _wait_for_groups(driver, ready_groups, remaining, escape, return_on_complete=True)
+        except Exception as e:
+            # 이전 문서에서 실행된 스크립트가 새 문서로 넘어가며 중단된 경우 새 문서에서 다시 대기
+            logger.debug(f"준비 대기 재시도: {e}")
+            time.sleep(0.2)
+            continue
+
+        if result.get('stale'):
+            continue
+        if result.get('matched'):
+            stop_loading(driver)
+            logger.info(f"⚡ 핵심 필드 확인 후 로딩 중단: {result.get('elapsed_ms')}ms")
+            return True
+        if result.get('escaped'):
+            logger.info(f"차단 페이지 요소 감지: {result['escaped'][:60]}")
+            return False
+        if result.get('ready_state') == 'complete':
+            logger.info("로딩 완료 - 핵심 필드 일부 없음 (품절/차단 페이지 가능)")
+            return False
+
+    stop_loading(driver)
+    raise NavigationTimeout(f"페이지 준비 한도 초과 ({deadline}초): {url}")
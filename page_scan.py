@@ -0,0 +1,237 @@
+"""
+브라우저 내 차단/재고 패턴 검사
+- 차단/캡차/재고 판정을 위해 page_source 전체(수 MB)를 Python으로 가져오던 대신
+  execute_script 한 번으로 브라우저 안에서 document.title + document.body.innerText를 검사
+- 일치한 패턴 ID 목록만 반환 (페이지당 수백 바이트)
+- 패턴: 문자열(대소문자 무시 부분 일치, ID = 소문자 문자열) 또는 text_pattern / html_pattern / regex_pattern
+  - 라틴 문자/숫자로 시작/끝나는 text 패턴은 단어 경계에서만 일치 (pattern_registry 정규식과 같은 규칙,
+    브라우저 검사 / 캐시 검사 모두 contains_word 기준)
+  - text: 제목 + 보이는 본문 텍스트 (기본)
+  - html: 마크업 안의 표시(클래스명/스크립트 도메인 등) - 직렬화는 브라우저 안에서만 수행
+- 이미 소스를 가져온 경우(HtmlSnapshot / PageSnapshot 캐시)는 같은 패턴을 Python에서 검사 (scan_text)
+  - 이때도 text 패턴은 소스에서 뽑은 보이는 텍스트(visible_text)에서만 찾음 - 브라우저 innerText와 같은 기준
+"""
+
+import logging
+import re
+import unicodedata
+
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+SCOPE_TEXT = 'text'
+SCOPE_HTML = 'html'
+
+# innerText에 들어가지 않는 요소
+_INVISIBLE_TAGS = {'head', 'title', 'script', 'style', 'noscript', 'template', 'meta', 'link'}
+# innerText에서 줄이 바뀌는 요소
+_BLOCK_TAGS = {'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset',
+               'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+               'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'}
+_HIDDEN_STYLE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.IGNORECASE)
+
+# arguments[0]: [{id, text, regex, scope, boundary}] - text는 소문자, boundary는 [앞 경계, 뒤 경계]
+SCAN_PATTERNS_JS = r"""
+const patterns = arguments[0];
+const WORD = /[\p{L}\p{N}_]/u;
+const isWord = (ch) => ch !== '' && WORD.test(ch);
+const contains = (haystack, needle, boundary) => {
+    const before = boundary && boundary[0];
+    const after = boundary && boundary[1];
+    let at = haystack.indexOf(needle);
+    while (at !== -1) {
+        if (!(before && isWord(haystack.charAt(at - 1))) && !(after && isWord(haystack.charAt(at + needle.length)))) {
+            return true;
+        }
+        at = haystack.indexOf(needle, at + 1);
+    }
+    return false;
+};
+const title = (document.title || '').toLowerCase();
+const body = document.body ? (document.body.innerText || '').toLowerCase() : '';
+const text = title + '\n' + body;
+let markup = null;
+
+const matched = [];
+for (const pattern of patterns) {
+    let haystack = text;
+    if (pattern.scope === 'html') {
+        if (markup === null) {
+            markup = title + '\n' + (document.documentElement ? document.documentElement.outerHTML.toLowerCase() : '');
+        }
+        haystack = markup;
+    }
+    let hit = false;
+    if (pattern.regex) {
+        try {
+            hit = new RegExp(pattern.regex, 'im').test(haystack);
+        } catch (e) {
+            hit = false;
+        }
+    } else {
+        hit = contains(haystack, pattern.text, pattern.boundary);
+    }
+    if (hit) matched.push(pattern.id);
+}
+return matched;
+"""
+
+
+def needs_boundary(char):
+    """
+    패턴 앞/끝 글자에 단어 경계를 둘지 (라틴 문자/숫자만)
+
+    일본어/한국어는 띄어쓰기 없이 붙거나 조사가 붙으므로 부분 일치 그대로 둠
+    """
+    if not char or not (char.isalnum() or char == '_'):
+        return False
+    return char.isascii() or unicodedata.name(char, '').startswith('LATIN')
+
+
+def _is_word_char(char):
+    """정규식 단어 문자와 같은 기준 (브라우저 검사의 WORD: 문자/숫자/밑줄)"""
+    return bool(char) and (char.isalnum() or char == '_')
+
+
+def contains_word(haystack, text, boundary=None):
+    """
+    부분 일치 (boundary=(앞, 뒤): True인 쪽은 단어 문자가 붙어 있으면 일치로 보지 않음)
+
+    SCAN_PATTERNS_JS의 contains와 같은 규칙
+    """
+    before, after = boundary or (False, False)
+    at = haystack.find(text)
+    while at != -1:
+        if not (before and at > 0 and _is_word_char(haystack[at - 1])) and \
+                not (after and _is_word_char(haystack[at + len(text):at + len(text) + 1])):
+            return True
+        at = haystack.find(text, at + 1)
+    return False
+
+
+def _is_visible(node):
+    if not isinstance(node.tag, str) or node.tag.lower() in _INVISIBLE_TAGS:
+        return False
+    if node.get('hidden') is not None:
+        return False
+    return not _HIDDEN_STYLE.search(node.get('style') or '')
+
+
+def _collect_text(node, parts):
+    if node.text:
+        parts.append(node.text)
+    for child in node:
+        if _is_visible(child):
+            _collect_text(child, parts)
+            if child.tag.lower() in _BLOCK_TAGS:
+                parts.append('\n')
+        if child.tail:
+            parts.append(child.tail)
+
+
+def visible_text(tree):
+    """
+    lxml 트리의 보이는 본문 텍스트 (브라우저 document.body.innerText 근사)
+
+    script/style/noscript/template, hidden 속성, 인라인 display:none / visibility:hidden 요소는 제외.
+    스타일시트로 숨긴 요소까지는 알 수 없으므로 innerText보다 약간 넓을 수 있음
+    """
+    if tree is None:
+        return ''
+    body = tree.find('.//body')
+    parts = []
+    _collect_text(body if body is not None else tree, parts)
+    text = re.sub(r'[ \t\r\f\v\xa0]+', ' ', ''.join(parts))
+    return re.sub(r' ?\n[\s]*', '\n', text).strip()
+
+
+def html_visible_text(page_source):
+    """소스 문자열 -> visible_text (파싱 실패 시 빈 문자열)"""
+    try:
+        return visible_text(lxml_html.fromstring(page_source)) if (page_source or '').strip() else ''
+    except (etree.ParserError, ValueError):
+        return ''
+
+
+def text_pattern(text, pattern_id=None):
+    """제목 + 보이는 본문 텍스트 부분 일치 (대소문자 무시, 라틴 문자로 시작/끝나면 단어 경계)"""
+    text = text.lower()
+    boundary = [needs_boundary(text[:1]), needs_boundary(text[-1:])]
+    return {'id': pattern_id or text, 'text': text, 'regex': None, 'scope': SCOPE_TEXT, 'boundary': boundary}
+
+
+def html_pattern(text, pattern_id=None):
+    """마크업 부분 일치 (클래스명, 스크립트 URL 등 보이지 않는 표시)"""
+    text = text.lower()
+    return {'id': pattern_id or text, 'text': text, 'regex': None, 'scope': SCOPE_HTML, 'boundary': None}
+
+
+def regex_pattern(regex, pattern_id=None, scope=SCOPE_TEXT):
+    """정규식 (대소문자 무시, ^/$는 줄 단위)"""
+    return {'id': pattern_id or regex, 'text': None, 'regex': regex, 'scope': scope, 'boundary': None}
+
+
+def normalize_patterns(patterns):
+    """문자열/스펙 혼합 목록 -> 스펙 목록"""
+    return [text_pattern(p) if isinstance(p, str) else p for p in patterns]
+
+
+def scan_text(title, lower_text, patterns, lower_markup=None):
+    """
+    이미 가져온 소스로 같은 패턴 검사 (HtmlSnapshot / PageSnapshot 캐시용)
+
+    브라우저 검사(SCAN_PATTERNS_JS)와 같은 기준: text 패턴은 제목 + 보이는 텍스트,
+    html 패턴은 제목 + 마크업에서 찾음
+
+    Args:
+        title: 페이지 제목
+        lower_text: 소문자 보이는 텍스트 (visible_text)
+        patterns: 패턴 목록
+        lower_markup: 소문자 소스 (None이면 html 패턴도 lower_text에서 찾음)
+
+    Returns:
+        set: 일치한 패턴 ID
+    """
+    title = (title or '').lower()
+    text_haystack = title + '\n' + (lower_text or '')
+    markup_haystack = title + '\n' + lower_markup if lower_markup is not None else text_haystack
+    matched = set()
+    for pattern in normalize_patterns(patterns):
+        haystack = markup_haystack if pattern['scope'] == SCOPE_HTML else text_haystack
+        if pattern['regex']:
+            try:
+                hit = re.search(pattern['regex'], haystack, re.IGNORECASE | re.MULTILINE) is not None
+            except re.error:
+                hit = False
+        else:
+            hit = contains_word(haystack, pattern['text'], pattern.get('boundary'))
+        if hit:
+            matched.add(pattern['id'])
+    return matched
+
+
+def scan_page(driver, patterns):
+    """
+    브라우저 안에서 패턴 검사 (execute_script 1회)
+
+    스크립트 실행이 실패하면 page_source를 가져와 Python에서 검사 (text 패턴은 보이는 텍스트에서)
+
+    Args:
+        driver: Selenium WebDriver
+        patterns: 문자열 또는 text_pattern / html_pattern / regex_pattern 스펙 목록
+
+    Returns:
+        set: 일치한 패턴 ID (문자열 패턴은 소문자 문자열 자체)
+    """
+    specs = normalize_patterns(patterns)
+    if not specs:
+        return set()
+    try:
+        matched = driver.execute_script(SCAN_PATTERNS_JS, specs)
+        if isinstance(matched, list):
+            return set(matched)
+    except Exception as e:
+        logger.debug(f"브라우저 내 패턴 검사 실패 - page_source로 검사: {e}")
+    page_source = driver.page_source or ''
+    return scan_text(driver.title, html_visible_text(page_source).lower(), specs, page_source.lower())
@@ -0,0 +1,343 @@
+"""
+다국어 패턴 레지스트리 (차단/재고/라벨 판정)
+- 크롤러마다 흩어져 있던 차단 문구, Continue 문구, 재고 문구, 라벨 문구를 언어별로 한 곳에서 관리
+- 크롤러는 필요한 언어 조합으로 PatternMatcher를 만들어 모듈 상수로 재사용 (get_matcher는 조합별 캐시)
+- 언어별 목록에는 그 언어를 쓰는 크롤러들이 공통으로 쓰던 문구만 두고, 한 리테일러만 쓰던 문구는
+  RETAILER_PATTERNS에 둠 (get_matcher(..., retailer=)로 언어 패턴에 더함 - 다른 크롤러의 판정은 넓어지지 않음)
+- 404(없는 상품) 페이지는 NOT_FOUND - 차단이 아니므로 재시도/요청 간격 감속 대상이 아님
+- PatternMatcher는 언어마다 그 언어 패턴을 하나의 정규식(문자 트라이)으로 컴파일해 언어당 한 번만 훑고
+  일치한 패턴을 카테고리별로 분류 (classify) - 패턴마다 `in` / re.search 를 반복하지 않음
+- 라틴 문자로 시작/끝나는 패턴은 단어 경계에서만 일치 ('available'은 'unavailable' 안에서 일치하지 않음)
+- 페이지 검사는 PageSnapshot.classify(matcher): 소스를 이미 가져왔으면 같은 정규식으로,
+  아니면 page_scan으로 브라우저 안에서 검사해 일치한 패턴만 받아 분류
+"""
+
+import re
+from functools import lru_cache
+
+from page_scan import SCOPE_HTML, html_pattern, needs_boundary, normalize_patterns
+
+# 카테고리
+BLOCKED_TITLE = 'blocked_title'  # 제목에 있으면 차단/오류 페이지 (Amazon)
+WALL_TITLE = 'wall_title'        # 일반 리테일러 봇 차단 페이지 제목 (넓은 기준)
+BLOCKED = 'blocked'              # 캡차/봇 확인 본문
+CHALLENGE = 'challenge'          # Cloudflare 등 챌린지 페이지
+CONTINUE = 'continue'            # Continue shopping 류 중간 페이지 (버튼으로 복구 가능)
+ERROR_PAGE = 'error_page'        # 503/오류 페이지 (홈 링크로 복구 가능)
+OUT_OF_STOCK = 'out_of_stock'
+IN_STOCK = 'in_stock'
+LABEL_ONLY = 'label_only'        # Sold By / Ships From 라벨
+NORMAL_PAGE = 'normal_page'      # 정상 상품 페이지 표시 문구
+NOT_FOUND = 'not_found'          # 없는 상품/주소 (404) 페이지 - 차단 아님
+
+# 언어별 패턴 (소문자 비교, html_pattern은 브라우저 검사 시 마크업에서 찾음)
+PATTERNS = {
+    'en': {
+        BLOCKED_TITLE: ['503', 'access denied', 'error has occurred'],
+        WALL_TITLE: ['access denied', 'blocked', 'robot', 'captcha', 'sorry', 'error'],
+        BLOCKED: [
+            'enter the characters',
+            'verify you are human',
+            'access denied',
+            'automated access',
+            'suspicious activity'
+        ],
+        NOT_FOUND: [
+            'the web address you entered is not a functioning page on our site',
+            "we're sorry. the web address"
+        ],
+        CHALLENGE: ['verifying you are human', 'just a moment', 'checking your browser', 'ddos protection',
+                    html_pattern('cf-challenge')],
+        CONTINUE: ['continue shopping', 'click the button below'],
+        ERROR_PAGE: ['something went wrong', 'service unavailable', 'error has occurred',
+                     "we're sorry, an error has occurred. please reload this page and try again."],
+        OUT_OF_STOCK: [
+            'currently unavailable',
+            'out of stock',
+            'temporarily out of stock',
+            'currently not available',
+            'this item is currently unavailable',
+            'no featured offers available',
+            'sold out'
+        ],
+        IN_STOCK: ['in stock', 'only', 'left in stock', 'available'],
+        LABEL_ONLY: ['sold by', 'ships from'],
+        NORMAL_PAGE: ['add to cart', 'buy now', 'product title', 'price', 'availability',
+                      'customer reviews', 'product details', 'ships from', 'sold by']
+    },
+    'de': {
+        BLOCKED_TITLE: ['fehler aufgetreten', '503 - service nicht verfügbar'],
+        BLOCKED: ['geben sie die zeichen ein', 'beweisen sie dass sie ein mensch sind'],
+        CHALLENGE: ['einen moment'],
+        CONTINUE: ['weiter shoppen', 'weiter einkaufen', 'fortfahren', 'klicke auf die schaltfläche'],
+        ERROR_PAGE: ['tut uns leid', 'fehler beim verarbeiten ihrer anforderung', 'klicken sie hier',
+                     'amazon-startseite'],
+        OUT_OF_STOCK: ['nicht verfügbar', 'nicht auf lager', 'ausverkauft'],
+        IN_STOCK: ['auf lager', 'verfügbar'],
+        LABEL_ONLY: ['verkauft von', 'versendet von']
+    },
+    'fr': {
+        CONTINUE: ['cliquez sur le bouton ci-dessous pour continuer vos achats', 'continuer les achats',
+                   'continuer'],
+        OUT_OF_STOCK: ['non disponible', 'épuisé', 'rupture de stock'],
+        IN_STOCK: ['en stock', 'disponible'],
+        LABEL_ONLY: ['vendu par', 'expédié par']
+    },
+    'it': {
+        BLOCKED_TITLE: ['accesso negato', 'errore', 'ci dispiace'],
+        BLOCKED: ['inserisci i caratteri', 'controlla di essere umano', 'accesso negato', 'attività sospetta'],
+        CONTINUE: ['continua lo shopping'],
+        ERROR_PAGE: [
+            'ci dispiace',
+            'si è verificato un errore',
+            'si è verificato un errore quando abbiamo tentato di elaborare la richiesta',
+            'stiamo lavorando al problema',
+            'clicca qui per tornare',
+            'clicca qui per tornare alla home page di amazon',
+            'non sarà stato elaborato per il momento'
+        ],
+        OUT_OF_STOCK: ['attualmente non disponibile', 'non disponibile', 'esaurito',
+                       'temporaneamente non disponibile'],
+        IN_STOCK: ['disponibile', 'disponibilità immediata', 'pronto per la spedizione', 'disponibili'],
+        LABEL_ONLY: ['venduto da', 'spedito da']
+    },
+    'es': {
+        BLOCKED_TITLE: ['lo sentimos', 'se ha producido un error'],
+        CONTINUE: ['continuar comprando', 'seguir comprando'],
+        ERROR_PAGE: ['lo sentimos', 'se ha producido un error', 'error de servicio', 'algo salió mal',
+                     'haz clic aquí para volver'],
+        OUT_OF_STOCK: ['no disponible', 'agotado'],
+        IN_STOCK: ['disponible', 'en stock'],
+        LABEL_ONLY: ['vendido por', 'enviado por', 'gestionado por']
+    },
+    'nl': {
+        CONTINUE: ['verder winkelen'],
+        OUT_OF_STOCK: ['niet beschikbaar', 'tijdelijk niet op voorraad', 'uitverkocht'],
+        IN_STOCK: ['op voorraad'],
+        LABEL_ONLY: ['verkocht door', 'verzonden door']
+    },
+    'ja': {
+        CONTINUE: ['ショッピングを続ける'],
+        ERROR_PAGE: ['ご迷惑をおかけしています', 'お客様のリクエストの処理中にエラーが発生しました',
+                     'しばらくしてから', 'amazon.co.jpホームへ'],
+        OUT_OF_STOCK: ['在庫切れ', '現在在庫切れです'],
+        IN_STOCK: ['在庫あり']
+    },
+    'hi': {
+        CONTINUE: ['खरीदारी जारी रखें']
+    },
+    'ko': {
+        CHALLENGE: ['사람인지 확인'],
+        OUT_OF_STOCK: ['일시품절', '품절', '재고없음']
+    }
+}
+
+# 리테일러별 추가 패턴 (언어 패턴에 더함) - 해당 크롤러에서만 쓰던 문구
+RETAILER_PATTERNS = {
+    'amazon_in': {
+        BLOCKED: [
+            'to continue shopping, please type the characters',
+            'sorry, we just need to make sure you',
+            'are you a robot',
+            '503 service unavailable'
+        ]
+    },
+    'amazon_es': {
+        BLOCKED: ['robot check']
+    },
+    'amazon_jp': {
+        BLOCKED_TITLE: ['sorry'],
+        BLOCKED: ['robot check']
+    },
+    # HTTP 엔진 - 브라우저 없이 받은 Cloudflare 챌린지 페이지 제목
+    'http_fetch': {
+        WALL_TITLE: ['attention required', 'just a moment']
+    }
+}
+
+
+def _trie_regex(patterns):
+    """
+    패턴 목록 -> 문자 트라이 형태 정규식 (첫 글자에서 바로 분기, 같은 위치에서는 가장 긴 패턴 우선)
+
+    라틴 문자로 시작/끝나는 패턴은 앞뒤에 단어 경계 검사(앞: 단어 문자가 아님, 뒤: 단어 문자가 이어지지 않음)를 붙임
+    """
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node, last):
+        branches = [re.escape(char) + build(child, char) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            # 여기서 끝나는 패턴 - 더 긴 패턴이 안 맞을 때만 선택되도록 맨 뒤에 둠
+            branches.append(r'(?!\w)' if needs_boundary(last) else '')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    roots = [(r'(?<!\w)' if needs_boundary(char) else '') + re.escape(char) + build(child, char)
+             for char, child in sorted(trie.items()) if char]
+    return roots[0] if len(roots) == 1 else '(?:' + '|'.join(roots) + ')'
+
+
+def _implies(pattern, prefix):
+    """같은 위치에서 pattern이 일치했을 때 접두어 prefix도 (단어 경계를 지키며) 일치했는지"""
+    if pattern == prefix or not pattern.startswith(prefix):
+        return False
+    return not (needs_boundary(prefix[-1]) and needs_boundary(pattern[len(prefix)]))
+
+
+class PatternMatcher:
+    """
+    언어별 패턴 목록을 언어마다 하나의 정규식(문자 트라이)으로 컴파일한 분류기
+
+    언어마다 모든 위치에서 가장 긴 패턴을 lookahead로 찾고 (언어당 한 번의 finditer),
+    그 패턴의 접두어인 짧은 패턴도 같은 위치에서 일치한 것으로 보고 함께 반환
+
+    Args:
+        entries: [(카테고리, 패턴 문자열 또는 page_scan 스펙, 언어)] - 언어를 생략하면 None 그룹
+    """
+
+    def __init__(self, entries):
+        self.specs = {}        # 패턴(소문자) -> page_scan 스펙
+        self.categories = {}   # 패턴 -> {카테고리}
+        self.locales = {}      # 언어 -> [텍스트 패턴]
+        for entry in entries:
+            category, pattern = entry[0], entry[1]
+            locale = entry[2] if len(entry) > 2 else None
+            spec = normalize_patterns([pattern])[0]
+            self.specs.setdefault(spec['id'], spec)
+            self.categories.setdefault(spec['id'], set()).add(category)
+            if spec['text'] and spec['scope'] != SCOPE_HTML:
+                group = self.locales.setdefault(locale, [])
+                if spec['id'] not in group:
+                    group.append(spec['id'])
+
+        # 언어별 트라이 정규식 - 같은 위치에서는 긴 쪽이 잡히므로 그 접두어인 짧은 패턴은 implied로 보충
+        self.locale_regexes = {
+            locale: re.compile('(?=(' + _trie_regex(group) + '))')
+            for locale, group in self.locales.items()
+        }
+        self.implied = {
+            locale: {pattern: [other for other in group if _implies(pattern, other)] for pattern in group}
+            for locale, group in self.locales.items()
+        }
+        # html_pattern은 보이는 텍스트가 아닌 마크업에서 찾음 (클래스명/스크립트 URL 등)
+        self.markup_literals = [pattern for pattern, spec in self.specs.items()
+                                if spec['text'] and spec['scope'] == SCOPE_HTML]
+        # regex_pattern 스펙은 따로 컴파일 (드묾)
+        self.regexes = {
+            pattern: re.compile(spec['regex'], re.IGNORECASE | re.MULTILINE)
+            for pattern, spec in self.specs.items() if spec['regex']
+        }
+
+    def patterns(self, *categories):
+        """카테고리 패턴 스펙 목록 (인자가 없으면 전체) - page_scan / PageSnapshot.scan 용"""
+        return [spec for pattern, spec in self.specs.items()
+                if not categories or self.categories[pattern] & set(categories)]
+
+    def find(self, text, markup=None):
+        """
+        텍스트에서 일치한 패턴 집합 (대소문자 무시, 언어당 한 번 훑기)
+
+        markup이 있으면 html_pattern은 markup에서 찾음 (없으면 text에서)
+        """
+        if not text and not markup:
+            return set()
+        text = text or ''
+        markup_lower = (markup if markup is not None else text).lower()
+        found = {pattern for pattern in self.markup_literals if pattern in markup_lower}
+        found.update(
+            pattern for pattern, regex in self.regexes.items()
+            if regex.search(markup_lower if self.specs[pattern]['scope'] == SCOPE_HTML else text)
+        )
+        lower = text.lower()
+        for locale, regex in self.locale_regexes.items():
+            implied = self.implied[locale]
+            for match in regex.finditer(lower):
+                pattern = match.group(1)
+                if pattern not in found:
+                    found.add(pattern)
+                    found.update(implied[pattern])
+        return found
+
+    def categorize(self, found, categories=()):
+        """일치한 패턴 -> {카테고리: [패턴]} (categories가 있으면 그 카테고리만, 패턴은 정렬)"""
+        result = {}
+        for pattern in sorted(found):
+            for category in self.categories.get(pattern, ()):
+                if not categories or category in categories:
+                    result.setdefault(category, []).append(pattern)
+        return result
+
+    def classify(self, text, *categories, markup=None):
+        """텍스트 분류 -> {카테고리: [일치한 패턴]} (categories가 있으면 그 카테고리만, markup은 html_pattern용)"""
+        return self.categorize(self.find(text, markup), categories)
+
+    def matches(self, text, category):
+        """카테고리 패턴이 하나라도 있으면 첫 번째 패턴 (없으면 None)"""
+        hits = self.classify(text).get(category)
+        return hits[0] if hits else None
+
+    def strip_label(self, text):
+        """
+        Sold By / Ships From 라벨 처리
+
+        Returns:
+            (bool, str): (라벨만 있는지, 앞 라벨을 떼어낸 텍스트)
+        """
+        stripped = (text or '').strip()
+        lower = stripped.lower()
+        labels = sorted((p for p, cats in self.categories.items() if LABEL_ONLY in cats), key=len, reverse=True)
+        for label in labels:
+            if lower == label:
+                return True, ''
+            if lower.startswith(label + ' '):
+                value = stripped[len(label):].strip()
+                return False, value or stripped
+        return False, stripped
+
+
+def build_matcher(locales, categories=None, extra=None):
+    """
+    언어 조합 PatternMatcher 생성
+
+    Args:
+        locales: PATTERNS 언어 키 목록 (예: ('en', 'de'))
+        categories: 포함할 카테고리 (None이면 전체)
+        extra: 크롤러 전용 추가 패턴 {카테고리: [패턴]}
+    """
+    entries = []
+    for locale in locales:
+        for category, patterns in PATTERNS.get(locale, {}).items():
+            if categories is None or category in categories:
+                entries.extend((category, pattern, locale) for pattern in patterns)
+    for category, patterns in (extra or {}).items():
+        entries.extend((category, pattern, 'extra') for pattern in patterns)
+    return PatternMatcher(entries)
+
+
+@lru_cache(maxsize=None)
+def get_matcher(*locales, retailer=None):
+    """
+    언어 조합(+ 리테일러)별 공유 PatternMatcher (전체 카테고리)
+
+    retailer: RETAILER_PATTERNS 키 - 그 리테일러 전용 문구를 언어 패턴에 더함 (없는 키면 언어 패턴만)
+    """
+    return build_matcher(locales, extra=RETAILER_PATTERNS.get(retailer))
+
+
+def label_patterns(locales=None):
+    """라벨 문구 목록 (dom_extractor 브라우저 내 라벨 제거용)"""
+    locales = locales or list(PATTERNS)
+    seen = []
+    for locale in locales:
+        for pattern in PATTERNS.get(locale, {}).get(LABEL_ONLY, []):
+            if pattern not in seen:
+                seen.append(pattern)
+    return seen
+
+
+# 전체 언어 Sold By / Ships From 라벨 (라벨 제거용 공용 분류기)
+LABELS = build_matcher(tuple(PATTERNS), categories=(LABEL_ONLY,))
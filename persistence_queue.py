@@ -0,0 +1,185 @@
+"""
+백그라운드 저장 파이프라인 (브라우저를 구동하는 크롤링 스레드와 분리)
+- 기존: 중간 저장, save_to_db, CSV/ZIP/MD5 생성, 파일서버(SFTP) 업로드가 모두 크롤링 스레드에서 실행
+  -> DB/SFTP 왕복이 느리면 그동안 크롤링이 멈추고, 무한 크롤러는 업로드가 끝나야 다음 회차 대기에 들어감
+- 프로세스당 저장 큐 1개 (get_persistence_queue) + 전용 writer 스레드 1개
+  - 작업은 제출 순서대로 실행 (중간 저장 -> 최종 저장 순서 유지, 같은 행 키는 result_writer가 1번만 저장)
+  - 큐 크기 제한 PERSIST_QUEUE_SIZE (기본 20): 가득 차면 제출한 스레드가 자리가 날 때까지 대기 (backpressure)
+  - submit()은 concurrent.futures.Future 반환 - 결과가 필요한 호출측은 .result() / add_done_callback
+- 종료: 프로세스 종료 시(atexit, Ctrl+C 포함) 남은 작업을 모두 처리한 뒤 처리 건수/실패/대기 시간 보고
+- PERSIST_MODE=sync: 큐 없이 호출 스레드에서 바로 실행 (기존 동작)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from result_writer import write_results
+
+logger = logging.getLogger(__name__)
+
+MODE_BACKGROUND = 'background'
+MODE_SYNC = 'sync'
+DEFAULT_QUEUE_SIZE = 20
+
+_STOP = object()
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def get_persist_mode(default=MODE_BACKGROUND):
+    """PERSIST_MODE 환경변수 (background: writer 스레드, sync: 호출 스레드에서 바로 실행)"""
+    mode = (os.getenv('PERSIST_MODE', default) or default).strip().lower()
+    if mode not in (MODE_BACKGROUND, MODE_SYNC):
+        logger.warning(f"PERSIST_MODE 값이 잘못됨: {mode} -> {default} 사용")
+        return default
+    return mode
+
+
+def get_queue_size(default=DEFAULT_QUEUE_SIZE):
+    try:
+        return max(1, int(os.getenv('PERSIST_QUEUE_SIZE', str(default)) or default))
+    except ValueError:
+        logger.warning(f"PERSIST_QUEUE_SIZE 값이 잘못됨: {os.getenv('PERSIST_QUEUE_SIZE')} -> {default} 사용")
+        return default
+
+
+class PersistenceQueue:
+    """
+    저장/내보내기 작업 큐 (writer 스레드 1개, 스레드 안전)
+
+    Args:
+        maxsize: 대기 작업 수 상한 (기본 PERSIST_QUEUE_SIZE)
+        mode: background / sync (기본 PERSIST_MODE)
+    """
+
+    def __init__(self, maxsize=None, mode=None):
+        self.maxsize = maxsize or get_queue_size()
+        self.mode = mode or get_persist_mode()
+        self._queue = queue.Queue(self.maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.closed = False
+        self.stats = {'submitted': 0, 'done': 0, 'failed': 0, 'work_seconds': 0.0, 'wait_seconds': 0.0}
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='persistence-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, label, func, *args, **kwargs):
+        """
+        작업 제출 (큐가 가득 차면 자리가 날 때까지 대기)
+
+        Args:
+            label: 로그용 작업 이름
+            func: 실행할 함수 (writer 스레드에서 func(*args, **kwargs))
+
+        Returns:
+            Future: 함수 반환값 / 예외
+        """
+        future = Future()
+        job = (label, func, args, kwargs, future)
+        with self._lock:
+            self.stats['submitted'] += 1
+            run_inline = self.mode == MODE_SYNC or self.closed
+
+        if run_inline:
+            self._execute(job)
+            return future
+
+        self._start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            logger.info(f"⏳ 저장 큐 가득 참 ({self.maxsize}개) - 자리 날 때까지 대기: {label}")
+            started = time.perf_counter()
+            self._queue.put(job)
+            with self._lock:
+                self.stats['wait_seconds'] += time.perf_counter() - started
+        return future
+
+    def _execute(self, job):
+        label, func, args, kwargs, future = job
+        if not future.set_running_or_notify_cancel():
+            return
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"❌ 저장 작업 실패 ({label}): {e}")
+            outcome = 'failed'
+            future.set_exception(e)
+        else:
+            outcome = 'done'
+            future.set_result(result)
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats['work_seconds'] += time.perf_counter() - started
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    def pending(self):
+        """대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """제출된 작업이 모두 끝날 때까지 대기"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """남은 작업을 모두 처리하고 writer 스레드 종료 (이후 제출은 호출 스레드에서 바로 실행)"""
+        if self.closed:
+            return
+        pending = self.pending()
+        if pending:
+            logger.info(f"💾 종료 전 남은 저장 작업 {pending}개 처리 중...")
+        self.flush()
+        with self._lock:
+            self.closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+        self.report()
+
+    def report(self):
+        stats = self.stats
+        if stats['submitted']:
+            logger.info(f"💾 저장 작업: {stats['done']}개 완료 / {stats['failed']}개 실패 | "
+                        f"처리 {stats['work_seconds']:.1f}초 | 큐 대기 {stats['wait_seconds']:.1f}초 ({self.mode})")
+
+
+def get_persistence_queue():
+    """프로세스 공용 저장 큐 (처음 사용할 때 생성, 종료 시 남은 작업 처리)"""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = PersistenceQueue()
+            atexit.register(_default_queue.close)
+        return _default_queue
+
+
+def submit_results(data, table_name, engine, country_code, label='중간 저장'):
+    """결과 행 DB 저장(write_results)을 저장 큐에 제출 (Future 반환 - 값은 저장한 행 수)"""
+    def run():
+        write_results(data, table_name, engine, country_code)
+        logger.info(f"💾 {label}: {len(data)}개 레코드 -> {table_name}")
+        return len(data)
+
+    return get_persistence_queue().submit(f"{label} {table_name}", run)
@@ -0,0 +1,226 @@
+"""
+가격 파싱 공통 모듈 (국가별 형식 테이블 기반)
+- 크롤러마다 따로 구현돼 있던 가격 파서(parse_price_by_country, parse_german_price, parse_rupee_price,
+  detect_currency_and_parse_price, 리테일러 인라인 정규식 등)를 국가별 형식 테이블 하나로 통합
+- 정규식은 모듈 로드 시 한 번만 컴파일, "1299" / "1299.99" 같은 단순 문자열과 숫자 값은 정규식 없이 바로 변환
+- 구분자 판정 규칙 (단건/일괄 동일)
+  - '.'과 ','가 모두 있으면 마지막에 나오는 쪽이 소수점 ("1.299,99" / "1,299.99")
+  - 한 종류만 한 번 있으면: 그 국가 소수점 문자이고 뒤 자릿수가 소수 자릿수 이하면 소수점,
+    다른 문자면 뒤가 1~2자리일 때만 소수점 ("89,99" / "89.99" / "1,299" / "1.299")
+  - 여러 번 나오거나 소수 자릿수가 0인 통화(JPY/KRW)는 천 단위
+- strict=True: 통화 기호/코드와 공백을 뺀 나머지가 숫자 하나뿐일 때만 인정 ("165 ratings", "Was: €12.99" 제외)
+- 일괄 모드: parse_price_series(Series, 국가) - 숫자 컬럼은 그대로, 문자열은 고유값만 한 번씩 해석해
+  float64 Series로 반환 (analyze_results, alert_monitor, 백필 스크립트용)
+"""
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 국가별 가격 형식 (decimal: 소수점 문자, decimals: 최대 소수 자릿수, symbols: 통화 기호/코드)
+PRICE_LOCALES = {
+    'usa': {'currency': 'USD', 'decimal': '.', 'decimals': 2, 'symbols': ['US$', '$', 'USD']},
+    'gb': {'currency': 'GBP', 'decimal': '.', 'decimals': 2, 'symbols': ['£', 'GBP']},
+    'au': {'currency': 'AUD', 'decimal': '.', 'decimals': 2, 'symbols': ['AU$', 'A$', '$', 'AUD']},
+    'in': {'currency': 'INR', 'decimal': '.', 'decimals': 2, 'symbols': ['₹', 'Rs.', 'Rs', 'INR']},
+    'de': {'currency': 'EUR', 'decimal': ',', 'decimals': 2, 'symbols': ['€', 'EUR']},
+    'fr': {'currency': 'EUR', 'decimal': ',', 'decimals': 2, 'symbols': ['€', 'EUR']},
+    'it': {'currency': 'EUR', 'decimal': ',', 'decimals': 2, 'symbols': ['€', 'EUR']},
+    'es': {'currency': 'EUR', 'decimal': ',', 'decimals': 2, 'symbols': ['€', 'EUR']},
+    'nl': {'currency': 'EUR', 'decimal': ',', 'decimals': 2, 'symbols': ['€', 'EUR']},
+    'pl': {'currency': 'PLN', 'decimal': ',', 'decimals': 2, 'symbols': ['zł', 'PLN']},
+    'jp': {'currency': 'JPY', 'decimal': None, 'decimals': 0, 'symbols': ['¥', '￥', '円', 'JPY']},
+    'kr': {'currency': 'KRW', 'decimal': None, 'decimals': 0, 'symbols': ['₩', '원', 'KRW']}
+}
+
+# 국가 코드 별칭 (크롤러/알림 모듈에서 쓰는 코드 -> PRICE_LOCALES 키)
+LOCALE_ALIASES = {'us': 'usa', 'uk': 'gb'}
+
+# 국가를 모를 때 (구조화 데이터 등): 점 소수점 기준, 구분자 규칙으로 판정
+AUTO_LOCALE = {'currency': None, 'decimal': '.', 'decimals': 2, 'symbols': []}
+
+# 숫자 토큰: 숫자 + (구분자 + 숫자 | 공백/아포스트로피 + 3자리)* + 끝 구분자 ("1 299,99", "1'299.00", "294.")
+NUMBER_PATTERN = r"\d+(?:[.,]\d+|[ \u00a0\u202f']\d{3}(?!\d))*[.,]?"
+NUMBER_RE = re.compile(NUMBER_PATTERN)
+TRAILING_NUMBER_RE = re.compile(NUMBER_PATTERN + r'\s*$')
+GROUP_SPACE_RE = re.compile(r"[ \u00a0\u202f']")
+# strict: 통화 기호/공백을 뺀 뒤 숫자와 구분자만 남아야 함
+STRICT_RE = re.compile(r"\d[\d.,']*")
+SIMPLE_RE = re.compile(r'\d+(?:\.\d{1,2})?')
+
+
+def _locale_key(country_code):
+    """국가 코드 -> PRICE_LOCALES 키 ('usa_bestbuy', 'kr_danawa' 같은 알림 코드는 앞부분, 없으면 None)"""
+    if not country_code:
+        return None
+    code = str(country_code).lower().split('_')[0]
+    code = LOCALE_ALIASES.get(code, code)
+    return code if code in PRICE_LOCALES else None
+
+
+def get_price_locale(country_code):
+    """국가 코드 -> 가격 형식 (모르는 코드는 AUTO_LOCALE)"""
+    return PRICE_LOCALES.get(_locale_key(country_code), AUTO_LOCALE)
+
+
+def _compile_symbols(locale):
+    """통화 기호/코드 + 공백 제거 정규식 (긴 기호 우선: 'AU$' > '$')"""
+    symbols = sorted(locale['symbols'], key=len, reverse=True)
+    alternatives = [re.escape(symbol) for symbol in symbols] + [r'\s']
+    return re.compile('|'.join(alternatives), re.IGNORECASE)
+
+
+_STRIP_RES = {key: _compile_symbols(locale) for key, locale in PRICE_LOCALES.items()}
+_STRIP_RES[None] = _compile_symbols(AUTO_LOCALE)
+_SYMBOL_RES = {
+    key: re.compile('|'.join(re.escape(s) for s in sorted(locale['symbols'], key=len, reverse=True)), re.IGNORECASE)
+    for key, locale in PRICE_LOCALES.items()
+}
+
+
+def _resolve_number(token, locale):
+    """숫자 토큰 -> float (천 단위/소수점 구분자 판정)"""
+    token = GROUP_SPACE_RE.sub('', token).rstrip('.,')
+    if not token:
+        return None
+
+    last_dot, last_comma = token.rfind('.'), token.rfind(',')
+    decimal = None
+    if locale['decimals'] > 0:
+        if last_dot >= 0 and last_comma >= 0:
+            decimal = '.' if last_dot > last_comma else ','
+        elif last_dot >= 0 or last_comma >= 0:
+            sep = '.' if last_dot >= 0 else ','
+            tail = len(token) - 1 - max(last_dot, last_comma)
+            limit = locale['decimals'] if sep == locale['decimal'] else 2
+            if token.count(sep) == 1 and tail <= limit:
+                decimal = sep
+
+    if decimal is None:
+        number = token.replace('.', '').replace(',', '')
+    else:
+        group = ',' if decimal == '.' else '.'
+        number = token.replace(group, '').replace(decimal, '.')
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def _symbol_amount(text, symbol_re):
+    """통화 기호 바로 뒤(없으면 바로 앞)의 첫 금액 텍스트"""
+    for symbol in symbol_re.finditer(text):
+        after = NUMBER_RE.match(text[symbol.end():].lstrip())
+        if after:
+            return after.group()
+        before = TRAILING_NUMBER_RE.search(text[:symbol.start()])
+        if before:
+            return before.group().strip()
+    return None
+
+
+def _check_price(price, bounds):
+    if price is None or price <= 0:
+        return None
+    if bounds and not bounds[0] <= price <= bounds[1]:
+        logger.debug(f"가격 범위 벗어남: {price} (허용 {bounds[0]}~{bounds[1]})")
+        return None
+    return price
+
+
+def parse_price(value, country_code=None, strict=False, bounds=None, require_symbol=False):
+    """
+    가격 텍스트/값 -> float
+
+    Args:
+        value: 가격 문자열 또는 숫자
+        country_code: 국가 코드 (PRICE_LOCALES 키 또는 별칭, None이면 구분자 규칙만 사용)
+        strict: 통화 기호/공백 외의 글자가 섞여 있으면 None (상품 페이지의 가격 외 숫자 배제)
+        bounds: (최소, 최대) - 범위를 벗어나면 None
+        require_symbol: 통화 기호가 붙은 첫 금액만 사용 ("Save $50 ..." 같은 텍스트에서 기호 붙은 금액)
+
+    Returns:
+        float / 해석할 수 없거나 0 이하면 None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        price = float(value)
+        return _check_price(price, bounds) if price == price else None
+    if not isinstance(value, str):
+        return None
+
+    key = _locale_key(country_code)
+    price = _parse_text(value.strip(), key, PRICE_LOCALES.get(key, AUTO_LOCALE), strict, require_symbol)
+    return _check_price(price, bounds)
+
+
+def _parse_text(text, key, locale, strict=False, require_symbol=False):
+    """정리된 가격 문자열 -> float (범위/양수 검사 전)"""
+    # 빠른 경로: 이미 "1299" / "1299.99" 형태
+    if text.isdigit() or (locale['decimals'] > 0 and SIMPLE_RE.fullmatch(text)):
+        return float(text)
+
+    if require_symbol and key is not None:
+        text = _symbol_amount(text, _SYMBOL_RES[key])
+        if text is None:
+            return None
+
+    if strict:
+        cleaned = _STRIP_RES[key].sub('', text)
+        return _resolve_number(cleaned, locale) if STRICT_RE.fullmatch(cleaned) else None
+
+    match = NUMBER_RE.search(text)
+    return _resolve_number(match.group(), locale) if match else None
+
+
+def format_price(price):
+    """파싱한 가격 -> 저장용 문자열 (정수면 "1299", 아니면 "1299.99")"""
+    if price is None:
+        return None
+    return str(int(price)) if price == int(price) else f"{price:.2f}"
+
+
+def parse_price_series(values, country_code=None, strict=False, bounds=None):
+    """
+    가격 컬럼 일괄 변환 (parse_price와 같은 규칙)
+
+    - 숫자 컬럼/숫자 값은 그대로 float 배열로 변환
+    - 문자열은 pd.factorize로 고유값만 한 번씩 해석한 뒤 배열 인덱싱으로 펼침
+      (행마다 Series.apply를 부르지 않음 - 같은 가격이 반복되는 백필/리포트 컬럼에서 특히 빠름)
+
+    Args:
+        values: pandas Series / 리스트 (문자열, 숫자, None 혼합 가능)
+        country_code: 국가 코드
+        strict: parse_price와 동일
+        bounds: (최소, 최대)
+
+    Returns:
+        pandas Series (float64, 해석할 수 없으면 NaN) - 입력 인덱스 유지
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype='object')
+    if series.dtype.kind in 'biuf':
+        return _check_series(series.astype('float64'), bounds)
+
+    key = _locale_key(country_code)
+    locale = PRICE_LOCALES.get(key, AUTO_LOCALE)
+
+    is_text = series.map(type).eq(str).to_numpy()
+    prices = pd.to_numeric(series.where(~is_text), errors='coerce').astype('float64')
+    if is_text.any():
+        codes, uniques = pd.factorize(series[is_text])
+        parsed = np.array([_parse_text(text.strip(), key, locale, strict) for text in uniques], dtype='float64')
+        prices[is_text] = parsed[codes]
+
+    return _check_series(prices, bounds)
+
+
+def _check_series(prices, bounds):
+    prices = prices.where(prices > 0)
+    if bounds:
+        prices = prices.where(prices.between(bounds[0], bounds[1]))
+    return prices
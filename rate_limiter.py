@@ -0,0 +1,226 @@
+"""
+도메인별 적응형 요청 속도 제한 (Token Bucket + AIMD)
+- 도메인마다 토큰 버킷 하나: 요청 전 acquire()로 토큰 1개 소비
+- 정상 페이지가 나오면 속도를 조금씩 올리고 (additive increase)
+- 차단/캡차/Cloudflare가 감지되면 속도를 절반으로 줄이고 잠시 쉼 (multiplicative decrease)
+- 학습된 속도는 JSON 파일에 저장되어 다음 실행에서 이어서 사용 (save_interval마다, 그리고 종료 시)
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rate_limiter_state.json')
+
+
+class DomainBucket:
+    """도메인 1개의 토큰 버킷 상태"""
+
+    __slots__ = ('rate', 'tokens', 'updated', 'blocked_until', 'clean_streak')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.clean_streak = 0
+
+
+class AdaptiveRateLimiter:
+    """
+    도메인별 적응형 속도 제한기 (스레드 안전)
+
+    scraper_pool.DomainThrottle과 같은 wait()/wait_async() 인터페이스를 제공하므로
+    워커 풀/비동기 엔진에 그대로 넘길 수 있다.
+
+    Args:
+        initial_interval: 학습값이 없을 때 요청 간격(초)
+        min_interval: 아무리 빨라도 이 간격보다 짧게 요청하지 않음
+        max_interval: 차단이 반복돼도 이 간격보다 길게 늘리지 않음
+        increase_step: 정상 페이지 1건당 증가시킬 속도 (요청/초)
+        decrease_factor: 차단 감지 시 속도에 곱할 값
+        block_cooldown: 차단 감지 직후 해당 도메인 요청을 쉬는 시간(초)
+        burst: 버킷 최대 토큰 수 (1이면 버스트 없음)
+        jitter: 대기 시간에 더할 무작위 비율 (0.2 = ±20%)
+        state_file: 학습 속도 저장 파일 (None이면 저장 안 함)
+        save_interval: 학습 속도를 파일에 반영하는 최소 간격(초) - 페이지마다 쓰지 않음
+    """
+
+    def __init__(self, initial_interval=7.5, min_interval=2.0, max_interval=60.0,
+                 increase_step=0.005, decrease_factor=0.5, block_cooldown=30.0,
+                 burst=1, jitter=0.2, state_file=DEFAULT_STATE_FILE, save_interval=60.0):
+        self.initial_rate = 1.0 / initial_interval
+        self.min_rate = 1.0 / max_interval
+        self.max_rate = 1.0 / min_interval
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.block_cooldown = block_cooldown
+        self.burst = burst
+        self.jitter = jitter
+        self.state_file = state_file
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._buckets = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._learned = self._load_state()
+
+    @staticmethod
+    def domain_of(url):
+        return urlparse(url or '').netloc.lower()
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"속도 학습값 로드 실패 (기본값 사용): {e}")
+            return {}
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            learned = self._learned.get(domain, {}).get('rate')
+            rate = min(self.max_rate, max(self.min_rate, learned or self.initial_rate))
+            bucket = DomainBucket(rate, self.burst)
+            self._buckets[domain] = bucket
+            logger.info(f"🚦 {domain}: 요청 간격 {1 / rate:.1f}초로 시작" + (" (학습값)" if learned else ""))
+        return bucket
+
+    def reserve(self, url):
+        """토큰 1개를 예약하고 남은 대기 시간(초)을 반환"""
+        domain = self.domain_of(url)
+
+        with self._lock:
+            bucket = self._bucket(domain)
+            now = time.monotonic()
+
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+
+            delay = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+            delay = max(delay, bucket.blocked_until - now)
+
+        if delay > 0 and self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, delay)
+
+    def wait(self, url):
+        """해당 도메인 토큰이 생길 때까지 대기"""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.info(f"⏳ {self.domain_of(url)} {delay:.1f}초 대기 중...")
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """asyncio 태스크용 wait()"""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.info(f"⏳ {self.domain_of(url)} {delay:.1f}초 대기 중...")
+            await asyncio.sleep(delay)
+
+    def record(self, url, blocked):
+        """
+        페이지 결과 반영
+
+        Args:
+            url: 요청한 URL
+            blocked: 차단/캡차/Cloudflare 감지 여부
+        """
+        domain = self.domain_of(url)
+
+        with self._lock:
+            bucket = self._bucket(domain)
+            self._dirty = True
+            if blocked:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+                bucket.blocked_until = time.monotonic() + self.block_cooldown
+                bucket.tokens = min(bucket.tokens, 0)
+                bucket.clean_streak = 0
+                logger.warning(f"🐢 {domain}: 차단 감지 -> 요청 간격 {1 / bucket.rate:.1f}초, {self.block_cooldown:.0f}초 휴식")
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+                bucket.clean_streak += 1
+                if bucket.clean_streak % 20 == 0:
+                    logger.info(f"🐇 {domain}: 정상 {bucket.clean_streak}건 연속 -> 요청 간격 {1 / bucket.rate:.1f}초")
+            save_due = time.monotonic() - self._last_save >= self.save_interval
+
+        # 파일 I/O는 버킷 락 밖에서 - 다른 워커의 reserve()/record()를 막지 않음
+        if save_due:
+            self.save_state()
+
+    def current_interval(self, url):
+        with self._lock:
+            return 1.0 / self._bucket(self.domain_of(url)).rate
+
+    def save_state(self):
+        """
+        학습 속도 저장 (record()가 save_interval마다, 프로세스 종료 시 atexit로 호출)
+
+        다른 프로세스(orchestrator.py의 다른 리테일러)가 같은 파일을 쓰므로
+        저장 직전에 다시 읽어 자기 도메인만 덮어쓴 뒤 원자적으로 교체한다.
+        버킷 락은 스냅샷을 뜨는 동안만 잡고, 파일 읽기/쓰기는 저장 전용 락 안에서 한다.
+        """
+        if not self.state_file:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = {
+                    domain: {'rate': bucket.rate, 'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+                    for domain, bucket in self._buckets.items()
+                }
+                self._dirty = False
+                self._last_save = time.monotonic()
+
+            try:
+                state = self._load_state()
+                state.update(snapshot)
+
+                state_dir = os.path.dirname(os.path.abspath(self.state_file))
+                fd, tmp_path = tempfile.mkstemp(dir=state_dir, prefix='.rate_limiter_', suffix='.json')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.state_file)
+            except Exception as e:
+                logger.debug(f"속도 학습값 저장 실패: {e}")
+                with self._lock:
+                    self._dirty = True
+
+
+_shared_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(name='default', **kwargs):
+    """
+    프로세스 공유 속도 제한기 조회
+
+    같은 name이면 같은 인스턴스를 반환하므로 워커 풀의 모든 스레드가 한 버킷을 공유한다.
+    RATE_LIMITER_STATE 환경변수로 저장 파일 경로를 바꿀 수 있다 ('' 이면 저장 안 함).
+    RATE_LIMITER_SAVE_INTERVAL(초, 기본 60)마다 저장하고, 남은 변경분은 종료 시 저장한다.
+    """
+    with _shared_lock:
+        if name not in _shared_limiters:
+            kwargs.setdefault('state_file', os.getenv('RATE_LIMITER_STATE', DEFAULT_STATE_FILE) or None)
+            kwargs.setdefault('save_interval', float(os.getenv('RATE_LIMITER_SAVE_INTERVAL', '60')))
+            limiter = AdaptiveRateLimiter(**kwargs)
+            atexit.register(limiter.save_state)
+            _shared_limiters[name] = limiter
+        return _shared_limiters[name]
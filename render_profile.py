@@ -0,0 +1,84 @@
+"""
+리테일러별 렌더링 프로필
+- JS / 이미지 / CSS 사용 여부와 페이지 로드 전략(normal/eager) 조합
+- render_tuner.py가 샘플 URL로 찾은 "기준 결과와 같으면서 가장 가벼운" 조합을 render_profiles.json에 저장
+- 실행 시 resource_blocking(이미지/CSS 차단, JS 비활성화)과 page_readiness(로드 전략)가 기본값으로 사용
+- RENDER_PROFILE_{RETAILER}=후보이름 환경변수가 있으면 파일보다 우선 (튜닝 시험 실행용)
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'render_profiles.json')
+
+# 가벼운 순서 (앞에 있을수록 저렴) - 마지막 'full'이 기준 렌더링
+RENDER_CANDIDATES = [
+    ('no_js', {'javascript': False, 'images': False, 'css': False, 'load_strategy': 'eager'}),
+    ('no_images_css_eager', {'javascript': True, 'images': False, 'css': False, 'load_strategy': 'eager'}),
+    ('no_images_eager', {'javascript': True, 'images': False, 'css': True, 'load_strategy': 'eager'}),
+    ('no_images_css', {'javascript': True, 'images': False, 'css': False, 'load_strategy': 'normal'}),
+    ('no_images', {'javascript': True, 'images': False, 'css': True, 'load_strategy': 'normal'}),
+    ('full', {'javascript': True, 'images': True, 'css': True, 'load_strategy': 'normal'})
+]
+CANDIDATES = dict(RENDER_CANDIDATES)
+BASELINE = 'full'
+
+
+def get_profile_file():
+    return os.getenv('RENDER_PROFILE_FILE', DEFAULT_PROFILE_FILE)
+
+
+def load_profiles(path=None):
+    """저장된 리테일러별 프로필 {retailer: {...}}"""
+    path = path or get_profile_file()
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"렌더링 프로필 로드 실패 (기본값 사용): {e}")
+        return {}
+
+
+def save_profile(retailer, name, extra=None, path=None):
+    """튜닝 결과 저장 (다른 리테일러 항목은 유지, 원자적 교체)"""
+    path = path or get_profile_file()
+    profiles = load_profiles(path)
+    entry = {'name': name, **CANDIDATES[name]}
+    if extra:
+        entry.update(extra)
+    profiles[retailer] = entry
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.render_profiles_', suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"💾 렌더링 프로필 저장: {retailer}={name} ({path})")
+    return entry
+
+
+def get_render_profile(retailer):
+    """
+    리테일러 렌더링 프로필 (RENDER_PROFILE_{RETAILER} 환경변수 > render_profiles.json)
+
+    Returns:
+        dict: {'name', 'javascript', 'images', 'css', 'load_strategy'} / 튜닝 결과가 없으면 None
+    """
+    name = os.getenv(f'RENDER_PROFILE_{retailer.upper()}', '').strip().lower()
+    if name:
+        if name in CANDIDATES:
+            return {'name': name, **CANDIDATES[name]}
+        logger.warning(f"RENDER_PROFILE_{retailer.upper()} 값이 잘못됨: {name} -> 무시")
+
+    entry = load_profiles().get(retailer)
+    if not entry:
+        return None
+    profile = dict(CANDIDATES.get(entry.get('name'), CANDIDATES[BASELINE]))
+    profile.update({key: entry[key] for key in profile if key in entry})
+    profile['name'] = entry.get('name', BASELINE)
+    return profile
@@ -0,0 +1,231 @@
+"""
+렌더링 프로필 자동 튜너
+- 리테일러별 추적 URL 일부를 샘플링해 기준 렌더링(full, 차단 없음)으로 한 번 추출
+- 더 가벼운 조합(JS 끔 / 이미지 끔 / CSS 끔 / eager 로드)을 가벼운 순서대로 같은 URL에 재실행
+- 추출 필드가 기준 결과와 일치하는 가장 가벼운 조합을 render_profiles.json에 리테일러 기본 프로필로 저장
+- 실제 크롤러는 resource_blocking / page_readiness를 통해 저장된 프로필을 자동으로 사용
+"""
+
+import importlib
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime
+
+import pytz
+
+from page_readiness import get_page_load_strategy
+from render_profile import RENDER_CANDIDATES, BASELINE, save_profile
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 튜닝 대상: 이름 -> 크롤러 모듈/클래스/생성 인자/프로필 키 (Amazon은 국가 공통 프로필이므로 usa로 대표)
+# fnac(Playwright)은 route 기반 차단만 지원하므로 제외
+TUNING_TARGETS = {
+    'usa': {'module': 'usa_v2', 'class': 'AmazonScraper', 'kwargs': {'country_code': 'usa'}, 'profile': 'amazon'},
+    'usa_bestbuy': {'module': 'bestbuy_v2', 'class': 'BestBuyScraper', 'profile': 'bestbuy'},
+    'gb_currys': {'module': 'currys_v2', 'class': 'CurrysScraper', 'profile': 'currys'},
+    'nl_coolblue': {'module': 'coolblue_nl_v2', 'class': 'CoolblueScraper', 'profile': 'coolblue'},
+    'kr_danawa': {'module': 'danawa_v2', 'class': 'DanawaScraper', 'profile': 'danawa'},
+    'de_mediamarkt': {'module': 'mediamarkt_v2', 'class': 'MediaMarktInfiniteScraper', 'profile': 'mediamarkt'},
+    'pl_xkom': {'module': 'xkom_v2', 'class': 'XKomInfiniteScraper', 'profile': 'xkom', 'interactive': True},
+}
+
+# 기준 결과와 비교할 필드
+COMPARE_FIELDS = ['title', 'retailprice', 'imageurl', 'ships_from', 'sold_by']
+
+
+def normalize_value(value):
+    if value is None:
+        return None
+    text = ' '.join(str(value).split())
+    return text or None
+
+
+def compare_results(baseline, candidate):
+    """기준 결과와 다른 필드 목록 (기준에 없는 필드는 비교하지 않음)"""
+    mismatched = []
+    for field in COMPARE_FIELDS:
+        if field not in baseline:
+            continue
+        if normalize_value(baseline.get(field)) != normalize_value(candidate.get(field)):
+            mismatched.append(field)
+    return mismatched
+
+
+class RenderTuner:
+    """
+    리테일러 1곳 튜닝
+
+    Args:
+        name: TUNING_TARGETS 키
+        sample_size: 샘플 URL 수
+        min_match: 일치로 인정할 최소 URL 비율 (1.0이면 전부 일치해야 함)
+    """
+
+    def __init__(self, name, sample_size=10, min_match=1.0):
+        self.name = name
+        self.spec = TUNING_TARGETS[name]
+        self.profile_key = self.spec['profile']
+        self.sample_size = sample_size
+        self.min_match = min_match
+        module = importlib.import_module(self.spec['module'])
+        self.scraper = getattr(module, self.spec['class'])(**self.spec.get('kwargs', {}))
+
+    def set_candidate(self, candidate):
+        """후보 프로필을 환경변수로 지정 (기준 렌더링은 리소스 차단도 끔)"""
+        key = self.profile_key.upper()
+        os.environ[f'RENDER_PROFILE_{key}'] = candidate
+        if candidate == BASELINE:
+            os.environ[f'BLOCK_PROFILE_{key}'] = 'off'
+        else:
+            os.environ.pop(f'BLOCK_PROFILE_{key}', None)
+
+        # __init__에서 로드 전략을 읽는 크롤러(Amazon) 갱신
+        if hasattr(self.scraper, 'page_load_strategy'):
+            self.scraper.page_load_strategy = get_page_load_strategy(self.profile_key)
+
+    def extract(self, url, row):
+        """재시도 없이 1회 추출 (재시도 인자가 없는 크롤러는 그대로 호출)"""
+        kwargs = {}
+        if 'max_retries' in inspect.signature(self.scraper.extract_product_info).parameters:
+            kwargs['max_retries'] = 0
+        self.scraper.rate_limiter.wait(url)
+        try:
+            result = self.scraper.extract_product_info(url, row, **kwargs)
+        except Exception as e:
+            logger.warning(f"[{self.name}] 추출 오류: {e}")
+            result = None
+        # 차단 분류는 크롤러가 extract_product_info()에서 남긴 값 사용 (다나와는 retry_page()에서 직접 기록)
+        if hasattr(self.scraper, 'last_blocked'):
+            self.scraper.rate_limiter.record(url, blocked=self.scraper.last_blocked)
+        return result or {}
+
+    def run_candidate(self, candidate, samples):
+        """후보 프로필로 샘플 URL 추출 -> URL별 결과 목록"""
+        self.set_candidate(candidate)
+        if hasattr(self.scraper, 'session_initialized'):
+            self.scraper.session_initialized = False
+        if not self.scraper.setup_driver():
+            logger.error(f"[{self.name}] 드라이버 설정 실패: {candidate}")
+            return None
+
+        results = []
+        try:
+            for row in samples:
+                results.append(self.extract(row.get('url'), row))
+        finally:
+            try:
+                self.scraper.driver.quit()
+            except Exception:
+                pass
+            self.scraper.driver = None
+        return results
+
+    def tune(self):
+        """기준 렌더링 후 가벼운 순서대로 시험해 처음 일치하는 후보 저장"""
+        targets = self.scraper.get_crawl_targets()
+        if not targets:
+            logger.error(f"[{self.name}] 크롤링 대상 없음")
+            return None
+        samples = random.sample(targets, min(self.sample_size, len(targets)))
+        logger.info(f"🎯 [{self.name}] 샘플 {len(samples)}개로 튜닝 시작 (프로필 키: {self.profile_key})")
+
+        baseline = self.run_candidate(BASELINE, samples)
+        if baseline is None:
+            return None
+
+        # 기준 렌더링에서도 실패한 URL은 비교 대상에서 제외
+        pairs = [(row, result) for row, result in zip(samples, baseline) if result.get('title')]
+        if not pairs:
+            logger.error(f"[{self.name}] 기준 렌더링에서 추출 성공한 URL 없음 - 튜닝 중단")
+            return None
+        samples = [row for row, _ in pairs]
+        baseline = [result for _, result in pairs]
+
+        report = {'retailer': self.name, 'profile': self.profile_key, 'sample_size': len(samples), 'candidates': []}
+        chosen = BASELINE
+        match_rate = 1.0
+
+        for candidate, _ in RENDER_CANDIDATES:
+            if candidate == BASELINE:
+                break
+            results = self.run_candidate(candidate, samples)
+            if results is None:
+                continue
+
+            mismatches = [compare_results(base, result) for base, result in zip(baseline, results)]
+            matched = sum(1 for fields in mismatches if not fields)
+            rate = matched / len(samples)
+            report['candidates'].append({
+                'name': candidate,
+                'match_rate': round(rate, 3),
+                'mismatched_fields': sorted({field for fields in mismatches for field in fields})
+            })
+            logger.info(f"[{self.name}] {candidate}: {matched}/{len(samples)} 일치")
+
+            if rate >= self.min_match:
+                chosen, match_rate = candidate, rate
+                break
+
+        korea_tz = pytz.timezone('Asia/Seoul')
+        save_profile(self.profile_key, chosen, {
+            'tuned_by': self.name,
+            'tuned_at': datetime.now(korea_tz).strftime('%Y-%m-%d %H:%M:%S'),
+            'sample_size': len(samples),
+            'match_rate': round(match_rate, 3)
+        })
+        report['chosen'] = chosen
+        logger.info(f"✅ [{self.name}] 선택된 프로필: {chosen}")
+        return report
+
+
+def main():
+    """메인 실행 함수"""
+    requested = [r.strip() for r in os.getenv('TUNE_RETAILERS', '').split(',') if r.strip()]
+    if requested:
+        unknown = [r for r in requested if r not in TUNING_TARGETS]
+        if unknown:
+            logger.warning(f"알 수 없는 리테일러 무시: {unknown}")
+        names = [r for r in requested if r in TUNING_TARGETS]
+    else:
+        names = [name for name, spec in TUNING_TARGETS.items() if not spec.get('interactive')]
+
+    sample_size = int(os.getenv('TUNE_SAMPLE_SIZE', '10'))
+    min_match = float(os.getenv('TUNE_MIN_MATCH', '1.0'))
+
+    reports = []
+    for name in names:
+        try:
+            report = RenderTuner(name, sample_size, min_match).tune()
+        except Exception as e:
+            logger.error(f"[{name}] 튜닝 오류: {e}")
+            report = None
+        reports.append(report or {'retailer': name, 'chosen': None})
+
+    log_dir = os.getenv('TUNE_LOG_DIR', os.path.join(BASE_DIR, 'logs'))
+    os.makedirs(log_dir, exist_ok=True)
+    report_path = os.path.join(log_dir, f"render_tuning_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2, default=str)
+    logger.info(f"튜닝 리포트 저장: {report_path}")
+
+    return 0 if all(r.get('chosen') for r in reports) else 1
+
+
+if __name__ == "__main__":
+    print("환경변수 설정:")
+    print("export TUNE_RETAILERS=usa,kr_danawa  # 튜닝할 리테일러 (기본: 수동 개입 필요 없는 전체)")
+    print("export TUNE_SAMPLE_SIZE=10           # 리테일러별 샘플 URL 수")
+    print("export TUNE_MIN_MATCH=1.0            # 기준 결과와 일치해야 하는 URL 비율")
+    print("export RENDER_PROFILE_FILE=...       # 저장 위치 (기본: render_profiles.json)")
+    print()
+
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+네트워크 리소스 차단 프로필
+- 스크래퍼는 텍스트와 이미지 src 속성만 읽으므로 이미지/미디어/폰트 파일과 광고/분석 스크립트는 받을 필요가 없음
+- Selenium(undetected_chromedriver): CDP Network.setBlockedURLs 로 URL 패턴 차단
+- Playwright(fnac): context.route() 핸들러에서 should_block_request()로 판정
+- 이미지 파일만 안 받을 뿐 <img src>는 DOM에 그대로 있으므로 imageurl 추출은 영향 없음
+- 리테일러별 기본 프로필은 RETAILER_PROFILES, BLOCK_PROFILE_{RETAILER} 환경변수로 변경 (off/light/full)
+- render_tuner.py로 튜닝된 렌더링 프로필이 있으면 이미지/CSS 차단과 JS 비활성화는 그 결과를 따름
+"""
+
+import logging
+import os
+from urllib.parse import urlparse
+
+from render_profile import get_render_profile
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp']
+MEDIA_EXTENSIONS = ['mp4', 'webm', 'm3u8', 'ts', 'mp3', 'ogg', 'wav']
+FONT_EXTENSIONS = ['woff', 'woff2', 'ttf', 'otf', 'eot']
+CSS_EXTENSIONS = ['css']
+
+# 광고/분석/트래커 호스트 (하위 도메인 포함)
+TRACKER_HOSTS = [
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'googletagservices.com',
+    'googletagmanager.com',
+    'google-analytics.com',
+    'adservice.google.com',
+    'amazon-adsystem.com',
+    'facebook.net',
+    'scorecardresearch.com',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'hotjar.com',
+    'bat.bing.com',
+    'adsrvr.org',
+    'quantserve.com',
+    'pinterest.com',
+    'tiktok.com',
+    'snapchat.com'
+]
+
+# 캡차 화면은 사람이 직접 풀어야 하므로 이미지 포함 절대 차단하지 않음 (Playwright 전용 - CDP 패턴은 예외 지정 불가)
+ALLOWED_HOSTS = [
+    'captcha-delivery.com',
+    'datadome.co',
+    'hcaptcha.com',
+    'recaptcha.net'
+]
+
+# 프로필별 차단 범주
+PROFILES = {
+    'off': (),
+    'light': ('media', 'fonts', 'trackers'),
+    'full': ('images', 'media', 'fonts', 'trackers')
+}
+
+# 리테일러별 기본 프로필 (수동 캡차 해결이 필요한 x-kom은 이미지 유지)
+RETAILER_PROFILES = {
+    'amazon': 'full',
+    'bestbuy': 'full',
+    'currys': 'full',
+    'coolblue': 'full',
+    'danawa': 'full',
+    'mediamarkt': 'full',
+    'fnac': 'full',
+    'xkom': 'light'
+}
+
+# Playwright resource_type -> 차단 범주
+PLAYWRIGHT_RESOURCE_CATEGORIES = {
+    'image': 'images',
+    'media': 'media',
+    'font': 'fonts'
+}
+
+
+def get_block_profile(retailer):
+    """리테일러 차단 프로필 - BLOCK_PROFILE_{RETAILER} 환경변수 > 튜닝된 렌더링 프로필 > RETAILER_PROFILES"""
+    default = RETAILER_PROFILES.get(retailer, 'light')
+    render = get_render_profile(retailer)
+    if render is not None:
+        default = 'light' if render['images'] else 'full'
+    name = f'BLOCK_PROFILE_{retailer.upper()}'
+    profile = (os.getenv(name, default) or default).strip().lower()
+    if profile not in PROFILES:
+        logger.warning(f"{name} 값이 잘못됨: {profile} -> {default} 사용")
+        return default
+    return profile
+
+
+def blocked_url_patterns(profile, block_css=False):
+    """CDP Network.setBlockedURLs 패턴 목록 ('*' 와일드카드)"""
+    categories = PROFILES.get(profile, ()) + (('css',) if block_css else ())
+    patterns = []
+    extensions = {
+        'images': IMAGE_EXTENSIONS,
+        'media': MEDIA_EXTENSIONS,
+        'fonts': FONT_EXTENSIONS,
+        'css': CSS_EXTENSIONS
+    }
+    for category, values in extensions.items():
+        if category in categories:
+            # 쿼리스트링이 붙은 URL도 포함
+            patterns.extend(f'*.{ext}' for ext in values)
+            patterns.extend(f'*.{ext}?*' for ext in values)
+    if 'trackers' in categories:
+        patterns.extend(f'*{host}/*' for host in TRACKER_HOSTS)
+    return patterns
+
+
+def apply_resource_blocking(driver, retailer):
+    """
+    Selenium 드라이버에 리테일러 차단 프로필 적용 (setup_driver에서 드라이버 생성 직후 호출)
+
+    Returns:
+        int: 적용된 패턴 수 (off 또는 CDP 실패 시 0)
+    """
+    profile = get_block_profile(retailer)
+    render = get_render_profile(retailer)
+    patterns = blocked_url_patterns(profile, block_css=render is not None and not render['css'])
+
+    if render is not None and not render['javascript']:
+        try:
+            driver.execute_cdp_cmd('Emulation.setScriptExecutionDisabled', {'value': True})
+            logger.info(f"🚫 페이지 JS 비활성화: {retailer} (렌더링 프로필 {render['name']})")
+        except Exception as e:
+            logger.warning(f"JS 비활성화 실패 (JS 사용): {e}")
+
+    if not patterns:
+        return 0
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.info(f"🚫 리소스 차단 프로필 적용: {retailer}={profile} ({len(patterns)}개 패턴)")
+        return len(patterns)
+    except Exception as e:
+        logger.warning(f"리소스 차단 적용 실패 (차단 없이 진행): {e}")
+        return 0
+
+
+def _host_matches(host, domains):
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+def should_block_request(url, resource_type, profile):
+    """Playwright route 핸들러용 차단 여부 (resource_type: request.resource_type)"""
+    categories = PROFILES.get(profile, ())
+    if not categories:
+        return False
+
+    host = (urlparse(url).hostname or '').lower()
+    if _host_matches(host, ALLOWED_HOSTS):
+        return False
+    if 'trackers' in categories and _host_matches(host, TRACKER_HOSTS):
+        return True
+    return PLAYWRIGHT_RESOURCE_CATEGORIES.get(resource_type) in categories
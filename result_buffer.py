@@ -0,0 +1,207 @@
+"""
+결과 행 공통 빌더 + 컬럼형 결과 버퍼
+- 크롤러마다 extract_product_info 정상/실패 경로에서 24개 키 dict를 두 번씩 직접 만들던 것을 new_result() 하나로 통합
+  (시간 컬럼 4개 계산 포함, 크롤러별 값은 country_code / channel_name / ships_from / sold_by / vat만 넘김)
+- 수집한 결과는 상품별 dict 목록 대신 ResultBuffer의 컬럼별 리스트에 쌓음 (append 후 dict는 버려짐)
+  - 중간 저장: take_unflushed() - 마지막 저장 이후 행만 DataFrame으로 (결과 전체에서 잘라 다시 만들지 않음)
+  - 최종 결과: to_frame() - 컬럼 리스트 -> DataFrame 1회 복사 / to_arrow() - pyarrow 설치 시 Arrow 테이블
+  - release_flushed=True: 중간 저장한 행은 임시 파일(pickle 스풀)로 내보내고 메모리에서 해제
+    (실행 중 메모리는 마지막 중간 저장 이후 행만큼으로 일정, to_frame()은 스풀까지 합쳐 전체 반환 - 최종 CSV용)
+- 스레드 안전하지 않음 - 여러 워커가 공유할 때는 호출측 락 안에서 사용 (scraper_pool.ResultSink)
+"""
+
+import pickle
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+
+# 결과 행 컬럼 (리테일러 크롤러 / DB 테이블 순서)
+RESULT_COLUMNS = (
+    'retailerid', 'country_code', 'ships_from', 'channel_name', 'channel', 'retailersku',
+    'brand', 'brand_eng', 'form_factor', 'segment_lv1', 'segment_lv2', 'segment_lv3', 'capacity', 'item',
+    'retailprice', 'retailprice_raw', 'sold_by', 'imageurl', 'producturl',
+    'crawl_datetime', 'crawl_strdatetime', 'kr_crawl_datetime', 'kr_crawl_strdatetime',
+    'title', 'vat'
+)
+
+# Amazon 크롤러 순서 (기존 테이블/CSV와 같게 한국시간 컬럼이 crawl_strdatetime 앞)
+AMAZON_RESULT_COLUMNS = (
+    'retailerid', 'country_code', 'ships_from', 'channel_name', 'channel', 'retailersku',
+    'brand', 'brand_eng', 'form_factor', 'segment_lv1', 'segment_lv2', 'segment_lv3', 'capacity', 'item',
+    'retailprice', 'retailprice_raw', 'sold_by', 'imageurl', 'producturl',
+    'crawl_datetime', 'kr_crawl_datetime', 'kr_crawl_strdatetime', 'crawl_strdatetime',
+    'title', 'vat'
+)
+
+
+def crawl_time_fields(local_tz, korea_tz):
+    """수집 시각 컬럼 (현지시간 ISO 8601 + 문자열, 한국시간 + 문자열)"""
+    now_time = datetime.now(korea_tz)
+    local_time = datetime.now(local_tz)
+
+    tz_offset = local_time.strftime("%z")
+    tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
+    return {
+        'crawl_datetime': local_time.strftime("%Y-%m-%dT%H:%M:%S") + tz_formatted,
+        'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
+        'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4]
+    }
+
+
+def new_result(row_data, url, local_tz, korea_tz, columns=RESULT_COLUMNS, **fields):
+    """
+    결과 행 1개 생성 (모든 크롤러 공통 빌더)
+
+    Args:
+        row_data: 크롤링 대상 행 (get_crawl_targets)
+        url: 상품 URL
+        local_tz / korea_tz: 현지 / 한국 타임존
+        columns: 행 컬럼 순서 (크롤러 테이블 기준)
+        **fields: 크롤러별 값 (country_code, channel_name, ships_from, sold_by, vat 등)
+
+    Returns:
+        dict: columns 순서의 결과 행 (추출 값은 None)
+    """
+    values = {
+        'retailerid': row_data.get('retailerid', ''),
+        'channel': row_data.get('channel', 'Online'),
+        'retailersku': row_data.get('retailersku', ''),
+        'brand': row_data.get('brand', ''),
+        'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
+        'form_factor': row_data.get('form_factor', ''),
+        'segment_lv1': row_data.get('seg_lv1', ''),
+        'segment_lv2': row_data.get('seg_lv2', ''),
+        'segment_lv3': row_data.get('seg_lv3', ''),
+        'capacity': row_data.get('capacity', ''),
+        'item': row_data.get('item', ''),
+        'producturl': url,
+        **crawl_time_fields(local_tz, korea_tz),
+        **fields
+    }
+    return {column: values.get(column) for column in columns}
+
+
+class ResultBuffer:
+    """
+    컬럼별 리스트 결과 버퍼
+
+    Args:
+        columns: 기본 컬럼 순서 (행에 다른 키가 있으면 뒤에 추가하고 이전 행은 None)
+        release_flushed: 중간 저장(take_unflushed)한 행을 임시 파일 스풀로 옮기고 메모리에서 해제
+    """
+
+    def __init__(self, columns=RESULT_COLUMNS, release_flushed=False):
+        self.columns = list(columns)
+        self.release_flushed = release_flushed
+        self._data = {column: [] for column in self.columns}
+        self._order = []
+        self._rows = 0      # 메모리에 있는 행 수
+        self._flushed = 0   # 메모리에 있는 행 중 중간 저장 완료된 앞쪽 행 수
+        self.total = 0      # 지금까지 추가된 전체 행 수 (해제된 행 포함)
+        self._spool = None  # 해제한 행 (DataFrame, order) pickle 묶음 - 임시 파일, 닫으면 삭제
+        self._spooled = 0   # 스풀에 있는 행 수
+
+    def __len__(self):
+        return self.total
+
+    def append(self, result, order=None):
+        """결과 행 추가 (order: 원래 대상 순서 - 워커 풀/비동기 수집에서 최종 정렬용)"""
+        for column in result:
+            if column not in self._data:
+                self.columns.append(column)
+                self._data[column] = [None] * self._rows
+        for column in self.columns:
+            self._data[column].append(result.get(column))
+        self._order.append(self.total if order is None else order)
+        self._rows += 1
+        self.total += 1
+
+    def column(self, name):
+        """메모리에 있는 행의 컬럼 값 목록 (복사하지 않음 - 스풀로 해제된 행은 포함하지 않음)"""
+        return self._data[name]
+
+    def _frame(self, start, stop):
+        data = {column: values[start:stop] for column, values in self._data.items()}
+        return pd.DataFrame(data, columns=self.columns)
+
+    def take_unflushed(self):
+        """마지막 중간 저장 이후 행 DataFrame (없으면 None) - 저장 완료로 표시"""
+        if self._flushed >= self._rows:
+            return None
+        frame = self._frame(self._flushed, self._rows)
+        self._flushed = self._rows
+        if self.release_flushed:
+            self._release()
+        return frame
+
+    def _release(self):
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile(prefix='result_buffer_', suffix='.pkl')
+        pickle.dump((self._frame(0, self._flushed), self._order[:self._flushed]), self._spool,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        self._spooled += self._flushed
+
+        for values in self._data.values():
+            del values[:self._flushed]
+        del self._order[:self._flushed]
+        self._rows -= self._flushed
+        self._flushed = 0
+
+    def _read_spool(self):
+        """스풀의 (DataFrame, order) 묶음 목록 (파일 위치는 끝으로 되돌림)"""
+        chunks = []
+        self._spool.seek(0)
+        try:
+            while True:
+                chunks.append(pickle.load(self._spool))
+        except EOFError:
+            pass
+        self._spool.seek(0, 2)
+        return chunks
+
+    def _ordered_data(self):
+        """order 순 컬럼 데이터 (이미 순서대로면 원본 리스트 그대로)"""
+        if self._order == sorted(self._order):
+            return self._data
+        index = sorted(range(self._rows), key=self._order.__getitem__)
+        return {column: [values[i] for i in index] for column, values in self._data.items()}
+
+    def to_frame(self):
+        """
+        전체 행 DataFrame (order 순)
+
+        해제한 행이 없으면 컬럼 리스트 -> DataFrame 1회 복사, 있으면 스풀 묶음과 메모리 행을 합쳐 정렬
+        """
+        if not self._spooled:
+            return pd.DataFrame(self._ordered_data(), columns=self.columns)
+        chunks = self._read_spool()
+        frames = [frame for frame, _ in chunks] + [self._frame(0, self._rows)]
+        order = [position for _, positions in chunks for position in positions] + self._order
+        df = pd.concat(frames, ignore_index=True).reindex(columns=self.columns)
+        if order != sorted(order):
+            df = df.iloc[sorted(range(len(order)), key=order.__getitem__)].reset_index(drop=True)
+        return df
+
+    def to_arrow(self):
+        """전체 행 Arrow 테이블 (pyarrow 필요, 해제한 행이 없으면 컬럼 리스트에서 바로 변환)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow()에는 pyarrow가 필요합니다: pip install pyarrow")
+        if self._spooled:
+            return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+        data = self._ordered_data()
+        return pa.Table.from_pydict({column: data[column] for column in self.columns})
+
+    def clear(self):
+        """전체 비우기 (무한 크롤러의 회차 사이)"""
+        for values in self._data.values():
+            values.clear()
+        self._order.clear()
+        self._rows = self._flushed = self.total = self._spooled = 0
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
@@ -0,0 +1,124 @@
+"""
+크롤링 결과 타입 스키마
+- retailprice가 크롤러마다 문자열("1,234.99" / "12,800") / float / 실패 시 0 또는 None으로 섞여 있어
+  분석·알림·SQL 집계 때마다 문자열 치환과 dtype 확인이 필요했던 문제를 저장 시점에 한 번 정리
+- 가격 컬럼 (retailprice 바로 뒤에 배치, 나머지 컬럼 순서는 그대로)
+  - retailprice: Float64 (기본 단위, 실패는 NA, 재고 없음 표시 0은 그대로)
+  - retailprice_minor: Int64 (최소 단위 정수 - 센트/펜스, JPY/KRW는 원 단위 그대로)
+  - currency: ISO 4217 통화 코드 (price_parser.PRICE_LOCALES)
+  - retailprice_raw: 크롤러가 parse_price 전에 읽은 가격 텍스트 원문 (크롤러가 attach_raw_price로 기록)
+    - 원문이 없는 행(구조화 데이터로 채운 가격, 이전 버전 결과)만 retailprice 값을 문자열로 대신 넣음
+- save_to_db / 중간 저장 / CSV는 모두 apply_result_schema 또는 result_writer.write_results를 거침
+- 기존 테이블의 새 컬럼은 migrate_result_columns.py로 1회 추가 (테이블이 없으면 저장 시 전체 컬럼으로 생성)
+  - 저장 경로(write_results)는 컬럼 존재만 확인, DDL 없음 - 없는 컬럼은 경고 후 빼고 저장
+"""
+
+import logging
+
+import pandas as pd
+from sqlalchemy import inspect
+
+from price_parser import get_price_locale, parse_price_series
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMN = 'retailprice'
+PRICE_MINOR_COLUMN = 'retailprice_minor'
+CURRENCY_COLUMN = 'currency'
+RAW_PRICE_COLUMN = 'retailprice_raw'
+
+# 컬럼 -> (pandas nullable dtype, 기존 테이블에 추가할 때의 MySQL 타입)
+PRICE_SCHEMA = {
+    PRICE_COLUMN: ('Float64', None),
+    PRICE_MINOR_COLUMN: ('Int64', 'BIGINT NULL'),
+    CURRENCY_COLUMN: ('string', 'CHAR(3) NULL'),
+    RAW_PRICE_COLUMN: ('string', 'VARCHAR(255) NULL')
+}
+
+# 컬럼 확인을 마친 (엔진 URL, 테이블) -> 테이블에 없는 가격 스키마 컬럼 이름
+_checked_tables = {}
+
+
+def _raw_text(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text_value = str(value).strip()
+    return text_value or None
+
+
+def attach_raw_price(result, raw_text):
+    """가격을 읽은 원문을 결과 행에 기록 (가격이 있고 원문이 아직 없을 때만)"""
+    if result.get(PRICE_COLUMN) is None or _raw_text(result.get(RAW_PRICE_COLUMN)):
+        return
+    result[RAW_PRICE_COLUMN] = _raw_text(raw_text)
+
+
+def apply_result_schema(data, country_code):
+    """
+    결과 행 목록/DataFrame -> 타입 스키마 DataFrame (이미 적용된 DataFrame에 다시 적용해도 같은 결과)
+
+    Args:
+        data: 결과 dict 목록 또는 DataFrame
+        country_code: 국가 코드 (가격 형식/통화/최소 단위 자릿수)
+
+    Returns:
+        DataFrame (새 객체, 입력은 변경하지 않음)
+    """
+    df = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+    if PRICE_COLUMN not in df.columns:
+        return df
+
+    locale = get_price_locale(country_code)
+    prices = df[PRICE_COLUMN]
+
+    raw = prices.map(_raw_text).astype('string')
+    if RAW_PRICE_COLUMN in df.columns:
+        raw = df[RAW_PRICE_COLUMN].astype('string').fillna(raw)
+
+    price = parse_price_series(prices, country_code).astype('Float64')
+    # 0은 실패가 아니라 재고 없음 표시 (다나와) - NA로 바꾸지 않음
+    price = price.mask(pd.to_numeric(prices, errors='coerce').eq(0), 0.0)
+    minor = (price * 10 ** locale['decimals']).round().astype('Int64')
+    currency = pd.Series(locale['currency'], index=df.index, dtype='string')
+
+    typed = {PRICE_COLUMN: price, PRICE_MINOR_COLUMN: minor, CURRENCY_COLUMN: currency, RAW_PRICE_COLUMN: raw}
+    # retailprice 바로 뒤에 가격 컬럼 배치 (나머지 컬럼 순서 유지)
+    columns = [column for column in df.columns if column not in typed or column == PRICE_COLUMN]
+    position = columns.index(PRICE_COLUMN)
+    columns[position:position + 1] = list(typed)
+
+    for column, values in typed.items():
+        df[column] = values.astype(PRICE_SCHEMA[column][0])
+    return df[columns]
+
+
+def missing_result_columns(inspector, table_name):
+    """테이블에 없는 가격 스키마 컬럼 [(컬럼, MySQL 타입)]"""
+    existing = {column['name'].lower() for column in inspector.get_columns(table_name)}
+    return [(column, sql_type) for column, (_, sql_type) in PRICE_SCHEMA.items()
+            if sql_type and column not in existing]
+
+
+def check_result_columns(engine, table_name):
+    """
+    기존 결과 테이블에 없는 가격 스키마 컬럼 이름 목록 (테이블별 1회 확인, DDL 없음)
+
+    컬럼 추가는 migrate_result_columns.py - 확인 실패 시 빈 목록 (다음 저장 때 다시 확인)
+    """
+    key = (str(engine.url), table_name)
+    if key in _checked_tables:
+        return _checked_tables[key]
+    try:
+        inspector = inspect(engine)
+        if not inspector.has_table(table_name):
+            missing = []  # 저장 시 전체 컬럼으로 테이블 생성
+        else:
+            missing = [column for column, _ in missing_result_columns(inspector, table_name)]
+        if missing:
+            logger.warning(f"{table_name} 가격 컬럼 없음 - 빼고 저장: {', '.join(missing)} "
+                           f"(python migrate_result_columns.py {table_name})")
+        _checked_tables[key] = missing
+        return missing
+    except Exception as e:
+        logger.warning(f"{table_name} 컬럼 확인 실패 (저장은 계속): {e}")
+        return []
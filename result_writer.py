@@ -0,0 +1,199 @@
+"""
+멱등 결과 저장 (중간 저장 + 최종 저장이 합쳐서 행당 정확히 1번)
+- 기존: scrape_urls가 10개마다 중간 저장한 행을 save_results -> save_to_db가 전체 DataFrame으로 다시 append
+  -> *_price_crawl_tbl_* 테이블에 대부분의 행이 2번씩 들어가 조회마다 중복 제거가 필요했음
+- 행 키: (producturl, crawl_strdatetime) - 같은 상품의 같은 수집 시각은 같은 행
+- 테이블별 ResultWriter (프로세스당 1개, get_result_writer)
+  - write-ahead 버퍼: 저장할 행을 먼저 버퍼에 쌓고 트랜잭션 1번으로 저장, 성공한 뒤에만 키를 저장 완료로 기록
+    (저장 실패한 중간 배치는 버퍼에 남아 다음 저장 때 함께 재시도)
+  - 연속 RESULT_FLUSH_MAX_RETRIES번(기본 3) 실패하면 배치를 CSV로 격리(logs/failed_results)하고 버퍼를 비움
+    (DB 장애가 길어져도 버퍼가 끝없이 커지거나 같은 배치를 계속 다시 보내지 않음)
+  - 이미 저장한 키는 건너뜀 -> 최종 save_to_db는 중간 저장되지 않은 행만 추가
+  - 저장은 bulk_writer.bulk_insert (청크 executemany / 선택적 LOAD DATA)
+  - MySQL: 테이블에 (producturl, crawl_strdatetime) UNIQUE 키가 있으면 INSERT ... ON DUPLICATE KEY UPDATE
+    (재실행/다른 프로세스에서 같은 키가 와도 1행 유지)
+  - UNIQUE 키는 migrate_result_unique_keys.py로 1회 생성 (저장 경로에서는 인덱스 존재만 확인, DDL 없음)
+    - 키가 없는 테이블은 경고 후 프로세스 내 키 기준 중복 제거만 적용
+  - 가격 스키마 컬럼도 migrate_result_columns.py로 1회 추가 (저장 경로에서는 확인만, 없는 컬럼은 빼고 저장)
+- RESULT_UPSERT=0: UNIQUE 키/upsert 사용 안 함 (프로세스 내 중복 제거는 유지)
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import inspect
+
+from bulk_writer import bulk_insert
+from result_schema import apply_result_schema, check_result_columns
+
+logger = logging.getLogger(__name__)
+
+RESULT_KEY = ('producturl', 'crawl_strdatetime')
+UNIQUE_KEY_NAME = 'uq_result_row'
+
+DEFAULT_MAX_FLUSH_FAILURES = 3
+DEFAULT_QUARANTINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'failed_results')
+
+# 테이블별 writer ((엔진 URL, 테이블) -> ResultWriter)
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def upsert_enabled():
+    """RESULT_UPSERT 환경변수 (기본 1: MySQL UNIQUE 키 + upsert)"""
+    return os.getenv('RESULT_UPSERT', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def max_flush_failures():
+    """RESULT_FLUSH_MAX_RETRIES 환경변수 (같은 버퍼 연속 저장 실패 허용 횟수, 기본 3)"""
+    try:
+        return max(1, int(os.getenv('RESULT_FLUSH_MAX_RETRIES', str(DEFAULT_MAX_FLUSH_FAILURES))))
+    except ValueError:
+        logger.warning(f"RESULT_FLUSH_MAX_RETRIES 값이 잘못됨: {os.getenv('RESULT_FLUSH_MAX_RETRIES')} -> {DEFAULT_MAX_FLUSH_FAILURES} 사용")
+        return DEFAULT_MAX_FLUSH_FAILURES
+
+
+class ResultWriter:
+    """
+    결과 테이블 1개용 멱등 writer (스레드 안전)
+
+    Args:
+        engine: SQLAlchemy 엔진
+        table_name: 결과 테이블
+        country_code: 국가 코드 (타입 스키마 적용)
+    """
+
+    def __init__(self, engine, table_name, country_code):
+        self.engine = engine
+        self.table_name = table_name
+        self.country_code = country_code
+        self._lock = threading.Lock()
+        self._pending = []      # write-ahead 버퍼 (저장 대기 DataFrame)
+        self._written = set()   # 저장 완료된 행 키
+        self._upsert = None     # UNIQUE 키 사용 여부 (테이블 확인 전 None)
+        self._failures = 0      # 현재 버퍼의 연속 저장 실패 횟수
+
+    def __len__(self):
+        """저장 대기 행 수"""
+        with self._lock:
+            return sum(len(df) for df in self._pending)
+
+    @staticmethod
+    def row_keys(df):
+        return list(zip(df[RESULT_KEY[0]].astype(str), df[RESULT_KEY[1]].astype(str)))
+
+    def stage(self, data):
+        """타입 스키마 적용 후 write-ahead 버퍼에 추가 (DataFrame 반환)"""
+        df = apply_result_schema(data, self.country_code)
+        if not df.empty:
+            with self._lock:
+                self._pending.append(df)
+        return df
+
+    def has_unique_key(self):
+        """MySQL 테이블에 행 키 UNIQUE 인덱스가 있는지 확인 (테이블이 생긴 뒤 1회, 생성은 migrate_result_unique_keys.py)"""
+        if self._upsert is not None:
+            return self._upsert
+        if not upsert_enabled() or self.engine.dialect.name != 'mysql':
+            self._upsert = False
+            return False
+        try:
+            inspector = inspect(self.engine)
+            if not inspector.has_table(self.table_name):
+                return False  # bulk_insert가 테이블 생성 후 다음 저장 때 다시 확인
+            self._upsert = any(index.get('unique') and tuple(index['column_names']) == RESULT_KEY
+                               for index in inspector.get_indexes(self.table_name))
+            if not self._upsert:
+                logger.warning(f"{self.table_name} 행 키 UNIQUE 인덱스 없음 - 프로세스 내 중복 제거만 적용 "
+                               f"(python migrate_result_unique_keys.py {self.table_name})")
+        except Exception as e:
+            logger.warning(f"{self.table_name} UNIQUE 키 확인 실패 - 프로세스 내 중복 제거만 적용: {e}")
+            self._upsert = False
+        return self._upsert
+
+    def quarantine(self, batch):
+        """저장을 포기한 배치를 CSV로 보관 (RESULT_QUARANTINE_DIR, 기본 logs/failed_results) - 파일 경로 반환"""
+        quarantine_dir = os.getenv('RESULT_QUARANTINE_DIR', DEFAULT_QUARANTINE_DIR)
+        try:
+            os.makedirs(quarantine_dir, exist_ok=True)
+            path = os.path.join(quarantine_dir, f"{self.table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv")
+            batch.to_csv(path, index=False, encoding='utf-8-sig')
+            return path
+        except Exception as e:
+            logger.error(f"{self.table_name} 격리 CSV 저장 실패 - {len(batch)}개 행 유실: {e}")
+            return None
+
+    def flush(self):
+        """
+        write-ahead 버퍼 저장 (이미 저장한 키 제외, 트랜잭션 1번)
+
+        Returns:
+            int: 새로 저장한 행 수 - 실패 시 예외
+                 (버퍼는 유지되어 다음 flush에서 재시도, 연속 max_flush_failures()번 실패하면 격리 후 비움)
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            df = pd.concat(self._pending, ignore_index=True) if len(self._pending) > 1 else self._pending[0]
+            keys = self.row_keys(df)
+            fresh = [key not in self._written for key in keys]
+            # 같은 키가 버퍼에 여러 번 있으면 마지막 값 (재시도/최종 저장이 최신)
+            batch = df[fresh].drop_duplicates(list(RESULT_KEY), keep='last')
+            skipped = len(df) - len(batch)
+
+            if not batch.empty:
+                try:
+                    missing = check_result_columns(self.engine, self.table_name)
+                    upsert_keys = RESULT_KEY if self.has_unique_key() else None
+                    bulk_insert(batch.drop(columns=missing) if missing else batch,
+                                self.table_name, self.engine, upsert_keys=upsert_keys)
+                except Exception as e:
+                    self._failures += 1
+                    limit = max_flush_failures()
+                    if self._failures < limit:
+                        logger.warning(f"{self.table_name} 저장 실패 ({self._failures}/{limit}) - "
+                                       f"{len(batch)}개 행은 버퍼에 남겨 다음 저장 때 재시도: {e}")
+                        raise
+                    path = self.quarantine(batch)
+                    logger.error(f"❌ {self.table_name} 저장 {self._failures}회 연속 실패 - "
+                                 f"{len(batch)}개 행 격리 후 버퍼 비움 ({path}): {e}")
+                    self._pending.clear()
+                    self._failures = 0
+                    raise
+                self._written.update(self.row_keys(batch))
+
+            self._pending.clear()
+            self._failures = 0
+
+        if skipped:
+            logger.info(f"♻️ {self.table_name}: 이미 저장된 {skipped}개 행 건너뜀 (신규 {len(batch)}개)")
+        return len(batch)
+
+    def write(self, data):
+        """stage + flush (DataFrame 반환)"""
+        df = self.stage(data)
+        self.flush()
+        return df
+
+
+def get_result_writer(engine, table_name, country_code):
+    """(엔진, 테이블)별 ResultWriter (프로세스 안에서 공유 - 중간/최종 저장이 같은 키 기록을 봄)"""
+    key = (str(engine.url), table_name)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = ResultWriter(engine, table_name, country_code)
+        return writer
+
+
+def write_results(data, table_name, engine, country_code):
+    """
+    결과를 타입 스키마로 변환해 테이블에 멱등 저장 (이미 저장한 행 키는 건너뜀)
+
+    Returns:
+        DataFrame: 타입 스키마 DataFrame (입력 전체 - 건너뛴 행 포함)
+    """
+    return get_result_writer(engine, table_name, country_code).write(data)
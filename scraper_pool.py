@@ -0,0 +1,248 @@
+"""
+멀티 브라우저 워커 풀
+- get_crawl_targets() 결과를 워커 수만큼 샤드로 나눠 워커별 Chrome 인스턴스로 병렬 처리
+- 모든 워커의 결과는 하나의 공유 싱크(ResultSink)로 수집
+- 도메인별 요청 간격은 풀 전체 기준으로 유지 (DomainThrottle 또는 rate_limiter.AdaptiveRateLimiter)
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from persistence_queue import submit_results
+from result_buffer import ResultBuffer
+
+logger = logging.getLogger(__name__)
+
+# undetected_chromedriver는 드라이버 바이너리를 패치하므로 동시에 생성하면 충돌함
+_DRIVER_SETUP_LOCK = threading.Lock()
+
+
+def get_pool_workers(default=1):
+    """POOL_WORKERS 환경변수에서 워커 수 조회 (1 이하면 기존 순차 모드)"""
+    try:
+        return max(1, int(os.getenv('POOL_WORKERS', str(default)) or default))
+    except ValueError:
+        logger.warning(f"POOL_WORKERS 값이 잘못됨: {os.getenv('POOL_WORKERS')} -> {default} 사용")
+        return default
+
+
+class DomainThrottle:
+    """
+    도메인별 요청 간격 제어 (스레드 안전)
+
+    순차 모드의 대기 규칙을 풀 전체에 적용한다. 워커가 몇 개든
+    같은 도메인으로 나가는 요청 시작 간격은 min_wait~max_wait초 이상이고,
+    pause_every개마다 pause_seconds초 휴식한다.
+    """
+
+    def __init__(self, min_wait=5, max_wait=10, pause_every=20, pause_seconds=30):
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.pause_every = pause_every
+        self.pause_seconds = pause_seconds
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+        self._counts = {}
+
+    @staticmethod
+    def domain_of(url):
+        return urlparse(url or '').netloc.lower()
+
+    def reserve(self, url):
+        """해당 도메인 요청 슬롯을 예약하고 남은 대기 시간(초)을 반환"""
+        domain = self.domain_of(url)
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(domain, now))
+            count = self._counts.get(domain, 0) + 1
+            self._counts[domain] = count
+
+            next_allowed = slot + random.uniform(self.min_wait, self.max_wait)
+            if self.pause_every and count % self.pause_every == 0:
+                logger.info(f"☕ {domain}: {count}개 요청 완료, {self.pause_seconds}초 휴식 예약")
+                next_allowed += self.pause_seconds
+            self._next_allowed[domain] = next_allowed
+
+        return max(0.0, slot - time.monotonic())
+
+    def wait(self, url):
+        """해당 도메인 요청 슬롯을 예약하고 차례가 올 때까지 대기"""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.info(f"⏳ [{threading.current_thread().name}] {self.domain_of(url)} 차례 대기 {delay:.1f}초")
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """asyncio 태스크용 wait() - 이벤트 루프를 막지 않고 대기"""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.info(f"⏳ {self.domain_of(url)} 차례 대기 {delay:.1f}초")
+            await asyncio.sleep(delay)
+
+
+class ResultSink:
+    """
+    워커 공유 결과 싱크 (스레드 안전)
+
+    interim_callback이 주어지면 interim_every개가 모일 때마다 해당 배치(DataFrame)로 호출한다.
+    결과는 컬럼별 버퍼(ResultBuffer)에 쌓고 컬럼 순서는 첫 결과 행의 키 순서를 따른다.
+    """
+
+    def __init__(self, interim_callback=None, interim_every=10):
+        self.interim_callback = interim_callback
+        self.interim_every = interim_every
+        self._lock = threading.Lock()
+        self._buffer = ResultBuffer(columns=(), release_flushed=True)
+        self._unsaved = 0
+        self.failed_urls = []
+
+    def add(self, order, result, row):
+        batch = None
+
+        with self._lock:
+            self._buffer.append(result, order=order)
+
+            reason = None
+            if result.get('retailprice') is None and result.get('title') is None:
+                reason = '가격과 제목 모두 없음'
+            elif result.get('retailprice') is None:
+                reason = '가격 없음'
+            if reason:
+                self.failed_urls.append({
+                    'url': result.get('producturl'),
+                    'item': row.get('item', ''),
+                    'brand': row.get('brand', ''),
+                    'reason': reason
+                })
+
+            if self.interim_callback:
+                self._unsaved += 1
+                if self._unsaved >= self.interim_every:
+                    batch = self._buffer.take_unflushed()
+                    self._unsaved = 0
+
+        if batch is not None:
+            try:
+                self.interim_callback(batch)
+            except Exception as e:
+                logger.error(f"중간 저장 실패: {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def to_frame(self):
+        """원래 대상 순서대로 정렬된 결과 DataFrame"""
+        with self._lock:
+            return self._buffer.to_frame()
+
+
+def _clone_worker(scraper):
+    """워커용 스크래퍼 복제 - 선택자/DB 엔진은 공유하고 드라이버만 분리"""
+    worker = copy.copy(scraper)
+    worker.driver = None
+    if hasattr(worker, 'wait'):
+        worker.wait = None
+
+    original_setup = worker.setup_driver
+
+    def locked_setup_driver():
+        with _DRIVER_SETUP_LOCK:
+            return original_setup()
+
+    # 재시도 중 드라이버 재시작도 같은 락을 타도록 인스턴스 메서드를 교체
+    worker.setup_driver = locked_setup_driver
+    return worker
+
+
+def _interim_saver(scraper, interim_table):
+    """중간 저장 콜백 생성 - 테이블이나 DB 엔진이 없으면 None"""
+    if not interim_table or scraper.db_engine is None:
+        return None
+
+    def save_interim(batch):
+        submit_results(batch, interim_table, scraper.db_engine, scraper.country_code)
+
+    return save_interim
+
+
+def run_scraper_pool(scraper, urls_data, workers, interim_table=None, throttle=None):
+    """
+    스크래퍼 워커 풀 실행
+
+    Args:
+        scraper: setup_driver()/extract_product_info(url, row)를 가진 스크래퍼 인스턴스
+        urls_data: get_crawl_targets() 결과 (dict 리스트)
+        workers: 동시 실행할 Chrome 인스턴스 수
+        interim_table: 10개마다 중간 저장할 테이블명 (None이면 중간 저장 안 함)
+        throttle: 공유 DomainThrottle/AdaptiveRateLimiter (None이면 기본 간격 사용)
+
+    Returns:
+        DataFrame: 원래 대상 순서대로 정렬된 결과
+    """
+    workers = max(1, min(workers, len(urls_data)))
+    throttle = throttle or DomainThrottle()
+
+    sink = ResultSink(interim_callback=_interim_saver(scraper, interim_table))
+    indexed = list(enumerate(urls_data))
+    shards = [indexed[i::workers] for i in range(workers)]
+    total = len(urls_data)
+
+    logger.info(f"🧵 워커 풀 시작: {workers}개 브라우저, 대상 {total}개")
+
+    def run_shard(worker_id, shard):
+        worker = _clone_worker(scraper)
+
+        # 브라우저 기동이 한꺼번에 몰리지 않도록 약간씩 지연
+        time.sleep(worker_id * random.uniform(2, 4))
+
+        if not worker.setup_driver():
+            logger.error(f"워커 {worker_id}: 드라이버 설정 실패 - 샤드 {len(shard)}개 건너뜀")
+            return
+
+        try:
+            for order, row in shard:
+                url = row.get('url')
+                try:
+                    throttle.wait(url)
+                    result = worker.extract_product_info(url, row)
+                    if hasattr(throttle, 'record'):
+                        throttle.record(url, blocked=worker.last_blocked)
+                    sink.add(order, result, row)
+                    done = len(sink)
+                    logger.info(f"진행률: {done}/{total} ({done / total * 100:.1f}%) [워커 {worker_id}]")
+                except Exception as e:
+                    logger.error(f"스크래핑 중 오류 (URL: {url}) [워커 {worker_id}]: {e}")
+        finally:
+            if worker.driver:
+                try:
+                    worker.driver.quit()
+                except Exception:
+                    pass
+                logger.info(f"워커 {worker_id} 드라이버 종료")
+
+    threads = [
+        threading.Thread(target=run_shard, args=(worker_id, shard), name=f"pool-{worker_id}", daemon=True)
+        for worker_id, shard in enumerate(shards)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    failed_urls = sink.failed_urls
+    if failed_urls:
+        logger.warning(f"문제 발생한 URL {len(failed_urls)}개:")
+        for fail in failed_urls[:5]:
+            logger.warning(f"  - {fail['brand']} {fail['item']}: {fail.get('reason', '알 수 없음')}")
+        if len(failed_urls) > 5:
+            logger.warning(f"  ... 외 {len(failed_urls) - 5}개")
+
+    return sink.to_frame()
@@ -0,0 +1,206 @@
+"""
+상품별 선택자 기억 (sticky selector + negative cache)
+- 같은 ASIN/SKU 페이지는 레이아웃이 거의 바뀌지 않으므로, 필드별로 지난번에 성공한 선택자/추출 단계를 기억
+- 다음 실행에서는 기억된 선택자를 먼저 시도하고, 실패할 때만 전체 선택자 목록으로 내려감
+- 연속으로 여러 번 값이 없었던 필드(sold_by/ships_from 등)는 일정 기간 추출 자체를 건너뜀 (negative cache)
+- 상태는 JSON 파일로 저장되어 다음 실행에서 이어서 사용
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SelectorMemory:
+    """
+    상품별 필드 선택자 기억 (스레드 안전)
+
+    Args:
+        state_file: 저장 파일 경로 (None이면 저장 안 함)
+        absent_after: 연속 몇 번 값이 없으면 "없는 필드"로 간주할지
+        negative_ttl_days: "없는 필드"로 간주한 뒤 다시 전체 확인하기까지의 기간(일)
+        save_every: 몇 건 변경마다 파일에 저장할지
+    """
+
+    def __init__(self, state_file=None, absent_after=3, negative_ttl_days=7, save_every=25):
+        self.state_file = state_file
+        self.absent_after = absent_after
+        self.negative_ttl = negative_ttl_days * 86400
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._entries = self._load_state()
+        self._dirty = set()
+        self._changes = 0
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"선택자 기억 로드 실패 (빈 상태로 시작): {e}")
+            return {}
+
+    def _touch(self, key):
+        self._dirty.add(key)
+        self._changes += 1
+        return self.save_every and self._changes % self.save_every == 0
+
+    def get(self, key, field):
+        """기억된 {'selector', 'stage'} (없으면 None)"""
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key, {}).get(field)
+            if entry and entry.get('selector') is not None:
+                return {'selector': entry['selector'], 'stage': entry.get('stage')}
+        return None
+
+    def pinned(self, key, field, selectors):
+        """ordered()가 맨 앞에 세우는 기억 선택자 (selectors에 없거나 기억이 없으면 None)"""
+        remembered = self.get(key, field)
+        if not remembered or remembered['selector'] not in selectors:
+            return None
+        return remembered['selector']
+
+    def ordered(self, key, field, selectors):
+        """기억된 선택자를 맨 앞으로 옮긴 선택자 목록"""
+        pinned = self.pinned(key, field, selectors)
+        if pinned is None:
+            return list(selectors)
+        return [pinned] + [s for s in selectors if s != pinned]
+
+    def remember(self, key, field, selector, stage=None):
+        """값을 만든 선택자/단계 기억 (negative cache 해제)"""
+        if not key or selector is None:
+            return
+        with self._lock:
+            fields = self._entries.setdefault(key, {})
+            previous = fields.get(field) or {}
+            if previous.get('selector') == selector and previous.get('stage') == stage and not previous.get('misses'):
+                return
+            fields[field] = {
+                'selector': selector,
+                'stage': stage,
+                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            should_save = self._touch(key)
+        if should_save:
+            self.save()
+
+    def miss(self, key, field):
+        """전체 선택자를 시도했는데 값이 없었던 경우 기록"""
+        if not key:
+            return
+        with self._lock:
+            fields = self._entries.setdefault(key, {})
+            entry = fields.get(field) or {}
+            fields[field] = {
+                'selector': None,
+                'stage': None,
+                'misses': int(entry.get('misses') or 0) + 1,
+                'checked_at': time.time(),
+                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            should_save = self._touch(key)
+        if should_save:
+            self.save()
+
+    def is_absent(self, key, field):
+        """연속 absent_after회 이상 값이 없었고 마지막 확인 후 TTL이 지나지 않았으면 True"""
+        if not key:
+            return False
+        with self._lock:
+            entry = self._entries.get(key, {}).get(field) or {}
+            misses = int(entry.get('misses') or 0)
+            checked_at = float(entry.get('checked_at') or 0)
+        return misses >= self.absent_after and time.time() - checked_at < self.negative_ttl
+
+    def extract_together(self, key, fields, extract):
+        """
+        서로 묶인 필드(ships_from/sold_by 등)를 negative cache를 반영해 추출
+
+        없는 필드로 기억된 필드는 건너뛰지만, 그 결과 모든 필드가 비면 건너뛴 필드를
+        캐시 없이 다시 추출한다. "판매자 정보가 모두 없으면 가격 빈값" 같은 규칙이
+        실제 페이지가 아닌 캐시만 보고 판단하지 않게 하기 위함.
+
+        Args:
+            key: 상품 URL
+            fields: 필드명 목록
+            extract: field -> 값 (extract가 remember()/miss()로 결과를 기록해야 캐시가 갱신됨)
+
+        Returns:
+            list: fields 순서대로 추출값
+        """
+        values = {}
+        skipped = []
+        for field in fields:
+            if self.is_absent(key, field):
+                logger.info(f"{field} 없음으로 기억된 상품 - 추출 생략")
+                values[field] = None
+                skipped.append(field)
+            else:
+                values[field] = extract(field)
+
+        if skipped and not any(values.values()):
+            logger.info(f"{', '.join(fields)} 모두 빈값 - 건너뛴 {', '.join(skipped)} 다시 확인")
+            for field in skipped:
+                values[field] = extract(field)
+
+        return [values[field] for field in fields]
+
+    def save(self):
+        """
+        변경된 상품만 저장
+
+        풀 모드/다른 프로세스가 같은 파일을 쓸 수 있으므로 저장 직전에 다시 읽어
+        변경된 키만 덮어쓴 뒤 원자적으로 교체한다.
+        """
+        if not self.state_file:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {key: self._entries[key] for key in self._dirty if key in self._entries}
+
+            try:
+                state = self._load_state()
+                state.update(snapshot)
+
+                state_dir = os.path.dirname(os.path.abspath(self.state_file))
+                fd, tmp_path = tempfile.mkstemp(dir=state_dir, prefix='.selector_memory_', suffix='.json')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, ensure_ascii=False)
+                os.replace(tmp_path, self.state_file)
+                self._dirty.clear()
+                logger.debug(f"선택자 기억 저장: {len(snapshot)}개 상품")
+            except Exception as e:
+                logger.warning(f"선택자 기억 저장 실패: {e}")
+
+
+_shared_memories = {}
+_shared_lock = threading.Lock()
+
+
+def get_selector_memory(name, **kwargs):
+    """
+    프로세스 공유 선택자 기억 조회
+
+    저장 파일은 selector_memory_{name}.json. SELECTOR_MEMORY_DIR 환경변수로 위치를 바꿀 수 있다 ('' 이면 저장 안 함).
+    """
+    with _shared_lock:
+        if name not in _shared_memories:
+            state_dir = os.getenv('SELECTOR_MEMORY_DIR', DEFAULT_STATE_DIR)
+            kwargs.setdefault('state_file', os.path.join(state_dir, f'selector_memory_{name}.json') if state_dir else None)
+            _shared_memories[name] = SelectorMemory(**kwargs)
+        return _shared_memories[name]
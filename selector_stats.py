@@ -0,0 +1,247 @@
+"""
+선택자 적중률 통계
+- 필드별로 어떤 선택자가 실제 값을 뽑았는지 국가/리테일러 단위로 기록
+- 관측된 적중률 순서로 메모리 내 선택자 목록을 주기적으로 재정렬 (안 맞는 선택자의 왕복 비용 절감)
+- 실행 종료 시 학습된 priority를 선택자 테이블(amazon_selectors / mall_selectors)에 일괄 반영
+- 충분히 시도됐는데 한 번도 적중하지 않은 선택자는 폐기 후보로 리포트
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+
+
+class SelectorStats:
+    """
+    선택자 적중률 수집기 (스레드 안전)
+
+    Args:
+        table: 선택자 테이블명 ('amazon_selectors' / 'mall_selectors')
+        scope: 테이블 WHERE 조건 {'country_code': 'usa'} / {'mall_name': 'danawa', 'country_code': 'kr'}
+        selectors: 재정렬 대상 {필드: [선택자, ...]} 딕셔너리 (스크래퍼의 선택자 딕셔너리를 그대로 전달)
+        priority_order: 'asc'면 priority 작은 값이 우선, 'desc'면 큰 값이 우선 (테이블 로드 쿼리의 ORDER BY와 맞춤)
+        reorder_every: 몇 건 기록마다 재정렬할지
+        min_attempts: 재정렬/폐기 판단에 필요한 최소 시도 횟수
+        min_selector_attempts: 적중률로 순위를 매길 선택자별 최소 시도 횟수 (미만이면 기존 순서 유지)
+    """
+
+    def __init__(self, table, scope, selectors=None, priority_order='asc', reorder_every=20, min_attempts=20,
+                 min_selector_attempts=5):
+        self.table = table
+        self.scope = dict(scope)
+        self.selectors = selectors
+        self.priority_order = priority_order
+        self.reorder_every = reorder_every
+        self.min_attempts = min_attempts
+        self.min_selector_attempts = min_selector_attempts
+        self._lock = threading.Lock()
+        self._attempts = {}   # (field, selector) -> 시도 횟수
+        self._hits = {}       # (field, selector) -> 적중 횟수
+        self._field_counts = {}  # field -> 기록 건수
+        self._records = 0
+
+    @property
+    def scope_name(self):
+        return '_'.join(str(value) for value in self.scope.values())
+
+    def record(self, field, tried, hit=None, pinned=None):
+        """
+        필드 1건 추출 결과 기록
+
+        Args:
+            field: 필드명 (element_type)
+            tried: 실제로 평가한 선택자 목록 (순서대로)
+            hit: 값을 만든 선택자 (실패 시 None)
+            pinned: 상품별 기억(selector_memory)으로 맨 앞에 세운 선택자 - 이 시도는 통계에서 제외
+        """
+        if pinned is not None:
+            # 기억된 선택자는 그 상품에서 이미 맞았던 것이라 적중률을 부풀리므로 집계하지 않음
+            tried = [selector for selector in tried if selector != pinned]
+            if hit == pinned:
+                hit = None
+            if not tried and hit is None:
+                return
+
+        with self._lock:
+            for selector in tried:
+                key = (field, selector)
+                self._attempts[key] = self._attempts.get(key, 0) + 1
+            if hit is not None:
+                key = (field, hit)
+                if hit not in tried:
+                    self._attempts[key] = self._attempts.get(key, 0) + 1
+                self._hits[key] = self._hits.get(key, 0) + 1
+            self._field_counts[field] = self._field_counts.get(field, 0) + 1
+            self._records += 1
+            should_reorder = self.selectors is not None and self._records % self.reorder_every == 0
+
+        if should_reorder:
+            self.reorder()
+
+    def record_first(self, field, selectors, hit=None, pinned=None):
+        """우선순위대로 시도해 hit에서 멈춘 경우 기록 (hit이 없으면 전체 시도)"""
+        selectors = list(selectors)
+        tried = selectors[:selectors.index(hit) + 1] if hit in selectors else selectors
+        self.record(field, tried, hit, pinned)
+
+    def hit_rate(self, field, selector):
+        with self._lock:
+            attempts = self._attempts.get((field, selector), 0)
+            return self._hits.get((field, selector), 0) / attempts if attempts else 0.0
+
+    def _ranked(self, field, selectors):
+        """
+        적중률(hits/attempts) 내림차순
+
+        min_selector_attempts 미만으로 시도된 선택자는 적중률을 믿을 수 없으므로
+        적중한 선택자 뒤, 충분히 시도됐는데 적중 0인 선택자 앞에 기존 순서대로 둔다.
+        """
+        order = {selector: idx for idx, selector in enumerate(selectors)}
+
+        def rank_key(selector):
+            key = (field, selector)
+            attempts = self._attempts.get(key, 0)
+            if attempts < self.min_selector_attempts:
+                return (1, 0.0, order[selector])
+            rate = self._hits.get(key, 0) / attempts
+            return (0 if rate > 0 else 2, -rate, order[selector])
+
+        return sorted(selectors, key=rank_key)
+
+    def reorder(self):
+        """메모리 내 선택자 목록을 적중률 순서로 재정렬"""
+        if self.selectors is None:
+            return
+
+        with self._lock:
+            fields = [f for f, count in self._field_counts.items() if count >= self.min_attempts]
+            for field in fields:
+                current = self.selectors.get(field)
+                if not isinstance(current, list):
+                    continue
+                ranked = self._ranked(field, current)
+                if ranked != current:
+                    # 다른 워커가 순회 중인 리스트를 건드리지 않도록 새 리스트로 교체
+                    self.selectors[field] = ranked
+                    logger.info(f"🔀 [{self.scope_name}] {field} 선택자 재정렬: 1순위 {ranked[0][:80]}")
+
+    def learned_priorities(self):
+        """
+        충분히 관측된 필드의 학습 priority 목록
+
+        Returns:
+            list: (priority, element_type, selector_value)
+        """
+        rows = []
+        with self._lock:
+            for field, count in self._field_counts.items():
+                if count < self.min_attempts:
+                    continue
+                seen = [s for (f, s) in self._attempts if f == field]
+                if self.selectors is not None and isinstance(self.selectors.get(field), list):
+                    seen = list(self.selectors[field]) + [s for s in seen if s not in self.selectors[field]]
+                ranked = self._ranked(field, seen)
+                for rank, selector in enumerate(ranked):
+                    priority = rank + 1 if self.priority_order == 'asc' else len(ranked) - rank
+                    rows.append((priority, field, selector))
+        return rows
+
+    def dead_selectors(self):
+        """min_attempts 이상 시도됐지만 한 번도 적중하지 않은 선택자"""
+        with self._lock:
+            return [
+                {'element_type': field, 'selector_value': selector, 'attempts': attempts}
+                for (field, selector), attempts in sorted(self._attempts.items())
+                if attempts >= self.min_attempts and not self._hits.get((field, selector))
+            ]
+
+    def write_back(self, db_engine):
+        """
+        학습된 priority를 선택자 테이블에 일괄 반영 (executemany 1회)
+
+        테이블에 없는 기본 선택자(setup_default_selectors)는 UPDATE 대상이 없으므로 그대로 둔다.
+        """
+        rows = self.learned_priorities()
+        if not rows or db_engine is None:
+            logger.info(f"[{self.scope_name}] 반영할 선택자 priority 없음")
+            return 0
+
+        where = ' AND '.join(f"{column} = %s" for column in self.scope)
+        query = f"""
+        UPDATE {self.table}
+        SET priority = %s
+        WHERE {where}
+          AND element_type = %s
+          AND selector_value = %s
+        """
+        params = [(priority, *self.scope.values(), field, selector) for priority, field, selector in rows]
+
+        connection = db_engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(query, params)
+            connection.commit()
+            updated = cursor.rowcount
+            cursor.close()
+            logger.info(f"💾 [{self.scope_name}] 선택자 priority 일괄 반영: {len(params)}개 중 {updated}개 변경")
+            return updated
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"선택자 priority 반영 실패: {e}")
+            return 0
+        finally:
+            connection.close()
+
+    def report(self, report_dir=None):
+        """필드별 적중률 및 폐기 후보 리포트 (로그 + JSON 파일)"""
+        with self._lock:
+            fields = {}
+            for (field, selector), attempts in sorted(self._attempts.items()):
+                hits = self._hits.get((field, selector), 0)
+                fields.setdefault(field, []).append({
+                    'selector_value': selector,
+                    'attempts': attempts,
+                    'hits': hits,
+                    'hit_rate': round(hits / attempts * 100, 1) if attempts else 0.0
+                })
+            field_counts = dict(self._field_counts)
+
+        dead = self.dead_selectors()
+        report = {
+            'table': self.table,
+            'scope': self.scope,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'min_attempts': self.min_attempts,
+            'field_counts': field_counts,
+            'fields': {field: sorted(rows, key=lambda r: (-r['hit_rate'], -r['attempts'])) for field, rows in fields.items()},
+            'dead_selectors': dead
+        }
+
+        logger.info("=" * 60)
+        logger.info(f"선택자 적중률 리포트 [{self.scope_name}]")
+        for field, rows in report['fields'].items():
+            best = rows[0] if rows else None
+            if best:
+                logger.info(f"{field}: {field_counts.get(field, 0)}건, 최고 적중률 {best['hit_rate']}% ({best['hits']}/{best['attempts']}회) {best['selector_value'][:80]}")
+        if dead:
+            logger.warning(f"⚠️ 폐기 후보 선택자 {len(dead)}개 ({self.min_attempts}회 이상 시도, 적중 0):")
+            for item in dead:
+                logger.warning(f"  - {item['element_type']}: {item['selector_value'][:100]} ({item['attempts']}회)")
+
+        report_dir = report_dir or os.getenv('SELECTOR_REPORT_DIR', DEFAULT_REPORT_DIR)
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            path = os.path.join(report_dir, f"selector_report_{self.scope_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            logger.info(f"선택자 리포트 저장: {path}")
+        except Exception as e:
+            logger.warning(f"선택자 리포트 저장 실패: {e}")
+
+        return report
@@ -0,0 +1,407 @@
+"""
+구조화 데이터 우선 추출
+- DOM 선택자보다 먼저 페이지에 박혀 있는 기계용 데이터에서 가격/제목/이미지/재고를 한 번에 채움
+  1) JSON-LD (<script type="application/ld+json">) Product / Offer / AggregateOffer (@graph, 목록 포함)
+  2) 임베디드 페이지 상태 JSON (Next.js __NEXT_DATA__, window.__INITIAL_STATE__ / __PRELOADED_STATE__ / __APOLLO_STATE__)
+  3) OpenGraph / product 메타 태그, itemprop 마이크로데이터
+- page_source 스냅샷 1회(html_snapshot)를 lxml로 파싱하므로 WebDriver 왕복은 1회
+- 추천/함께 본 상품 가격이 섞이지 않도록 상품이 여러 개면 retailersku가 일치하는 것만 사용하고,
+  임베디드 상태 JSON은 retailersku 값을 가진 객체 안의 가격만 사용
+- og:title은 "| 쇼핑몰명" 접미사가 붙는 경우가 많아 제목에는 사용하지 않음
+- 결과는 dom_extractor와 같은 {'values': {필드: 값}, 'sources': {필드: 출처}} 형태
+- STRUCTURED_DATA=0 이면 비활성화 (기존 선택자 단계만 사용)
+"""
+
+import json
+import logging
+import os
+import re
+from urllib.parse import urljoin
+
+import price_parser
+from html_snapshot import HtmlSnapshot, take_snapshot
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('title', 'retailprice', 'currency', 'imageurl', 'availability')
+
+SOURCE_JSONLD = 'jsonld'
+SOURCE_STATE = 'state'
+SOURCE_META = 'meta'
+
+# schema.org availability -> in_stock / out_of_stock
+# (가격 API 응답의 버튼 상태 값 포함: ADD_TO_CART / SOLD_OUT 등)
+IN_STOCK_VALUES = {'instock', 'limitedavailability', 'onlineonly', 'instoreonly', 'preorder', 'presale', 'backorder',
+                   'addtocart', 'available'}
+OUT_OF_STOCK_VALUES = {'outofstock', 'soldout', 'discontinued', 'unavailable', 'notavailable'}
+
+# JSON-LD 상품 식별자 키 (retailersku와 비교)
+PRODUCT_ID_KEYS = ('sku', 'productID', 'mpn', 'gtin', 'gtin13', 'gtin12', 'gtin8')
+
+# 임베디드 상태 JSON에서 가격/제목/이미지로 보는 키 (앞에 있을수록 우선)
+STATE_PRICE_KEYS = ('currentPrice', 'customerPrice', 'salePrice', 'sellingPrice', 'finalPrice', 'price')
+STATE_TITLE_KEYS = ('name', 'title', 'productName')
+STATE_IMAGE_KEYS = ('image', 'imageUrl', 'imageURL', 'mainImage', 'thumbnailUrl')
+STATE_CURRENCY_KEYS = ('currency', 'currencyCode', 'priceCurrency')
+STATE_AVAILABILITY_KEYS = ('availability', 'buttonState', 'stockStatus', 'inventoryStatus')
+
+# window.X = {...} 형태로 상태를 넣는 변수명
+STATE_VARIABLES = ('__INITIAL_STATE__', '__PRELOADED_STATE__', '__APOLLO_STATE__', '__NUXT__')
+_STATE_ASSIGN_RE = re.compile(r'window\.(' + '|'.join(re.escape(v) for v in STATE_VARIABLES) + r')\s*=\s*')
+
+# 임베디드 상태 탐색 한도 (거대한 Redux 상태에서 시간 낭비 방지)
+MAX_STATE_NODES = 50000
+
+META_PRICE = [
+    "//meta[@property='product:price:amount']",
+    "//meta[@property='og:price:amount']",
+    "//*[@itemprop='price']"
+]
+META_CURRENCY = [
+    "//meta[@property='product:price:currency']",
+    "//meta[@property='og:price:currency']",
+    "//*[@itemprop='priceCurrency']"
+]
+META_AVAILABILITY = [
+    "//meta[@property='product:availability']",
+    "//meta[@property='og:availability']",
+    "//*[@itemprop='availability']"
+]
+META_IMAGE = [
+    "//meta[@property='og:image']",
+    "//meta[@property='og:image:url']",
+    "//meta[@name='twitter:image']"
+]
+
+
+def structured_data_enabled():
+    """STRUCTURED_DATA 환경변수 (기본 사용, 0/false/off면 비활성화)"""
+    return os.getenv('STRUCTURED_DATA', '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+
+def parse_price(value):
+    """
+    가격 값 -> float (숫자 또는 "1.299,00" / "1,299.00" / "₩1,299,000" 같은 문자열)
+
+    국가 정보가 없으므로 price_parser의 구분자 규칙만 사용 (마지막 구분자 + 자릿수로 소수점 판정)
+
+    Returns:
+        float / 해석할 수 없거나 0 이하면 None
+    """
+    return price_parser.parse_price(value)
+
+
+def normalize_availability(value):
+    """schema.org availability URL/문자열 -> 'in_stock' / 'out_of_stock' / None"""
+    if not value or not isinstance(value, str):
+        return None
+    key = re.sub(r'[^a-z]', '', value.rstrip('/').rsplit('/', 1)[-1].lower())
+    if key in IN_STOCK_VALUES:
+        return 'in_stock'
+    if key in OUT_OF_STOCK_VALUES:
+        return 'out_of_stock'
+    return None
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _types(node):
+    return {str(t).rsplit('/', 1)[-1].lower() for t in _as_list(node.get('@type'))}
+
+
+def _first_image(value, base_url):
+    """image 값 (문자열 / 목록 / ImageObject) -> 절대 URL"""
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            item = item.get('url') or item.get('contentUrl')
+        if isinstance(item, str) and item.strip():
+            return urljoin(base_url, item.strip()) if base_url else item.strip()
+    return None
+
+
+def _matches_sku(node, sku):
+    return any(str(node.get(key, '')).strip() == sku for key in PRODUCT_ID_KEYS if node.get(key) is not None)
+
+
+def _load_json(text):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        # 일부 사이트는 JSON-LD 안에 제어문자/줄바꿈을 그대로 넣음
+        try:
+            return json.loads(re.sub(r'[\x00-\x1f]', ' ', text or ''))
+        except ValueError:
+            return None
+
+
+def _jsonld_nodes(snapshot):
+    """모든 JSON-LD 블록의 객체 (@graph, 목록, ProductGroup.hasVariant 펼침)"""
+    nodes = []
+    for script in snapshot.find_all("//script[@type='application/ld+json']"):
+        stack = _as_list(_load_json(script.text_content()))
+        while stack:
+            node = stack.pop(0)
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                nodes.append(node)
+                stack.extend(_as_list(node.get('@graph')))
+                stack.extend(_as_list(node.get('hasVariant')))
+    return nodes
+
+
+def _select_product(products, sku):
+    """대상 상품 선택 - sku 일치 > 상품이 하나뿐이면 그 상품 > (sku를 모를 때만) 첫 번째"""
+    if not products:
+        return None
+    if sku:
+        for product in products:
+            if _matches_sku(product, sku):
+                return product
+        return products[0] if len(products) == 1 else None
+    return products[0]
+
+
+def _select_offer(offers):
+    """가격이 있는 첫 Offer (AggregateOffer는 lowPrice, priceSpecification도 확인)"""
+    for offer in _as_list(offers):
+        if not isinstance(offer, dict):
+            continue
+        if 'aggregateoffer' in _types(offer) and offer.get('offers'):
+            nested = _select_offer(offer.get('offers'))
+            if nested:
+                return nested
+        price = offer.get('price')
+        if price is None:
+            price = offer.get('lowPrice')
+        if price is None:
+            for spec in _as_list(offer.get('priceSpecification')):
+                if isinstance(spec, dict) and spec.get('price') is not None:
+                    price = spec.get('price')
+                    offer = {**spec, **offer}
+                    break
+        if parse_price(price) is not None:
+            return {**offer, 'price': price}
+    return None
+
+
+def extract_jsonld(snapshot, sku=None):
+    """JSON-LD Product/Offer -> {필드: 값}"""
+    nodes = _jsonld_nodes(snapshot)
+    products = [node for node in nodes if _types(node) & {'product', 'productgroup', 'individualproduct'}]
+    product = _select_product(products, sku)
+    if product is None:
+        return {}
+
+    values = {
+        'title': product.get('name').strip() if isinstance(product.get('name'), str) else None,
+        'imageurl': _first_image(product.get('image'), snapshot.url)
+    }
+    offer = _select_offer(product.get('offers'))
+    if offer:
+        values['retailprice'] = parse_price(offer.get('price'))
+        values['currency'] = offer.get('priceCurrency')
+        values['availability'] = normalize_availability(offer.get('availability'))
+    return {key: value for key, value in values.items() if value}
+
+
+def _state_blobs(snapshot):
+    """임베디드 상태 JSON 목록 (__NEXT_DATA__ 스크립트 + window.X = {...} 할당)"""
+    blobs = []
+    for script in snapshot.find_all("//script[@id='__NEXT_DATA__']"):
+        data = _load_json(script.text_content())
+        if data is not None:
+            blobs.append(data)
+
+    if not any(name in snapshot.html for name in STATE_VARIABLES):
+        return blobs
+
+    decoder = json.JSONDecoder()
+    for script in snapshot.find_all('//script[not(@src)]'):
+        text = script.text_content() or ''
+        for match in _STATE_ASSIGN_RE.finditer(text):
+            try:
+                data, _ = decoder.raw_decode(text, match.end())
+            except ValueError:
+                # JSON.parse("...") 처럼 JSON이 아닌 JS 표현식은 건너뜀
+                continue
+            blobs.append(data)
+    return blobs
+
+
+def _state_price(value):
+    """가격 키 값 (숫자/문자열 또는 {'amount'|'value'|'currentPrice'...: ...})"""
+    if isinstance(value, dict):
+        for key in ('amount', 'value', 'current') + STATE_PRICE_KEYS:
+            if key in value:
+                return _state_price(value[key])
+        return None
+    return parse_price(value)
+
+
+def _state_availability(node):
+    """재고 키 값 (문자열 또는 {'buttonState': ...} 같이 한 단계 중첩)"""
+    for key in STATE_AVAILABILITY_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = next((value[k] for k in STATE_AVAILABILITY_KEYS if isinstance(value.get(k), str)), None)
+        availability = normalize_availability(value)
+        if availability:
+            return availability
+    return None
+
+
+def find_product_values(blob, sku, base_url=''):
+    """
+    JSON 객체(임베디드 상태, 가격 API 응답 등)에서 retailersku 값을 가진 객체의 필드
+
+    sku를 모르면 어떤 객체가 대상 상품인지 판단할 수 없으므로 빈 결과
+    """
+    if not sku:
+        return {}
+
+    stack = [blob]
+    visited = 0
+    while stack and visited < MAX_STATE_NODES:
+        node = stack.pop()
+        visited += 1
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        anchored = any(
+            isinstance(value, (str, int)) and not isinstance(value, bool) and str(value).strip() == sku
+            for value in node.values()
+        )
+        if anchored:
+            price = next((p for p in (_state_price(node.get(k)) for k in STATE_PRICE_KEYS) if p is not None), None)
+            if price is not None:
+                values = {'retailprice': price}
+                title = next((node[k] for k in STATE_TITLE_KEYS if isinstance(node.get(k), str) and node[k].strip()), None)
+                if title:
+                    values['title'] = title.strip()
+                image = next((_first_image(node[k], base_url) for k in STATE_IMAGE_KEYS if node.get(k)), None)
+                if image:
+                    values['imageurl'] = image
+                currency = next((node[k] for k in STATE_CURRENCY_KEYS if isinstance(node.get(k), str)), None)
+                if currency:
+                    values['currency'] = currency
+                availability = _state_availability(node)
+                if availability:
+                    values['availability'] = availability
+                return values
+
+        stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return {}
+
+
+def extract_state(snapshot, sku):
+    """임베디드 상태 JSON에서 retailersku 값을 가진 객체의 필드"""
+    if not sku:
+        return {}
+    for blob in _state_blobs(snapshot):
+        values = find_product_values(blob, sku, snapshot.url)
+        if values:
+            return values
+    return {}
+
+
+def _meta_value(snapshot, selectors):
+    """메타 태그 content (itemprop 요소는 content > href > 텍스트)"""
+    for selector in selectors:
+        for node in snapshot.find_all(selector):
+            value = node.get('content') or node.get('href') or (node.text_content() or '').strip()
+            if value:
+                return value.strip()
+    return None
+
+
+def extract_meta(snapshot):
+    """OpenGraph / product 메타 태그, itemprop 마이크로데이터"""
+    values = {
+        'retailprice': parse_price(_meta_value(snapshot, META_PRICE)),
+        'currency': _meta_value(snapshot, META_CURRENCY),
+        'availability': normalize_availability(_meta_value(snapshot, META_AVAILABILITY)),
+        'imageurl': _first_image(_meta_value(snapshot, META_IMAGE), snapshot.url)
+    }
+    return {key: value for key, value in values.items() if value}
+
+
+def extract_structured(snapshot, sku=None):
+    """
+    구조화 데이터 일괄 추출 (JSON-LD > 임베디드 상태 > 메타 태그 순으로 빈 필드만 채움)
+
+    Args:
+        snapshot: HtmlSnapshot
+        sku: 대상 상품 retailersku (상품이 여러 개인 페이지에서 대상 식별용)
+
+    Returns:
+        dict: {'values': {필드: 값}, 'sources': {필드: 'jsonld'|'state'|'meta'}}
+    """
+    sku = str(sku).strip() if sku else None
+    values, sources = {}, {}
+    if snapshot is None or snapshot.tree is None:
+        return {'values': values, 'sources': sources}
+
+    stages = [
+        (SOURCE_JSONLD, lambda: extract_jsonld(snapshot, sku)),
+        (SOURCE_STATE, lambda: extract_state(snapshot, sku)),
+        (SOURCE_META, lambda: extract_meta(snapshot))
+    ]
+    for source, stage in stages:
+        if all(field in values for field in FIELDS):
+            break
+        try:
+            found = stage()
+        except Exception as e:
+            logger.debug(f"구조화 데이터 추출 오류 ({source}): {e}")
+            continue
+        for field, value in found.items():
+            if field not in values:
+                values[field] = value
+                sources[field] = source
+
+    return {'values': values, 'sources': sources}
+
+
+def extract_from_driver(driver, sku=None, snapshot=None):
+    """현재 페이지 구조화 데이터 (snapshot 엔진이 이미 만든 스냅샷이 있으면 재사용, 비활성화/오류 시 빈 결과)"""
+    if not structured_data_enabled():
+        return {'values': {}, 'sources': {}}
+    try:
+        return extract_structured(snapshot if snapshot is not None else take_snapshot(driver), sku)
+    except Exception as e:
+        logger.debug(f"구조화 데이터 스냅샷 실패: {e}")
+        return {'values': {}, 'sources': {}}
+
+
+def extract_from_html(page_source, url='', sku=None):
+    """HTML 문자열 구조화 데이터 (Playwright page.content() 등)"""
+    if not structured_data_enabled():
+        return {'values': {}, 'sources': {}}
+    return extract_structured(HtmlSnapshot(page_source, url), sku)
+
+
+def fill_result(result, structured, fields=('title', 'retailprice', 'imageurl')):
+    """
+    결과 dict의 빈 필드를 구조화 데이터로 채움
+
+    Returns:
+        list: 채운 필드 목록 (선택자 단계는 나머지 필드만 실행)
+    """
+    filled = []
+    for field in fields:
+        value = structured['values'].get(field)
+        if value is not None and result.get(field) in (None, ''):
+            result[field] = value
+            filled.append(field)
+    if filled:
+        detail = ', '.join(f"{field}={structured['sources'][field]}" for field in filled)
+        logger.info(f"🧩 구조화 데이터로 추출: {detail}")
+    return filled
@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+
+import bulk_writer
+from bulk_writer import _csv_field, _insert_sql, bulk_insert, get_chunk_size
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(bulk_writer, '_known_tables', set())
+    monkeypatch.setattr(bulk_writer, '_load_disabled', set())
+    monkeypatch.setattr(bulk_writer, '_load_engines', {})
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+
+
+def frame(count, start=0):
+    return pd.DataFrame({
+        'producturl': [f'https://example.com/p/{i}' for i in range(start, start + count)],
+        'retailprice': pd.array([float(i) if i % 5 else None for i in range(start, start + count)], dtype='Float64'),
+        'title': [f'SSD "{i}"' for i in range(start, start + count)],
+    })
+
+
+class FakeMySQLEngine:
+    class dialect:
+        name = 'mysql'
+        paramstyle = 'format'
+
+    url = 'mysql+pymysql://fake/db'
+
+
+def test_chunk_size_from_env_and_column_cap(monkeypatch):
+    monkeypatch.delenv('BULK_CHUNK_SIZE', raising=False)
+    assert get_chunk_size(10) == bulk_writer.DEFAULT_CHUNK_SIZE
+
+    monkeypatch.setenv('BULK_CHUNK_SIZE', '250')
+    assert get_chunk_size(10) == 250
+    assert get_chunk_size(1000) == bulk_writer.MAX_PARAMS_PER_CHUNK // 1000
+
+    monkeypatch.setenv('BULK_CHUNK_SIZE', 'abc')
+    assert get_chunk_size(10) == bulk_writer.DEFAULT_CHUNK_SIZE
+
+
+def test_chunked_executemany_writes_all_rows(engine, monkeypatch):
+    monkeypatch.setenv('BULK_CHUNK_SIZE', '4')
+    first = bulk_insert(frame(3), 'result_tbl', engine)
+    assert first['method'] == 'create'
+
+    batches = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT'):
+            batches.append(len(parameters) if executemany else 1)
+
+    stats = bulk_insert(frame(10, start=3), 'result_tbl', engine)
+
+    assert stats['method'] == 'executemany'
+    assert stats['rows'] == 10 and stats['rows_per_sec'] > 0
+    assert batches == [4, 4, 2]
+    with engine.connect() as conn:
+        stored = conn.execute(text("SELECT producturl, retailprice, title FROM result_tbl ORDER BY rowid")).fetchall()
+    assert len(stored) == 13
+    assert stored[5] == ('https://example.com/p/5', None, 'SSD "5"')
+    assert stored[12] == ('https://example.com/p/12', 12.0, 'SSD "12"')
+
+
+def test_empty_frame_is_noop(engine):
+    stats = bulk_insert(frame(0), 'result_tbl', engine)
+    assert stats['method'] is None and stats['rows'] == 0
+
+
+def test_insert_sql_placeholders_and_upsert():
+    columns = ['producturl', 'crawl_strdatetime', 'retailprice']
+    engine = create_engine('sqlite://')
+    assert _insert_sql(engine, 'tbl', columns, None) == (
+        "INSERT INTO `tbl` (`producturl`, `crawl_strdatetime`, `retailprice`) VALUES (?, ?, ?)")
+
+    sql = _insert_sql(FakeMySQLEngine(), 'tbl', columns, ('producturl', 'crawl_strdatetime'))
+    assert 'VALUES (%s, %s, %s)' in sql
+    assert sql.endswith(" ON DUPLICATE KEY UPDATE `retailprice` = VALUES(`retailprice`)")
+
+    only_keys = _insert_sql(FakeMySQLEngine(), 'tbl', columns[:2], ('producturl', 'crawl_strdatetime'))
+    assert 'ON DUPLICATE KEY' not in only_keys
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, 'NULL'),
+    (True, '1'),
+    (False, '0'),
+    (12800, '12800'),
+    (1299.99, '1299.99'),
+    ('plain', '"plain"'),
+    ('27" monitor', '"27"" monitor"'),
+    ('NULL', '"NULL"'),
+    ('a,b\nc', '"a,b\nc"'),
+])
+def test_csv_field(value, expected):
+    assert _csv_field(value) == expected
+
+
+class CapturingLoadEngine:
+    """LOAD DATA 문과 실행 시점의 CSV 내용을 기록"""
+
+    def __init__(self):
+        self.sql = None
+        self.csv = None
+        self.path = None
+
+    def begin(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec_driver_sql(self, sql):
+        self.sql = sql
+        self.path = sql.split("INFILE '")[1].split("'")[0]
+        with open(self.path, encoding='utf-8') as f:
+            self.csv = f.read()
+
+
+@pytest.mark.parametrize('upsert_keys, replace', [(None, False), (('producturl',), True)])
+def test_load_data_sql_and_csv(monkeypatch, upsert_keys, replace):
+    load_engine = CapturingLoadEngine()
+    monkeypatch.setattr(bulk_writer, '_load_engine', lambda engine: load_engine)
+    df = pd.DataFrame({'producturl': ['u1', 'u2'], 'retailprice': [np.float64(1299.5), np.nan], 'stock': [True, False]})
+
+    bulk_writer._load_data(FakeMySQLEngine(), 'result_tbl', df, upsert_keys)
+
+    assert ('REPLACE INTO TABLE' in load_engine.sql) is replace
+    assert "INTO TABLE `result_tbl` CHARACTER SET utf8mb4" in load_engine.sql
+    assert load_engine.sql.endswith("(`producturl`, `retailprice`, `stock`)")
+    assert load_engine.csv == '"u1",1299.5,1\n"u2",NULL,0\n'
+    assert not os.path.exists(load_engine.path)
+
+
+def test_large_batch_uses_load_data_and_falls_back_once(monkeypatch):
+    monkeypatch.setenv('BULK_LOAD_DATA', '1')
+    monkeypatch.setenv('BULK_LOAD_DATA_MIN_ROWS', '5')
+    engine = FakeMySQLEngine()
+    bulk_writer._known_tables.add((str(engine.url), 'result_tbl'))
+    calls = []
+
+    def failing_load(*args):
+        calls.append('load_data')
+        raise RuntimeError('local_infile disabled')
+
+    monkeypatch.setattr(bulk_writer, '_load_data', failing_load)
+    monkeypatch.setattr(bulk_writer, '_execute_many', lambda engine, table, df, keys: calls.append(('executemany', keys)))
+
+    assert bulk_insert(frame(3), 'result_tbl', engine)['method'] == 'executemany'
+    assert bulk_insert(frame(6), 'result_tbl', engine, upsert_keys=('producturl',))['method'] == 'executemany'
+    assert bulk_insert(frame(6), 'result_tbl', engine)['method'] == 'executemany'
+    assert calls == [('executemany', None), 'load_data', ('executemany', ('producturl',)), ('executemany', None)]
+
+
+def test_upsert_keys_ignored_outside_mysql(engine, monkeypatch):
+    bulk_insert(frame(1), 'result_tbl', engine)
+    seen = []
+    monkeypatch.setattr(bulk_writer, '_execute_many', lambda engine, table, df, keys: seen.append(keys))
+    bulk_insert(frame(1, start=1), 'result_tbl', engine, upsert_keys=('producturl',))
+    assert seen == [None]
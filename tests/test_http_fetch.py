@@ -0,0 +1,149 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_fetch import HttpFetcher
+from price_parser import parse_price
+
+PRODUCT_HTML = """<html><head><title>Sony WH-1000XM5 | Best Buy</title>
+<script type="application/ld+json">
+{"@type": "Product", "name": "Sony WH-1000XM5", "image": "https://img.example/p.jpg",
+ "offers": {"@type": "Offer", "price": "399.99", "priceCurrency": "USD"}}
+</script></head><body><h1>Sony WH-1000XM5</h1></body></html>"""
+
+SELECTOR_HTML = """<html><head><title>Product</title></head><body>
+<h1 class="sku-title">Selector Product</h1>
+<div class="price"><span>$1,249.00</span></div>
+</body></html>"""
+
+CHALLENGE_HTML = """<html><head><title>Fnac</title></head><body>
+<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1"></script></body></html>"""
+
+CAPTCHA_TITLE_HTML = "<html><head><title>Access Denied</title></head><body></body></html>"
+
+PAGES = {
+    '/product': (200, PRODUCT_HTML),
+    '/selector': (200, SELECTOR_HTML),
+    '/challenge': (200, CHALLENGE_HTML),
+    '/denied': (200, CAPTCHA_TITLE_HTML),
+    '/forbidden': (403, PRODUCT_HTML),
+    '/missing-price': (200, "<html><head><title>Product</title></head><body><h1>Only title</h1></body></html>"),
+}
+
+SELECTORS = {'title': ['//h1'], 'price': ["//div[@class='price']/span"], 'imageurl': []}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1.0)
+            status, body = 200, PRODUCT_HTML
+        else:
+            status, body = PAGES.get(self.path, (404, 'not found'))
+        data = body.encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def extract(fetcher, url):
+    result = {'title': None, 'retailprice': None, 'imageurl': None}
+    ok = fetcher.extract(url, result, SELECTORS, lambda text: parse_price(text, 'usa'))
+    return ok, result
+
+
+def test_fetch_success_uses_structured_data(server):
+    fetcher = HttpFetcher('stub', timeout=5)
+
+    ok, result = extract(fetcher, server + '/product')
+
+    assert ok is True
+    assert fetcher.last_blocked is False
+    assert result['title'] == 'Sony WH-1000XM5'
+    assert result['retailprice'] == 399.99
+    assert result['imageurl'] == 'https://img.example/p.jpg'
+    assert fetcher.stats == {'http': 1, 'fallback': 0}
+
+
+def test_fetch_success_falls_back_to_selectors(server):
+    fetcher = HttpFetcher('stub', timeout=5)
+
+    ok, result = extract(fetcher, server + '/selector')
+
+    assert ok is True
+    assert result['title'] == 'Selector Product'
+    assert result['retailprice'] == 1249.0
+
+
+def test_set_cookie_is_sent_back(server):
+    fetcher = HttpFetcher('stub', timeout=5)
+    fetcher.fetch(server + '/product')
+
+    assert fetcher._cookie_header(server + '/product') == 'session=abc'
+
+
+@pytest.mark.parametrize('path, reason', [
+    ('/challenge', '/cdn-cgi/challenge-platform'),
+    ('/denied', 'access denied'),
+    ('/forbidden', 'HTTP 403'),
+])
+def test_block_or_challenge_falls_back_to_browser(server, path, reason):
+    fetcher = HttpFetcher('stub', timeout=5)
+
+    page = fetcher.fetch(server + path)
+    assert not page.ok
+    assert reason in page.reason
+
+    ok, result = extract(fetcher, server + path)
+    assert ok is False
+    assert fetcher.last_blocked is True
+    assert result['retailprice'] is None
+    assert fetcher.stats == {'http': 0, 'fallback': 1}
+
+
+def test_missing_required_field_falls_back_without_block(server):
+    fetcher = HttpFetcher('stub', timeout=5)
+
+    ok, result = extract(fetcher, server + '/missing-price')
+
+    assert ok is False
+    assert fetcher.last_blocked is False
+    assert result['title'] == 'Only title'
+    assert fetcher.stats['fallback'] == 1
+
+
+def test_timeout_returns_failed_result(server):
+    fetcher = HttpFetcher('stub', timeout=0.2)
+
+    started = time.perf_counter()
+    page = fetcher.fetch(server + '/slow')
+
+    assert time.perf_counter() - started < 1.0
+    assert not page.ok
+    assert page.status == 0
+    assert page.reason.startswith('요청 실패')
+
+    ok, _ = extract(fetcher, server + '/slow')
+    assert ok is False
+    assert fetcher.stats['fallback'] == 1
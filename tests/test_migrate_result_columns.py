@@ -0,0 +1,45 @@
+import importlib
+import sys
+import types
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from result_schema import check_result_columns
+
+
+@pytest.fixture
+def migrate(monkeypatch):
+    config = types.ModuleType('config')
+    config.DB_CONFIG = config.DB_CONFIG_V2 = {}
+    monkeypatch.setitem(sys.modules, 'config', config)
+    for name in ('migrate_result_unique_keys', 'migrate_result_columns'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module('migrate_result_columns')
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'results.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE result_tbl (producturl TEXT, crawl_strdatetime TEXT, retailprice FLOAT)"))
+    return engine
+
+
+def columns(engine):
+    return [column['name'] for column in inspect(engine).get_columns('result_tbl')]
+
+
+def test_migration_adds_missing_price_columns_once(migrate, engine):
+    status = migrate.migrate_table(engine, inspect(engine), 'result_tbl', dry_run=True)
+    assert status.startswith('DDL: ALTER TABLE `result_tbl` ADD COLUMN `retailprice_minor` BIGINT NULL')
+    assert 'currency' not in columns(engine)
+
+    assert migrate.migrate_table(engine, inspect(engine), 'result_tbl').startswith('추가 완료')
+    assert columns(engine)[-3:] == ['retailprice_minor', 'currency', 'retailprice_raw']
+    assert migrate.migrate_table(engine, inspect(engine), 'result_tbl') == '이미 있음'
+
+
+def test_write_path_check_runs_no_ddl(engine):
+    assert check_result_columns(engine, 'result_tbl') == ['retailprice_minor', 'currency', 'retailprice_raw']
+    assert columns(engine) == ['producturl', 'crawl_strdatetime', 'retailprice']
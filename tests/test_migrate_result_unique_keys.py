@@ -0,0 +1,64 @@
+import importlib
+import re
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def db_config(database):
+    return {'user': 'crawler', 'password': 'secret', 'host': 'db.local', 'port': 3306, 'database': database}
+
+
+@pytest.fixture
+def migrate(monkeypatch):
+    config = types.ModuleType('config')
+    config.DB_CONFIG = db_config('crawl_db_v1')
+    config.DB_CONFIG_V2 = db_config('crawl_db_v2')
+    monkeypatch.setitem(sys.modules, 'config', config)
+    monkeypatch.delitem(sys.modules, 'migrate_result_unique_keys', raising=False)
+    return importlib.import_module('migrate_result_unique_keys')
+
+
+def writer_config_names():
+    """write_results로 결과를 저장하는 크롤러들이 DB 엔진을 만드는 설정 이름"""
+    names = {}
+    for path in REPO_ROOT.glob('*.py'):
+        source = path.read_text(encoding='utf-8')
+        if 'write_results(' not in source or 'from config import' not in source:
+            continue
+        match = re.search(r'^from config import (DB_CONFIG\w*)(?: as DB_CONFIG)?', source, re.M)
+        names[path.name] = match.group(1) if match else None
+    return names
+
+
+def test_result_writers_use_v2_config():
+    names = writer_config_names()
+    assert 'usa_v2.py' in names and 'fnac.py' in names
+    assert set(names.values()) == {'DB_CONFIG_V2'}
+
+
+def test_migration_targets_writer_database(migrate, monkeypatch):
+    urls = []
+
+    class EmptyInspector:
+        def get_table_names(self):
+            return []
+
+    monkeypatch.setattr(migrate, 'create_engine', lambda url: urls.append(url) or object())
+    monkeypatch.setattr(migrate, 'inspect', lambda engine: EmptyInspector())
+
+    assert migrate.main([]) == 0
+    assert migrate.main(['--v1', '--dry-run']) == 0
+    assert urls[0].endswith('@db.local:3306/crawl_db_v2')
+    assert urls[1].endswith('@db.local:3306/crawl_db_v1')
+    assert migrate.get_db_config() is sys.modules['config'].DB_CONFIG_V2
+
+
+def test_unique_key_ddl_prefixes_text_columns(migrate):
+    ddl = migrate.unique_key_ddl('usa_price_crawl_tbl_usa_v2', {'producturl': 'TEXT', 'crawl_strdatetime': 'VARCHAR(20)'})
+    assert ddl == ("ALTER TABLE `usa_price_crawl_tbl_usa_v2` ADD UNIQUE KEY `uq_result_row` "
+                   "(`producturl`(255), `crawl_strdatetime`)")
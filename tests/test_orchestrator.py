@@ -0,0 +1,96 @@
+import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import orchestrator
+from orchestrator import RETAILERS, RetailerRun, build_report, parse_workers_override
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeProcesses:
+    """subprocess.run 대역 - 시도마다 정해진 종료 코드를 돌려주고 요약 파일을 남김"""
+
+    def __init__(self, outcomes, summary=None):
+        self.outcomes = list(outcomes)
+        self.summary = summary
+        self.envs = []
+
+    def __call__(self, args, env, timeout, **kwargs):
+        self.envs.append(env)
+        outcome = self.outcomes.pop(0)
+        if outcome == 'timeout':
+            raise subprocess.TimeoutExpired(args, timeout)
+        if self.summary is not None:
+            with open(env['RUN_SUMMARY_FILE'], 'w', encoding='utf-8') as f:
+                json.dump(self.summary, f)
+        return subprocess.CompletedProcess(args, outcome)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(orchestrator.time, 'sleep', calls.append)
+    return calls
+
+
+def retailer_run(tmp_path, max_restarts=2):
+    return RetailerRun('usa', RETAILERS['usa'], 3, max_restarts, str(tmp_path))
+
+
+def test_restart_with_backoff_until_success(tmp_path, monkeypatch, sleeps):
+    processes = FakeProcesses([1, 'timeout', 0], summary={'target_count': 10, 'crawled_count': 9})
+    monkeypatch.setattr(orchestrator.subprocess, 'run', processes)
+
+    report = retailer_run(tmp_path).run()
+
+    assert report['status'] == 'success'
+    assert [a['returncode'] for a in report['attempts']] == [1, 'timeout', 0]
+    assert sleeps == [30, 60]
+    assert report['summary'] == {'target_count': 10, 'crawled_count': 9}
+    assert processes.envs[0]['POOL_WORKERS'] == '3' and processes.envs[0]['COUNTRY_CODE'] == 'usa'
+    assert not any(Path(env['RUN_SUMMARY_FILE']).exists() for env in processes.envs)
+
+
+def test_gives_up_after_max_restarts(tmp_path, monkeypatch, sleeps):
+    processes = FakeProcesses([1, 1])
+    monkeypatch.setattr(orchestrator.subprocess, 'run', processes)
+
+    report = retailer_run(tmp_path, max_restarts=1).run()
+
+    assert report['status'] == 'failed'
+    assert len(report['attempts']) == 2
+    assert sleeps == [30]
+    assert report['summary'] is None
+
+
+def test_report_totals_skip_and_list_missing_summaries():
+    reports = [
+        {'retailer': 'usa', 'status': 'success', 'attempts': [], 'elapsed_sec': 1,
+         'summary': {'target_count': 10, 'crawled_count': 8, 'is_critical': False}},
+        {'retailer': 'jp', 'status': 'success', 'attempts': [], 'elapsed_sec': 1,
+         'summary': {'target_count': 5, 'crawled_count': 1, 'is_critical': True}},
+        {'retailer': 'au', 'status': 'success', 'attempts': [], 'elapsed_sec': 1, 'summary': None},
+        {'retailer': 'de', 'status': 'failed', 'attempts': [], 'elapsed_sec': 1, 'summary': None},
+    ]
+
+    report = build_report(reports, datetime(2026, 10, 17, 9, 0))
+
+    assert report['totals'] == {'target_count': 15, 'crawled_count': 9}
+    assert report['missing_summary'] == ['au', 'de']
+    assert report['success_count'] == 3 and report['critical_count'] == 1
+    assert [r['retailer'] for r in report['retailers']] == ['au', 'de', 'jp', 'usa']
+    orchestrator.log_report(report)
+
+
+def test_parse_workers_override():
+    assert parse_workers_override('usa=3, jp=0,bad,de=x') == {'usa': 3, 'jp': 1}
+
+
+def test_every_retailer_script_writes_run_summary():
+    for name, spec in RETAILERS.items():
+        source = (REPO_ROOT / spec['script']).read_text(encoding='utf-8')
+        assert 'monitor_and_alert(' in source, f"{name}: {spec['script']}"
@@ -0,0 +1,144 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from html_snapshot import HtmlSnapshot, PageSnapshot
+from page_scan import SCAN_PATTERNS_JS, contains_word, html_pattern, html_visible_text, scan_page, scan_text, text_pattern
+from pattern_registry import BLOCKED, CHALLENGE, CONTINUE, IN_STOCK, OUT_OF_STOCK, get_matcher
+
+PAGE = """<html><head><title>Echo Dot</title>
+<style>.captcha-note { color: red }</style>
+<script>window.captchaConfig = {text: "enter the characters"};</script></head>
+<body class="cf-challenge-free">
+<div id="title"><span>Echo</span> <span>Dot</span></div>
+<div hidden>Currently unavailable</div>
+<p style="display: none">Out of stock</p>
+<div><a>Continue</a> <b>shopping</b></div>
+<!-- sold out -->
+</body></html>"""
+
+MATCHER = get_matcher('en')
+
+
+class FakeDriver:
+    """execute_script가 실패하는 드라이버 - scan_page가 page_source 폴백을 타게 함"""
+
+    title = 'Echo Dot'
+    current_url = 'https://www.amazon.com/dp/B000TEST'
+    page_source = PAGE
+
+    def execute_script(self, *args):
+        raise RuntimeError('no javascript')
+
+
+def test_visible_text_skips_script_style_hidden_and_comments():
+    text = html_visible_text(PAGE)
+
+    assert 'Echo Dot' in text
+    assert 'Continue shopping' in text
+    for hidden in ('enter the characters', 'captcha', 'Currently unavailable', 'Out of stock', 'sold out'):
+        assert hidden not in text
+
+
+def test_scan_text_checks_text_patterns_against_visible_text_only():
+    snapshot = HtmlSnapshot(PAGE)
+
+    found = snapshot.scan(['enter the characters', 'currently unavailable', 'continue shopping',
+                           html_pattern('window.captchaconfig')])
+
+    assert found == {'continue shopping', 'window.captchaconfig'}
+
+
+def test_classify_uses_visible_text_and_markup_for_html_patterns():
+    found = HtmlSnapshot(PAGE).classify(MATCHER, CONTINUE, OUT_OF_STOCK, CHALLENGE)
+
+    assert found == {CONTINUE: ['continue shopping'], CHALLENGE: ['cf-challenge']}
+
+
+def test_cached_and_live_paths_agree():
+    patterns = MATCHER.patterns(CONTINUE, OUT_OF_STOCK, CHALLENGE)
+
+    live = PageSnapshot(FakeDriver())
+    live_found = live.scan(patterns)
+
+    cached = PageSnapshot(FakeDriver())
+    cached.html  # 소스를 먼저 가져와 캐시 경로를 타게 함
+    cached_found = cached.scan(patterns)
+
+    assert live_found == cached_found == scan_page(FakeDriver(), patterns)
+    assert 'out of stock' not in cached_found
+    assert cached.classify(MATCHER, CONTINUE, OUT_OF_STOCK) == {CONTINUE: ['continue shopping']}
+
+
+def test_scan_text_without_markup_falls_back_to_text():
+    assert scan_text('t', 'cf-challenge', [html_pattern('cf-challenge')]) == {'cf-challenge'}
+
+
+@pytest.mark.parametrize('haystack, text, expected', [
+    ('robot check', 'robot check', True),
+    ('robot checking', 'robot check', False),
+    ('unavailable', 'available', False),
+    ('now available!', 'available', True),
+    ('only 3 left', 'only', True),
+    ('commonly', 'only', False),
+    ('在庫切れです', '在庫切れ', True),
+])
+def test_contains_word_boundaries(haystack, text, expected):
+    assert contains_word(haystack, text, text_pattern(text)['boundary']) is expected
+
+
+BOUNDARY_PAGE = """<html><head><title>Robot checking tools</title></head>
+<body><div>This model is unavailable commonly in stores.</div>
+<div>Sold by Example Store. Currently unavailable.</div>
+<div>Continue shopping</div>
+<div>在庫切れです</div>
+<script>var captcha = "enter the characters";</script>
+<div class="cf-challenge">x</div></body></html>"""
+
+NODE_RUNNER = """
+const [title, body, markup, patterns] = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+global.document = {title: title, body: {innerText: body}, documentElement: {outerHTML: markup}};
+const scan = new Function(process.argv[1]);
+process.stdout.write(JSON.stringify(scan(patterns)));
+"""
+
+
+class NodeDriver:
+    """SCAN_PATTERNS_JS를 node에서 실행하는 드라이버 (innerText는 lxml 보이는 텍스트로 대신함)"""
+
+    current_url = 'https://www.example.com/p/1'
+
+    def __init__(self, page):
+        self.page_source = page
+        self.title = HtmlSnapshot(page).title
+
+    def execute_script(self, script, patterns):
+        payload = json.dumps([self.title, html_visible_text(self.page_source), self.page_source, patterns])
+        output = subprocess.run(['node', '-e', NODE_RUNNER, script], input=payload, capture_output=True,
+                                text=True, check=True).stdout
+        return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node 필요')
+@pytest.mark.parametrize('page', [PAGE, BOUNDARY_PAGE])
+def test_browser_and_lxml_paths_classify_the_same(page):
+    categories = (BLOCKED, CHALLENGE, CONTINUE, OUT_OF_STOCK, IN_STOCK)
+    matcher = get_matcher('en', 'ja')
+
+    browser = PageSnapshot(NodeDriver(page)).classify(matcher, *categories)
+    cached = PageSnapshot(NodeDriver(page))
+    cached.html  # 소스를 먼저 가져와 lxml 경로를 타게 함
+
+    assert browser == cached.classify(matcher, *categories)
+    assert browser == HtmlSnapshot(page).classify(matcher, *categories)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node 필요')
+def test_browser_scan_respects_word_boundaries():
+    found = NodeDriver(BOUNDARY_PAGE).execute_script(SCAN_PATTERNS_JS, [
+        text_pattern('robot check'), text_pattern('available'), text_pattern('only'),
+        text_pattern('currently unavailable'), text_pattern('在庫切れ'), html_pattern('cf-challenge')
+    ])
+    assert set(found) == {'currently unavailable', '在庫切れ', 'cf-challenge'}
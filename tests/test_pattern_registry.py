@@ -0,0 +1,91 @@
+import pytest
+
+from pattern_registry import (
+    BLOCKED, BLOCKED_TITLE, CONTINUE, IN_STOCK, NOT_FOUND, OUT_OF_STOCK, WALL_TITLE, build_matcher, get_matcher
+)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('This item is currently unavailable.', {OUT_OF_STOCK: ['currently unavailable', 'this item is currently unavailable']}),
+    ('Available now', {IN_STOCK: ['available']}),
+    ('unavailable', {}),
+    ('Only 3 left in stock', {IN_STOCK: ['in stock', 'left in stock', 'only']}),
+    ('commonly bought', {}),
+])
+def test_word_boundaries(text, expected):
+    assert get_matcher('en').classify(text, OUT_OF_STOCK, IN_STOCK) == expected
+
+
+def test_word_boundaries_for_accented_latin():
+    matcher = get_matcher('de')
+
+    assert matcher.classify('Derzeit verfügbar', IN_STOCK) == {IN_STOCK: ['verfügbar']}
+    assert matcher.classify('unverfügbar', IN_STOCK) == {}
+
+
+def test_prefix_pattern_is_implied_only_at_word_boundary():
+    matcher = get_matcher('fr')
+
+    assert matcher.classify('Continuer les achats', CONTINUE) == {CONTINUE: ['continuer', 'continuer les achats']}
+
+
+def test_digits_use_boundaries():
+    matcher = get_matcher('en')
+
+    assert matcher.matches('503 Service Unavailable', BLOCKED_TITLE) == '503'
+    assert matcher.matches('Model 15030', BLOCKED_TITLE) is None
+
+
+def test_cjk_and_hangul_still_match_inside_words():
+    assert get_matcher('ja').classify('現在在庫切れです。', OUT_OF_STOCK) == {OUT_OF_STOCK: ['在庫切れ', '現在在庫切れです']}
+    assert get_matcher('ko').classify('일시품절입니다', OUT_OF_STOCK) == {OUT_OF_STOCK: ['일시품절', '품절']}
+
+
+def test_patterns_are_grouped_per_locale():
+    matcher = build_matcher(('en', 'fr'), categories=(IN_STOCK,))
+
+    assert set(matcher.locale_regexes) == {'en', 'fr'}
+    assert 'disponible' in matcher.locales['fr']
+    assert 'disponible' not in matcher.locales['en']
+    # 여러 언어 그룹이 같은 텍스트를 각각 훑어도 결과는 합쳐짐
+    assert matcher.classify('In stock - en stock', IN_STOCK) == {IN_STOCK: ['en stock', 'in stock']}
+
+
+def test_extra_patterns_get_their_own_group():
+    matcher = build_matcher(('en',), categories=(OUT_OF_STOCK,), extra={OUT_OF_STOCK: ['nicht lieferbar']})
+
+    assert matcher.locales['extra'] == ['nicht lieferbar']
+    assert matcher.classify('Leider nicht lieferbar', OUT_OF_STOCK) == {OUT_OF_STOCK: ['nicht lieferbar']}
+
+
+AMAZON_404 = ("Looking for something? We're sorry. The Web address you entered is not a functioning page "
+              "on our site.")
+
+
+def test_amazon_404_is_not_found_not_blocked():
+    for matcher in (get_matcher('en', 'de'), get_matcher('en', 'hi', retailer='amazon_in')):
+        found = matcher.classify(AMAZON_404, BLOCKED, NOT_FOUND)
+        assert BLOCKED not in found
+        assert found[NOT_FOUND]
+
+
+def test_retailer_patterns_stay_with_their_retailer():
+    usa = get_matcher('en', 'de')
+    india = get_matcher('en', 'hi', retailer='amazon_in')
+    text = 'Sorry, we just need to make sure you are not a robot. Are you a robot?'
+
+    assert BLOCKED not in usa.classify(text, BLOCKED)
+    assert india.classify(text, BLOCKED)[BLOCKED] == ['are you a robot', 'sorry, we just need to make sure you']
+    assert BLOCKED not in get_matcher('en', 'de').classify('Robot Check', BLOCKED)
+    assert get_matcher('en', 'ja', retailer='amazon_jp').classify('Robot Check', BLOCKED) == {BLOCKED: ['robot check']}
+
+
+def test_retailer_title_patterns():
+    assert get_matcher('en', 'ja', retailer='amazon_jp').classify('Sorry! Something went wrong', BLOCKED_TITLE)
+    assert not get_matcher('en').classify('Sorry! Something went wrong', BLOCKED_TITLE)
+    assert get_matcher('en', retailer='http_fetch').matches('Just a moment...', WALL_TITLE) == 'just a moment'
+    assert get_matcher('en').matches('Just a moment...', WALL_TITLE) is None
+
+
+def test_unknown_retailer_falls_back_to_locale_patterns():
+    assert get_matcher('en', retailer='bestbuy').patterns() == get_matcher('en').patterns()
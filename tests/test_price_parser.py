@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_parser import format_price, get_price_locale, parse_price, parse_price_series
+
+
+@pytest.mark.parametrize('text, country, expected', [
+    ('$1,299.99', 'usa', 1299.99),
+    ('$1,299', 'usa', 1299.0),
+    ('US$ 49.00', 'usa', 49.0),
+    ('£89.99', 'gb', 89.99),
+    ('AU$1,049.00', 'au', 1049.0),
+    ('₹1,29,999.00', 'in', 129999.0),
+    ('Rs. 2,499', 'in', 2499.0),
+    ('1.299,99 €', 'de', 1299.99),
+    ('89,99 €', 'de', 89.99),
+    ('1.299 €', 'de', 1299.0),
+    ('1 299,99 €', 'fr', 1299.99),
+    ('1 299,99 €', 'fr', 1299.99),
+    ('€ 349,-', 'nl', 349.0),
+    ('2 499,00 zł', 'pl', 2499.0),
+    ('￥12,800', 'jp', 12800.0),
+    ('12.800円', 'jp', 12800.0),
+    ('1,290,000원', 'kr', 1290000.0),
+    ('294.', 'usa', 294.0),
+    ('1299', 'de', 1299.0),
+    ('1299.99', 'usa', 1299.99),
+])
+def test_parse_price_locales(text, country, expected):
+    assert parse_price(text, country) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('country', ['us', 'uk', 'usa_bestbuy', 'kr_danawa'])
+def test_country_aliases(country):
+    assert get_price_locale(country)['currency'] is not None
+
+
+def test_unknown_country_uses_separator_rules():
+    assert parse_price('1.299,99') == 1299.99
+    assert parse_price('1,299.99') == 1299.99
+    assert parse_price('89,99') == 89.99
+    assert parse_price('1,299') == 1299.0
+
+
+@pytest.mark.parametrize('value', [None, '', 'N/A', 'Currently unavailable', True, '0', '0,00 €', float('nan'), -5])
+def test_unparseable_or_non_positive_is_none(value):
+    assert parse_price(value, 'de') is None
+
+
+def test_numeric_values_pass_through():
+    assert parse_price(1299, 'usa') == 1299.0
+    assert parse_price(np.float64(12.5), 'usa') == 12.5
+    assert parse_price(np.int64(7), 'kr') == 7.0
+
+
+def test_strict_rejects_text_around_number():
+    assert parse_price('165 ratings', 'usa', strict=True) is None
+    assert parse_price('Was: €12.99', 'de', strict=True) is None
+    assert parse_price('€ 12,99', 'de', strict=True) == 12.99
+
+
+def test_require_symbol_picks_amount_next_to_currency():
+    assert parse_price('Save 15% - now $84.99 (was $99.99)', 'usa', require_symbol=True) == 84.99
+    assert parse_price('1.299,00 € inkl. MwSt.', 'de', require_symbol=True) == 1299.0
+    assert parse_price('3 items', 'usa', require_symbol=True) is None
+
+
+def test_bounds():
+    assert parse_price('$4.99', 'usa', bounds=(5, 50000)) is None
+    assert parse_price('$49.99', 'usa', bounds=(5, 50000)) == 49.99
+
+
+def test_format_price():
+    assert format_price(1299.0) == '1299'
+    assert format_price(1299.5) == '1299.50'
+    assert format_price(None) is None
+
+
+def test_parse_price_series_matches_single_parse():
+    values = ['1.299,99 €', None, '89,99 €', '1.299,99 €', 'n/a', 15, '0,00 €']
+    series = parse_price_series(pd.Series(values, index=list('abcdefg'), dtype='object'), 'de')
+
+    assert list(series.index) == list('abcdefg')
+    assert series.dtype == 'float64'
+    for value, parsed in zip(values, series):
+        single = parse_price(value, 'de')
+        assert (single is None and math.isnan(parsed)) or parsed == pytest.approx(single)
+
+
+def test_parse_price_series_numeric_column_and_bounds():
+    series = parse_price_series(pd.Series([1.0, 10.0, -3.0, 100000.0]), 'usa', bounds=(5, 50000))
+
+    assert series.isna().tolist() == [True, False, True, True]
@@ -0,0 +1,58 @@
+import json
+
+from rate_limiter import AdaptiveRateLimiter
+
+URL = 'https://www.amazon.com/dp/B000TEST'
+
+
+def make_limiter(tmp_path, **kwargs):
+    kwargs.setdefault('jitter', 0)
+    return AdaptiveRateLimiter(state_file=str(tmp_path / 'state.json'), **kwargs)
+
+
+def test_block_halves_rate_and_clean_page_raises_it(tmp_path):
+    limiter = make_limiter(tmp_path, initial_interval=4.0, increase_step=0.01)
+
+    limiter.record(URL, blocked=True)
+    assert limiter.current_interval(URL) == 8.0
+
+    limiter.record(URL, blocked=False)
+    assert limiter.current_interval(URL) < 8.0
+
+
+def test_record_does_not_write_state_before_interval(tmp_path):
+    limiter = make_limiter(tmp_path, save_interval=3600)
+
+    for _ in range(50):
+        limiter.record(URL, blocked=False)
+
+    assert not (tmp_path / 'state.json').exists()
+
+    limiter.save_state()
+    state = json.loads((tmp_path / 'state.json').read_text(encoding='utf-8'))
+    assert 'www.amazon.com' in state
+
+
+def test_record_writes_state_when_interval_elapsed(tmp_path):
+    limiter = make_limiter(tmp_path, save_interval=0)
+
+    limiter.record(URL, blocked=True)
+
+    state = json.loads((tmp_path / 'state.json').read_text(encoding='utf-8'))
+    assert state['www.amazon.com']['rate'] == limiter._buckets['www.amazon.com'].rate
+
+
+def test_save_state_merges_other_domains_and_loads_learned_rate(tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text(json.dumps({'www.bestbuy.com': {'rate': 0.5}}), encoding='utf-8')
+
+    limiter = make_limiter(tmp_path, save_interval=3600)
+    limiter.record(URL, blocked=True)
+    limiter.save_state()
+
+    state = json.loads(path.read_text(encoding='utf-8'))
+    assert state['www.bestbuy.com'] == {'rate': 0.5}
+    assert 'www.amazon.com' in state
+
+    reloaded = make_limiter(tmp_path)
+    assert reloaded.current_interval(URL) == limiter.current_interval(URL)
@@ -0,0 +1,108 @@
+from datetime import timezone
+
+import pytest
+
+from result_buffer import AMAZON_RESULT_COLUMNS, RESULT_COLUMNS, ResultBuffer, new_result
+
+
+def row(i, **fields):
+    return {'producturl': f'https://example.com/p/{i}', 'retailprice': float(i), **fields}
+
+
+def test_new_result_follows_columns_and_defaults():
+    result = new_result({'brand': 'Samsung', 'seg_lv1': 'SSD'}, 'https://example.com/p/1', timezone.utc, timezone.utc,
+                        columns=AMAZON_RESULT_COLUMNS, country_code='us', channel='Amazon')
+
+    assert tuple(result) == AMAZON_RESULT_COLUMNS
+    assert result['brand_eng'] == 'Samsung' and result['segment_lv1'] == 'SSD'
+    assert result['channel'] == 'Amazon' and result['country_code'] == 'us'
+    assert result['retailprice'] is None
+    assert len(result['crawl_strdatetime']) == 18
+
+
+def test_append_adds_unknown_columns_with_none_for_earlier_rows():
+    buffer = ResultBuffer(columns=())
+    buffer.append({'producturl': 'a'})
+    buffer.append({'producturl': 'b', 'retailprice': 10.0})
+
+    df = buffer.to_frame()
+    assert list(df.columns) == ['producturl', 'retailprice']
+    assert df['retailprice'].isna().tolist() == [True, False]
+
+
+def test_take_unflushed_returns_only_new_rows():
+    buffer = ResultBuffer(RESULT_COLUMNS)
+    assert buffer.take_unflushed() is None
+
+    for i in range(3):
+        buffer.append(row(i))
+    assert buffer.take_unflushed()['producturl'].tolist() == [row(i)['producturl'] for i in range(3)]
+    assert buffer.take_unflushed() is None
+
+    buffer.append(row(3))
+    assert buffer.take_unflushed()['retailprice'].tolist() == [3.0]
+    assert len(buffer) == 4 and len(buffer.to_frame()) == 4
+
+
+@pytest.mark.parametrize('release_flushed', [False, True])
+def test_to_frame_keeps_every_row_in_order(release_flushed):
+    buffer = ResultBuffer(RESULT_COLUMNS, release_flushed=release_flushed)
+    # 완료 순서로 추가 (워커 풀/비동기 수집)
+    for batch in ([4, 1], [0, 5], [3]):
+        for i in batch:
+            buffer.append(row(i), order=i)
+        buffer.take_unflushed()
+    buffer.append(row(2), order=2)
+
+    df = buffer.to_frame()
+    assert list(df.columns) == list(RESULT_COLUMNS)
+    assert df['retailprice'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(buffer) == 6
+
+
+def test_release_flushed_frees_saved_rows():
+    buffer = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
+    for i in range(5):
+        buffer.append(row(i))
+    buffer.take_unflushed()
+    buffer.append(row(5))
+
+    assert buffer.column('producturl') == [row(5)['producturl']]
+    assert len(buffer) == 6
+    assert buffer.to_frame()['producturl'].tolist() == [row(i)['producturl'] for i in range(6)]
+    # 스풀을 다시 읽어도 같은 결과
+    assert len(buffer.to_frame()) == 6
+
+
+def test_released_rows_get_columns_added_later():
+    buffer = ResultBuffer(columns=(), release_flushed=True)
+    buffer.append({'producturl': 'a'})
+    buffer.take_unflushed()
+    buffer.append({'producturl': 'b', 'title': 'SSD'})
+
+    df = buffer.to_frame()
+    assert list(df.columns) == ['producturl', 'title']
+    assert df['title'].isna().tolist() == [True, False]
+
+
+def test_clear_drops_memory_and_spool():
+    buffer = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
+    buffer.append(row(0))
+    buffer.take_unflushed()
+    buffer.clear()
+
+    assert len(buffer) == 0 and buffer.to_frame().empty
+    buffer.append(row(1))
+    assert buffer.to_frame()['retailprice'].tolist() == [1.0]
+
+
+def test_to_arrow_includes_released_rows():
+    pytest.importorskip('pyarrow')
+    buffer = ResultBuffer(RESULT_COLUMNS, release_flushed=True)
+    buffer.append(row(1), order=1)
+    buffer.take_unflushed()
+    buffer.append(row(0), order=0)
+
+    table = buffer.to_arrow()
+    assert table.column_names == list(RESULT_COLUMNS)
+    assert table.column('retailprice').to_pylist() == [0.0, 1.0]
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from result_buffer import RESULT_COLUMNS, ResultBuffer
+from result_schema import apply_result_schema, attach_raw_price
+
+
+def test_attach_raw_price_keeps_crawler_text():
+    result = {'retailprice': 1299.99, 'retailprice_raw': None}
+    attach_raw_price(result, '  $1,299.99 ')
+    assert result['retailprice_raw'] == '$1,299.99'
+
+
+def test_attach_raw_price_skips_missing_price_and_existing_raw():
+    missing = {'retailprice': None, 'retailprice_raw': None}
+    attach_raw_price(missing, '$1,299.99')
+    assert missing['retailprice_raw'] is None
+
+    captured = {'retailprice': 1299.99, 'retailprice_raw': '$1,299.99'}
+    attach_raw_price(captured, 'US$ 1,299.99')
+    assert captured['retailprice_raw'] == '$1,299.99'
+
+
+def test_schema_preserves_raw_text_and_falls_back_to_price():
+    buffer = ResultBuffer(RESULT_COLUMNS)
+    captured = {'retailprice': 1299.0, 'title': 'SSD'}
+    attach_raw_price(captured, '1.299,00 €')
+    buffer.append(captured)
+    buffer.append({'retailprice': 89.99, 'title': 'HDD'})
+    buffer.append({'retailprice': None, 'title': 'NVMe'})
+
+    df = apply_result_schema(buffer.to_frame(), 'de')
+
+    assert df['retailprice_raw'].tolist()[:2] == ['1.299,00 €', '89.99']
+    assert df['retailprice_raw'].isna().iloc[2]
+    assert df['retailprice'].tolist()[:2] == [1299.0, 89.99]
+    assert df.columns.get_loc('retailprice_raw') == df.columns.get_loc('retailprice') + 3
+
+
+def test_schema_is_idempotent_for_raw_column():
+    df = apply_result_schema(pd.DataFrame({'retailprice': ['£89.99'], 'retailprice_raw': ['£89.99']}), 'gb')
+    again = apply_result_schema(df, 'gb')
+    assert again['retailprice_raw'].tolist() == ['£89.99']
+    assert again['retailprice'].tolist() == [89.99]
@@ -0,0 +1,189 @@
+import os
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+import result_writer
+from result_writer import ResultWriter
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'results.db'}")
+
+
+def rows(start, stop, price=100.0):
+    return [{'producturl': f'https://example.com/p/{i}', 'crawl_strdatetime': f'2026101712000{i}',
+             'retailprice': price + i, 'title': f'SSD {i}'} for i in range(start, stop)]
+
+
+def table_rows(engine, table='result_tbl'):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT producturl, retailprice FROM {table} ORDER BY producturl")).fetchall()
+
+
+def test_interim_and_final_save_write_each_row_once(engine):
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    writer.write(rows(0, 3))
+    writer.write(rows(3, 5))
+
+    # 최종 저장은 중간 저장분을 포함한 전체 결과를 다시 넘김
+    writer.write(rows(0, 7))
+
+    stored = table_rows(engine)
+    assert len(stored) == 7
+    assert len({url for url, _ in stored}) == 7
+
+
+def test_duplicate_keys_in_buffer_keep_latest_value(engine):
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    writer.stage(rows(0, 2))
+    writer.stage(rows(1, 2, price=500.0))
+
+    assert writer.flush() == 2
+    assert table_rows(engine)[1][1] == 501.0
+    assert writer.flush() == 0
+
+
+def test_rewrite_after_flush_skips_written_keys(engine):
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    writer.write(rows(0, 3))
+    writer.stage(rows(0, 3))
+
+    assert writer.flush() == 0
+    assert len(writer) == 0
+    assert len(table_rows(engine)) == 3
+
+
+def test_failed_flush_keeps_buffer_for_retry(engine, monkeypatch):
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    real_insert = result_writer.bulk_insert
+    calls = []
+
+    def flaky_insert(*args, **kwargs):
+        calls.append(len(args[0]))
+        if len(calls) == 1:
+            raise RuntimeError('connection lost')
+        return real_insert(*args, **kwargs)
+
+    monkeypatch.setattr(result_writer, 'bulk_insert', flaky_insert)
+    writer.stage(rows(0, 3))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert len(writer) == 3
+
+    writer.stage(rows(3, 4))
+    assert writer.flush() == 4
+    assert calls == [3, 4]
+    assert len(table_rows(engine)) == 4
+
+
+def test_repeated_failures_quarantine_batch_and_clear_buffer(engine, monkeypatch, tmp_path):
+    quarantine_dir = tmp_path / 'failed'
+    monkeypatch.setenv('RESULT_FLUSH_MAX_RETRIES', '2')
+    monkeypatch.setenv('RESULT_QUARANTINE_DIR', str(quarantine_dir))
+
+    def failing_insert(*args, **kwargs):
+        raise RuntimeError('bad batch')
+
+    monkeypatch.setattr(result_writer, 'bulk_insert', failing_insert)
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    writer.stage(rows(0, 3))
+
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert len(writer) == 3
+    assert not quarantine_dir.exists()
+
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert len(writer) == 0
+    assert writer.flush() == 0
+
+    files = os.listdir(quarantine_dir)
+    assert len(files) == 1 and files[0].startswith('result_tbl_')
+    quarantined = pd.read_csv(quarantine_dir / files[0], encoding='utf-8-sig')
+    assert quarantined['producturl'].tolist() == [row['producturl'] for row in rows(0, 3)]
+    assert 'retailprice_raw' in quarantined.columns
+
+
+def test_failure_count_resets_after_success(engine, monkeypatch, tmp_path):
+    monkeypatch.setenv('RESULT_FLUSH_MAX_RETRIES', '2')
+    monkeypatch.setenv('RESULT_QUARANTINE_DIR', str(tmp_path / 'failed'))
+    real_insert = result_writer.bulk_insert
+    outcomes = iter([False, True, False, True])
+
+    def alternating_insert(*args, **kwargs):
+        if not next(outcomes):
+            raise RuntimeError('timeout')
+        return real_insert(*args, **kwargs)
+
+    monkeypatch.setattr(result_writer, 'bulk_insert', alternating_insert)
+    writer = ResultWriter(engine, 'result_tbl', 'usa')
+    for start in (0, 2):
+        writer.stage(rows(start, start + 2))
+        with pytest.raises(RuntimeError):
+            writer.flush()
+        assert writer.flush() == 2
+
+    assert not (tmp_path / 'failed').exists()
+    assert len(table_rows(engine)) == 4
+
+
+class FakeMySQLEngine:
+    """UNIQUE 키 확인용 MySQL 엔진 대역 - DDL을 실행하려 하면 실패"""
+
+    class dialect:
+        name = 'mysql'
+
+    url = 'mysql+pymysql://fake/db'
+
+    def begin(self):
+        raise AssertionError('저장 경로에서 DDL 실행')
+
+    connect = begin
+
+
+class FakeInspector:
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def has_table(self, table_name):
+        return True
+
+    def get_indexes(self, table_name):
+        return self.indexes
+
+
+@pytest.mark.parametrize('indexes, expected', [
+    ([], False),
+    ([{'unique': False, 'column_names': ['producturl', 'crawl_strdatetime']}], False),
+    ([{'unique': True, 'column_names': ['producturl', 'crawl_strdatetime']}], True),
+])
+def test_unique_key_is_detected_without_ddl(monkeypatch, indexes, expected):
+    monkeypatch.setenv('RESULT_UPSERT', '1')
+    monkeypatch.setattr(result_writer, 'inspect', lambda engine: FakeInspector(indexes))
+    writer = ResultWriter(FakeMySQLEngine(), 'result_tbl', 'usa')
+
+    assert writer.has_unique_key() is expected
+    assert writer.has_unique_key() is expected
+
+
+def test_upsert_keys_follow_unique_key(engine, monkeypatch):
+    calls = []
+    monkeypatch.setattr(result_writer, 'bulk_insert', lambda *args, **kwargs: calls.append(kwargs['upsert_keys']))
+    monkeypatch.setattr(ResultWriter, 'has_unique_key', lambda self: True)
+    ResultWriter(engine, 'result_tbl', 'usa').write(rows(0, 1))
+    assert calls == [result_writer.RESULT_KEY]
+
+
+def test_old_table_saves_without_missing_price_columns(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE old_tbl (producturl TEXT, crawl_strdatetime TEXT, retailprice FLOAT, title TEXT)"))
+
+    ResultWriter(engine, 'old_tbl', 'usa').write(rows(0, 2))
+
+    assert table_rows(engine, 'old_tbl') == [('https://example.com/p/0', 100.0), ('https://example.com/p/1', 101.0)]
+    with engine.connect() as conn:
+        assert 'currency' not in conn.execute(text("SELECT * FROM old_tbl")).keys()
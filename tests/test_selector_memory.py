@@ -0,0 +1,60 @@
+from selector_memory import SelectorMemory
+
+URL = 'https://www.amazon.com/dp/B000TEST'
+FIELDS = ('ships_from', 'sold_by')
+
+
+class FakePage:
+    """extract_element_text처럼 값이 있으면 remember(), 없으면 miss()를 기록하는 추출기"""
+
+    def __init__(self, memory, values):
+        self.memory = memory
+        self.values = values
+        self.calls = []
+
+    def extract(self, field):
+        self.calls.append(field)
+        value = self.values.get(field)
+        if value:
+            self.memory.remember(URL, field, '#' + field)
+        else:
+            self.memory.miss(URL, field)
+        return value
+
+
+def mark_absent(memory):
+    page = FakePage(memory, {})
+    for _ in range(memory.absent_after):
+        memory.extract_together(URL, FIELDS, page.extract)
+    assert memory.is_absent(URL, 'ships_from') and memory.is_absent(URL, 'sold_by')
+
+
+def test_both_absent_fields_are_rechecked_before_giving_up():
+    memory = SelectorMemory(absent_after=2)
+    mark_absent(memory)
+
+    page = FakePage(memory, {})
+    assert memory.extract_together(URL, FIELDS, page.extract) == [None, None]
+    assert page.calls == ['ships_from', 'sold_by']
+
+
+def test_absent_to_present_transition_returns_values_and_clears_cache():
+    memory = SelectorMemory(absent_after=2)
+    mark_absent(memory)
+
+    # 판매자가 다시 나타난 페이지: 캐시 때문에 빈값으로 남지 않아야 함 (가격이 지워지지 않음)
+    page = FakePage(memory, {'ships_from': 'Amazon.com', 'sold_by': 'Amazon.com'})
+    assert memory.extract_together(URL, FIELDS, page.extract) == ['Amazon.com', 'Amazon.com']
+    assert not memory.is_absent(URL, 'ships_from')
+    assert not memory.is_absent(URL, 'sold_by')
+    assert memory.get(URL, 'sold_by')['selector'] == '#sold_by'
+
+
+def test_absent_field_still_skipped_when_other_field_present():
+    memory = SelectorMemory(absent_after=2)
+    for _ in range(2):
+        memory.miss(URL, 'ships_from')
+
+    page = FakePage(memory, {'ships_from': 'Amazon.com', 'sold_by': 'Seller'})
+    assert memory.extract_together(URL, FIELDS, page.extract) == [None, 'Seller']
+    assert page.calls == ['sold_by']
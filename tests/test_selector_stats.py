@@ -0,0 +1,48 @@
+from selector_stats import SelectorStats
+
+
+def make_stats(selectors, **kwargs):
+    kwargs.setdefault('reorder_every', 1000)
+    kwargs.setdefault('min_attempts', 1)
+    return SelectorStats('amazon_selectors', {'country_code': 'usa'}, selectors=selectors, **kwargs)
+
+
+def test_rank_by_hit_rate_not_raw_hits():
+    selectors = {'title': ['#broad', '#precise']}
+    stats = make_stats(selectors)
+
+    # #broad: 10번 시도 4번 적중 (40%), #precise: 5번 시도 5번 적중 (100%)
+    for hit in [True] * 4 + [False] * 6:
+        stats.record('title', ['#broad'], '#broad' if hit else None)
+    for _ in range(5):
+        stats.record('title', ['#precise'], '#precise')
+
+    stats.reorder()
+    assert selectors['title'] == ['#precise', '#broad']
+
+
+def test_under_floor_selector_keeps_place_behind_proven_selectors():
+    selectors = {'title': ['#new', '#proven', '#dead']}
+    stats = make_stats(selectors, min_selector_attempts=5)
+
+    stats.record('title', ['#new'], '#new')  # 1회 100% - 최소 시도 미만
+    for _ in range(5):
+        stats.record('title', ['#proven'], '#proven')
+        stats.record('title', ['#dead'])
+
+    stats.reorder()
+    assert selectors['title'] == ['#proven', '#new', '#dead']
+
+
+def test_pinned_attempts_are_excluded():
+    stats = make_stats(None)
+
+    stats.record_first('title', ['#memo', '#a', '#b'], '#memo', pinned='#memo')
+    assert stats.hit_rate('title', '#memo') == 0.0
+    assert stats._attempts == {}
+    assert stats._records == 0
+
+    # 기억 선택자가 빗나가고 다음 선택자가 맞은 경우는 나머지만 집계
+    stats.record_first('title', ['#memo', '#a', '#b'], '#a', pinned='#memo')
+    assert ('title', '#memo') not in stats._attempts
+    assert stats.hit_rate('title', '#a') == 1.0
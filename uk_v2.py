@@ -35,13 +35,36 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from page_scan import scan_page
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import get_matcher, CONTINUE, OUT_OF_STOCK, IN_STOCK
+
+# Continue/재고 문구 (영국 페이지는 영어, amazon.de 상품은 영어 + 독일어)
+PAGE_PATTERNS = get_matcher('en')
+DE_PAGE_PATTERNS = get_matcher('en', 'de')
 
 class AmazonUKScraper:
     def __init__(self):
         self.driver = None
         self.db_engine = None
         self.country_code = 'gb'
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('Europe/London')  # 영국 현지 시간
@@ -214,8 +237,11 @@ class AmazonUKScraper:
             options.add_argument(f'--user-agent={random.choice(user_agents)}')
             options.add_experimental_option('prefs', {'intl.accept_languages': 'en-GB,en,de-DE,de'})
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             self.wait = WebDriverWait(self.driver, 20)
             
             logger.info("드라이버 설정 완료")
@@ -286,74 +312,13 @@ class AmazonUKScraper:
             return False
     
     def detect_currency_and_parse_price(self, price_text, url):
-        """URL을 기반으로 통화를 감지하고 가격 파싱"""
-        try:
-            price_text = price_text.strip()
-            
-            # URL 기반으로 국가 감지
-            is_german = '.de/' in url or 'amazon.de' in url
-            
-            # 무효한 패턴 확인
-            invalid_patterns = [
-                r'^[a-zA-Z\s]+$',
-                r'^\d+\s*[a-zA-Z]',
-            ]
-            
-            if is_german:
-                invalid_patterns.extend([
-                    r'war\s*[€]',
-                    r'uvp\s*[€]',
-                    r'gebraucht'
-                ])
-            else:
-                invalid_patterns.extend([
-                    r'was\s*[£]',
-                    r'list\s*price',
-                    r'buy\s*used'
-                ])
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, price_text, re.IGNORECASE):
-                    return None
-            
-            if is_german:
-                # 독일: 유로 처리
-                cleaned = re.sub(r'[€\s]', '', price_text)
-                
-                # 독일 형식: 1.234,99
-                if re.match(r'^\d{1,3}(?:\.\d{3})*(?:,\d{1,2})?$', cleaned):
-                    try:
-                        if ',' in cleaned:
-                            parts = cleaned.split(',')
-                            if len(parts) == 2:
-                                whole_part = parts[0].replace('.', '')
-                                decimal_part = parts[1]
-                                price_value = float(f"{whole_part}.{decimal_part}")
-                            else:
-                                return None
-                        else:
-                            price_value = float(cleaned.replace('.', ''))
-                        
-                        if 5 <= price_value <= 50000:
-                            return str(price_value)
-                    except:
-                        pass
-            else:
-                # 영국: 파운드 처리
-                cleaned = re.sub(r'[£\s]', '', price_text)
-                
-                # 영국 형식: 1,234.99
-                if re.match(r'^\d{1,4}(?:,\d{3})*(?:\.\d{1,2})?$', cleaned):
-                    try:
-                        price_value = float(cleaned.replace(',', ''))
-                        if 5 <= price_value <= 50000:
-                            return cleaned.replace(',', '')
-                    except:
-                        pass
-            
-            return None
-        except Exception:
-            return None
+        """URL을 기반으로 통화를 감지하고 가격 파싱 (price_parser 공통 규칙, 5~50000)"""
+        # URL 기반으로 국가 감지 (독일: 1.234,99 € / 영국: £1,234.99)
+        is_german = '.de/' in url or 'amazon.de' in url
+        price = parse_price(price_text, 'de' if is_german else 'gb', strict=True, bounds=(5, 50000))
+        if price is not None:
+            self.last_price_text = price_text
+        return format_price(price)
     
     def extract_price(self, url):
         """가격 추출"""
@@ -487,26 +452,13 @@ class AmazonUKScraper:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
                 
-                if is_german:
-                    unavailable_phrases = [
-                        'derzeit nicht verfügbar', 'nicht auf lager', 'ausverkauft',
-                        'currently unavailable', 'out of stock', 'temporarily out of stock'
-                    ]
-                    available_phrases = [
-                        'auf lager', 'verfügbar', 'in stock', 'only', 'left in stock'
-                    ]
-                else:
-                    unavailable_phrases = [
-                        'currently unavailable', 'out of stock', 'temporarily out of stock'
-                    ]
-                    available_phrases = [
-                        'in stock', 'only', 'left in stock'
-                    ]
+                matcher = DE_PAGE_PATTERNS if is_german else PAGE_PATTERNS
+                stock = matcher.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in unavailable_phrases):
+                if OUT_OF_STOCK in stock:
                     return False
                 
-                if any(phrase in availability_text for phrase in available_phrases):
+                if IN_STOCK in stock:
                     return True
             except:
                 pass
@@ -524,8 +476,17 @@ class AmazonUKScraper:
         except Exception:
             return True
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code='gb', channel_name='amazon.co.uk', vat=row_data.get('vat', 'x'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info("=" * 60)
             logger.info(f"제품 정보 추출 시작: {url}")
@@ -533,8 +494,10 @@ class AmazonUKScraper:
             # URL 확인 (독일 사이트 여부 판별용)
             is_german_site = '.de/' in url or 'amazon.de' in url
             
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 고정 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                time.sleep(random.uniform(2, 4))
             
             # 페이지 로드 대기
             try:
@@ -542,53 +505,14 @@ class AmazonUKScraper:
             except:
                 pass
             
-            # 차단 페이지 확인
-            page_source_lower = self.driver.page_source.lower()
-            if any(text in page_source_lower for text in ['continue shopping', 'weiter einkaufen']):
+            # 차단 페이지 확인 (브라우저 안에서 검사)
+            if scan_page(self.driver, DE_PAGE_PATTERNS.patterns(CONTINUE)):
+                self.last_blocked = True
                 logger.info("차단 페이지 감지 - Continue 버튼 시도")
                 self.handle_captcha_or_block_page()
                 time.sleep(3)
-            
-            # V2: 타임존 분리
-
-            
-            now_time = datetime.now(self.korea_tz)
-
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'gb',  # 항상 gb로 고정
-                'ships_from': None,
-                'channel_name': 'amazon.co.uk',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+
+            result = self.build_base_result(url, row_data)
             
             # 제목 추출
             result['title'] = self.extract_element_text(self.selectors.get('title', []), "제목")
@@ -668,6 +592,7 @@ class AmazonUKScraper:
             logger.info(f"배송지: {result['ships_from']}")
             logger.info(f"이미지: {result['imageurl']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -680,44 +605,9 @@ class AmazonUKScraper:
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
             
             # 실패 시에도 기본 구조 반환 (가격은 0으로)
-            # V2: 타임존 분리
-
-            now_time = datetime.now(self.korea_tz)
-
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식 (에러 시에도 필요)
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': 'gb',  # 항상 gb로 고정
-                'ships_from': None,
-                'channel_name': 'amazon.co.uk',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': "0",
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+            result = self.build_base_result(url, row_data)
+            result['retailprice'] = "0"
+            return result
     
     def get_uk_crawl_targets(self, limit=None):
         """DB에서 UK 크롤링 대상 조회"""
@@ -748,7 +638,7 @@ class AmazonUKScraper:
         
         try:
             table_name = 'amazon_price_crawl_tbl_uk_v2'
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"DB 저장 완료: {len(df)}개")
             return True
         except Exception as e:
@@ -807,6 +697,9 @@ class AmazonUKScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_gb_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -857,10 +750,15 @@ class AmazonUKScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table='amazon_price_crawl_tbl_uk_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info(f"UK 크롤링 시작 - {len(urls_data)}개 URL")
         
@@ -868,7 +766,7 @@ class AmazonUKScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
 
         for idx, row in enumerate(urls_data):
@@ -878,7 +776,9 @@ class AmazonUKScraper:
 
                 logger.info(f"진행률: {idx + 1}/{len(urls_data)} - {item_name}")
 
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
 
                 if result['retailprice'] == '0':
                     failed_urls.append({
@@ -891,22 +791,10 @@ class AmazonUKScraper:
 
                 # 중간 저장
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = 'amazon_price_crawl_tbl_uk_v2'
-                            interim_df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
-                            logger.info("중간 저장: 10개 레코드")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    time.sleep(wait_time)
-
-                    if (idx + 1) % 20 == 0:
-                        logger.info("20개 처리 완료, 30초 휴식")
-                        time.sleep(30)
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = 'amazon_price_crawl_tbl_uk_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
 
             except Exception as e:
                 logger.error(f"스크래핑 중 오류 (URL: {row.get('url', 'unknown')}): {e}")
@@ -922,7 +810,7 @@ class AmazonUKScraper:
             except:
                 pass
 
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -941,7 +829,7 @@ class AmazonUKScraper:
         if with_price > 0:
             try:
                 price_df = df[df['retailprice'] != '0'].copy()
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("가격 통계:")
                 logger.info(f"  평균: {price_df['price_numeric'].mean():.2f}")
@@ -953,6 +841,7 @@ class AmazonUKScraper:
 def main():
     """메인 실행 함수"""
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print("=" * 60)
     print("Amazon UK Price Scraper (독일 URL 호환)")
@@ -975,7 +864,7 @@ def main():
         monitor_and_alert('gb', 0, None, error_message="크롤링 대상 없음")
         return
 
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과 없음")
         monitor_and_alert('gb', len(urls_data), None, error_message="크롤링 결과 없음")
@@ -6,7 +6,6 @@ ships_from, sold_by 빈값 시 price 빈값 처리 로직 추가
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import pandas as pd
 import pymysql
@@ -32,13 +31,84 @@ logger = logging.getLogger(__name__)
 from config import DB_CONFIG_V2 as DB_CONFIG
 from config import FILE_SERVER_CONFIG
 from alert_monitor import monitor_and_alert
+from page_readiness import (
+    navigate, get_page_load_strategy, get_navigation_deadline, apply_page_load_strategy,
+    wait_until_ready, get_ready_timeout, AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS
+)
+from scraper_pool import run_scraper_pool, get_pool_workers
+from rate_limiter import get_rate_limiter
+from resource_blocking import apply_resource_blocking
+from html_snapshot import get_extract_engine, PageSnapshot, ENGINE_SNAPSHOT
+from selector_stats import SelectorStats
+from selector_memory import get_selector_memory
+from dom_extractor import (
+    extract_fields, text_field, texts_field, attr_field, exists_field, pairs_field
+)
+from price_parser import parse_price, parse_price_series, format_price
+from result_schema import apply_result_schema, attach_raw_price
+from result_writer import write_results
+from bulk_writer import bulk_insert
+from persistence_queue import submit_results
+from result_buffer import AMAZON_RESULT_COLUMNS, ResultBuffer, new_result
+from pattern_registry import (
+    get_matcher, LABELS, BLOCKED_TITLE, BLOCKED, CONTINUE, NOT_FOUND, OUT_OF_STOCK, IN_STOCK
+)
+
+# 차단/Continue/재고 문구 (영어 + 독일어 Amazon)
+PAGE_PATTERNS = get_matcher('en', 'de')
+
+# 가격 1단계: a-offscreen (완전한 가격 텍스트)
+PRICE_OFFSCREEN_SELECTORS = [
+    "//*[@id='corePrice_feature_div']//span[@class='a-offscreen']",
+    "//*[@id='corePriceDisplay_desktop_feature_div']//span[@class='a-offscreen']",
+    ".a-price .a-offscreen",
+    "//span[@class='a-price']//span[@class='a-offscreen']"
+]
+
+# 가격 2단계: (정수부, 소수부) 조합
+PRICE_COMBINATIONS = [
+    ("//*[@id='corePrice_feature_div']//span[@class='a-price-whole']",
+     "//*[@id='corePrice_feature_div']/div/div/div/div/span[1]/span[2]"),
+    ("//*[@id='corePriceDisplay_desktop_feature_div']//span[@class='a-price-whole']",
+     "//*[@id='corePriceDisplay_desktop_feature_div']/div[1]/span[3]/span[2]"),
+    ("//*[@id='corePrice_feature_div']//span[@class='a-price-whole']",
+     "//*[@id='corePrice_feature_div']//span[@class='a-price-fraction']"),
+    ("//span[@class='a-price-whole']",
+     "//span[@class='a-price-fraction']")
+]
+
+# ships_from 없이 sold_by만 있을 때 배송자/판매자 통합 라벨
+COMBINED_SELLER_LABEL_SELECTORS = [
+    "//span[contains(text(), 'Shipper / Seller')]",
+    "//span[contains(text(), 'Shipper/Seller')]",
+    "//*[@id='merchantInfoFeature_feature_div']//span[contains(@class, 'a-color-tertiary')][contains(text(), 'Shipper')]"
+]
+
+# 페이지 준비 판정: 제품 페이지 핵심 노드 또는 차단(Continue shopping/캡차) 페이지 노드
+PAGE_READY_SELECTORS = [
+    '#productTitle',
+    '#priceblock_ourprice',
+    '.a-price-whole',
+    '#availability',
+    '#imageBlock',
+    'form[action*="validateCaptcha"]',
+    "//button[contains(., 'Continue shopping') or contains(., 'Weiter shoppen')]"
+]
 
 class AmazonScraper:
     def __init__(self, country_code='usa'):
         self.driver = None
         self.db_engine = None
         self.country_code = country_code.lower()
+        self.rate_limiter = get_rate_limiter('amazon', initial_interval=7.5)  # 도메인별 적응형 요청 간격
+        self.last_blocked = False  # 마지막 extract_product_info()에서 차단/캡차가 감지됐는지 (rate_limiter 기록용)
+        self.last_price_text = None  # 마지막으로 파싱에 성공한 가격 원문 (retailprice_raw)
+        self.batch_extract = os.getenv('BATCH_EXTRACT', '0') == '1'  # execute_script 1회 일괄 추출
+        self.extract_engine = get_extract_engine()  # snapshot: 보임 여부가 필요 없는 필드는 HTML 1회 파싱으로 추출
+        self.ready_timeout = get_ready_timeout('amazon', default=15)  # 페이지 준비 대기 한도 (초)
         self.wait = None
+        self.page_load_strategy = get_page_load_strategy('amazon')  # eager/none: 제목+가격 확인 즉시 로딩 중단
+        self.navigation_deadline = get_navigation_deadline('amazon')  # 탐색 한도 (초과 시 재시도 대상)
         # V2: 타임존 분리 (현지시간 + 한국시간)
         self.korea_tz = pytz.timezone('Asia/Seoul')
         self.local_tz = pytz.timezone('America/New_York')  # 미국 현지 시간
@@ -52,6 +122,14 @@ class AmazonScraper:
         # DB에서 선택자 로드
         self.load_selectors_from_db()
         
+        # 선택자 적중률 통계 (적중률 순 재정렬 + 종료 시 priority 일괄 반영)
+        self.selector_stats = SelectorStats(
+            'amazon_selectors', {'country_code': self.country_code}, self.selectors[self.country_code]
+        )
+        
+        # 상품별 선택자 기억 (지난번 성공 선택자 우선 시도 + 없는 필드 negative cache)
+        self.selector_memory = get_selector_memory(f'amazon_{self.country_code}')
+        
     def setup_db_connection(self):
         """DB 연결 설정"""
         try:
@@ -243,8 +321,11 @@ class AmazonScraper:
             lang = language_map.get(self.country_code, 'en-US,en')
             options.add_experimental_option('prefs', {'intl.accept_languages': lang})
             
+            apply_page_load_strategy(options, self.page_load_strategy)
             self.driver = uc.Chrome(options=options)
             self.driver.maximize_window()
+            apply_resource_blocking(self.driver, 'amazon')  # 이미지/폰트/미디어/광고 요청 차단 (src 속성은 유지)
+            self.driver.set_page_load_timeout(self.navigation_deadline)
             
             self.wait = WebDriverWait(self.driver, 20)
             
@@ -384,46 +465,36 @@ class AmazonScraper:
             logger.error(f"차단 페이지 처리 중 오류: {e}")
             return False
     
-    def is_page_blocked(self):
-        """페이지 차단 감지 - 독일 Amazon 패턴 포함"""
+    def is_page_blocked(self, page=None):
+        """페이지 차단 감지 - 독일 Amazon 패턴 포함 (page: PageSnapshot/HtmlSnapshot, 이미 읽은 값 재사용)"""
         try:
-            page_title = self.driver.title.lower()
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
+            page = page if page is not None else PageSnapshot(self.driver)
+            page_title = page.title.lower()
+            current_url = page.url.lower()
+            
+            title_hits = PAGE_PATTERNS.classify(page_title, BLOCKED_TITLE)
+            if title_hits:
+                logger.warning(f"심각한 차단 감지 (제목): {title_hits[BLOCKED_TITLE][0]}")
+                self.last_blocked = True
+                return True
             
-            serious_blocked_indicators = {
-                'title': [
-                    '503',
-                    'access denied',
-                    'error has occurred',
-                    'fehler aufgetreten'
-                ],
-                'content': [
-                    'enter the characters',
-                    'verify you are human',
-                    'access denied',
-                    'automated access',
-                    'suspicious activity',
-                    'geben sie die zeichen ein',
-                    'beweisen sie dass sie ein mensch sind'
-                ]
-            }
+            # 본문 문구는 브라우저 안에서 검사해 일치한 패턴만 받아옴
+            found = page.classify(PAGE_PATTERNS, CONTINUE, BLOCKED, NOT_FOUND)
             
-            for pattern in serious_blocked_indicators['title']:
-                if pattern in page_title:
-                    logger.warning(f"심각한 차단 감지 (제목): {pattern}")
-                    return True
+            # 없는 상품(404) 페이지는 차단이 아님 - 재시도/감속하지 않음
+            if NOT_FOUND in found:
+                logger.info(f"상품 페이지 없음 (404): {current_url}")
+                return False
             
             # Continue shopping이나 Weiter shoppen이 없는 경우만 차단으로 판단
-            if ('continue shopping' not in page_source and 
-                'weiter shoppen' not in page_source):
-                for pattern in serious_blocked_indicators['content']:
-                    if pattern in page_source:
-                        logger.warning(f"심각한 차단 감지 (본문): {pattern}")
-                        return True
+            if CONTINUE not in found and BLOCKED in found:
+                logger.warning(f"심각한 차단 감지 (본문): {found[BLOCKED][0]}")
+                self.last_blocked = True
+                return True
             
             if 'amazon' not in current_url:
                 logger.warning(f"Amazon 페이지가 아님: {current_url}")
+                self.last_blocked = True
                 return True
             
             return False
@@ -432,44 +503,33 @@ class AmazonScraper:
             logger.error(f"페이지 차단 확인 중 오류: {e}")
             return False
     
-    def wait_for_page_load(self, timeout=10):
-        """페이지 로드 대기"""
+    def wait_for_page_load(self, timeout=None):
+        """페이지 로드 대기 - 제품/차단 페이지 노드가 나타나는 순간 반환 (MutationObserver)"""
         try:
-            self.wait.until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            
-            possible_elements = [
-                (By.ID, "productTitle"),
-                (By.ID, "priceblock_ourprice"),
-                (By.CLASS_NAME, "a-price-whole"),
-                (By.ID, "availability"),
-                (By.ID, "imageBlock")
-            ]
-            
-            for by, value in possible_elements:
-                try:
-                    WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((by, value))
-                    )
-                    logger.debug(f"요소 발견: {by}={value}")
-                    return True
-                except:
-                    continue
-            
+            wait_until_ready(self.driver, PAGE_READY_SELECTORS, timeout or self.ready_timeout)
             return True
             
         except Exception as e:
             logger.warning(f"페이지 로드 대기 중 오류: {e}")
             return False
     
-    def extract_element_text(self, selectors, element_name="요소"):
-        """선택자 목록에서 텍스트 추출 - 단순화된 버전"""
+    def extract_element_text(self, selectors, element_name="요소", field=None, key=None):
+        """
+        선택자 목록에서 텍스트 추출 - 단순화된 버전
+
+        field가 있으면 적중 선택자 기록, key(상품 URL)까지 있으면 상품별 기억 선택자를 먼저 시도
+        """
+        if field and key:
+            selectors_to_try = self.selector_memory.ordered(key, field, selectors)
+            pinned = self.selector_memory.pinned(key, field, selectors)
+        else:
+            selectors_to_try = selectors
+            pinned = None
         logger.info(f"{element_name} 추출 시작 - 총 {len(selectors)}개 선택자")
         
-        for idx, selector in enumerate(selectors, 1):
+        for idx, selector in enumerate(selectors_to_try, 1):
             try:
-                logger.info(f"[{idx}/{len(selectors)}] 시도 중: {selector}")
+                logger.info(f"[{idx}/{len(selectors_to_try)}] 시도 중: {selector}")
                 
                 if selector.startswith('//') or selector.startswith('('):
                     elements = self.driver.find_elements(By.XPATH, selector)
@@ -498,40 +558,20 @@ class AmazonScraper:
                                     
                                     # Ships From과 Sold By에 대해서만 간단한 필터링
                                     if element_name in ["Sold By", "Ships From"]:
-                                        # 명확히 라벨만 있는 경우만 스킵
-                                        text_lower = text.lower().strip()
-                                        
-                                        # 라벨만 있는 경우들
-                                        label_only_patterns = [
-                                            'sold by',
-                                            'ships from', 
-                                            'vendu par',
-                                            'expédié par',
-                                            'verkauft von',
-                                            'versendet von',
-                                            'venduto da',
-                                            'spedito da',
-                                            'vendido por',
-                                            'enviado por'
-                                        ]
-                                        
-                                        # 정확히 라벨만 있는 경우 스킵
-                                        if text_lower in label_only_patterns:
+                                        # 정확히 라벨만 있는 경우 스킵, "Sold by Amazon.com" 형태에서 "Amazon.com"만 추출
+                                        label_only, value = LABELS.strip_label(text)
+                                        if label_only:
                                             logger.info(f"라벨만 있음, 스킵: '{text}'")
                                             continue
-                                        
-                                        # "Sold by Amazon.com" 형태에서 "Amazon.com"만 추출
-                                        for pattern in label_only_patterns:
-                                            if text_lower.startswith(pattern + ' '):
-                                                # 라벨 뒤의 실제 값만 추출
-                                                actual_value = text[len(pattern):].strip()
-                                                if actual_value:
-                                                    text = actual_value
-                                                    logger.info(f"라벨 제거 후: '{text}'")
-                                                break
+                                        if value != text.strip():
+                                            text = value
+                                            logger.info(f"라벨 제거 후: '{text}'")
                                     
                                     if text:
                                         logger.info(f"최종 추출: '{text}'")
+                                        if field:
+                                            self.selector_stats.record_first(field, selectors_to_try, selector, pinned)
+                                            self.selector_memory.remember(key, field, selector)
                                         return text
                         except Exception as e:
                             logger.debug(f"요소 처리 중 오류: {e}")
@@ -541,84 +581,100 @@ class AmazonScraper:
                 continue
         
         logger.error(f"{element_name} 추출 완전 실패")
+        if field:
+            self.selector_stats.record_first(field, selectors, pinned=pinned)
+            self.selector_memory.miss(key, field)
         return None
     
     def parse_price_by_country(self, price_text, country_code):
-        """국가별 가격 파싱 - 원본 형태 보존"""
-        try:
-            price_text = price_text.strip()
-            logger.debug(f"파싱할 가격 텍스트: {price_text}")
-            
-            if country_code in ['fr', 'it', 'es', 'de']:
-                cleaned = re.sub(r'[€\s]', '', price_text)
-                if ',' in cleaned:
-                    parts = cleaned.split(',')
-                    if len(parts) == 2 and len(parts[1]) <= 2 and parts[1].isdigit():
-                        integer_part = parts[0].replace('.', '')
-                        decimal_part = parts[1]
-                        cleaned = f"{integer_part}.{decimal_part}"
+        """국가별 가격 파싱 (price_parser 공통 규칙) - 통화 기호 외 글자가 섞인 텍스트 제외, "1299.99" 형태로 반환"""
+        price = parse_price(price_text, country_code, strict=True)
+        if price is None:
+            logger.debug(f"가격 파싱 실패: {price_text}")
+        else:
+            self.last_price_text = price_text
+        return format_price(price)
+    
+    def _price_from_selector(self, selector, country_code):
+        """선택자 1개의 보이는 요소들에서 가격 파싱 (a-offscreen/개별 선택자 단계 공통)"""
+        if selector.startswith('//'):
+            elements = self.driver.find_elements(By.XPATH, selector)
+        else:
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        
+        for element in elements:
+            if element.is_displayed():
+                text_methods = [
+                    element.get_attribute('textContent'),
+                    element.get_attribute('innerText'),
+                    element.text
+                ]
                 
-                if re.match(r'^\d{1,3}([.,]\d{3})*(\.\d{1,2})?$', cleaned) or re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-                    
-            elif country_code == 'jp':
-                cleaned = re.sub(r'[¥￥\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{3})*$', cleaned) or re.match(r'^\d+$', cleaned):
-                    return cleaned
-                    
-            elif country_code == 'in':
-                cleaned = re.sub(r'[₹\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{2,3})*(\.\d{1,2})?$', cleaned) or re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-                    
-            else:
-                cleaned = re.sub(r'[$£\s]', '', price_text)
-                if re.match(r'^\d{1,3}(,\d{3})*(\.\d{1,2})?$', cleaned) or re.match(r'^\d+(\.\d{1,2})?$', cleaned):
-                    return cleaned
-                    
+                for text in text_methods:
+                    if text and text.strip():
+                        price_text = text.strip()
+                        logger.info(f"텍스트: {price_text}")
+                        
+                        price = self.parse_price_by_country(price_text, country_code)
+                        if price:
+                            return price
+        return None
+    
+    def _price_from_combo(self, whole_selector, fraction_selector, country_code):
+        """whole + fraction 조합 1개로 가격 구성"""
+        whole_elem = self.driver.find_element(By.XPATH, whole_selector)
+        fraction_elem = self.driver.find_element(By.XPATH, fraction_selector)
+        
+        if whole_elem and fraction_elem and whole_elem.is_displayed() and fraction_elem.is_displayed():
+            whole_text = whole_elem.text.strip()
+            fraction_text = fraction_elem.text.strip()
+            
+            logger.info(f"정수부 텍스트: {whole_text}")
+            logger.info(f"소수부 텍스트: {fraction_text}")
+            
+            if whole_text and fraction_text:
+                fraction_clean = re.sub(r'[^\d]', '', fraction_text)
+                if fraction_clean:
+                    combined_price = f"{whole_text}.{fraction_clean}"
+                    logger.info(f"조합된 가격: {combined_price}")
+                    return self.parse_price_by_country(combined_price, country_code)
+        return None
+    
+    def _remembered_price(self, key, country_code):
+        """상품별로 기억된 가격 선택자/단계를 먼저 시도"""
+        remembered = self.selector_memory.get(key, 'price')
+        if not remembered:
+            return None
+        
+        stage, selector = remembered['stage'], remembered['selector']
+        logger.info(f"기억된 가격 선택자 우선 시도 ({stage}): {selector}")
+        try:
+            if stage == 'combo':
+                return self._price_from_combo(selector[0], selector[1], country_code)
+            return self._price_from_selector(selector, country_code)
         except Exception as e:
-            logger.debug(f"가격 파싱 오류: {price_text} - {e}")
-            
+            logger.debug(f"기억된 가격 선택자 오류: {e}")
         return None
     
-    def extract_price(self, country_code):
-        """가격 추출 - 소수점까지 완벽 추출"""
+    def extract_price(self, country_code, key=None):
+        """가격 추출 - 소수점까지 완벽 추출 (key가 있으면 상품별 기억 선택자 우선)"""
         logger.info(f"가격 추출 시작 - 국가: {country_code}")
         
+        price = self._remembered_price(key, country_code)
+        if price:
+            logger.info(f"기억된 선택자로 가격 추출 성공: {price}")
+            return price
+        
         # 1단계: a-offscreen 우선 시도
         logger.info("1단계: a-offscreen 요소에서 완전한 가격 추출 시도")
-        offscreen_selectors = [
-            "//*[@id='corePrice_feature_div']//span[@class='a-offscreen']",
-            "//*[@id='corePriceDisplay_desktop_feature_div']//span[@class='a-offscreen']", 
-            ".a-price .a-offscreen",
-            "//span[@class='a-price']//span[@class='a-offscreen']"
-        ]
-        
-        for selector in offscreen_selectors:
+        for selector in PRICE_OFFSCREEN_SELECTORS:
             try:
                 logger.info(f"시도: {selector}")
-                if selector.startswith('//'):
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                else:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for element in elements:
-                    if element.is_displayed():
-                        text_methods = [
-                            element.get_attribute('textContent'),
-                            element.get_attribute('innerText'),
-                            element.text
-                        ]
-                        
-                        for text in text_methods:
-                            if text and text.strip():
-                                price_text = text.strip()
-                                logger.info(f"발견된 텍스트: {price_text}")
-                                
-                                price = self.parse_price_by_country(price_text, country_code)
-                                if price:
-                                    logger.info(f"a-offscreen에서 완전한 가격 추출 성공: {price}")
-                                    return price
+                price = self._price_from_selector(selector, country_code)
+                if price:
+                    logger.info(f"a-offscreen에서 완전한 가격 추출 성공: {price}")
+                    self.selector_memory.remember(key, 'price', selector, 'offscreen')
+                    return price
                                     
             except Exception as e:
                 logger.debug(f"오류: {e}")
@@ -626,51 +682,17 @@ class AmazonScraper:
         # 2단계: whole + fraction 조합 시도
         logger.info("2단계: whole + fraction 조합으로 가격 구성")
         
-        combination_attempts = [
-            {
-                'whole': "//*[@id='corePrice_feature_div']//span[@class='a-price-whole']",
-                'fraction': "//*[@id='corePrice_feature_div']/div/div/div/div/span[1]/span[2]"
-            },
-            {
-                'whole': "//*[@id='corePriceDisplay_desktop_feature_div']//span[@class='a-price-whole']",
-                'fraction': "//*[@id='corePriceDisplay_desktop_feature_div']/div[1]/span[3]/span[2]"
-            },
-            {
-                'whole': "//*[@id='corePrice_feature_div']//span[@class='a-price-whole']",
-                'fraction': "//*[@id='corePrice_feature_div']//span[@class='a-price-fraction']"
-            },
-            {
-                'whole': "//span[@class='a-price-whole']",
-                'fraction': "//span[@class='a-price-fraction']"
-            }
-        ]
-        
-        for i, combo in enumerate(combination_attempts, 1):
+        for i, (whole_selector, fraction_selector) in enumerate(PRICE_COMBINATIONS, 1):
             try:
                 logger.info(f"조합 시도 {i}:")
-                logger.info(f"정수부: {combo['whole']}")
-                logger.info(f"소수부: {combo['fraction']}")
+                logger.info(f"정수부: {whole_selector}")
+                logger.info(f"소수부: {fraction_selector}")
                 
-                whole_elem = self.driver.find_element(By.XPATH, combo['whole'])
-                fraction_elem = self.driver.find_element(By.XPATH, combo['fraction'])
-                
-                if whole_elem and fraction_elem and whole_elem.is_displayed() and fraction_elem.is_displayed():
-                    whole_text = whole_elem.text.strip()
-                    fraction_text = fraction_elem.text.strip()
-                    
-                    logger.info(f"정수부 텍스트: {whole_text}")
-                    logger.info(f"소수부 텍스트: {fraction_text}")
-                    
-                    if whole_text and fraction_text:
-                        fraction_clean = re.sub(r'[^\d]', '', fraction_text)
-                        if fraction_clean:
-                            combined_price = f"{whole_text}.{fraction_clean}"
-                            logger.info(f"조합된 가격: {combined_price}")
-                            
-                            price = self.parse_price_by_country(combined_price, country_code)
-                            if price:
-                                logger.info(f"조합 가격 추출 성공: {price}")
-                                return price
+                price = self._price_from_combo(whole_selector, fraction_selector, country_code)
+                if price:
+                    logger.info(f"조합 가격 추출 성공: {price}")
+                    self.selector_memory.remember(key, 'price', [whole_selector, fraction_selector], 'combo')
+                    return price
                                 
             except Exception as e:
                 logger.debug(f"조합 {i} 오류: {e}")
@@ -682,56 +704,128 @@ class AmazonScraper:
         for idx, selector in enumerate(price_selectors, 1):
             try:
                 logger.info(f"[{idx}/{len(price_selectors)}] 시도: {selector}")
-                
-                if selector.startswith('//'):
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                else:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for element in elements:
-                    if element.is_displayed():
-                        text_methods = [
-                            element.get_attribute('textContent'),
-                            element.get_attribute('innerText'),
-                            element.text
-                        ]
-                        
-                        for text in text_methods:
-                            if text and text.strip():
-                                price_text = text.strip()
-                                logger.info(f"텍스트: {price_text}")
-                                
-                                price = self.parse_price_by_country(price_text, country_code)
-                                if price:
-                                    logger.info(f"개별 선택자 가격 추출 성공: {price}")
-                                    return price
+                price = self._price_from_selector(selector, country_code)
+                if price:
+                    logger.info(f"개별 선택자 가격 추출 성공: {price}")
+                    self.selector_stats.record_first('price', price_selectors, selector)
+                    self.selector_memory.remember(key, 'price', selector, 'selector')
+                    return price
                                     
             except Exception as e:
                 logger.debug(f"선택자 오류: {e}")
         
+        self.selector_stats.record_first('price', price_selectors)
         logger.error("모든 방법으로 가격 추출 실패")
         return None
     
+    def extract_fields_batch(self, key=None):
+        """
+        execute_script 1회로 제목/가격/판매자/배송자/이미지/재고 텍스트 일괄 추출
+
+        Args:
+            key: 상품 URL (있으면 필드별로 기억된 선택자를 맨 앞에 두고, 적중/미적중을 기억)
+
+        Returns:
+            dict: 필드별 값 / 스크립트 실패 시 None (기존 방식으로 대체)
+        """
+        selectors = self.selectors[self.country_code]
+        memory = self.selector_memory
+        spec = {
+            'title': text_field(memory.ordered(key, 'title', selectors.get('title', []))),
+            'price_offscreen': texts_field(PRICE_OFFSCREEN_SELECTORS),
+            'price_pairs': pairs_field(PRICE_COMBINATIONS),
+            'price': texts_field(selectors.get('price', [])),
+            'ships_from': text_field(memory.ordered(key, 'ships_from', selectors.get('ships_from', [])), strip_labels=True),
+            'sold_by': text_field(memory.ordered(key, 'sold_by', selectors.get('sold_by', [])), strip_labels=True),
+            'imageurl': attr_field(memory.ordered(key, 'imageurl', selectors.get('imageurl', [])), 'src'),
+            'availability': text_field(selectors.get('availability', [])),
+            'combined_label': exists_field(COMBINED_SELLER_LABEL_SELECTORS)
+        }
+
+        bundle = extract_fields(self.driver, spec)
+        if bundle is None:
+            return None
+
+        values = bundle['values']
+        hits = bundle.get('hits') or {}
+        for field in ('title', 'ships_from', 'sold_by', 'imageurl', 'availability'):
+            self.selector_stats.record_first(field, spec[field]['selectors'], hits.get(field),
+                                             memory.pinned(key, field, selectors.get(field, [])))
+        for field in ('title', 'ships_from', 'sold_by', 'imageurl'):
+            if hits.get(field):
+                memory.remember(key, field, hits[field])
+            else:
+                memory.miss(key, field)
+
+        return {
+            'title': values.get('title'),
+            'retailprice': self.pick_price(values),
+            'ships_from': values.get('ships_from'),
+            'sold_by': values.get('sold_by'),
+            'imageurl': values.get('imageurl'),
+            'availability': values.get('availability'),
+            'combined_label': bool(values.get('combined_label'))
+        }
+
+    def pick_price(self, values):
+        """일괄 추출한 가격 후보에서 extract_price()와 같은 순서로 가격 선택"""
+        for price_text in values.get('price_offscreen') or []:
+            price = self.parse_price_by_country(price_text, self.country_code)
+            if price:
+                logger.info(f"a-offscreen에서 완전한 가격 추출 성공: {price}")
+                return price
+
+        for pair in values.get('price_pairs') or []:
+            if not pair or not pair[0] or not pair[1]:
+                continue
+            fraction_clean = re.sub(r'[^\d]', '', pair[1])
+            if fraction_clean:
+                price = self.parse_price_by_country(f"{pair[0]}.{fraction_clean}", self.country_code)
+                if price:
+                    logger.info(f"조합 가격 추출 성공: {price}")
+                    return price
+
+        for price_text in values.get('price') or []:
+            price = self.parse_price_by_country(price_text, self.country_code)
+            if price:
+                logger.info(f"개별 선택자 가격 추출 성공: {price}")
+                return price
+
+        logger.error("모든 방법으로 가격 추출 실패")
+        return None
+
+    def extract_price_fast(self, key=None):
+        """batch_extract 모드면 일괄 추출, 아니면 기존 extract_price()"""
+        if self.batch_extract:
+            fields = self.extract_fields_batch(key)
+            if fields is not None:
+                return fields['retailprice']
+        return self.extract_price(self.country_code, key=key)
+
+    def has_combined_seller_label(self):
+        """"Shipper / Seller" 통합 라벨(배송자=판매자) 존재 여부"""
+        for label_selector in COMBINED_SELLER_LABEL_SELECTORS:
+            try:
+                label_element = self.driver.find_element(By.XPATH, label_selector)
+                if label_element and label_element.is_displayed():
+                    return True
+            except:
+                continue
+        return False
+
     def check_stock_availability(self):
         """재고 상태 확인"""
         try:
             try:
                 availability_elem = self.driver.find_element(By.ID, "availability")
                 availability_text = availability_elem.text.lower()
+                stock = PAGE_PATTERNS.classify(availability_text, OUT_OF_STOCK, IN_STOCK)  # 재고 문구 한 번에 분류
                 
-                if any(phrase in availability_text for phrase in [
-                    'currently unavailable',
-                    'out of stock',
-                    'temporarily out of stock'
-                ]):
+                if OUT_OF_STOCK in stock:
                     logger.info(f"재고 없음: {availability_text}")
                     return False
                     
-                if any(phrase in availability_text for phrase in [
-                    'in stock',
-                    'only',
-                    'left in stock'
-                ]):
+                if IN_STOCK in stock:
                     logger.info(f"재고 있음: {availability_text}")
                     return True
                     
@@ -760,8 +854,18 @@ class AmazonScraper:
             logger.warning(f"재고 확인 중 오류: {e}")
             return True
     
+    def build_base_result(self, url, row_data):
+        """결과 행 기본 구조 생성 (정상/실패 경로 공통)"""
+        return new_result(row_data, url, self.local_tz, self.korea_tz, AMAZON_RESULT_COLUMNS,
+                          country_code=self.country_code, channel_name='amazon.com',
+                          vat=row_data.get('vat', 'x'))
+
     def extract_product_info(self, url, row_data, retry_count=0, max_retries=3):
         """제품 정보 추출"""
+        self.last_price_text = None
+        if retry_count == 0:
+            self.last_blocked = False
+
         try:
             logger.info("=" * 60)
             logger.info("제품 정보 추출 시작")
@@ -769,111 +873,88 @@ class AmazonScraper:
             logger.info(f"브랜드: {row_data.get('brand', 'N/A')}")
             logger.info(f"제품: {row_data.get('item', 'N/A')}")
             
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # eager/none 로딩: 제목+가격 확인 즉시 로딩 중단 (이미 확인됐으면 추가 대기 생략)
+            if not navigate(self.driver, url, self.page_load_strategy, self.navigation_deadline,
+                            AMAZON_READY_GROUPS, AMAZON_BLOCK_SELECTORS):
+                self.wait_for_page_load()
             
-            page_source_lower = self.driver.page_source.lower()
-            if ('continue shopping' in page_source_lower or 
-                'click the button below' in page_source_lower or
-                'weiter shoppen' in page_source_lower or
-                'klicke auf die schaltfläche' in page_source_lower):
+            # 이번 페이지의 title/URL은 한 번만 조회해 차단 검사에서 공유 (차단 문구는 브라우저 안에서 검사)
+            page = PageSnapshot(self.driver)
+            if page.classify(PAGE_PATTERNS, CONTINUE):
+                self.last_blocked = True
                 logger.info("차단/캡차 페이지 감지 - Continue/Weiter 버튼 찾는 중...")
                 if self.handle_captcha_or_block_page():
-                    time.sleep(3)
                     self.wait_for_page_load()
                 else:
                     logger.warning("Continue/Weiter 버튼 클릭 실패")
+                page.invalidate()
             
-            self.wait_for_page_load()
+            # snapshot 엔진: 같은 페이지 소스를 lxml로 한 번 파싱해 제목/이미지를 오프라인으로 처리
+            snapshot = page.parsed if self.extract_engine == ENGINE_SNAPSHOT else None
             
-            if self.is_page_blocked():
+            if self.is_page_blocked(page):
                 logger.error("여전히 차단 페이지임")
                 raise Exception("페이지 차단됨")
-            
-            # V2: 타임존 분리
 
+            result = self.build_base_result(url, row_data)
             
-            now_time = datetime.now(self.korea_tz)
+            fields = self.extract_fields_batch(url) if self.batch_extract else None
 
-            
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            result = {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.com',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
-            
-            result['title'] = self.extract_element_text(
-                self.selectors[self.country_code].get('title', []), 
-                "제목"
-            )
-            
-            has_stock = self.check_stock_availability()
-            
-            logger.info("가격 추출 시도")
-            result['retailprice'] = self.extract_price(self.country_code)
-            
-            result['ships_from'] = self.extract_element_text(
-                self.selectors[self.country_code].get('ships_from', []),
-                "Ships From"
-            )
+            if fields is not None:
+                result['title'] = fields['title']
+                result['retailprice'] = fields['retailprice']
+                result['ships_from'] = fields['ships_from']
+                result['sold_by'] = fields['sold_by']
+                result['imageurl'] = fields['imageurl']
+                logger.info(f"재고 텍스트: {fields['availability']}")
+            else:
+                if snapshot is not None:
+                    base_title_selectors = self.selectors[self.country_code].get('title', [])
+                    title_selectors = self.selector_memory.ordered(url, 'title', base_title_selectors)
+                    title_pinned = self.selector_memory.pinned(url, 'title', base_title_selectors)
+                    result['title'], title_hit = snapshot.first_text_match(title_selectors)
+                    if title_hit:
+                        self.selector_stats.record_first('title', title_selectors, title_hit, title_pinned)
+                        self.selector_memory.remember(url, 'title', title_hit)
+                if not result['title']:
+                    result['title'] = self.extract_element_text(
+                        self.selectors[self.country_code].get('title', []), 
+                        "제목",
+                        field='title',
+                        key=url
+                    )
+                
+                has_stock = self.check_stock_availability()
+                
+                logger.info("가격 추출 시도")
+                result['retailprice'] = self.extract_price(self.country_code, key=url)
+                
+                # 연속으로 값이 없었던 필드는 negative cache 기간 동안 추출 생략
+                # (둘 다 비면 건너뛴 필드를 다시 확인 - 아래 "판매자 없음 -> 가격 빈값" 규칙이 캐시만 보고 가격을 지우지 않도록)
+                seller_names = {'ships_from': "Ships From", 'sold_by': "Sold By"}
+                result['ships_from'], result['sold_by'] = self.selector_memory.extract_together(
+                    url, ('ships_from', 'sold_by'),
+                    lambda field: self.extract_element_text(
+                        self.selectors[self.country_code].get(field, []),
+                        seller_names[field],
+                        field=field,
+                        key=url
+                    )
+                )
 
             # "Fulfilled by Amazon"이면 "Amazon"으로 변환
             if result['ships_from'] and 'Fulfilled by Amazon' in result['ships_from']:
                 result['ships_from'] = 'Amazon'
 
-            result['sold_by'] = self.extract_element_text(
-                self.selectors[self.country_code].get('sold_by', []),
-                "Sold By"
-            )
-
             # ships_from이 None이고 sold_by가 있을 때, 통합 라벨 확인
             if not result['ships_from'] and result['sold_by']:
                 try:
                     # "Shipper / Seller" 라벨이 있는지 확인 (배송자/판매자 통합)
-                    combined_label_selectors = [
-                        "//span[contains(text(), 'Shipper / Seller')]",
-                        "//span[contains(text(), 'Shipper/Seller')]",
-                        "//*[@id='merchantInfoFeature_feature_div']//span[contains(@class, 'a-color-tertiary')][contains(text(), 'Shipper')]"
-                    ]
-                    for label_selector in combined_label_selectors:
-                        try:
-                            label_element = self.driver.find_element(By.XPATH, label_selector)
-                            if label_element and label_element.is_displayed():
-                                # 통합 라벨 발견 - sold_by 값을 ships_from에도 저장
-                                result['ships_from'] = result['sold_by']
-                                logger.info(f"Shipper / Seller 통합 라벨 발견 - ships_from에 sold_by 값 복사: {result['ships_from']}")
-                                break
-                        except:
-                            continue
+                    combined_label = fields['combined_label'] if fields is not None else self.has_combined_seller_label()
+                    if combined_label:
+                        # 통합 라벨 발견 - sold_by 값을 ships_from에도 저장
+                        result['ships_from'] = result['sold_by']
+                        logger.info(f"Shipper / Seller 통합 라벨 발견 - ships_from에 sold_by 값 복사: {result['ships_from']}")
                 except Exception as e:
                     logger.debug(f"통합 라벨 확인 중 오류: {e}")
 
@@ -885,31 +966,41 @@ class AmazonScraper:
             # ships_from 또는 sold_by가 있는데 price가 없으면 새로고침 후 재시도
             if result['retailprice'] is None and (result['ships_from'] or result['sold_by']):
                 logger.warning("ships_from/sold_by 있는데 price 없음 - 새로고침 후 재시도")
-                self.driver.refresh()
-                time.sleep(3)
+                page.refresh()
                 self.wait_for_page_load()
-                result['retailprice'] = self.extract_price(self.country_code)
+                result['retailprice'] = self.extract_price_fast(url)
                 if result['retailprice']:
                     logger.info(f"새로고침 후 가격 추출 성공: {result['retailprice']}")
                 else:
                     logger.warning("새로고침 후에도 가격 추출 실패")
 
-            for selector in self.selectors[self.country_code].get('imageurl', []):
-                try:
-                    if selector.startswith('//'):
-                        element = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        element = self.driver.find_element(By.CSS_SELECTOR, selector)
+            base_image_selectors = self.selectors[self.country_code].get('imageurl', [])
+            image_selectors = self.selector_memory.ordered(url, 'imageurl', base_image_selectors)
+            image_pinned = self.selector_memory.pinned(url, 'imageurl', base_image_selectors)
+            if fields is None and snapshot is not None:
+                result['imageurl'], image_hit = snapshot.first_attr_match(image_selectors, 'src')
+                self.selector_stats.record_first('imageurl', image_selectors, image_hit, image_pinned)
+                self.selector_memory.remember(url, 'imageurl', image_hit)
+            elif fields is None:
+                image_hit = None
+                for selector in image_selectors:
+                    try:
+                        if selector.startswith('//'):
+                            element = self.driver.find_element(By.XPATH, selector)
+                        else:
+                            element = self.driver.find_element(By.CSS_SELECTOR, selector)
                     
-                    result['imageurl'] = element.get_attribute('src')
-                    if result['imageurl']:
-                        logger.debug("이미지 URL 추출 성공")
-                        break
-                except:
-                    continue
+                        result['imageurl'] = element.get_attribute('src')
+                        if result['imageurl']:
+                            logger.debug("이미지 URL 추출 성공")
+                            image_hit = selector
+                            break
+                    except:
+                        continue
+                self.selector_stats.record_first('imageurl', image_selectors, image_hit, image_pinned)
+                self.selector_memory.remember(url, 'imageurl', image_hit)
             
-            page_source = self.driver.page_source
-            page_source_lower = page_source.lower()
+            # VAT 확인이 꺼져 있는 동안은 소스를 가져오지 않음 (다시 켤 때: page_source_lower = page.lower)
             
             # for vat_text in self.selectors[self.country_code].get('vat_text_list', []):
             #     if vat_text.lower() in page_source_lower:
@@ -925,6 +1016,7 @@ class AmazonScraper:
             logger.info(f"배송지: {result['ships_from']}")
             # logger.info(f"VAT: {result['vat']}")
             
+            attach_raw_price(result, self.last_price_text)
             return result
             
         except Exception as e:
@@ -943,47 +1035,8 @@ class AmazonScraper:
                     self.setup_driver()
                 
                 return self.extract_product_info(url, row_data, retry_count + 1, max_retries)
-            
-            # V2: 타임존 분리
-
-
-            now_time = datetime.now(self.korea_tz)
-
-
-            local_time = datetime.now(self.local_tz)
-
-            # ISO 8601 형식
-            crawl_dt = local_time.strftime("%Y-%m-%dT%H:%M:%S")
-            tz_offset = local_time.strftime("%z")
-            tz_formatted = f"{tz_offset[:3]}:{tz_offset[3:]}" if tz_offset else "+00:00"
-            crawl_datetime_iso = f"{crawl_dt}{tz_formatted}"
-
-            return {
-                'retailerid': row_data.get('retailerid', ''),
-                'country_code': self.country_code,
-                'ships_from': None,
-                'channel_name': 'amazon.com',
-                'channel': row_data.get('channel', 'Online'),
-                'retailersku': row_data.get('retailersku', ''),
-                'brand': row_data.get('brand', ''),
-                'brand_eng': row_data.get('brand_eng', row_data.get('brand', '')),
-                'form_factor': row_data.get('form_factor', ''),
-                'segment_lv1': row_data.get('seg_lv1', ''),
-                'segment_lv2': row_data.get('seg_lv2', ''),
-                'segment_lv3': row_data.get('seg_lv3', ''),
-                'capacity': row_data.get('capacity', ''),
-                'item': row_data.get('item', ''),
-                'retailprice': None,
-                'sold_by': None,
-                'imageurl': None,
-                'producturl': url,
-                'crawl_datetime': crawl_datetime_iso,
-                'kr_crawl_datetime': now_time.strftime('%Y-%m-%d %H:%M:%S'),  # V2: 한국시간
-                'kr_crawl_strdatetime': now_time.strftime('%Y%m%d%H%M%S') + f"{now_time.microsecond:06d}"[:4],  # V2: 한국시간 문자열
-                'crawl_strdatetime': local_time.strftime('%Y%m%d%H%M%S') + f"{local_time.microsecond:06d}"[:4],
-                'title': None,
-                'vat': row_data.get('vat', 'x')
-            }
+
+            return self.build_base_result(url, row_data)
     
     def get_crawl_targets(self, limit=None):
         """DB에서 크롤링 대상 URL 목록 조회"""
@@ -1016,7 +1069,7 @@ class AmazonScraper:
         try:
             table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
             
-            df.to_sql(table_name, self.db_engine, if_exists='append', index=False)
+            df = write_results(df, table_name, self.db_engine, self.country_code)
             logger.info(f"DB 저장 완료: {len(df)}개 레코드 -> {table_name}")
             
             log_records = []
@@ -1024,8 +1077,8 @@ class AmazonScraper:
                 log_records.append({
                     'country_code': self.country_code,
                     'url': row['producturl'],
-                    'status': 'success' if row['retailprice'] is not None else 'failed',
-                    'error_message': None if row['retailprice'] is not None else 'Price not found',
+                    'status': 'success' if pd.notna(row['retailprice']) else 'failed',
+                    'error_message': None if pd.notna(row['retailprice']) else 'Price not found',
                     'execution_time': random.uniform(3, 10),
                     'retailprice': row['retailprice'],
                     'crawl_datetime': row['crawl_datetime']
@@ -1033,7 +1086,7 @@ class AmazonScraper:
             
             if log_records:
                 log_df = pd.DataFrame(log_records)
-                log_df.to_sql('amazon_crawl_logs', self.db_engine, if_exists='append', index=False)
+                bulk_insert(log_df, 'amazon_crawl_logs', self.db_engine)
                 logger.info(f"크롤링 로그 저장 완료: {len(log_records)}개")
             
             return True
@@ -1094,6 +1147,9 @@ class AmazonScraper:
         time_str = now.strftime('%H%M%S')
         base_filename = f"{date_str}_{time_str}_usa_amazon"
 
+        # DB/CSV 공통 타입 스키마 (retailprice 숫자 + 최소 단위/통화/원문 컬럼)
+        df = apply_result_schema(df, self.country_code)
+
         results = {'db_saved': False, 'server_uploaded': False}
 
         if save_db:
@@ -1144,10 +1200,15 @@ class AmazonScraper:
                 logger.error(f"파일 저장 실패: {e}")
 
         return results
-    def scrape_urls(self, urls_data, max_items=None):
+    def scrape_urls(self, urls_data, max_items=None, pool_workers=1):
         """여러 URL 스크래핑"""
         if max_items:
             urls_data = urls_data[:max_items]
+
+        # 워커 풀 모드: 여러 브라우저가 샤드를 나눠 처리 (도메인 간격은 풀 전체 기준)
+        if pool_workers > 1:
+            return run_scraper_pool(self, urls_data, pool_workers, interim_table=f'amazon_price_crawl_tbl_{self.country_code}_v2',
+                                    throttle=self.rate_limiter)
         
         logger.info("=" * 80)
         logger.info("크롤링 시작")
@@ -1159,7 +1220,7 @@ class AmazonScraper:
             logger.error("드라이버 설정 실패")
             return None
         
-        results = []
+        results = ResultBuffer(AMAZON_RESULT_COLUMNS, release_flushed=True)
         failed_urls = []
 
         for idx, row in enumerate(urls_data):
@@ -1168,7 +1229,9 @@ class AmazonScraper:
 
                 url = row.get('url')
 
+                self.rate_limiter.wait(url)
                 result = self.extract_product_info(url, row)
+                self.rate_limiter.record(url, blocked=self.last_blocked)
 
                 if result['retailprice'] is None and result['title'] is None:
                     failed_urls.append({
@@ -1188,24 +1251,10 @@ class AmazonScraper:
                 results.append(result)
 
                 if (idx + 1) % 10 == 0:
-                    interim_df = pd.DataFrame(results[-10:])
-                    if self.db_engine:
-                        try:
-                            table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
-                            interim_df.to_sql(table_name, self.db_engine,
-                                            if_exists='append', index=False)
-                            logger.info("중간 저장: 10개 레코드 DB 저장")
-                        except Exception as e:
-                            logger.error(f"중간 저장 실패: {e}")
-
-                if idx < len(urls_data) - 1:
-                    wait_time = random.uniform(5, 10)
-                    logger.info(f"{wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-
-                    if (idx + 1) % 20 == 0:
-                        logger.info("20개 처리 완료, 30초 휴식...")
-                        time.sleep(30)
+                    interim_df = results.take_unflushed()
+                    if interim_df is not None and self.db_engine:
+                        table_name = f'amazon_price_crawl_tbl_{self.country_code}_v2'
+                        submit_results(interim_df, table_name, self.db_engine, self.country_code)
 
             except Exception as e:
                 logger.error(f"스크래핑 중 오류 (URL: {row.get('url', 'unknown')}): {e}")
@@ -1223,7 +1272,7 @@ class AmazonScraper:
             self.driver.quit()
             logger.info("드라이버 종료")
 
-        return pd.DataFrame(results)
+        return results.to_frame()
     
     def analyze_results(self, df):
         """결과 분석"""
@@ -1245,7 +1294,7 @@ class AmazonScraper:
             price_df = df[df['retailprice'].notna()].copy()
             
             try:
-                price_df['price_numeric'] = price_df['retailprice'].astype(str).str.replace(',', '').astype(float)
+                price_df['price_numeric'] = parse_price_series(price_df['retailprice'], self.country_code)
                 
                 logger.info("가격 통계:")
                 logger.info(f"   평균가: {price_df['price_numeric'].mean():.2f}")
@@ -1271,6 +1320,7 @@ def main():
     country_code = os.getenv('COUNTRY_CODE', 'usa').lower()
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     max_items = int(os.getenv('MAX_ITEMS', '0')) or None
+    pool_workers = get_pool_workers()
     
     print("=" * 80)
     print("Amazon 가격 추출 시스템 v5.4 (Clean Text Extraction + Ships/Sold By Validation)")
@@ -1324,7 +1374,7 @@ def main():
 
     logger.info(f"크롤링 대상: {len(urls_data)}개")
     
-    results_df = scraper.scrape_urls(urls_data, max_items)
+    results_df = scraper.scrape_urls(urls_data, max_items, pool_workers)
     
     if results_df is None or results_df.empty:
         logger.error("크롤링 결과가 없습니다.")
@@ -1349,6 +1399,14 @@ def main():
     logger.info("크롤링 프로세스 완료!")
     logger.info("=" * 80)
 
+    # 상품별 선택자 기억 저장 (다음 실행에서 우선 시도)
+    scraper.selector_memory.save()
+
+    # 선택자 적중률 리포트 + 학습된 priority 일괄 반영
+    scraper.selector_stats.report()
+    if os.getenv('SELECTOR_WRITEBACK', '1') == '1':
+        scraper.selector_stats.write_back(scraper.db_engine)
+
     # 크롤링 결과 모니터링 및 알림
     monitor_and_alert(country_code, len(urls_data), results_df)
 
@@ -1360,7 +1418,9 @@ if __name__ == "__main__":
         'pymysql',
         'sqlalchemy',
         'paramiko',
-        'openpyxl'
+        'openpyxl',
+        'lxml',
+        'cssselect'
     ]
     
     print("필요한 패키지:")
@@ -1369,6 +1429,15 @@ if __name__ == "__main__":
     print("export COUNTRY_CODE=us  # us, uk, de, fr, jp, ind 등")
     print("export TEST_MODE=false  # 테스트 모드")
     print("export MAX_ITEMS=10     # 최대 처리 개수 (선택사항)")
+    print("export BATCH_EXTRACT=1   # execute_script 1회로 전체 필드 일괄 추출 (선택사항)")
+    print("export EXTRACT_ENGINE=snapshot  # HTML 1회 스냅샷 후 lxml로 오프라인 추출 (기본: live)")
+    print("export SELECTOR_WRITEBACK=0  # 학습된 선택자 priority DB 반영 끄기 (기본: 반영)")
+    print("export PAGE_LOAD_STRATEGY_AMAZON=eager  # normal/eager/none - eager/none이면 제목+가격 확인 즉시 로딩 중단 (기본: normal)")
+    print("export NAV_DEADLINE_AMAZON=60  # 페이지 탐색 한도 초, 초과 시 재시도 (기본: 60)")
+    print("export READY_TIMEOUT_AMAZON=15  # 페이지 준비(가격/제목 노드 등장) 대기 한도 초 (기본: 15)")
+    print("export SELECTOR_MEMORY_DIR=  # 상품별 선택자 기억 파일 위치 (빈 값이면 저장 안 함, 기본: 스크립트 폴더)")
+    print("export BLOCK_PROFILE_AMAZON=full  # off/light/full - 이미지·폰트·미디어·광고 요청 차단 (기본: full)")
+    print("export POOL_WORKERS=3    # 동시 실행 브라우저 수 (선택사항, 기본 1)")
     print()
     
     main()
\ No newline at end of file